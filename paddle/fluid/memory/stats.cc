@@ -50,6 +50,10 @@ class StatRegistry {
     return GetStat(stat_type, dev_id)->GetPeakValue();
   }
 
+  void ResetPeakValue(const std::string& stat_type, int dev_id) {
+    GetStat(stat_type, dev_id)->ResetPeakValue();
+  }
+
   void Update(const std::string& stat_type, int dev_id, int64_t increment) {
     GetStat(stat_type, dev_id)->Update(increment);
   }
@@ -83,6 +87,10 @@ int64_t DeviceMemoryStatPeakValue(const std::string& stat_type, int dev_id) {
                                                    dev_id);
 }
 
+void DeviceMemoryStatResetPeakValue(const std::string& stat_type, int dev_id) {
+  StatRegistry::GetInstance()->ResetPeakValue("Device" + stat_type, dev_id);
+}
+
 void DeviceMemoryStatUpdate(const std::string& stat_type,
                             int dev_id,
                             int64_t increment) {
@@ -98,6 +106,10 @@ int64_t HostMemoryStatPeakValue(const std::string& stat_type, int dev_id) {
   return StatRegistry::GetInstance()->GetPeakValue("Host" + stat_type, dev_id);
 }
 
+void HostMemoryStatResetPeakValue(const std::string& stat_type, int dev_id) {
+  StatRegistry::GetInstance()->ResetPeakValue("Host" + stat_type, dev_id);
+}
+
 void HostMemoryStatUpdate(const std::string& stat_type,
                           int dev_id,
                           int64_t increment) {
@@ -31,6 +31,7 @@ using framework::ThreadDataRegistry;
 struct ThreadLocalStatBase {
   int64_t current{0};
   int64_t peak{0};
+  uint64_t peak_epoch{0};
 };
 
 class StatBase {
@@ -40,6 +41,7 @@ class StatBase {
 
   virtual int64_t GetCurrentValue() = 0;
   virtual int64_t GetPeakValue() = 0;
+  virtual void ResetPeakValue() = 0;
   virtual void Update(int64_t) = 0;
 
  private:
@@ -67,11 +69,23 @@ class Stat : public StatBase {
 
   int64_t GetPeakValue() override { return peak_value_; }
 
+  // Resets the peak value to the current value. The thread-local peaks are
+  // reset lazily, by the first update of each thread after the reset.
+  void ResetPeakValue() override {
+    ++peak_epoch_;
+    peak_value_ = GetCurrentValue();
+  }
+
   void Update(int64_t increment) override {
     auto& thread_data_registry =
         ThreadDataRegistry<ThreadLocalStatType>::GetInstance();
     ThreadLocalStatType* thread_local_stat =
         thread_data_registry.GetMutableCurrentThreadData();
+    uint64_t peak_epoch = peak_epoch_.load(std::memory_order_relaxed);
+    if (thread_local_stat->peak_epoch != peak_epoch) {
+      thread_local_stat->peak = thread_local_stat->current;
+      thread_local_stat->peak_epoch = peak_epoch;
+    }
     thread_local_stat->current += increment;
 
     if (thread_local_stat->current > thread_local_stat->peak) {
@@ -90,6 +104,7 @@ class Stat : public StatBase {
   Stat() {}
   ~Stat() {}
   std::atomic<int64_t> peak_value_{0};
+  std::atomic<uint64_t> peak_epoch_{0};
 };
 
 // xxxMemoryStatCurrentValue, xxxMemoryStatPeakValue and xxxMemoryStatUpdate
@@ -99,12 +114,14 @@ class Stat : public StatBase {
 // functions where ultra-low performance overhead is required.
 int64_t DeviceMemoryStatCurrentValue(const std::string& stat_type, int dev_id);
 int64_t DeviceMemoryStatPeakValue(const std::string& stat_type, int dev_id);
+void DeviceMemoryStatResetPeakValue(const std::string& stat_type, int dev_id);
 void DeviceMemoryStatUpdate(const std::string& stat_type,
                             int dev_id,
                             int64_t increment);
 
 int64_t HostMemoryStatCurrentValue(const std::string& stat_type, int dev_id);
 int64_t HostMemoryStatPeakValue(const std::string& stat_type, int dev_id);
+void HostMemoryStatResetPeakValue(const std::string& stat_type, int dev_id);
 void HostMemoryStatUpdate(const std::string& stat_type,
                           int dev_id,
                           int64_t increment);
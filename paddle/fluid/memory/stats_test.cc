@@ -173,5 +173,20 @@ TEST_F(StatsTest, HostReservedTest) {
   RunTests();
 }
 
+TEST_F(StatsTest, ResetPeakValueTest) {
+  // device 1 is not updated by the other tests
+  DeviceMemoryStatUpdate("Allocated", 1, 100);
+  DeviceMemoryStatUpdate("Allocated", 1, -60);
+  EXPECT_EQ(DeviceMemoryStatPeakValue("Allocated", 1), 100);
+
+  DeviceMemoryStatResetPeakValue("Allocated", 1);
+  EXPECT_EQ(DeviceMemoryStatPeakValue("Allocated", 1), 40);
+  // the peak after the reset is below the peak before it
+  DeviceMemoryStatUpdate("Allocated", 1, 30);
+  DeviceMemoryStatUpdate("Allocated", 1, -50);
+  EXPECT_EQ(DeviceMemoryStatPeakValue("Allocated", 1), 70);
+  DeviceMemoryStatUpdate("Allocated", 1, -20);
+}
+
 }  // namespace memory
 }  // namespace paddle
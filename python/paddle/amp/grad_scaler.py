@@ -146,6 +146,24 @@ class AmpScaler:
             self._cache_founf_inf = None
             self._optimizer_states = defaultdict(_refresh_optimizer_state)
 
+            # On GPU and XPU, the loss scaling and the step counters are
+            # updated by the update_loss_scaling kernel, which reads found_inf
+            # on device, so updating them does not wait for the step. The
+            # counters are only copied to the host by state_dict(). Only the
+            # optimizers whose update kernels check found_inf on device, i.e.
+            # Lamb, also skip the update without reading found_inf on the host.
+            self._update_on_device = (
+                tracer._expected_place.is_gpu_place()
+                or tracer._expected_place.is_xpu_place()
+            )
+            self._good_steps = to_variable(np.array([0]).astype(np.int32))
+            self._bad_steps = to_variable(np.array([0]).astype(np.int32))
+            # update_loss_scaling zeroes its inputs when found_inf is set,
+            # the gradients are left untouched by passing a placeholder
+            self._update_placeholder = to_variable(
+                np.array([0]).astype(np.float32)
+            )
+
     def scale(self, var):
         """
         Multiplies a Tensor by the scale factor and returns scaled outputs.
@@ -401,6 +419,21 @@ class AmpScaler:
         if not self._enable:
             return
 
+        if self._update_on_device:
+            _C_ops.update_loss_scaling_(
+                [self._update_placeholder],
+                self._found_inf,
+                self._scale,
+                self._good_steps,
+                self._bad_steps,
+                self._incr_every_n_steps,
+                self._decr_every_n_nan_or_inf,
+                self._incr_ratio,
+                self._decr_ratio,
+                False,
+            )
+            return
+
         if self._cache_founf_inf:
             self._incr_count = 0
             self._decr_count = self._decr_count + 1
@@ -412,13 +445,22 @@ class AmpScaler:
                         float(self._decr_ratio),
                     )
                 )
+                # the same lower bound as the update_loss_scaling kernel
                 self._scale = self._scale * self._decr_ratio
+                if float(self._scale) < 1.0:
+                    self._scale = to_variable(
+                        np.array([1.0]).astype(np.float32)
+                    )
                 self._decr_count = 0
         else:
             self._decr_count = 0
             self._incr_count = self._incr_count + 1
             if self._incr_count == self._incr_every_n_steps:
-                self._scale = self._scale * self._incr_ratio
+                # like the update_loss_scaling kernel, the scale is kept if
+                # the increased one overflows
+                new_scale = self._scale * self._incr_ratio
+                if np.isfinite(new_scale.numpy()).all():
+                    self._scale = new_scale
                 self._incr_count = 0
 
         return
@@ -551,6 +593,9 @@ class AmpScaler:
             decr_count(int): The number of recent consecutive skipped steps.
             use_dynamic_loss_scaling(bool): Whether to use dynamic loss scaling. If False, fixed loss_scaling is used. If True, the loss scaling is updated dynamicly. Default is True.
         """
+        if self._enable and self._update_on_device:
+            self._incr_count = int(self._good_steps.numpy()[0])
+            self._decr_count = int(self._bad_steps.numpy()[0])
         return (
             {
                 "scale": self._scale.numpy(),
@@ -592,6 +637,12 @@ class AmpScaler:
         self._decr_every_n_nan_or_inf = state_dict["decr_every_n_nan_or_inf"]
         self._incr_count = state_dict["incr_count"]
         self._decr_count = state_dict["decr_count"]
+        self._good_steps = to_variable(
+            np.array([self._incr_count]).astype(np.int32)
+        )
+        self._bad_steps = to_variable(
+            np.array([self._decr_count]).astype(np.int32)
+        )
         self._use_dynamic_loss_scaling = state_dict["use_dynamic_loss_scaling"]
 
 
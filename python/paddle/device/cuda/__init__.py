@@ -247,6 +247,14 @@ def max_memory_allocated(device=None):
     return core.device_memory_stat_peak_value("Allocated", device_id)
 
 
+def _reset_max_memory_allocated(device=None):
+    # resets the peak returned by max_memory_allocated to the size of gpu
+    # memory allocated now, so the peak of a later step can be measured
+    name = "paddle.device.cuda._reset_max_memory_allocated"
+    device_id = extract_cuda_device_id(device, op_name=name)
+    core.device_memory_stat_reset_peak_value("Allocated", device_id)
+
+
 def max_memory_reserved(device=None):
     '''
     Return the peak size of GPU memory that is held by the allocator of the given device.
@@ -18,9 +18,14 @@ import paddle
 import paddle.distributed.communication.stream as stream
 import paddle.framework as framework
 
+from .batch_isend_irecv import P2POp, batch_isend_irecv
+from .group import _get_global_group, _warn_cur_rank_not_in_group
+from .recv import irecv
+from .send import isend
 from .serialization_utils import (
-    convert_object_to_tensor,
-    convert_tensor_to_object,
+    _OBJECT_CHUNK_BYTES,
+    deserialize_object,
+    serialize_object,
 )
 
 
@@ -72,6 +77,8 @@ def all_gather_object(object_list, obj, group=None):
     """
 
     Gather picklable objects from all participators and all get the result. Similiar to all_gather(), but python object can be passed in.
+    The tensors and numpy arrays in the object are sent as raw bytes instead of being pickled, and the objects of different sizes are
+    gathered in chunks without padding them to the largest one.
 
     Args:
         object_list (list): A list of output object. The datatype of every element in the list is same as the input obj.
@@ -105,23 +112,73 @@ def all_gather_object(object_list, obj, group=None):
         framework.in_dygraph_mode()
     ), "all_gather_object doesn't support static graph mode."
 
-    tensor, len_of_tensor = convert_object_to_tensor(obj)
+    group = _get_global_group() if group is None else group
+    if _warn_cur_rank_not_in_group(group):
+        return
 
-    # gather len_of_tensor from all ranks
+    frame = serialize_object(obj)
+
+    # gather the frame sizes from all ranks
     list_len_of_tensor = []
-    all_gather(list_len_of_tensor, len_of_tensor, group)
-    # get the max length from list
-    max_len_of_tensor = int(max(list_len_of_tensor).item())
-    # resize the input tensor to max length avoid hang in all gather
-    # Note(liyurui): Maybe we should support various length all_gather?
-    # Now this operation is efficient for we don't support resize in python.
-    numpy_data = tensor.numpy()
-    numpy_data = np.resize(numpy_data, [max_len_of_tensor])
-    input_tensor = paddle.to_tensor(numpy_data)
-
-    tensor_list = []
-    all_gather(tensor_list, input_tensor, group)
-    for i, tensor in enumerate(tensor_list):
-        object_list.append(
-            convert_tensor_to_object(tensor, list_len_of_tensor[i])
-        )
+    all_gather(
+        list_len_of_tensor, paddle.to_tensor([frame.size], dtype="int64"), group
+    )
+    sizes = paddle.concat(list_len_of_tensor).numpy().tolist()
+
+    for gathered in _all_gather_frames(frame, sizes, group):
+        object_list.append(deserialize_object(gathered))
+
+
+def _all_gather_frames(frame, sizes, group):
+    """
+    Gather the variable-size uint8 frames of all ranks in chunks. A chunk
+    round is a padded all_gather if its padded size is within the chunk
+    budget, otherwise a ring of send/recv of the exact sizes, so at most two
+    chunks are staged on device.
+    """
+    rank, nranks = group.rank, group.nranks
+    outputs = [np.empty([size], dtype=np.uint8) for size in sizes]
+    outputs[rank] = frame
+    chunk_bytes = _OBJECT_CHUNK_BYTES
+    for offset in range(0, max(sizes), chunk_bytes):
+        pieces = [min(max(size - offset, 0), chunk_bytes) for size in sizes]
+        max_piece = max(pieces)
+        if max_piece * nranks <= chunk_bytes:
+            padded = np.zeros([max_piece], dtype=np.uint8)
+            padded[: pieces[rank]] = frame[offset : offset + pieces[rank]]
+            tensor_list = []
+            all_gather(tensor_list, paddle.to_tensor(padded), group)
+            for i, tensor in enumerate(tensor_list):
+                if i != rank:
+                    outputs[i][offset : offset + pieces[i]] = tensor.numpy()[
+                        : pieces[i]
+                    ]
+            continue
+
+        next_rank = group.ranks[(rank + 1) % nranks]
+        prev_rank = group.ranks[(rank - 1) % nranks]
+        send_tensor = None
+        if pieces[rank] > 0:
+            send_tensor = paddle.to_tensor(
+                frame[offset : offset + pieces[rank]]
+            )
+        for step in range(nranks - 1):
+            # forward the piece received in the last step to the next rank
+            send_idx = (rank - step) % nranks
+            recv_idx = (rank - step - 1) % nranks
+            ops = []
+            if pieces[send_idx] > 0:
+                ops.append(P2POp(isend, send_tensor, next_rank, group))
+            recv_tensor = None
+            if pieces[recv_idx] > 0:
+                recv_tensor = paddle.empty([pieces[recv_idx]], dtype="uint8")
+                ops.append(P2POp(irecv, recv_tensor, prev_rank, group))
+            if ops:
+                for task in batch_isend_irecv(ops):
+                    task.wait()
+            if recv_tensor is not None:
+                outputs[recv_idx][
+                    offset : offset + pieces[recv_idx]
+                ] = recv_tensor.numpy()
+            send_tensor = recv_tensor
+    return outputs
@@ -12,14 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+
 import paddle
 import paddle.distributed as dist
 import paddle.distributed.communication.stream as stream
 import paddle.framework as framework
 
 from .serialization_utils import (
-    convert_object_to_tensor,
-    convert_tensor_to_object,
+    _OBJECT_CHUNK_BYTES,
+    deserialize_object,
+    serialize_object,
 )
 
 
@@ -74,6 +77,7 @@ def broadcast_object_list(object_list, src, group=None):
     """
 
     Broadcast picklable objects from the source to all others. Similiar to broadcast(), but python object can be passed in.
+    The tensors and numpy arrays in the objects are sent as raw bytes instead of being pickled, and large objects are sent in chunks.
 
     Args:
         object_list (list): The list of objects to send if current rank is the source, or the list of objects to receive otherwise.
@@ -106,32 +110,36 @@ def broadcast_object_list(object_list, src, group=None):
     ), "broadcast_object_list doesn't support static graph mode."
 
     rank = dist.get_rank()
-    obj_tensors = []
     obj_nums = len(object_list)
-
     if rank == src:
-        obj_sizes = []
-        for obj in object_list:
-            obj_tensor, obj_size = convert_object_to_tensor(obj)
-            obj_tensors.append(obj_tensor)
-            obj_sizes.append(obj_size)
-        obj_size_tensor = paddle.concat(obj_sizes)
+        frames = [serialize_object(obj) for obj in object_list]
+        obj_size_tensor = paddle.to_tensor(
+            [frame.size for frame in frames], dtype="int64"
+        )
     else:
         obj_size_tensor = paddle.empty([obj_nums], dtype="int64")
-    broadcast(obj_size_tensor, src)
+    broadcast(obj_size_tensor, src, group)
+    obj_sizes = obj_size_tensor.numpy().tolist()
 
     if rank == src:
-        # cast to uint8 to keep the same dtype
-        obj_data_tensor = paddle.concat(obj_tensors).cast("uint8")
+        data = np.concatenate(frames) if frames else np.empty([0], np.uint8)
     else:
-        data_len = paddle.sum(obj_size_tensor).item()
-        obj_data_tensor = paddle.empty([data_len], dtype="uint8")
-    broadcast(obj_data_tensor, src)
+        data = np.empty([sum(obj_sizes)], dtype=np.uint8)
+    # stream the frames in chunks, so only one chunk is staged on device
+    for offset in range(0, data.size, _OBJECT_CHUNK_BYTES):
+        chunk = data[offset : offset + _OBJECT_CHUNK_BYTES]
+        if rank == src:
+            chunk_tensor = paddle.to_tensor(chunk)
+        else:
+            chunk_tensor = paddle.empty([chunk.size], dtype="uint8")
+        broadcast(chunk_tensor, src, group)
+        if rank != src:
+            chunk[:] = chunk_tensor.numpy()
 
+    if rank == src:
+        return
     offset = 0
     for i in range(obj_nums):
-        data_len = obj_size_tensor[i]
-        object_list[i] = convert_tensor_to_object(
-            obj_data_tensor[offset : offset + data_len], data_len
-        )
+        data_len = obj_sizes[i]
+        object_list[i] = deserialize_object(data[offset : offset + data_len])
         offset += data_len
@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copyreg
 import io
 import pickle
+import sys
 
 import numpy as np
 
@@ -32,3 +34,100 @@ def convert_object_to_tensor(obj):
 def convert_tensor_to_object(tensor, len_of_tensor):
     _unpickler = pickle.Unpickler
     return _unpickler(io.BytesIO(tensor.numpy()[:len_of_tensor])).load()
+
+
+_HAS_PROTOCOL_5 = sys.version_info >= (3, 8)
+# the bytes staged on device by one step of the object collectives
+_OBJECT_CHUNK_BYTES = 16 << 20
+
+
+def _rebuild_tensor(data, stop_gradient):
+    return paddle.to_tensor(data, stop_gradient=stop_gradient)
+
+
+def _reduce_tensor(tensor):
+    # the numpy data is pickled out-of-band instead of the tensor bytes
+    return (_rebuild_tensor, (tensor.numpy(), tensor.stop_gradient))
+
+
+def _dumps_out_of_band(obj):
+    """
+    Pickle ``obj`` with protocol 5, taking the data of the tensors and numpy
+    arrays out-of-band. Shared by the object collectives and the rpc.
+
+    Returns:
+        tuple, the pickle stream and the list of the out-of-band buffers, as
+        memoryviews.
+    """
+    buffers = []
+    f = io.BytesIO()
+    pickler = pickle.Pickler(
+        f, protocol=5, buffer_callback=lambda buf: buffers.append(buf.raw())
+    )
+    pickler.dispatch_table = copyreg.dispatch_table.copy()
+    pickler.dispatch_table[paddle.Tensor] = _reduce_tensor
+    pickler.dump(obj)
+    return f.getbuffer(), buffers
+
+
+def serialize_object(obj):
+    """
+    Serialize ``obj`` into a frame of uint8.
+
+    With pickle protocol 5, the data of the tensors and numpy arrays in
+    ``obj`` are taken out-of-band and copied into the frame once, instead of
+    being pickled into the stream. The frame starts with an int64 header
+    ``[num_buffers, stream_size, buffer_size_0, ...]``.
+
+    Args:
+        obj (object): A picklable object.
+
+    Returns:
+        numpy.ndarray, the frame of dtype uint8.
+    """
+    if _HAS_PROTOCOL_5:
+        stream, buffers = _dumps_out_of_band(obj)
+    else:
+        stream, buffers = memoryview(pickle.dumps(obj)), []
+
+    header = np.array(
+        [len(buffers), stream.nbytes] + [buf.nbytes for buf in buffers],
+        dtype=np.int64,
+    ).view(np.uint8)
+    frame = np.empty(
+        [header.size + stream.nbytes + sum(buf.nbytes for buf in buffers)],
+        dtype=np.uint8,
+    )
+    offset = 0
+    for part in [header, stream] + buffers:
+        size = part.nbytes
+        frame[offset : offset + size] = np.frombuffer(part, dtype=np.uint8)
+        offset += size
+    return frame
+
+
+def deserialize_object(frame):
+    """
+    Rebuild the object from a frame made by ``serialize_object``. The arrays
+    in the object share the memory of ``frame``.
+
+    Args:
+        frame (numpy.ndarray): The frame of dtype uint8.
+
+    Returns:
+        object, the rebuilt object.
+    """
+    itemsize = np.dtype(np.int64).itemsize
+    num_buffers, stream_size = frame[: 2 * itemsize].view(np.int64).tolist()
+    header_size = (2 + num_buffers) * itemsize
+    buffer_sizes = frame[2 * itemsize : header_size].view(np.int64).tolist()
+    view = memoryview(frame)
+    offset = header_size + stream_size
+    stream = view[header_size:offset]
+    buffers = []
+    for size in buffer_sizes:
+        buffers.append(view[offset : offset + size])
+        offset += size
+    if _HAS_PROTOCOL_5:
+        return pickle.loads(stream, buffers=buffers)
+    return pickle.loads(stream)
@@ -1567,6 +1567,12 @@ class DistributedStrategy:
 
             **micro_batch_size**: the number of small batches in each user defined batch
 
+            **activation_offload**: in dygraph pipeline parallel, move the activations of the micro batches waiting for backward to pinned host memory. Default False.
+
+            **offload_prefetch_depth**: the number of micro batches whose activations are prefetched back to device ahead of their backward. Default 1.
+
+            **report_pipeline_stats**: in dygraph pipeline parallel, collect the peak memory and bubble time of each stage, see ``PipelineParallel.get_pipeline_stats``. Default False.
+
         Examples:
             .. code-block:: python
 
@@ -13,6 +13,14 @@
 # limitations under the License.
 """This is definition of dataset class, which is high performance IO."""
 
+import math
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
 from google.protobuf import text_format
 
 import paddle.fluid.core as core
@@ -375,7 +383,17 @@ class InMemoryDataset(DatasetBase):
         self.merge_by_sid = True
         self.enable_pv_merge = False
         self.merge_by_lineid = False
+        self.merge_size = -1
         self.fleet_send_sleep_seconds = None
+        self.shuffle_by_uid = False
+        self.fea_eval = False
+        self.candidate_size = None
+        self.shuffle_memory_budget = None
+        self.shuffle_spill_dir = None
+        self.shuffle_window_num = None
+        self.shuffle_spill_buffer_size = 64 * 1024 * 1024
+        self.shuffle_seed = None
+        self.streaming_shuffle_stats = []
 
     def _init_distributed_settings(self, **kwargs):
         """
@@ -395,6 +413,9 @@ class InMemoryDataset(DatasetBase):
             fea_eval(bool): Set if Dataset need to do feature importance evaluation using slots shuffle.
                             default is False.
             candidate_size(int): if fea_eval is set True, set the candidate size used in slots shuffle.
+            shuffle_memory_budget(int): bytes of input data allowed in memory by streaming_global_shuffle. default is None.
+            shuffle_spill_dir(str): local directory of the spill files of streaming_global_shuffle. default is a temporary directory.
+            shuffle_window_num(int): number of windows of streaming_global_shuffle, required if the files are not local. default is None.
 
         Examples:
             .. code-block:: python
@@ -438,6 +459,14 @@ class InMemoryDataset(DatasetBase):
             candidate_size = kwargs.get("candidate_size", 10000)
             self._set_fea_eval(candidate_size, True)
 
+        shuffle_memory_budget = kwargs.get("shuffle_memory_budget", None)
+        if shuffle_memory_budget:
+            self._set_streaming_shuffle(
+                shuffle_memory_budget,
+                kwargs.get("shuffle_spill_dir", None),
+                kwargs.get("shuffle_window_num", None),
+            )
+
     def update_settings(self, **kwargs):
         """
         :api_attr: Static Graph
@@ -468,6 +497,9 @@ class InMemoryDataset(DatasetBase):
             fea_eval(bool): Set if Dataset need to do feature importance evaluation using slots shuffle.
                             default is False.
             candidate_size(int): if fea_eval is set True, set the candidate size used in slots shuffle.
+            shuffle_memory_budget(int): bytes of input data allowed in memory by streaming_global_shuffle. default is None.
+            shuffle_spill_dir(str): local directory of the spill files of streaming_global_shuffle. default is a temporary directory.
+            shuffle_window_num(int): number of windows of streaming_global_shuffle, required if the files are not local. default is None.
 
         Examples:
             .. code-block:: python
@@ -518,6 +550,12 @@ class InMemoryDataset(DatasetBase):
             elif key == "fea_eval" and kwargs[key]:
                 candidate_size = kwargs.get("candidate_size", 10000)
                 self._set_fea_eval(candidate_size, True)
+            elif key == "shuffle_memory_budget" and kwargs[key]:
+                self._set_streaming_shuffle(
+                    kwargs[key],
+                    kwargs.get("shuffle_spill_dir", None),
+                    kwargs.get("shuffle_window_num", None),
+                )
 
     def init(self, **kwargs):
         """
@@ -767,6 +805,7 @@ class InMemoryDataset(DatasetBase):
         """
         self.dataset.set_merge_by_lineid(merge_size)
         self.merge_by_lineid = True
+        self.merge_size = merge_size
         self.parse_ins_id = True
 
     def _set_shuffle_by_uid(self, enable_shuffle_uid):
@@ -785,6 +824,7 @@ class InMemoryDataset(DatasetBase):
               dataset._set_shuffle_by_uid(True)
         """
         self.dataset.set_shuffle_by_uid(enable_shuffle_uid)
+        self.shuffle_by_uid = enable_shuffle_uid
 
     def _set_generate_unique_feasigns(self, generate_uni_feasigns, shard_num):
         self.dataset.set_generate_unique_feasigns(generate_uni_feasigns)
@@ -1058,6 +1098,253 @@ class InMemoryDataset(DatasetBase):
         if fleet is not None:
             fleet._role_maker.barrier_worker()
 
+    def _set_streaming_shuffle(
+        self, memory_budget, spill_dir=None, window_num=None, seed=None
+    ):
+        """
+        Set the memory budget of streaming_global_shuffle.
+
+        Args:
+            memory_budget(int): bytes of input data allowed in memory. Two
+                windows are resident at the same time, the one being shuffled
+                and trained and the one being preloaded, so every window holds
+                at most half of the budget.
+            spill_dir(str): local directory of the spill files. default is a
+                temporary directory removed after the pass.
+            window_num(int): number of windows. default is None, which means
+                it is computed from the sizes of the local files.
+            seed(int): seed of the scatter of instances into windows.
+
+        Examples:
+            .. code-block:: python
+
+              import paddle
+              paddle.enable_static()
+              dataset = paddle.distributed.InMemoryDataset()
+              dataset._set_streaming_shuffle(32 * 1024 * 1024 * 1024, "./spill")
+
+        """
+        self.shuffle_memory_budget = memory_budget
+        self.shuffle_spill_dir = spill_dir
+        self.shuffle_window_num = window_num
+        self.shuffle_seed = seed
+
+    def _create_window_dataset(self):
+        if self.proto_desc.name == "SlotRecordInMemoryDataFeed":
+            dataset = core.Dataset("SlotRecordDataset")
+        else:
+            dataset = core.Dataset("MultiSlotDataset")
+        if self.merge_by_lineid:
+            dataset.set_merge_by_lineid(self.merge_size)
+        if self.shuffle_by_uid:
+            dataset.set_shuffle_by_uid(True)
+        if self.fea_eval:
+            dataset.set_fea_eval(True, self.candidate_size)
+        return dataset
+
+    def _read_lines(self, filename):
+        if os.path.isfile(filename):
+            with open(filename, "rb") as f:
+                for line in f:
+                    yield line
+            return
+        cmd = "{} {}".format(self.dataset.get_download_cmd(), filename)
+        proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE)
+        for line in proc.stdout:
+            yield line
+        if proc.wait() != 0:
+            raise RuntimeError("Failed to read file by: {}".format(cmd))
+
+    def _get_shuffle_window_num(self, filelist, fleet=None):
+        if self.shuffle_window_num:
+            window_num = self.shuffle_window_num
+        else:
+            if not all(os.path.isfile(f) for f in filelist):
+                raise ValueError(
+                    "shuffle_window_num should be set for streaming_global_shuffle "
+                    "when the files are not local."
+                )
+            total_size = sum(os.path.getsize(f) for f in filelist)
+            window_size = max(self.shuffle_memory_budget // 2, 1)
+            window_num = max(int(math.ceil(total_size / window_size)), 1)
+        if fleet is not None:
+            # every worker has to run the same number of global shuffles
+            import numpy as np
+
+            local_window_num = np.array([window_num])
+            global_window_num = local_window_num * 0
+            fleet._role_maker.all_reduce_worker(
+                local_window_num, global_window_num, "max"
+            )
+            window_num = int(global_window_num[0])
+        return window_num
+
+    def _spill_to_windows(self, filelist, window_num, spill_dir):
+        """
+        Scatter the instances of filelist randomly into the spill files of
+        window_num windows, with at most shuffle_spill_buffer_size bytes
+        buffered in memory. Each window is split into thread_num files so that
+        it can be loaded by thread_num readers.
+        """
+        rng = random.Random(self.shuffle_seed)
+        part_num = max(self.thread_num, 1)
+        bucket_num = window_num * part_num
+        paths = [
+            os.path.join(
+                spill_dir,
+                "window_{}_part_{}".format(i // part_num, i % part_num),
+            )
+            for i in range(bucket_num)
+        ]
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+        buffers = [[] for _ in range(bucket_num)]
+        buffered_size = 0
+
+        def flush():
+            for i, lines in enumerate(buffers):
+                if lines:
+                    with open(paths[i], "ab") as f:
+                        f.writelines(lines)
+                    buffers[i] = []
+
+        for filename in filelist:
+            for line in self._read_lines(filename):
+                if not line.endswith(b"\n"):
+                    line += b"\n"
+                buffers[rng.randrange(bucket_num)].append(line)
+                buffered_size += len(line)
+                if buffered_size >= self.shuffle_spill_buffer_size:
+                    flush()
+                    buffered_size = 0
+        flush()
+
+        return [
+            [
+                path
+                for path in paths[i * part_num : (i + 1) * part_num]
+                if os.path.exists(path)
+            ]
+            for i in range(window_num)
+        ]
+
+    def _preload_window(self, filelist, thread_num):
+        dataset = self._create_window_dataset()
+        origin_dataset, origin_filelist = self.dataset, self.filelist
+        self.dataset = dataset
+        try:
+            self.set_filelist(filelist)
+            self.preload_into_memory(thread_num)
+        finally:
+            self.dataset, self.filelist = origin_dataset, origin_filelist
+        return dataset
+
+    def streaming_global_shuffle(self, fleet=None, thread_num=12):
+        """
+        :api_attr: Static Graph
+
+        Global shuffle within the memory budget set by shuffle_memory_budget.
+
+        The instances of the filelist are first scattered randomly into the
+        windows, which are spilled to the local disk. Then for every window,
+        the window is loaded into memory and global shuffled, while the next
+        window is preloaded. It is a generator, which yields the window id
+        when the current window is ready to train. The memory of the window
+        is released when the generator resumes.
+
+        Args:
+            fleet(Fleet): fleet singleton. Default None.
+            thread_num(int): shuffle thread num. Default is 12.
+
+        Examples:
+            .. code-block:: python
+
+                import paddle
+                paddle.enable_static()
+
+                dataset = paddle.distributed.InMemoryDataset()
+                slots = ["slot1", "slot2", "slot3", "slot4"]
+                slots_vars = []
+                for slot in slots:
+                    var = paddle.static.data(
+                        name=slot, shape=[None, 1], dtype="int64", lod_level=1)
+                    slots_vars.append(var)
+                dataset.init(
+                    batch_size=1,
+                    thread_num=2,
+                    input_type=1,
+                    pipe_command="cat",
+                    use_var=slots_vars)
+                dataset.update_settings(shuffle_memory_budget=1024 * 1024)
+                filelist = ["a.txt", "b.txt"]
+                dataset.set_filelist(filelist)
+                exe = paddle.static.Executor(paddle.CPUPlace())
+                startup_program = paddle.static.Program()
+                main_program = paddle.static.Program()
+                exe.run(startup_program)
+                for window_id in dataset.streaming_global_shuffle():
+                    exe.train_from_dataset(main_program, dataset)
+
+        """
+        if self.shuffle_memory_budget is None:
+            raise ValueError(
+                "shuffle_memory_budget should be set before calling "
+                "streaming_global_shuffle."
+            )
+        if self.use_ps_gpu:
+            raise NotImplementedError(
+                "streaming_global_shuffle does not support ps gpu yet."
+            )
+
+        filelist = list(self.filelist)
+        window_num = self._get_shuffle_window_num(filelist, fleet)
+        spill_dir = self.shuffle_spill_dir
+        is_temp_dir = spill_dir is None
+        if is_temp_dir:
+            spill_dir = tempfile.mkdtemp(prefix="paddle_shuffle_")
+        else:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        origin_dataset = self.dataset
+        self.streaming_shuffle_stats = []
+        try:
+            windows = self._spill_to_windows(filelist, window_num, spill_dir)
+            next_dataset = self._preload_window(windows[0], self.thread_num)
+            for window_id in range(window_num):
+                window_dataset = next_dataset
+                window_dataset.wait_preload_done()
+                window_dataset.destroy_preload_readers()
+                if window_id + 1 < window_num:
+                    # overlap the preload of the next window with the
+                    # shuffle and the training of this window
+                    next_dataset = self._preload_window(
+                        windows[window_id + 1], self.thread_num
+                    )
+
+                self.dataset = window_dataset
+                memory_data_size = self.dataset.get_memory_data_size()
+                start = time.time()
+                self.global_shuffle(fleet, thread_num)
+                shuffle_seconds = time.time() - start
+                self.streaming_shuffle_stats.append(
+                    {
+                        "window_id": window_id,
+                        "memory_data_size": memory_data_size,
+                        "shuffle_data_size": self.dataset.get_shuffle_data_size(),
+                        "shuffle_seconds": shuffle_seconds,
+                        "shuffle_throughput": memory_data_size
+                        / max(shuffle_seconds, 1e-6),
+                    }
+                )
+                yield window_id
+                window_dataset.release_memory()
+        finally:
+            self.dataset = origin_dataset
+            if is_temp_dir:
+                shutil.rmtree(spill_dir, ignore_errors=True)
+
     def release_memory(self):
         """
         :api_attr: Static Graph
@@ -1105,7 +1392,8 @@ class InMemoryDataset(DatasetBase):
         of ins in all workers after load into memory.
 
         Note:
-            This function may cause bad performance, because it has barrier
+            This function may cause bad performance, because it has barrier.
+            Inside streaming_global_shuffle, it is the size of the current window.
 
         Args:
             fleet(Fleet): Fleet Object.
@@ -1160,6 +1448,9 @@ class InMemoryDataset(DatasetBase):
         Note:
             This function may cause bad performance to local shuffle,
             because it has barrier. It does not affect global shuffle.
+            Inside streaming_global_shuffle, it is the size of the current
+            window, and the shuffle throughput of every window is recorded
+            in ``streaming_shuffle_stats``.
 
         Args:
             fleet(Fleet): Fleet Object.
@@ -1229,6 +1520,7 @@ class InMemoryDataset(DatasetBase):
         if fea_eval:
             self.dataset.set_fea_eval(fea_eval, record_candidate_size)
         self.fea_eval = fea_eval
+        self.candidate_size = record_candidate_size
 
     def slots_shuffle(self, slots):
         """
@@ -24,6 +24,7 @@ from ..utils.log_util import logger
 from .meta_parallel_base import MetaParallelBase
 from .parallel_layers.pp_layers import PipelineLayer
 from .pp_utils import p2p_communication as p2p
+from .pp_utils.activation_offload import ActivationOffloader, PipelineStats
 
 __all__ = []
 
@@ -55,6 +56,17 @@ class PipelineParallel(MetaParallelBase):
             'enable_partial_send_recv'
         ]
         self._using_cache = self._strategy.pipeline_configs['p2p_cache_shape']
+        # Stashed activations of the micro batches waiting for backward
+        # can be moved to pinned host memory and prefetched back.
+        self._offloader = ActivationOffloader(
+            self._strategy.pipeline_configs['activation_offload']
+        )
+        self._offload_prefetch_depth = self._strategy.pipeline_configs[
+            'offload_prefetch_depth'
+        ]
+        self._stats = PipelineStats(
+            self._strategy.pipeline_configs['report_pipeline_stats']
+        )
 
         self.num_stages = self._hcg.get_pipe_parallel_world_size()
         self.stage_id = self._hcg.get_stage_id()
@@ -114,6 +126,46 @@ class PipelineParallel(MetaParallelBase):
     def set_virtual_pipeline_rank(self, rank):
         self._virtual_pp_rank = rank
 
+    def get_pipeline_stats(self):
+        """
+        Get the statistics of the last ``forward_backward_pipeline`` call on
+        this stage, including ``peak_memory``, ``bubble_time`` and
+        ``offloaded_bytes``. Only collected when ``report_pipeline_stats``
+        is set in ``pipeline_configs``.
+        """
+        return self._stats.as_dict()
+
+    def _forward_step_with_offload(self, input_tensor, key, chunk_id=None):
+        with self._stats.compute(), self._offloader.capture(key):
+            output_tensor = self._forward_step(input_tensor, chunk_id)
+        return output_tensor
+
+    def _backward_step_with_offload(
+        self,
+        key,
+        prefetch_keys,
+        input_tensor,
+        output_tensor,
+        output_tensor_grad,
+    ):
+        # the activations of key are usually prefetched by the previous
+        # backward step, issuing the copy again is a no-op
+        self._offloader.prefetch(key)
+        for prefetch_key in prefetch_keys:
+            self._offloader.prefetch(prefetch_key)
+        with self._stats.compute():
+            input_tensor_grad = self._backward_step(
+                input_tensor, output_tensor, output_tensor_grad
+            )
+        self._offloader.release(key)
+        return input_tensor_grad
+
+    def _prefetch_keys(self, micro_id):
+        last = min(
+            micro_id + self._offload_prefetch_depth, self.accumulate_steps - 1
+        )
+        return range(micro_id + 1, last + 1)
+
     def forward_backward_pipeline(self, data, scaler=None):
         # use the 1f1b scheduling strategy.
         # this strategy is inspired by:
@@ -134,14 +186,27 @@ class PipelineParallel(MetaParallelBase):
         startup_steps = min(startup_steps, self.accumulate_steps)
         steady_steps = self.accumulate_steps - startup_steps
 
+        # the micro batches forwarded by a stage with startup steps always
+        # wait for at least one other backward, it is worth to offload them
+        need_offload = startup_steps > 0
+        self._offloader.reset()
+        self._stats.begin()
+
         input_buffers = []
         output_buffers = []
+        forward_id = 0
+        backward_id = 0
 
         for step_id in range(startup_steps):
             input_tensor = p2p.recv_forward(self.is_pipeline_first_stage())
 
-            output_tensor = self._forward_step(input_tensor)
+            output_tensor = self._forward_step_with_offload(
+                input_tensor, forward_id
+            )
             p2p.send_forward(output_tensor, self.is_pipeline_last_stage())
+            if need_offload:
+                self._offloader.offload(forward_id)
+            forward_id += 1
 
             input_buffers.append(input_tensor)
             output_buffers.append(output_tensor)
@@ -152,11 +217,16 @@ class PipelineParallel(MetaParallelBase):
         for i in range(steady_steps):
             last_iter = i == (steady_steps - 1)
 
-            output_tensor = self._forward_step(input_tensor)
+            output_tensor = self._forward_step_with_offload(
+                input_tensor, forward_id
+            )
 
             output_tensor_grad = p2p.send_forward_recv_backward(
                 output_tensor, self.is_pipeline_last_stage()
             )
+            if need_offload:
+                self._offloader.offload(forward_id)
+            forward_id += 1
 
             input_buffers.append(input_tensor)
             output_buffers.append(output_tensor)
@@ -165,9 +235,14 @@ class PipelineParallel(MetaParallelBase):
                 0
             ), output_buffers.pop(0)
 
-            input_tensor_grad = self._backward_step(
-                input_tensor, output_tensor, output_tensor_grad
+            input_tensor_grad = self._backward_step_with_offload(
+                backward_id,
+                self._prefetch_keys(backward_id),
+                input_tensor,
+                output_tensor,
+                output_tensor_grad,
             )
+            backward_id += 1
 
             if last_iter:
                 input_tensor = None
@@ -187,12 +262,18 @@ class PipelineParallel(MetaParallelBase):
                 self.is_pipeline_last_stage()
             )
 
-            input_tensor_grad = self._backward_step(
-                input_tensor, output_tensor, output_tensor_grad
+            input_tensor_grad = self._backward_step_with_offload(
+                backward_id,
+                self._prefetch_keys(backward_id),
+                input_tensor,
+                output_tensor,
+                output_tensor_grad,
             )
+            backward_id += 1
             p2p.send_backward(input_tensor_grad, self.is_pipeline_first_stage())
 
         self._layers.allreduce_shared_weight_gradients()
+        self._stats.end(self._offloader.offloaded_bytes)
         with paddle.amp.auto_cast(enable=False):
             train_loss = self._broadcast_final_loss()
         return train_loss
@@ -500,7 +581,14 @@ class PipelineParallelWithInterleave(PipelineParallel):
             ):
                 self.input_tensors[virtual_pp_rank].append(None)
         input_tensor = self.input_tensors[virtual_pp_rank][-1]
-        output_tensor = self._forward_step(input_tensor, virtual_pp_rank)
+        if self._forward_only:
+            output_tensor = self._forward_step(input_tensor, virtual_pp_rank)
+        else:
+            key = (virtual_pp_rank, self._forward_counts[virtual_pp_rank])
+            self._forward_counts[virtual_pp_rank] += 1
+            output_tensor = self._forward_step_with_offload(
+                input_tensor, key, virtual_pp_rank
+            )
         self.output_tensors[virtual_pp_rank].append(output_tensor)
 
         if self._forward_only:
@@ -510,6 +598,19 @@ class PipelineParallelWithInterleave(PipelineParallel):
 
         return output_tensor
 
+    def _offload_last_forward(self, micro_step):
+        # in the interleave schedule, every forwarded chunk waits for the
+        # backward of the chunks forwarded before it
+        if self._forward_only:
+            return
+        virtual_pp_rank = self._get_virtual_pp_rank(micro_step, forward=True)
+        key = (virtual_pp_rank, self._forward_counts[virtual_pp_rank] - 1)
+        self._offloader.offload(key)
+
+    def _backward_key(self, micro_step):
+        virtual_pp_rank = self._get_virtual_pp_rank(micro_step, forward=False)
+        return (virtual_pp_rank, self._backward_counts[virtual_pp_rank])
+
     def _backward_step_helper(self, micro_step):
         virtual_pp_rank = self._get_virtual_pp_rank(micro_step, forward=False)
         self.set_virtual_pipeline_rank(virtual_pp_rank)
@@ -526,8 +627,19 @@ class PipelineParallelWithInterleave(PipelineParallel):
         input_tensor = self.input_tensors[virtual_pp_rank].pop(0)
         output_tensor = self.output_tensors[virtual_pp_rank].pop(0)
         output_tensor_grad = self.output_tensor_grads[virtual_pp_rank].pop(0)
-        input_tensor_grad = self._backward_step(
-            input_tensor, output_tensor, output_tensor_grad
+
+        key = self._backward_key(micro_step)
+        self._backward_counts[virtual_pp_rank] += 1
+        num_steps = self.accumulate_steps * self.num_model_chunks
+        prefetch_keys = [
+            self._backward_key(step)
+            for step in range(
+                micro_step + 1,
+                min(micro_step + 1 + self._offload_prefetch_depth, num_steps),
+            )
+        ]
+        input_tensor_grad = self._backward_step_with_offload(
+            key, prefetch_keys, input_tensor, output_tensor, output_tensor_grad
         )
 
         return input_tensor_grad
@@ -554,6 +666,10 @@ class PipelineParallelWithInterleave(PipelineParallel):
         self.input_tensors = [[] for _ in range(self.num_model_chunks)]
         self.output_tensors = [[] for _ in range(self.num_model_chunks)]
         self.output_tensor_grads = [[] for _ in range(self.num_model_chunks)]
+        self._forward_counts = [0] * self.num_model_chunks
+        self._backward_counts = [0] * self.num_model_chunks
+        self._offloader.reset()
+        self._stats.begin()
 
         num_steps = self.accumulate_steps * self.num_model_chunks
         all_startup_steps = False
@@ -579,6 +695,7 @@ class PipelineParallelWithInterleave(PipelineParallel):
         # run startup steps
         for micro_step in range(startup_steps):
             output_tensor = self._forward_step_helper(micro_step)
+            self._offload_last_forward(micro_step)
 
             # determine whether recv forward tensor or not
             next_virtual_pp_rank = self._get_virtual_pp_rank(
@@ -631,6 +748,7 @@ class PipelineParallelWithInterleave(PipelineParallel):
             # forward
             forward_micro_step_id = micro_step + startup_steps
             output_tensor = self._forward_step_helper(forward_micro_step_id)
+            self._offload_last_forward(forward_micro_step_id)
 
             # backward
             backward_micro_step_id = micro_step
@@ -748,6 +866,8 @@ class PipelineParallelWithInterleave(PipelineParallel):
 
             self._layers.allreduce_shared_weight_gradients()
 
+        self._stats.end(self._offloader.offloaded_bytes)
+
         if compute_loss:
             # return loss if compute loss
             with paddle.amp.auto_cast(enable=False):
@@ -0,0 +1,190 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import time
+
+import paddle
+from paddle.framework import core
+
+__all__ = []
+
+
+def _tensor_bytes(tensor):
+    return int(tensor._numel()) * core.size_of_dtype(tensor.dtype)
+
+
+class _SavedActivation:
+    """Holder returned by the pack hook for one tensor saved by autograd."""
+
+    def __init__(self, tensor):
+        self.tensor = tensor
+        self.device_place = None
+
+    @property
+    def offloaded(self):
+        return self.device_place is not None
+
+    def offload(self):
+        self.device_place = self.tensor.place
+        self.tensor = self.tensor._copy_to(core.CUDAPinnedPlace(), False)
+
+    def reload(self, blocking):
+        self.tensor = self.tensor._copy_to(self.device_place, blocking)
+        self.device_place = None
+
+
+class ActivationOffloader:
+    """
+    Move the activations stashed by autograd for the micro batches that are
+    waiting for their backward pass to pinned host memory, and bring them back
+    before the backward pass runs.
+
+    The offloader only provides the mechanism, the pipeline schedule decides
+    which micro batch to offload and when to prefetch it. Every micro batch is
+    identified by a hashable key chosen by the schedule.
+
+    Args:
+        enable(bool): whether to offload. If False, all methods are no-ops.
+        min_offload_bytes(int, optional): saved tensors smaller than this are
+            kept on device, since copying them costs more than it saves.
+            Default: 1MB.
+    """
+
+    def __init__(self, enable, min_offload_bytes=1 << 20):
+        self.enable = enable and paddle.is_compiled_with_cuda()
+        self.min_offload_bytes = min_offload_bytes
+        self._stash = {}
+        self.offloaded_bytes = 0
+
+    def reset(self):
+        self._stash = {}
+        self.offloaded_bytes = 0
+
+    @contextlib.contextmanager
+    def capture(self, key):
+        """Record the tensors saved by autograd while running the forward of ``key``."""
+        if not self.enable:
+            yield
+            return
+
+        holders = self._stash.setdefault(key, [])
+
+        def pack(x):
+            holder = _SavedActivation(x)
+            holders.append(holder)
+            return holder
+
+        def unpack(holder):
+            if holder.offloaded:
+                # not prefetched by the schedule, fall back to a blocking copy
+                holder.reload(blocking=True)
+            return holder.tensor
+
+        with paddle.autograd.saved_tensors_hooks(pack, unpack):
+            yield
+
+    def offload(self, key):
+        """Issue the device to pinned host copies of the activations of ``key``."""
+        for holder in self._stash.get(key, []):
+            tensor = holder.tensor
+            if (
+                holder.offloaded
+                or tensor.persistable
+                or not tensor.place.is_gpu_place()
+            ):
+                # parameters stay resident, they are not owned by this micro batch
+                continue
+            nbytes = _tensor_bytes(tensor)
+            if nbytes < self.min_offload_bytes:
+                continue
+            holder.offload()
+            self.offloaded_bytes += nbytes
+
+    def prefetch(self, key):
+        """Issue the non-blocking host to device copies of the activations of ``key``."""
+        for holder in self._stash.get(key, []):
+            if holder.offloaded:
+                holder.reload(blocking=False)
+
+    def release(self, key):
+        """Drop the holders of ``key`` once its backward pass has finished."""
+        self._stash.pop(key, None)
+
+
+class PipelineStats:
+    """
+    Per-stage statistics of one ``forward_backward_pipeline`` call.
+
+    ``compute_time`` is the host time spent in forward and backward steps,
+    ``bubble_time`` is the remaining wall time of the batch, which is spent
+    waiting on the neighbour stages. ``peak_memory`` is the peak gpu memory
+    allocated during the batch. The device is synchronized only at the
+    beginning and the end of the batch, so the numbers are cheap to collect
+    but launch-bound steps are attributed to compute.
+    """
+
+    def __init__(self, enable):
+        self.enable = enable
+        self.reset()
+
+    def reset(self):
+        self.total_time = 0.0
+        self.compute_time = 0.0
+        self.bubble_time = 0.0
+        self.peak_memory = None
+        self.offloaded_bytes = 0
+        self._start = None
+
+    def _synchronize(self):
+        if paddle.is_compiled_with_cuda():
+            paddle.device.cuda.synchronize()
+
+    def begin(self):
+        if not self.enable:
+            return
+        self.reset()
+        self._synchronize()
+        if paddle.is_compiled_with_cuda():
+            # max_memory_allocated is cumulative, restart it from this batch
+            paddle.device.cuda._reset_max_memory_allocated()
+        self._start = time.time()
+
+    @contextlib.contextmanager
+    def compute(self):
+        if not self.enable:
+            yield
+            return
+        start = time.time()
+        yield
+        self.compute_time += time.time() - start
+
+    def end(self, offloaded_bytes=0):
+        if not self.enable:
+            return
+        self._synchronize()
+        self.total_time = time.time() - self._start
+        self.bubble_time = max(self.total_time - self.compute_time, 0.0)
+        self.offloaded_bytes = offloaded_bytes
+        if paddle.is_compiled_with_cuda():
+            self.peak_memory = paddle.device.cuda.max_memory_allocated()
+
+    def as_dict(self):
+        return {
+            "total_time": self.total_time,
+            "compute_time": self.compute_time,
+            "bubble_time": self.bubble_time,
+            "peak_memory": self.peak_memory,
+            "offloaded_bytes": self.offloaded_bytes,
+        }
@@ -24,6 +24,12 @@ from paddle import framework, nn
 from paddle.autograd import PyLayer
 from paddle.distributed import collective
 from paddle.fluid.framework import EagerParamBase
+from paddle.fluid.lazy_init import (
+    Shard,
+    _is_lazy_param,
+    _materialize_param,
+    _materialize_shard,
+)
 from paddle.framework import core
 from paddle.nn import ClipGradByGlobalNorm
 
@@ -71,6 +77,9 @@ class GroupShardedStage3(nn.Layer):
     # 2. Support communication flow and computing flow.
     # 3. Support offload function.
     # 4. Support the establishment of independent communication groups.
+    # 5. Support the layer constructed under paddle.LazyGuard, every rank only
+    #    allocates its slices of the segmented params, which are initialized
+    #    or filled from lazy_state_dict, keyed by the structured names.
 
     def __init__(
         self,
@@ -85,6 +94,7 @@ class GroupShardedStage3(nn.Layer):
         sync_comm=False,
         dp_group=None,
         exclude_layer=None,
+        lazy_state_dict=None,
     ):
         super().__init__()
 
@@ -173,6 +183,10 @@ class GroupShardedStage3(nn.Layer):
                     if "grad_clip" in item.keys():
                         item["grad_clip"] = self._optim._grad_clip
 
+        # {param.name: value in lazy_state_dict}
+        self._lazy_state_dict = self._lazy_param_values(lazy_state_dict)
+        self._materialize_unslice_params()
+
         # Synchronous all ranks models
         if pertrain_sync_models:
             self._sync_params_and_buffers()
@@ -207,6 +221,9 @@ class GroupShardedStage3(nn.Layer):
         """
 
         for p in self._layer.parameters():
+            if _is_lazy_param(p):
+                # only the slice of the rank is allocated in _param_storage
+                continue
             dist.broadcast(
                 p, src=self._global_root_rank, group=self._group, sync_op=True
             )
@@ -348,6 +365,33 @@ class GroupShardedStage3(nn.Layer):
                 param, self._unslice_params2align[param.name]
             )
 
+    def _lazy_param_values(self, lazy_state_dict):
+        if not lazy_state_dict:
+            return {}
+        return {
+            p.name: lazy_state_dict[name]
+            for name, p in self._layer.named_parameters()
+            if _is_lazy_param(p) and name in lazy_state_dict
+        }
+
+    def _materialize_unslice_params(self):
+        """
+        Allocate the lazy params that are not segmented, they are kept whole
+        on every rank.
+        """
+        for layer in self._layer.sublayers(include_self=True):
+            exclude = (
+                id(layer) in self._exclude_layer
+                or layer.__class__.__name__ in self._exclude_layer
+            )
+            for p in _current_layer_params(layer):
+                if _is_lazy_param(p) and (
+                    exclude or p._numel() <= self._segment_size
+                ):
+                    _materialize_param(
+                        p, self._lazy_state_dict.pop(p.name, None)
+                    )
+
     def _segment_rank_params(self, layer, name="last_layer"):
         """
         Flatten parameters according to layer.
@@ -424,38 +468,42 @@ class GroupShardedStage3(nn.Layer):
         This is a function to simplify the handling of parameter InternalStorages.
         """
         assert isinstance(buffer_size, int)
-        value = (
-            np.zeros(buffer_size, dtype=np.float16)
-            if (
-                Type.fp16.value == param.dtype or Type.bf16.value == param.dtype
-            )
-            else np.zeros(buffer_size, dtype=np.float32)
-        )
-        buffer = core.eager.Tensor(value=value, place=core.CPUPlace())
-        if Type.bf16.value == param.dtype:
-            buffer = buffer.cast(Type.bf16.value)
-
-        param_shape = param.shape
-        origin_state = param.stop_gradient
-        param.stop_gradient = True
-        param.flatten_()
-        param.stop_gradient = origin_state
         start, end = self._param2buffer[param.name][self._rank]
+        if _is_lazy_param(param):
+            param_slice = self._lazy_param_slice(param, start, end)
+        else:
+            value = (
+                np.zeros(buffer_size, dtype=np.float16)
+                if (
+                    Type.fp16.value == param.dtype
+                    or Type.bf16.value == param.dtype
+                )
+                else np.zeros(buffer_size, dtype=np.float32)
+            )
+            buffer = core.eager.Tensor(value=value, place=core.CPUPlace())
+            if Type.bf16.value == param.dtype:
+                buffer = buffer.cast(Type.bf16.value)
 
-        # Copy the current param value
-        with device_guard():
-            tmp_var = buffer._slice(0, param._numel())
-        param_cpu = param.cpu()
-        tmp_var.get_tensor().set(param_cpu.get_tensor(), core.CPUPlace())
-        del tmp_var
-        param.get_tensor()._set_dims(param_shape)
+            param_shape = param.shape
+            origin_state = param.stop_gradient
+            param.stop_gradient = True
+            param.flatten_()
+            param.stop_gradient = origin_state
+
+            # Copy the current param value
+            with device_guard():
+                tmp_var = buffer._slice(0, param._numel())
+            param_cpu = param.cpu()
+            tmp_var.get_tensor().set(param_cpu.get_tensor(), core.CPUPlace())
+            del tmp_var
+            param.get_tensor()._set_dims(param_shape)
+            with device_guard():
+                param_slice = buffer._slice(start, end)
 
         # Current rank param_storage
         if self._offload:
-            with device_guard():
-                tmp_tensor = buffer._slice(start, end)
             param.fw_storage = core.eager.Tensor(
-                value=tmp_tensor,
+                value=param_slice,
                 place=core.CPUPlace(),
                 name="slice@" + param.name,
             )
@@ -466,7 +514,7 @@ class GroupShardedStage3(nn.Layer):
                     )
         else:
             param.fw_storage = core.eager.Tensor(
-                value=buffer._slice(start, end), name="slice@" + param.name
+                value=param_slice, name="slice@" + param.name
             )
         param.status = "part"
 
@@ -483,6 +531,27 @@ class GroupShardedStage3(nn.Layer):
             self._optim._master_weights[param.fw_storage.name] = master_tensor
         param._clear_data()
 
+    def _lazy_param_slice(self, param, start, end):
+        """
+        Allocate only the slice [start, end) of the flattened lazy param,
+        without the buffer of the whole param.
+        """
+        value = self._lazy_state_dict.pop(param.name, None)
+        param_slice = _materialize_shard(param, Shard(start, end), value)
+        if (
+            value is None
+            and self._dp_group is not None
+            and self._dp_group.nranks > 1
+        ):
+            # the random initialization differs between the replicas
+            dist.broadcast(
+                param_slice,
+                src=self._dp_group.ranks[0],
+                group=self._dp_group,
+                sync_op=True,
+            )
+        return param_slice
+
     def _register_forward_hooks(self, layer):
         """
         Register PyLayer to manage memory slices.
@@ -14,5 +14,6 @@
 
 from .recompute import recompute, recompute_sequential
 from .recompute_hybrid import recompute_hybrid
+from .recompute_planner import RecomputePlanner, plan_recompute
 
 __all__ = []
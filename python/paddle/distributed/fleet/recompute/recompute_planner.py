@@ -0,0 +1,305 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import time
+
+import paddle
+from paddle import framework
+from paddle.framework import core
+
+from ..utils.log_util import logger
+from .recompute import recompute
+
+__all__ = []
+
+
+def _tensor_bytes(tensor):
+    return int(tensor._numel()) * core.size_of_dtype(tensor.dtype)
+
+
+def _input_bytes(inputs):
+    return sum(_tensor_bytes(x) for x in inputs if paddle.is_tensor(x))
+
+
+def _requires_grad(inputs):
+    return any(paddle.is_tensor(x) and not x.stop_gradient for x in inputs)
+
+
+def _synchronize():
+    if paddle.is_compiled_with_cuda():
+        paddle.device.cuda.synchronize()
+
+
+def _memory_allocated():
+    if paddle.is_compiled_with_cuda():
+        return paddle.device.cuda.memory_allocated()
+    return None
+
+
+def plan_recompute(
+    activation_bytes,
+    input_bytes,
+    forward_costs,
+    memory_budget,
+    num_buckets=1000,
+    recomputable=None,
+):
+    """
+    Choose the layers to recompute with a 0/1 knapsack.
+
+    Recomputing layer ``i`` releases ``activation_bytes[i] - input_bytes[i]``
+    bytes, since the recompute segment still keeps its inputs, and costs
+    ``forward_costs[i]`` in backward. The layers kept resident are the ones
+    with the largest total forward cost whose released bytes fit in the
+    budget left after recomputing everything.
+
+    Args:
+        activation_bytes(list[int]): bytes saved by autograd in each layer.
+        input_bytes(list[int]): bytes of the inputs of each layer.
+        forward_costs(list[float]): forward time of each layer.
+        memory_budget(int): the bytes of activations allowed to be kept.
+        num_buckets(int, optional): the memory budget is discretized into
+            ``num_buckets`` units for the dynamic programming. Default: 1000.
+        recomputable(list[bool], optional): whether each layer can be
+            recomputed. A layer whose inputs all stop gradient can not, since
+            the recompute segment would not pass gradients to its parameters.
+            Default: None, which means all the layers can be recomputed.
+
+    Returns:
+        list[int], the sorted indices of the layers to recompute.
+    """
+    assert len(activation_bytes) == len(input_bytes) == len(forward_costs)
+    if recomputable is None:
+        recomputable = [True] * len(activation_bytes)
+    assert len(recomputable) == len(activation_bytes)
+    savings = [
+        max(act - inp, 0) if can else 0
+        for act, inp, can in zip(activation_bytes, input_bytes, recomputable)
+    ]
+    candidates = [i for i, saving in enumerate(savings) if saving > 0]
+    # memory used even if every candidate is recomputed
+    min_memory = sum(activation_bytes) - sum(savings)
+    capacity = memory_budget - min_memory
+    if capacity < 0:
+        logger.warning(
+            "[Recompute]: the memory budget {} is smaller than the memory {} "
+            "used when recomputing every layer.".format(
+                memory_budget, min_memory
+            )
+        )
+        return candidates
+    if sum(savings[i] for i in candidates) <= capacity:
+        return []
+
+    unit = max(capacity / num_buckets, 1.0)
+    buckets = int(capacity // unit)
+    # weights are rounded up, so the chosen plan never exceeds the budget
+    weights = {i: int(math.ceil(savings[i] / unit)) for i in candidates}
+
+    best = [0.0] * (buckets + 1)
+    keep = []
+    for i in candidates:
+        weight = weights[i]
+        chosen = [False] * (buckets + 1)
+        for c in range(buckets, weight - 1, -1):
+            value = best[c - weight] + forward_costs[i]
+            if value > best[c]:
+                best[c] = value
+                chosen[c] = True
+        keep.append(chosen)
+
+    kept = set()
+    c = buckets
+    for idx in range(len(candidates) - 1, -1, -1):
+        i = candidates[idx]
+        if keep[idx][c]:
+            kept.add(i)
+            c -= weights[i]
+    return [i for i in candidates if i not in kept]
+
+
+class RecomputePlanner(paddle.nn.Layer):
+    """
+    Run the sublayers of a ``paddle.nn.Sequential`` or ``paddle.nn.LayerList``
+    in order, and recompute the sublayers chosen by a memory budget planner.
+
+    The first training step runs without recompute and profiles the bytes
+    saved by autograd and the forward time of every sublayer. Then the
+    sublayers to recompute are chosen by ``plan_recompute`` and applied from
+    the next step on. A sublayer whose tensor inputs all stop gradient, like
+    the first one fed with data, is never recomputed, since the recompute
+    segment would not pass gradients to its parameters.
+
+    Parameters:
+        layers(paddle.nn.Sequential|paddle.nn.LayerList): the sublayers, the
+            output of each sublayer is the input of the next one.
+        memory_budget(int): the bytes of activations allowed to be kept.
+        preserve_rng_state(bool, optional): whether to restore the forward rng
+            when recomputing. Default: True.
+        num_buckets(int, optional): the granularity of the planner. Default: 1000.
+
+    Examples:
+        .. code-block:: python
+
+            import paddle
+            from paddle.distributed.fleet.recompute import RecomputePlanner
+
+            blocks = paddle.nn.Sequential(
+                *[paddle.nn.Linear(1024, 1024) for _ in range(8)]
+            )
+            model = RecomputePlanner(blocks, memory_budget=64 * 1024 * 1024)
+            for _ in range(2):
+                loss = model(paddle.rand([256, 1024])).mean()
+                loss.backward()
+            print(model.report())
+    """
+
+    def __init__(
+        self, layers, memory_budget, preserve_rng_state=True, num_buckets=1000
+    ):
+        super().__init__()
+        if not isinstance(layers, (paddle.nn.Sequential, paddle.nn.LayerList)):
+            raise TypeError(
+                "RecomputePlanner only supports paddle.nn.Sequential or "
+                "paddle.nn.LayerList, but received {}".format(type(layers))
+            )
+        self.layers = layers
+        self.memory_budget = memory_budget
+        self.preserve_rng_state = preserve_rng_state
+        self.num_buckets = num_buckets
+
+        self._activation_bytes = None
+        self._input_bytes = None
+        self._input_requires_grad = None
+        self._forward_costs = None
+        self._recompute_layers = None
+        self._full_memory = None
+        self._actual_saved_bytes = None
+
+    @property
+    def recompute_layers(self):
+        """The indices of the sublayers to recompute, None before profiling."""
+        return self._recompute_layers
+
+    def _run_layer(self, layer, inputs):
+        if isinstance(inputs, tuple):
+            return layer(*inputs)
+        return layer(inputs)
+
+    def _profile_forward(self, inputs):
+        self._activation_bytes = []
+        self._input_bytes = []
+        self._input_requires_grad = []
+        self._forward_costs = []
+        saved_bytes = 0
+
+        def pack(x):
+            nonlocal saved_bytes
+            if not x.persistable:
+                saved_bytes += _tensor_bytes(x)
+            return x
+
+        def unpack(x):
+            return x
+
+        start_memory = _memory_allocated()
+        for layer in self.layers:
+            layer_inputs = inputs if isinstance(inputs, tuple) else (inputs,)
+            self._input_bytes.append(_input_bytes(layer_inputs))
+            self._input_requires_grad.append(_requires_grad(layer_inputs))
+            saved_bytes = 0
+            _synchronize()
+            start = time.time()
+            with paddle.autograd.saved_tensors_hooks(pack, unpack):
+                inputs = self._run_layer(layer, inputs)
+            _synchronize()
+            self._forward_costs.append(time.time() - start)
+            self._activation_bytes.append(saved_bytes)
+        if start_memory is not None:
+            self._full_memory = _memory_allocated() - start_memory
+
+        self._recompute_layers = plan_recompute(
+            self._activation_bytes,
+            self._input_bytes,
+            self._forward_costs,
+            self.memory_budget,
+            self.num_buckets,
+            self._input_requires_grad,
+        )
+        logger.info(
+            "[Recompute]: planner chooses layers {} to recompute, "
+            "estimated saved bytes: {}".format(
+                self._recompute_layers, self.estimated_saved_bytes()
+            )
+        )
+        return inputs
+
+    def _planned_forward(self, inputs):
+        recompute_layers = set(self._recompute_layers)
+        start_memory = None
+        if self._actual_saved_bytes is None:
+            start_memory = _memory_allocated()
+        for i, layer in enumerate(self.layers):
+            layer_inputs = inputs if isinstance(inputs, tuple) else (inputs,)
+            # the inputs may stop gradient unlike on the profiled step
+            if i in recompute_layers and _requires_grad(layer_inputs):
+                inputs = recompute(
+                    layer,
+                    *layer_inputs,
+                    preserve_rng_state=self.preserve_rng_state
+                )
+            else:
+                inputs = self._run_layer(layer, inputs)
+        if start_memory is not None and self._full_memory is not None:
+            planned_memory = _memory_allocated() - start_memory
+            self._actual_saved_bytes = self._full_memory - planned_memory
+        return inputs
+
+    def forward(self, *inputs):
+        inputs = inputs[0] if len(inputs) == 1 else inputs
+        if not (self.training and framework._dygraph_tracer()._has_grad):
+            for layer in self.layers:
+                inputs = self._run_layer(layer, inputs)
+            return inputs
+        if self._recompute_layers is None:
+            return self._profile_forward(inputs)
+        return self._planned_forward(inputs)
+
+    def estimated_saved_bytes(self):
+        if self._recompute_layers is None:
+            return None
+        return sum(
+            max(self._activation_bytes[i] - self._input_bytes[i], 0)
+            for i in self._recompute_layers
+        )
+
+    def report(self):
+        """
+        Get the plan and the memory saved by it.
+
+        Returns:
+            dict, with the keys ``recompute_layers``, ``activation_bytes``,
+            ``forward_costs``, ``estimated_saved_bytes`` and
+            ``actual_saved_bytes``. The actual bytes are measured by the device
+            allocator on the first planned step, and are None on devices
+            without allocator statistics.
+        """
+        return {
+            "recompute_layers": self._recompute_layers,
+            "activation_bytes": self._activation_bytes,
+            "forward_costs": self._forward_costs,
+            "estimated_saved_bytes": self.estimated_saved_bytes(),
+            "actual_saved_bytes": self._actual_saved_bytes,
+        }
@@ -467,7 +467,7 @@ class AMPState:
                                 appended_grad_times
                             ][cast_name] = fwd_cast_name
 
-                            cast_op = self._block._insert_op(
+                            cast_op = self._block._insert_op_without_sync(
                                 idx + 1,
                                 type="cast",
                                 inputs={"X": cast_var},
@@ -233,9 +233,14 @@ class DataParallelOptimizationPass(PassBase):
     def _remove_grad_scaling(self):
         block = default_main_program().global_block()
 
-        for op_idx, op in reversed(list(enumerate(block.ops))):
-            if is_data_parallel_scale_op(op):
-                block._remove_op(op_idx, False)
+        block._remove_ops(
+            [
+                op_idx
+                for op_idx, op in enumerate(block.ops)
+                if is_data_parallel_scale_op(op)
+            ],
+            sync=False,
+        )
 
         block._sync_with_cpp()
 
@@ -505,11 +510,11 @@ class DataParallelOptimizationPass(PassBase):
                 + group.remove_allreduce_op_indices
                 + group.remove_scale_op_indices
             )
-            for idx in sorted(remove_op_indices, reverse=True):
+            for idx in remove_op_indices:
                 assert (
                     block.ops[idx].type in remove_op_types
                 ), "Unexpected: try to remove op {}".format(str(block.ops[idx]))
-                block._remove_op(idx, False)
+            block._remove_ops(remove_op_indices, sync=False)
 
             # insert coalesce op
             concated_shapes = []
@@ -667,13 +672,15 @@ class DataParallelOptimizationPass(PassBase):
                 return False
             return True
 
-        for idx, op in reversed(list(enumerate(block.ops))):
+        removed_op_indices = []
+        for idx, op in enumerate(block.ops):
             if is_data_parallel_reduce_op(op):
                 op._set_attr('use_calc_stream', True)
                 op.dist_attr.execution_stream = self.gradient_sync_stream
 
             if remove_cond(op):
-                block._remove_op(idx, sync=False)
+                removed_op_indices.append(idx)
+        block._remove_ops(removed_op_indices, sync=False)
 
         block._sync_with_cpp()
 
@@ -400,13 +400,15 @@ class ClipGradByGloblNormPass(PassBase):
                 else:
                     op.desc.set_input("X", reserved_vars)
 
+        removed_indices = []
         for idx, op in reversed(list(enumerate(block.ops))):
             if not is_optimize_op(op):
                 break
             if not is_gradient_clip_op(op):
                 continue
             if idx in removed_op_idx:
-                block._remove_op(idx, sync=False)
+                removed_indices.append(idx)
+        block._remove_ops(removed_indices, sync=False)
 
         for idx, op in reversed(list(enumerate(block.ops))):
             if not is_optimize_op(op):
@@ -421,7 +423,7 @@ class ClipGradByGloblNormPass(PassBase):
                     offset = 0
                     if input_name in removed_tmp_var:
                         removed_tmp_var.remove(input_name)
-                        fill_constant_op = block._insert_op(
+                        fill_constant_op = block._insert_op_without_sync(
                             idx,
                             type='fill_constant',
                             inputs={},
@@ -441,7 +443,7 @@ class ClipGradByGloblNormPass(PassBase):
                         self.clip_helper._init_dist_attr(fill_constant_op)
                         insert_leaf_fill_constant_node = True
 
-                    allreduce_op = block._insert_op(
+                    allreduce_op = block._insert_op_without_sync(
                         idx + offset,
                         type='c_allreduce_sum',
                         inputs={'X': [input_var]},
@@ -369,11 +369,7 @@ class ShardingPass(PassBase):
                         for output_name in op.output_arg_names:
                             removed_tmp_var.add(output_name)
 
-        for idx, op in reversed(list(enumerate(main_block.ops))):
-            if not _is_gradient_clip_op(op):
-                continue
-            if idx in removed_op_idx:
-                main_block._remove_op(idx, sync=False)
+        main_block._remove_ops(removed_op_idx, sync=False)
 
         for varname in removed_tmp_var:
             main_block._remove_var(varname, sync=False)
@@ -432,6 +428,7 @@ class ShardingPass(PassBase):
     def _shard_optimizer_ops_and_states(self, main_block, startup_block):
 
         should_removed_optimizer_states = []
+        removed_op_indices = []
         for idx, op in reversed(list(enumerate(main_block.ops))):
             if not is_optimize_op(op):
                 break
@@ -448,18 +445,23 @@ class ShardingPass(PassBase):
                             if varname != param_name
                         ]
                     )
-                    main_block._remove_op(idx, sync=False)
+                    removed_op_indices.append(idx)
                 else:
                     self.shared_params_grads.append(
                         self._get_param_grad(param_name)
                     )
-
-        for idx, op in reversed(list(enumerate(startup_block.ops))):
-            if (
-                len(op.output_arg_names) == 1
-                and op.output_arg_names[0] in should_removed_optimizer_states
-            ):
-                startup_block._remove_op(idx, sync=False)
+        main_block._remove_ops(removed_op_indices, sync=False)
+
+        removed_states = set(should_removed_optimizer_states)
+        startup_block._remove_ops(
+            [
+                idx
+                for idx, op in enumerate(startup_block.ops)
+                if len(op.output_arg_names) == 1
+                and op.output_arg_names[0] in removed_states
+            ],
+            sync=False,
+        )
 
         for varname in should_removed_optimizer_states:
             if main_block.has_var(varname):
@@ -1740,8 +1742,7 @@ def re_order_program(block, param_grads, dist_context):
             )
 
         # remove old opts
-        for idx in remove_op_indices:
-            block._remove_op(idx, sync=False)
+        block._remove_ops(remove_op_indices, sync=False)
 
         block._sync_with_cpp()
         assert len(block.ops) == num_ops
@@ -60,10 +60,10 @@ def prune_program(program, start_op_idx, end_op_idx):
     assert start_op_idx < end_op_idx
 
     program = program.clone()
-    for idx in range(op_num - 1, end_op_idx - 1, -1):
-        program.global_block()._remove_op(idx, sync=False)
-    for idx in range(start_op_idx - 1, -1, -1):
-        program.global_block()._remove_op(idx, sync=False)
+    program.global_block()._remove_ops(
+        list(range(start_op_idx)) + list(range(end_op_idx, op_num)),
+        sync=False,
+    )
     program._sync_with_cpp()
 
     valid_vars = set()
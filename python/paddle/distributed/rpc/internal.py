@@ -13,20 +13,96 @@
 # limitations under the License.
 
 import pickle
+import struct
 from collections import namedtuple
 
+# _rebuild_tensor is kept here for the messages pickled with its former path
+from paddle.distributed.communication.serialization_utils import (  # noqa: F401
+    _HAS_PROTOCOL_5,
+    _dumps_out_of_band,
+    _rebuild_tensor,
+)
+
 PythonFunc = namedtuple("PythonFunc", ["func", "args", "kwargs"])
 """Some Python code interfaces called in C++"""
 
+# Pickle protocol 5 (PEP 574) keeps the buffers of NumPy arrays out of the
+# pickle stream. A message with out-of-band buffers is framed as
+#   magic | num_buffers | pickle_size | buffer_sizes... | pickle | buffers...
+# and the buffers are handed to `pickle.loads` as writable copies. With
+# _set_zero_copy_deserialization(True), they are handed as memoryviews of the
+# received bytes instead, so the arrays are rebuilt without copying their
+# data, but are read-only.
+_OOB_MAGIC = b"PDRPC5"
+_SIZE_FORMAT = "<Q"
+_SIZE_BYTES = struct.calcsize(_SIZE_FORMAT)
+_use_out_of_band = _HAS_PROTOCOL_5
+_zero_copy = False
+
+
+def _set_out_of_band_serialization(enable):
+    """Enable or disable the out-of-band serialization of the calls sent by this process."""
+    global _use_out_of_band
+    _use_out_of_band = enable and _HAS_PROTOCOL_5
+
+
+def _set_zero_copy_deserialization(enable):
+    """Enable or disable receiving arrays as read-only views of the message."""
+    global _zero_copy
+    _zero_copy = enable
+
 
 def _serialize(obj):
-    return pickle.dumps(obj)
+    if not _use_out_of_band:
+        return pickle.dumps(obj)
+
+    stream, buffers = _dumps_out_of_band(obj)
+    if not buffers:
+        return stream.tobytes()
+
+    header = [
+        _OOB_MAGIC,
+        struct.pack(_SIZE_FORMAT, len(buffers)),
+        struct.pack(_SIZE_FORMAT, stream.nbytes),
+    ]
+    header.extend(struct.pack(_SIZE_FORMAT, buf.nbytes) for buf in buffers)
+    return b"".join(header + [stream] + buffers)
 
 
 def _deserialize(obj):
-    return pickle.loads(obj)
+    if not obj.startswith(_OOB_MAGIC):
+        return pickle.loads(obj)
+
+    view = memoryview(obj)
+    offset = len(_OOB_MAGIC)
+
+    def read_size():
+        nonlocal offset
+        (size,) = struct.unpack_from(_SIZE_FORMAT, view, offset)
+        offset += _SIZE_BYTES
+        return size
+
+    num_buffers = read_size()
+    stream_size = read_size()
+    buffer_sizes = [read_size() for _ in range(num_buffers)]
+    stream = view[offset : offset + stream_size]
+    offset += stream_size
+    buffers = []
+    for size in buffer_sizes:
+        buf = view[offset : offset + size]
+        # NOTE: the arrays rebuilt from views share the memory of `obj`,
+        # which is immutable, so they are read-only. Callers may modify the
+        # results in place, so the buffers are copied unless zero-copy is
+        # enabled.
+        buffers.append(buf if _zero_copy else bytearray(buf))
+        offset += size
+    return pickle.loads(stream, buffers=buffers)
 
 
 def _run_py_func(python_func):
     result = python_func.func(*python_func.args, **python_func.kwargs)
     return result
+
+
+def _run_py_funcs(python_funcs):
+    return [_run_py_func(python_func) for python_func in python_funcs]
@@ -20,7 +20,11 @@ from collections import namedtuple
 
 import paddle.fluid.core as core
 from paddle.distributed.launch.context import Node
-from paddle.distributed.rpc.internal import PythonFunc, _serialize
+from paddle.distributed.rpc.internal import (
+    PythonFunc,
+    _run_py_funcs,
+    _serialize,
+)
 from paddle.distributed.utils.launch_utils import logger
 
 WorkerInfo = namedtuple("WorkerInfo", ["name", "rank", "ip", "port"])
@@ -216,6 +220,53 @@ def rpc_async(to, fn, args=None, kwargs=None, timeout=_DEFAULT_RPC_TIMEOUT):
     return _invoke_rpc(to, fn, args, kwargs, timeout)
 
 
+def rpc_async_batch(to, calls, timeout=_DEFAULT_RPC_TIMEOUT):
+    """
+    Make a non-blocking RPC call to run a batch of functions on worker ``to``.
+    The functions are sent in one message and run in order, which saves the
+    round trips of calling them one by one.
+
+    Args:
+        to (str): name of the destination worker.
+        calls (list): the calls to run, each of them is a tuple of
+            ``(fn,)``, ``(fn, args)`` or ``(fn, args, kwargs)``.
+        timeout (int, optional): timeout in seconds to use for this RPC. A value
+                                   less than or equal to 0 indicates an infinite
+                                   timeout. The default value is -1.
+
+    Returns:
+        Returns a :class:`FutureWrapper` object. When completed, the list of the
+        return values of the calls can be got by `fut.wait()`.
+
+    Examples:
+        .. code-block:: python
+
+            import paddle.distributed.rpc as rpc
+
+            def add(a, b):
+                return a + b
+
+            rpc.init_rpc("worker0", rank=0, world_size=1,
+                    master_endpoint="127.0.0.1:8005")
+            fut = rpc.rpc_async_batch("worker0", [(add, (2, 3)), (add, (4, 5))])
+            print(fut.wait())  # [5, 9]
+            rpc.shutdown()
+
+    """
+    python_funcs = []
+    for call in calls:
+        if not isinstance(call, (tuple, list)) or not 1 <= len(call) <= 3:
+            raise ValueError(
+                "Each call should be a tuple of (fn,), (fn, args) or "
+                "(fn, args, kwargs), but received {}".format(call)
+            )
+        fn = call[0]
+        args = call[1] if len(call) > 1 and call[1] else ()
+        kwargs = call[2] if len(call) > 2 and call[2] else {}
+        python_funcs.append(PythonFunc(fn, args, kwargs))
+    return _invoke_rpc(to, _run_py_funcs, (python_funcs,), None, timeout)
+
+
 def _invoke_rpc(to, fn, args, kwargs, timeout):
     args = args if args else ()
     kwargs = kwargs if kwargs else {}
@@ -185,15 +185,13 @@ class ProgramStats:
         if "dropout" not in op_types:
             return
 
-        op_idx = 0
-        while op_idx < len(self.ops):
-            op = self.ops[op_idx]
+        # insert all the seed ops with one sync of the block
+        seed_ops = []
+        for op_idx, op in enumerate(self.ops):
             if op.desc.type() != "dropout":
-                op_idx += 1
                 continue
             # already insert seed op before dropout
             if op.input('Seed') is not None and len(op.input('Seed')) == 1:
-                op_idx += 1
                 continue
             # add a seed op so that the two dropout op can generate same output
             op_unique_name = unique_name.generate("seed")
@@ -218,20 +216,34 @@ class ProgramStats:
 
             # Setting the force_cpu of seed to true will make the output of seed in cpu memory,
             # reduce the synchronous copy from GPU to CPU in dropout, and reduce the communication hang
-            added_op = self.block._insert_op(
-                index=op.idx,
-                type='seed',
-                inputs={},
-                outputs={'Out': [added_var]},
-                attrs={'seed': seed, 'op_device': op_device, 'force_cpu': True},
+            seed_ops.append(
+                (
+                    op_idx,
+                    op.idx,
+                    dict(
+                        type='seed',
+                        inputs={},
+                        outputs={'Out': [added_var]},
+                        attrs={
+                            'seed': seed,
+                            'op_device': op_device,
+                            'force_cpu': True,
+                        },
+                    ),
+                )
             )
-            self.ops.insert(op_idx, added_op)
             # modify dropout op desc so that it accept a seed var as input
             op.desc.set_input("Seed", [var_unique_name])
             op.desc.remove_attr("fix_seed")
             op.desc.remove_attr("seed")
-            self.block._sync_with_cpp()
-            op_idx += 2
+
+        added_ops = self.block._insert_ops(
+            [(block_idx, kwargs) for _, block_idx, kwargs in seed_ops]
+        )
+        for (op_idx, _, _), added_op in reversed(
+            list(zip(seed_ops, added_ops))
+        ):
+            self.ops.insert(op_idx, added_op)
 
 
 def _pretty_op_desc_(op_desc, prefix):
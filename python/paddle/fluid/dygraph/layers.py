@@ -88,6 +88,117 @@ def _addindent(string, indent):
     return s1[0] + '\n' + '\n'.join(s2)
 
 
+# In compiled dispatch mode, Layer.__call__ runs the forward directly when the
+# plan cached by the layer for the current dispatch epoch allows it, instead
+# of checking the hooks and the execution modes on every call. The
+# parameters, buffers and sublayers of such layers are also stored as
+# instance attributes, so that accessing them skips Layer.__getattr__. A plan
+# is only valid in the thread and the modes it was built in, and no layer
+# has direct slots while any thread is in declarative mode, in which the
+# parameters are converted by param_guard.
+_compiled_dispatch = False
+_slotted_layers = weakref.WeakSet()
+
+# Incremented whenever the parameters, buffers, sublayers or hooks of any
+# layer change, the name index cached by Layer.state_dict is only valid for
+# the version it was built in.
+_structure_version = 0
+
+
+def _drop_all_direct_slots():
+    for layer in list(_slotted_layers):
+        layer._invalidate_call_plan()
+
+
+def _set_compiled_dispatch(enable):
+    global _compiled_dispatch
+    _compiled_dispatch = enable
+    if enable:
+        if _drop_all_direct_slots not in framework._dispatch_epoch_listeners:
+            framework._dispatch_epoch_listeners.append(_drop_all_direct_slots)
+    else:
+        if _drop_all_direct_slots in framework._dispatch_epoch_listeners:
+            framework._dispatch_epoch_listeners.remove(_drop_all_direct_slots)
+    framework._bump_dispatch_epoch()
+    _drop_all_direct_slots()
+
+
+def _can_share_memory(param, state):
+    if not isinstance(state, core.eager.Tensor) or not state._is_initialized():
+        return False
+    if not state.is_dense() or state.dtype != param.dtype:
+        return False
+    return not param._is_initialized() or param.place._equals(state.place)
+
+
+class _LayerDict(collections.OrderedDict):
+    """
+    The parameters, buffers, sublayers or hooks of a layer. Any change
+    invalidates the call plan and the direct slots of the owner layer, and the
+    state_dict name indices of all layers.
+    """
+
+    _owner_ref = None
+
+    def _bind(self, owner):
+        self._owner_ref = weakref.ref(owner)
+        return self
+
+    def _changed(self):
+        global _structure_version
+        _structure_version += 1
+        owner = self._owner_ref() if self._owner_ref is not None else None
+        if owner is not None:
+            owner._invalidate_call_plan()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self, last=True):
+        item = super().popitem(last)
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def copy(self):
+        return collections.OrderedDict(self)
+
+    def __reduce__(self):
+        return (collections.OrderedDict, (), None, None, iter(self.items()))
+
+
+_LAYER_DICT_NAMES = (
+    '_parameters',
+    '_buffers',
+    '_sub_layers',
+    '_forward_pre_hooks',
+    '_forward_post_hooks',
+    '_state_dict_hooks',
+)
+
+
 class HookRemoveHelper:
     """A HookRemoveHelper that can be used to remove hook."""
 
@@ -143,6 +254,9 @@ class Layer:
             out = mylayer(x)
     """
 
+    # the dispatch epoch in which the cached call plan runs forward directly
+    _call_plan_epoch = -1
+
     def __init__(self, name_scope=None, dtype="float32"):
         self.training = True
         if name_scope is None:
@@ -154,23 +268,23 @@ class Layer:
         self._dtype = dtype
         self._init_in_dynamic_mode = in_dygraph_mode()
 
-        self._parameters = collections.OrderedDict()
+        self._parameters = _LayerDict()._bind(self)
         # Buffers the variable (not parameter) created in layer
-        self._buffers = collections.OrderedDict()
+        self._buffers = _LayerDict()._bind(self)
         self._non_persistable_buffer_names_set = set()
-        self._sub_layers = collections.OrderedDict()
+        self._sub_layers = _LayerDict()._bind(self)
         self._loaddict_holder = collections.OrderedDict()
 
         # Record generated op_descs in this layer
         self._op_recorder = LayerOpsRecoder(ops=[], hooks=[])
         self._customized_attrs = {}
 
-        self._forward_pre_hooks = collections.OrderedDict()
-        self._forward_post_hooks = collections.OrderedDict()
+        self._forward_pre_hooks = _LayerDict()._bind(self)
+        self._forward_post_hooks = _LayerDict()._bind(self)
 
         self._casted_by_pure_fp16 = False
 
-        self._state_dict_hooks = collections.OrderedDict()
+        self._state_dict_hooks = _LayerDict()._bind(self)
         # Records orignal functions after @to_static to support to rollback
         self._original_funcs = collections.OrderedDict()
 
@@ -960,7 +1074,12 @@ class Layer:
                 linear.clear_gradients()
 
         """
-        for p in self.parameters():
+        from paddle.nn.utils.flat_parameters import _split_flat_params
+
+        flats, parameters = _split_flat_params(self.parameters())
+        for flat in flats:
+            flat.zero_grad()
+        for p in parameters:
             if p.trainable:
                 p.clear_gradient()
 
@@ -991,6 +1110,7 @@ class Layer:
                     )
 
             self._built = True
+            self._invalidate_call_plan()
 
         if in_profiler_mode():
             with profiler.RecordEvent(
@@ -1008,6 +1128,13 @@ class Layer:
         return outputs
 
     def __call__(self, *inputs, **kwargs):
+        if _compiled_dispatch:
+            if (
+                self._call_plan_epoch == framework.global_var._dispatch_epoch_
+                or self._compile_call_plan()
+            ):
+                return self.forward(*inputs, **kwargs)
+            return self._dygraph_call_func(*inputs, **kwargs)
         if (
             (not in_declarative_mode())
             and (not self._forward_pre_hooks)
@@ -1021,6 +1148,60 @@ class Layer:
         else:
             return self._dygraph_call_func(*inputs, **kwargs)
 
+    def _compile_call_plan(self):
+        """
+        Check whether calling the layer can run its forward directly in the
+        current modes, and if so, cache that for the current dispatch epoch
+        and store the parameters, buffers and sublayers as direct slots.
+        """
+        direct = (
+            in_dygraph_mode()
+            and (not in_declarative_mode())
+            and (not in_profiler_mode())
+            and (not self._forward_pre_hooks)
+            and (not self._forward_post_hooks)
+            and (self._built or type(self)._build_once is Layer._build_once)
+        )
+        if not direct or framework._declarative_threads:
+            self._invalidate_call_plan()
+            return False
+        self._install_direct_slots()
+        if framework._declarative_threads:
+            # a thread entered declarative mode while installing the slots,
+            # and may have dropped the slots of all layers before that
+            self._invalidate_call_plan()
+            return False
+        self.__dict__[
+            '_call_plan_epoch'
+        ] = framework.global_var._dispatch_epoch_
+        return True
+
+    def _install_direct_slots(self):
+        attrs = self.__dict__
+        if '_direct_slots' in attrs:
+            return
+        cls = type(self)
+        slots = []
+        # Layer.__getattr__ looks up parameters first, then sublayers, then
+        # buffers, and only if the normal attribute lookup fails
+        for container in (self._parameters, self._sub_layers, self._buffers):
+            for name, value in container.items():
+                if name in attrs or hasattr(cls, name):
+                    continue
+                attrs[name] = value
+                slots.append(name)
+        attrs['_direct_slots'] = slots
+        _slotted_layers.add(self)
+
+    def _invalidate_call_plan(self):
+        attrs = self.__dict__
+        attrs.pop('_call_plan_epoch', None)
+        slots = attrs.pop('_direct_slots', None)
+        if slots is not None:
+            for name in slots:
+                attrs.pop(name, None)
+            _slotted_layers.discard(self)
+
     def forward(self, *inputs, **kwargs):
         """
         Defines the computation performed at every call.
@@ -1215,10 +1396,26 @@ class Layer:
             self._op_recorder.hooks.append(post_hook_helper)
 
     def __getstate__(self):
-        return self.__dict__
+        if (
+            '_direct_slots' not in self.__dict__
+            and '_state_dict_cache' not in self.__dict__
+        ):
+            return self.__dict__
+        state = dict(self.__dict__)
+        for name in state.pop('_direct_slots', ()):
+            state.pop(name, None)
+        state.pop('_call_plan_epoch', None)
+        state.pop('_state_dict_cache', None)
+        return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
+        for name in _LAYER_DICT_NAMES:
+            value = self.__dict__.get(name, None)
+            if value is not None and not isinstance(value, _LayerDict):
+                self.__dict__[name] = _LayerDict(value)._bind(self)
+        global _structure_version
+        _structure_version += 1
 
     def __getattr__(self, name):
         if '_parameters' in self.__dict__:
@@ -1341,6 +1538,12 @@ class Layer:
                         # it will be remarked as a buffer with same `persistable` attribute.
                         _buffers[name] = None
                 else:
+                    if name in _LAYER_DICT_NAMES and isinstance(
+                        value, collections.OrderedDict
+                    ):
+                        if not isinstance(value, _LayerDict):
+                            value = _LayerDict(value)
+                        value._bind(self)._changed()
                     object.__setattr__(self, name, value)
 
     def __delattr__(self, name):
@@ -1379,7 +1582,8 @@ class Layer:
 
         """
         method = dir(self.__class__)
-        attrs = list(self.__dict__.keys())
+        slots = set(self.__dict__.get('_direct_slots', ()))
+        attrs = [name for name in self.__dict__.keys() if name not in slots]
         parameters = list(self._parameters.keys())
         sublayers = list(self._sub_layers.keys())
         buffers = list(self._buffers.keys())
@@ -1447,15 +1651,11 @@ class Layer:
         if include_sublayers:
             for layer_name, layer_item in self._sub_layers.items():
                 if layer_item is not None:
-                    destination_temp = destination.copy()
-                    destination_temp.update(
-                        layer_item._obtain_parameters_buffers(
-                            destination_temp,
-                            include_sublayers,
-                            structured_name_prefix + layer_name + ".",
-                        )
+                    layer_item._obtain_parameters_buffers(
+                        destination,
+                        include_sublayers,
+                        structured_name_prefix + layer_name + ".",
                     )
-                    destination = destination_temp
         return destination
 
     def _state_dict_impl(
@@ -1495,17 +1695,18 @@ class Layer:
         if include_sublayers:
             for layer_name, layer_item in self._sub_layers.items():
                 if layer_item is not None:
-                    destination_temp = destination.copy()
-                    destination_temp.update(
-                        layer_item._state_dict_impl(
-                            destination_temp,
-                            include_sublayers,
-                            structured_name_prefix + layer_name + ".",
-                            include_non_persistable_buffer,
-                            use_hook,
-                        )
+                    # the sublayer fills destination in place, but its hooks
+                    # may return another dict
+                    layer_destination = layer_item._state_dict_impl(
+                        destination,
+                        include_sublayers,
+                        structured_name_prefix + layer_name + ".",
+                        include_non_persistable_buffer,
+                        use_hook,
                     )
-                    destination = destination_temp
+                    if layer_destination is not destination:
+                        destination = collections.OrderedDict(destination)
+                        destination.update(layer_destination)
         if use_hook:
             for state_dict_hook in self._state_dict_hooks.values():
                 hook_result = state_dict_hook(destination)
@@ -1514,6 +1715,59 @@ class Layer:
 
         return destination
 
+    def _state_dict_index(self, include_non_persistable_buffer=False):
+        """
+        Get the structured names of the parameters and buffers of current layer
+        and its sub-layers, cached until any layer changes. Returns None if a
+        state_dict hook is registered in current layer or its sub-layers, since
+        hooks may change the values.
+        """
+        cache = self.__dict__.get('_state_dict_cache', None)
+        if cache is None or cache[0] != _structure_version:
+            cache = (_structure_version, {})
+            self.__dict__['_state_dict_cache'] = cache
+        index = cache[1].get(include_non_persistable_buffer, False)
+        if index is False:
+            has_hooks = any(
+                layer._state_dict_hooks
+                for layer in self.sublayers(include_self=True)
+            )
+            index = (
+                None
+                if has_hooks
+                else self._state_dict_impl(
+                    include_non_persistable_buffer=include_non_persistable_buffer,
+                    use_hook=False,
+                )
+            )
+            cache[1][include_non_persistable_buffer] = index
+        return index
+
+    def _cached_state_dict(
+        self,
+        destination,
+        include_sublayers,
+        structured_name_prefix,
+        include_non_persistable_buffer,
+        use_hook,
+    ):
+        if destination is None and include_sublayers:
+            index = self._state_dict_index(include_non_persistable_buffer)
+            if index is not None:
+                if not structured_name_prefix:
+                    return collections.OrderedDict(index)
+                return collections.OrderedDict(
+                    (structured_name_prefix + name, data)
+                    for name, data in index.items()
+                )
+        return self._state_dict_impl(
+            destination=destination,
+            include_sublayers=include_sublayers,
+            structured_name_prefix=structured_name_prefix,
+            include_non_persistable_buffer=include_non_persistable_buffer,
+            use_hook=use_hook,
+        )
+
     def to_static_state_dict(
         self,
         destination=None,
@@ -1544,7 +1798,7 @@ class Layer:
                 paddle.save( state_dict, "paddle_dy.pdparams")
 
         '''
-        return self._state_dict_impl(
+        return self._cached_state_dict(
             destination=destination,
             include_sublayers=include_sublayers,
             structured_name_prefix=structured_name_prefix,
@@ -1581,7 +1835,7 @@ class Layer:
                 paddle.save( state_dict, "paddle_dy.pdparams")
 
         '''
-        return self._state_dict_impl(
+        return self._cached_state_dict(
             destination=destination,
             include_sublayers=include_sublayers,
             structured_name_prefix=structured_name_prefix,
@@ -1590,14 +1844,25 @@ class Layer:
         )
 
     @framework.deprecate_stat_dict
-    def set_state_dict(self, state_dict, use_structured_name=True):
+    def set_state_dict(
+        self, state_dict, use_structured_name=True, share_memory=False
+    ):
         '''
         Set parameters and persistable buffers from state_dict. All the parameters and buffers will be reset by the tensor in the state_dict
 
+        The shapes of all the tensors are checked before any of them is set. The values are looked up again when they
+        are set instead of being kept, so ``state_dict`` can be a mapping that loads its values lazily and only one
+        loaded value is held at a time. The check only reads the ``shape`` of a value, so e.g. ``numpy.memmap`` values
+        are not read from disk by it.
+
         Parameters:
             state_dict(dict) : Dict contains all the parameters and persistable buffers.
             use_structured_name(bool, optional) : If true, use structured name as key, otherwise, use parameter or buffer name as key.
                                                   Default: True
+            share_memory(bool, optional) : If true, in dynamic graph mode, a tensor in state_dict with the same dtype, shape and place as
+                                           the parameter or buffer shares its memory with it instead of being copied, so the tensor in
+                                           state_dict must not be modified afterwards. An uninitialized parameter, e.g. one created under
+                                           ``paddle.LazyGuard``, takes the memory and place of the tensor. Default: False
         Returns:
             missing_keys(list):A list of str containing the missing keys
             unexpected_keys(list):A list of str containing the unexpected keys
@@ -1655,21 +1920,34 @@ class Layer:
                 match_keys.add(key)
                 return param, state
 
-        matched_param_state = []
-        for key, param in self._state_dict_impl(use_hook=False).items():
+        # keep the keys instead of the values, so that a lazily loaded
+        # state_dict only holds one value at a time
+        matched_param_keys = []
+        index = self._state_dict_index()
+        if index is None:
+            index = self._state_dict_impl(use_hook=False)
+        for key, param in index.items():
             key_name = key if use_structured_name else param.name
             try:
-                match_res = _check_match(key_name, param)
-                matched_param_state.append(match_res)
+                _check_match(key_name, param)
+                matched_param_keys.append((param, key_name))
             except ValueError as err:
                 warnings.warn(("Skip loading for {}. ".format(key) + str(err)))
         for key in state_dict.keys():
             if key not in match_keys:
                 unexpected_keys.append(key)
         if in_dygraph_mode():
-            for param, state in matched_param_state:
-                param.set_value(state)
+            for param, key in matched_param_keys:
+                state = state_dict[key]
+                if share_memory and _can_share_memory(param, state):
+                    state._share_buffer_to(param)
+                else:
+                    param.set_value(state)
+                del state
         else:
+            matched_param_state = [
+                (param, state_dict[key]) for param, key in matched_param_keys
+            ]
 
             def _set_var(var, ndarray):
                 t = global_scope().find_var(var.name).get_tensor()
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import concurrent.futures
 import logging
 import os
 import multiprocessing
@@ -19,7 +21,7 @@ import sys
 import warnings
 import numpy as np
 from .wrapped_decorator import signature_safe_contextmanager
-from .data_feeder import convert_dtype
+from .data_feeder import convert_dtype, _PADDLE_DTYPE_2_NUMPY_DTYPE
 from .framework import Program, default_main_program, Variable, Operator
 from .framework import convert_np_dtype_to_dtype_, _apply_pass
 
@@ -234,19 +236,27 @@ def check_feed_shape_type(var, feed, num_places=1):
         ValueError: if the shape or dtype of the variable is not compatible with
             the feed value
     """
-    if var.desc.need_check_feed():
-        diff_shape = core.diff_tensor_shape(feed, var.desc, num_places)
+    return _check_feed_desc_shape_type(var.desc, feed, num_places)
+
+
+def _check_feed_desc_shape_type(var_desc, feed, num_places=1):
+    # the same as check_feed_shape_type, but checks the VarDesc, so the feed
+    # is checked without creating the Variable of a cloned program
+    if var_desc.need_check_feed():
+        diff_shape = core.diff_tensor_shape(feed, var_desc, num_places)
         if diff_shape is not None:
+            shape = tuple(var_desc.shape())
             raise ValueError(
                 'The fed Variable %r should have dimensions = %d, shape = '
                 '%r, but received fed shape %r on each device'
-                % (var.name, len(var.shape), var.shape, diff_shape)
+                % (var_desc.name(), len(shape), shape, diff_shape)
             )
-        if not dtype_is_compatible_with(feed._dtype(), var.dtype):
+        var_dtype = var_desc.dtype()
+        if not dtype_is_compatible_with(feed._dtype(), var_dtype):
             var_dtype_format = (
-                convert_dtype(var.dtype)
-                if isinstance(var.dtype, core.VarDesc.VarType)
-                else var.dtype
+                convert_dtype(var_dtype)
+                if isinstance(var_dtype, core.VarDesc.VarType)
+                else var_dtype
             )
             feed_dtype_format = (
                 convert_dtype(feed._dtype())
@@ -255,11 +265,19 @@ def check_feed_shape_type(var, feed, num_places=1):
             )
             raise ValueError(
                 'The data type of fed Variable %r must be %r, but received %r'
-                % (var.name, var_dtype_format, feed_dtype_format)
+                % (var_desc.name(), var_dtype_format, feed_dtype_format)
             )
     return True
 
 
+def _block_op_descs(block):
+    # iterate the op descs of the block, without creating the Operators of
+    # a lazy block
+    block_desc = block.desc
+    for i in range(block_desc.op_size()):
+        yield block_desc.op(i)
+
+
 def has_feed_operators(block, feed_targets, feed_holder_name):
     """Check whether the block already has feed operators.
 
@@ -282,11 +300,11 @@ def has_feed_operators(block, feed_targets, feed_holder_name):
     """
 
     feed_count = 0
-    for op in block.ops:
-        if op.desc.type() == 'feed':
+    for op_desc in _block_op_descs(block):
+        if op_desc.type() == 'feed':
             feed_count += 1
-            assert op.desc.input('X')[0] == feed_holder_name
-            feed_target_name = op.desc.output('Out')[0]
+            assert op_desc.input('X')[0] == feed_holder_name
+            feed_target_name = op_desc.output('Out')[0]
             if feed_target_name not in feed_targets:
                 raise Exception(
                     "'feed_targets' does not have {} variable".format(
@@ -327,11 +345,11 @@ def has_fetch_operators(
     """
 
     fetch_count = 0
-    for op in block.ops:
-        if op.desc.type() == fetch_op:
+    for op_desc in _block_op_descs(block):
+        if op_desc.type() == fetch_op:
             fetch_count += 1
-            assert op.desc.output('Out')[0] == fetch_holder_name
-            fetch_target_name = op.desc.input('X')[0]
+            assert op_desc.output('Out')[0] == fetch_holder_name
+            fetch_target_name = op_desc.input('X')[0]
             if fetch_target_name not in [
                 var.desc.name() for var in fetch_targets
             ]:
@@ -340,7 +358,7 @@ def has_fetch_operators(
                         fetch_target_name
                     )
                 )
-            idx = op.desc.attr('col')
+            idx = op_desc.attr('col')
             assert fetch_target_name == fetch_targets[idx].desc.name()
     if fetch_count > 0 and fetch_count != len(fetch_targets):
         raise Exception(
@@ -349,6 +367,76 @@ def has_fetch_operators(
     return fetch_count > 0
 
 
+def _create_holder_var_desc(block, name, type):
+    block_desc = block.desc
+    if not block_desc.has_var(name.encode()):
+        var_desc = block_desc.var(name.encode())
+        var_desc.set_type(type)
+        var_desc.set_persistable(True)
+
+
+def _init_holder_op_desc(op_desc, program, type, inputs, outputs, col):
+    op_maker = core.op_proto_and_checker_maker
+    op_desc.set_type(type)
+    for param, args in inputs.items():
+        op_desc.set_input(param, args)
+    for param, args in outputs.items():
+        op_desc.set_output(param, args)
+    op_desc._set_int32_attr('col', col)
+    op_desc._set_int32_attr(op_maker.kOpRoleAttrName(), int(program._op_role))
+    op_desc._set_attr(
+        op_maker.kOpNameScopeAttrName(), framework._full_name_scope()
+    )
+    op_desc.check_attrs()
+
+
+def _prepend_feed_ops(block, feed, feed_var_name):
+    # the feed ops are bound to the variables by name on the desc, which
+    # keeps the blocks of a cloned program lazy
+    _create_holder_var_desc(
+        block, feed_var_name, core.VarDesc.VarType.FEED_MINIBATCH
+    )
+    if has_feed_operators(block, feed, feed_var_name):
+        return
+    for i, name in enumerate(feed):
+        if block.has_var(name):
+            _init_holder_op_desc(
+                block.desc._prepend_op(),
+                block.program,
+                'feed',
+                {'X': [feed_var_name]},
+                {'Out': [name]},
+                i,
+            )
+        else:
+            warnings.warn(
+                "The variable %s is not found in program. It is not declared or is pruned."
+                % name
+            )
+    block._sync_with_cpp()
+
+
+def _append_fetch_ops(block, fetch_list, fetch_var_name, fetch_op='fetch'):
+    _create_holder_var_desc(
+        block, fetch_var_name, core.VarDesc.VarType.FETCH_LIST
+    )
+    if has_fetch_operators(block, fetch_list, fetch_var_name, fetch_op):
+        return
+    for i, var in enumerate(fetch_list):
+        assert isinstance(var, Variable) or isinstance(
+            var, str
+        ), "Wrong type for fetch_list[%s]: %s" % (i, type(var))
+        _init_holder_op_desc(
+            block.desc.append_op(),
+            block.program,
+            fetch_op,
+            {'X': [_to_name_str(var)]},
+            {'Out': [fetch_var_name]},
+            i,
+        )
+    block._sync_with_cpp()
+
+
 def _add_feed_fetch_ops(
     program, feed, fetch_list, feed_var_name, fetch_var_name, use_fetch_v2=False
 ):
@@ -356,40 +444,8 @@ def _add_feed_fetch_ops(
 
     global_block = tmp_program.global_block()
 
-    if feed_var_name in global_block.vars:
-        feed_var = global_block.var(feed_var_name)
-    else:
-        feed_var = global_block.create_var(
-            name=feed_var_name,
-            type=core.VarDesc.VarType.FEED_MINIBATCH,
-            persistable=True,
-        )
-
-    if fetch_var_name in global_block.vars:
-        fetch_var = global_block.var(fetch_var_name)
-    else:
-        fetch_var = global_block.create_var(
-            name=fetch_var_name,
-            type=core.VarDesc.VarType.FETCH_LIST,
-            persistable=True,
-        )
-
     # prepend feed operators
-    if not has_feed_operators(global_block, feed, feed_var_name):
-        for i, name in enumerate(feed):
-            if global_block.has_var(name):
-                out = global_block.var(name)
-                global_block._prepend_op(
-                    type='feed',
-                    inputs={'X': [feed_var]},
-                    outputs={'Out': [out]},
-                    attrs={'col': i},
-                )
-            else:
-                warnings.warn(
-                    "The variable %s is not found in program. It is not declared or is pruned."
-                    % name
-                )
+    _prepend_feed_ops(global_block, feed, feed_var_name)
 
     if use_fetch_v2:
         fetch_op = 'fetch_v2'
@@ -397,19 +453,7 @@ def _add_feed_fetch_ops(
         fetch_op = 'fetch'
 
     # append fetch_operators
-    if not has_fetch_operators(
-        global_block, fetch_list, fetch_var_name, fetch_op
-    ):
-        for i, var in enumerate(fetch_list):
-            assert isinstance(var, Variable) or isinstance(
-                var, str
-            ), "Wrong type for fetch_list[%s]: %s" % (i, type(var))
-            global_block.append_op(
-                type=fetch_op,
-                inputs={'X': [var]},
-                outputs={'Out': [fetch_var]},
-                attrs={'col': i},
-            )
+    _append_fetch_ops(global_block, fetch_list, fetch_var_name, fetch_op)
 
     return tmp_program
 
@@ -549,7 +593,11 @@ def _get_strong_program_cache_key(program, feed, fetch_list):
     # TODO(zhiqiu): use hash_str to generate cache key as above
     def _get_varname_from_block(block):
         block_str = []
-        for var_name in list(block.vars.keys()):
+        if block._is_lazy():
+            var_names = [var.name() for var in block.desc.all_vars()]
+        else:
+            var_names = list(block.vars.keys())
+        for var_name in var_names:
             block_str.append(var_name)
         return "\n".join(block_str)
 
@@ -565,6 +613,10 @@ def _get_strong_program_cache_key(program, feed, fetch_list):
     )
 
 
+def _var_desc_dtype(program, name):
+    return program.global_block().desc.find_var(name.encode()).dtype()
+
+
 def _get_program_cache_key(feed, fetch_list):
     feed_var_names = []
     if isinstance(feed, dict):
@@ -659,6 +711,124 @@ handler = FetchHandlerExample(var_dict=var_dict)
         )
 
 
+class _FeedStaging:
+    """
+    The feed tensors bound to a program with feed ops, one per feed target,
+    which are kept across runs instead of creating a new LoDTensor for every
+    numpy feed of every run.
+
+    On CPUPlace, a numpy feed of the dtype of its feed target which is
+    C-contiguous and aligned is wrapped by the bound tensor without copy,
+    unless an op of the program writes the feed target. Other numpy feeds
+    are copied into the memory of the bound tensor. On other places, a
+    numpy feed is copied to a new tensor on the place, since the former run
+    may still read the memory of the bound tensor on the device. The check
+    of the shape and dtype of a numpy feed is skipped if they are the same
+    as those of the former run.
+    """
+
+    class _Slot:
+        def __init__(self, name, col, var_desc, zero_copy):
+            self.name = name
+            self.col = col
+            self.var_desc = var_desc
+            var_dtype = var_desc.dtype()
+            self.is_strings = var_dtype == core.VarDesc.VarType.STRINGS
+            # the numpy dtype which can be wrapped without copy
+            self.dtype = (
+                np.dtype(_PADDLE_DTYPE_2_NUMPY_DTYPE[var_dtype])
+                if zero_copy and var_dtype in _PADDLE_DTYPE_2_NUMPY_DTYPE
+                else None
+            )
+            self.tensor = core.LoDTensor()
+            # whether the tensor wraps the memory of a numpy feed
+            self.wrapped = False
+            # the shape and dtype of the numpy feed which passed the check
+            self.checked = None
+
+    def __init__(self, program, place):
+        self._place = place
+        p = core.Place()
+        p.set_place(place)
+        self._in_place = p.is_cpu_place()
+        block_desc = program.global_block().desc
+        feed_ops = []
+        for op_desc in _block_op_descs(program.global_block()):
+            if op_desc.type() != 'feed':
+                break
+            feed_ops.append(op_desc)
+        written = set()
+        if self._in_place and feed_ops:
+            for i in range(program.desc.num_blocks()):
+                sub_block_desc = program.desc.block(i)
+                for j in range(sub_block_desc.op_size()):
+                    op_desc = sub_block_desc.op(j)
+                    if op_desc.type() != 'feed':
+                        written.update(op_desc.output_arg_names())
+        self._slots = []
+        for op_desc in feed_ops:
+            name = op_desc.output('Out')[0]
+            self._slots.append(
+                self._Slot(
+                    name,
+                    op_desc.attr('col'),
+                    block_desc.find_var(name.encode()),
+                    self._in_place and name not in written,
+                )
+            )
+
+    def stage(self, feed):
+        """
+        Convert the feed to tensors.
+
+        Args:
+            feed(dict): the feed data of the feed targets.
+
+        Returns:
+            list: the (col, tensor) pairs of the feed targets, where col is
+                the column in the feed holder.
+        """
+        staged = []
+        for slot in self._slots:
+            data = feed[slot.name]
+            if slot.is_strings:
+                tensor = data
+            elif isinstance(data, np.ndarray):
+                tensor = self._stage_ndarray(slot, data)
+            else:
+                if not isinstance(data, core.LoDTensor):
+                    data = _as_lodtensor(
+                        data, self._place, slot.var_desc.dtype()
+                    )
+                _check_feed_desc_shape_type(slot.var_desc, data)
+                tensor = data
+            staged.append((slot.col, tensor))
+        return staged
+
+    def _stage_ndarray(self, slot, data):
+        if self._in_place:
+            zero_copy = (
+                slot.dtype is not None
+                and data.dtype == slot.dtype
+                and data.flags.c_contiguous
+                and data.flags.aligned
+            )
+            if slot.wrapped and not zero_copy:
+                # never copy into the memory of a former numpy feed
+                slot.tensor = core.LoDTensor()
+            slot.wrapped = zero_copy
+            tensor = slot.tensor
+            tensor.set(data, self._place, zero_copy)
+        else:
+            tensor = core.LoDTensor()
+            tensor.set(data, self._place)
+        checked = (data.shape, data.dtype)
+        if slot.checked != checked:
+            _check_feed_desc_shape_type(slot.var_desc, tensor)
+            slot.checked = checked
+        return tensor
+
+
 class _StandaloneExecutor:
     def __init__(self, place, main_program, scope):
         self._place = core.Place()
@@ -666,6 +836,7 @@ class _StandaloneExecutor:
         self._main_program = main_program
         self._scope = scope
         self._new_exe = self._create_new_executor()
+        self._feed_staging = _FeedStaging(main_program, place)
 
     def run(self, scope, feed_names, fetch_list, return_numpy=True):
         """
@@ -912,10 +1083,15 @@ class _ExecutorCache:
             _apply_inplace_addto_pass(
                 program, enable_inplace, enable_addto, skip_var_names
             )
+            # the program is not cloned after the pass, so its blocks are
+            # synced with the desc changed by the pass, in case they were
+            # created before it
+            program._sync_with_cpp()
 
-        new_program = program.clone()
-        new_exe = _StandaloneExecutor(place, new_program, scope)
-        return new_program, new_exe
+        # the program returned by _add_feed_fetch_ops is already a private
+        # clone, so it is not cloned again
+        new_exe = _StandaloneExecutor(place, program, scope)
+        return program, new_exe
 
 
 class Executor:
@@ -1027,11 +1203,20 @@ class Executor:
         # of fleet executor with standalone executor is ready.
         self._fleet_executor_with_standalone = False
 
+        # NOTE: The runs with non_blocking=True are executed one by one by a
+        # worker thread created on the first of them, and at most
+        # _max_in_flight of them are pending at a time.
+        self._run_worker = None
+        self._pending_runs = collections.deque()
+        self._max_in_flight = 2
+
     def __del__(self):
         # NOTE(Ruibiao): The manually call of clear is required. Because in Python, executor_cache
         # may not immediately destructed after Executor instance deleted (so does not the _StandaloneExecutor),
         # that brings errors to mkl-dnn unit tests (see ClearMKLDNNCache in interpretercore.cc for why).
         self._executor_cache.clear()
+        if self._run_worker is not None:
+            self._run_worker.shutdown(wait=False)
 
     def _get_scope_cache(self, program_cache_key):
         return self.scope_caches.get(program_cache_key, None)
@@ -1078,19 +1263,20 @@ class Executor:
 
     def _feed_data(self, program, feed, feed_var_name, scope):
         # feed var to framework
-        global_block = program.global_block()
-        for op in global_block.ops:
-            if op.desc.type() == 'feed':
-                feed_target_name = op.desc.output('Out')[0]
+        global_block_desc = program.global_block().desc
+        for op_desc in _block_op_descs(program.global_block()):
+            if op_desc.type() == 'feed':
+                feed_target_name = op_desc.output('Out')[0]
                 cur_feed = feed[feed_target_name]
-                var = global_block.var(feed_target_name)
-                if var.dtype != core.VarDesc.VarType.STRINGS:
+                var_desc = global_block_desc.find_var(feed_target_name.encode())
+                var_dtype = var_desc.dtype()
+                if var_dtype != core.VarDesc.VarType.STRINGS:
                     if not isinstance(cur_feed, core.LoDTensor):
                         cur_feed = _as_lodtensor(
-                            cur_feed, self.place, var.dtype
+                            cur_feed, self.place, var_dtype
                         )
-                    check_feed_shape_type(var, cur_feed)
-                idx = op.desc.attr('col')
+                    _check_feed_desc_shape_type(var_desc, cur_feed)
+                idx = op_desc.attr('col')
                 core.set_feed_variable(scope, cur_feed, feed_var_name, idx)
             else:
                 break
@@ -1296,6 +1482,10 @@ class Executor:
               exe.close()
         """
         if not self._closed:
+            self._wait_pending_runs()
+            if self._run_worker is not None:
+                self._run_worker.shutdown()
+                self._run_worker = None
             self._closed = True
             for k, trainer_instance in self.trainer_caches.items():
                 self._default_executor.release_trainer(trainer_instance)
@@ -1396,6 +1586,7 @@ class Executor:
         use_program_cache=False,
         return_merged=True,
         use_prune=False,
+        non_blocking=False,
     ):
         """
         Run the specified :code:`Program` or :code:`CompiledProgram`. It should be noted that the executor
@@ -1453,10 +1644,20 @@ class Executor:
                 program will not pruned and all the operators and variables will be executed during running.
                 Note that if the tuple returned from :code:`Optimizer.minimize()` is passed to :code:`fetch_list`,
                 :code:`use_prune` will be overrided to True, and the program will be pruned.
+            non_blocking(bool): This parameter indicates whether to return before the program
+                finishes running. If it is True, the run is enqueued to the worker thread of the
+                executor, and a :code:`concurrent.futures.Future` is returned, whose result is the
+                fetched result list and whose exception is the one raised by the run. The runs are
+                executed in the order they are enqueued, and at most two of them are pending, so
+                enqueuing one more waits for the oldest one to finish. A run with non_blocking=False,
+                :code:`train_from_dataset` and :code:`infer_from_dataset` wait for all the pending
+                runs first. The arrays in :code:`feed` must not be modified
+                until the run is done. The default is False.
 
         Returns:
 
-            List: The fetched result list.
+            List: The fetched result list, or a :code:`concurrent.futures.Future` of it if
+            :code:`non_blocking` is True.
 
         NOTES:
             1. If it is multi-card running and the feed parameter is dict type, the input data
@@ -1583,6 +1784,21 @@ class Executor:
             ]
             self._log_force_set_program_cache(use_program_cache)
 
+        if non_blocking:
+            return self._submit_run(
+                program=program,
+                feed=feed,
+                fetch_list=fetch_list,
+                feed_var_name=feed_var_name,
+                fetch_var_name=fetch_var_name,
+                scope=scope,
+                return_numpy=return_numpy,
+                use_program_cache=use_program_cache,
+                use_prune=use_prune,
+                return_merged=return_merged,
+            )
+
+        self._wait_pending_runs()
         res = self._run_impl(
             program=program,
             feed=feed,
@@ -1598,6 +1814,53 @@ class Executor:
         core.update_autotune_status()
         return res
 
+    def _submit_run(self, program, feed, scope, **kwargs):
+        if self._closed:
+            raise RuntimeError("Attempted to use a closed Executor")
+        # the default program and scope are resolved by the caller, as the
+        # guards switching them may exit before the run starts
+        if program is None:
+            program = default_main_program()
+        if scope is None:
+            scope = global_scope()
+        # the fed variables are popped out of the feed while running, so the
+        # run gets its own copy of the feed
+        if isinstance(feed, dict):
+            feed = dict(feed)
+        elif isinstance(feed, list):
+            feed = [
+                dict(each) if isinstance(each, dict) else each for each in feed
+            ]
+
+        while self._pending_runs and self._pending_runs[0].done():
+            self._pending_runs.popleft()
+        if len(self._pending_runs) >= self._max_in_flight:
+            concurrent.futures.wait([self._pending_runs.popleft()])
+
+        if self._run_worker is None:
+            self._run_worker = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="executor_run"
+            )
+        future = self._run_worker.submit(
+            self._run_in_worker,
+            program=program,
+            feed=feed,
+            scope=scope,
+            **kwargs,
+        )
+        self._pending_runs.append(future)
+        return future
+
+    def _run_in_worker(self, **kwargs):
+        res = self._run_impl(**kwargs)
+        core.update_autotune_status()
+        return res
+
+    def _wait_pending_runs(self):
+        if self._pending_runs:
+            concurrent.futures.wait(self._pending_runs)
+            self._pending_runs.clear()
+
     def _run_impl(
         self,
         program,
@@ -1821,7 +2084,8 @@ class Executor:
                 scope,
             )
 
-            self._feed_data(program, feed, feed_var_name, scope)
+            for idx, tensor in new_exe._feed_staging.stage(feed):
+                core.set_feed_variable(scope, tensor, feed_var_name, idx)
             if hasattr(program, 'lr_sheduler'):
                 from paddle.optimizer.lr import LRScheduler
 
@@ -1830,8 +2094,8 @@ class Executor:
                 ), "must be LRScheduler"
                 lr_sheduler = program.lr_sheduler
                 lr_value = lr_sheduler()
-                lr_var = program.global_block().vars[lr_sheduler._var_name]
-                data = np.array([lr_value]).astype(convert_dtype(lr_var.dtype))
+                lr_dtype = _var_desc_dtype(program, lr_sheduler._var_name)
+                data = np.array([lr_value]).astype(convert_dtype(lr_dtype))
                 tensor = core.get_variable_tensor(scope, lr_sheduler._var_name)
                 # NOTE(dev): `tensor.set(data, self.place)` always call TensorCopySync that is a blocking behavior. So we use `_copy_from` to replace it.
                 cpu_tensor = _as_lodtensor(data, core.CPUPlace())
@@ -2008,8 +2272,8 @@ class Executor:
             ), "must be LRScheduler"
             lr_sheduler = program.lr_sheduler
             lr_value = lr_sheduler()
-            lr_var = program.global_block().vars[lr_sheduler._var_name]
-            data = np.array([lr_value]).astype(convert_dtype(lr_var.dtype))
+            lr_dtype = _var_desc_dtype(program, lr_sheduler._var_name)
+            data = np.array([lr_value]).astype(convert_dtype(lr_dtype))
             tensor = core.get_variable_tensor(scope, lr_sheduler._var_name)
             tensor.set(data, self.place)
 
@@ -2186,6 +2450,9 @@ class Executor:
         print_period=100,
         fetch_handler=None,
     ):
+        # the dataset runs share the scope and the executor with the pending
+        # runs, so they start after them
+        self._wait_pending_runs()
         if program._pipeline_opt is not None:
             import paddle
 
@@ -2687,33 +2954,8 @@ class Executor:
     def _add_feed_ops(self, program, feed, feed_var_name):
         tmp_program = program.clone()
 
-        global_block = tmp_program.global_block()
-
-        if feed_var_name in global_block.vars:
-            feed_var = global_block.var(feed_var_name)
-        else:
-            feed_var = global_block.create_var(
-                name=feed_var_name,
-                type=core.VarDesc.VarType.FEED_MINIBATCH,
-                persistable=True,
-            )
-
         # prepend feed operators
-        if not has_feed_operators(global_block, feed, feed_var_name):
-            for i, name in enumerate(feed):
-                if global_block.has_var(name):
-                    out = global_block.var(name)
-                    global_block._prepend_op(
-                        type='feed',
-                        inputs={'X': [feed_var]},
-                        outputs={'Out': [out]},
-                        attrs={'col': i},
-                    )
-                else:
-                    warnings.warn(
-                        "The variable %s is not found in program. It is not declared or is pruned."
-                        % name
-                    )
+        _prepend_feed_ops(tmp_program.global_block(), feed, feed_var_name)
 
         return tmp_program
 
@@ -2723,36 +2965,15 @@ class Executor:
     ):
         tmp_program = program.clone()
 
-        global_block = tmp_program.global_block()
-
-        if fetch_var_name in global_block.vars:
-            fetch_var = global_block.var(fetch_var_name)
-        else:
-            fetch_var = global_block.create_var(
-                name=fetch_var_name,
-                type=core.VarDesc.VarType.FETCH_LIST,
-                persistable=True,
-            )
-
         if use_fetch_v2:
             fetch_op = 'fetch_v2'
         else:
             fetch_op = 'fetch'
 
         # append fetch_operators
-        if not has_fetch_operators(
-            global_block, fetch_list, fetch_var_name, fetch_op
-        ):
-            for i, var in enumerate(fetch_list):
-                assert isinstance(var, Variable) or isinstance(
-                    var, str
-                ), "Wrong type for fetch_list[%s]: %s" % (i, type(var))
-                global_block.append_op(
-                    type=fetch_op,
-                    inputs={'X': [var]},
-                    outputs={'Out': [fetch_var]},
-                    attrs={'col': i},
-                )
+        _append_fetch_ops(
+            tmp_program.global_block(), fetch_list, fetch_var_name, fetch_op
+        )
 
         return tmp_program
 
@@ -2908,6 +3129,7 @@ class Executor:
         print_period=100,
         fetch_handler=None,
     ):
+        self._wait_pending_runs()
         scope, trainer = self._prepare_trainer(
             program=program,
             dataset=None,
@@ -37,6 +37,7 @@ from . import unique_name
 import paddle.version as fluid_version
 import warnings
 import functools
+import itertools
 from .variable_index import _getitem_impl_, _setitem_impl_
 import threading
 
@@ -103,10 +104,43 @@ class GlobalThreadLocal(threading.local):
         if name == '_dygraph_tracer_':
             global _dygraph_tracer_
             _dygraph_tracer_ = val
+        if name in _DISPATCH_STATE_NAMES and self.__dict__.get(name) is not val:
+            if name == '_in_declarative_mode_':
+                if val:
+                    _declarative_threads.add(threading.get_ident())
+                else:
+                    _declarative_threads.discard(threading.get_ident())
+            _bump_dispatch_epoch(self)
         self.__dict__[name] = val
 
 
 _dygraph_tracer_ = None
+
+# The modes read by Layer.__call__, which are thread local. Changing any of
+# them gives the thread a new dispatch epoch, and the call plans cached by
+# layers in compiled dispatch mode are only valid for the epoch they were
+# built in. The epochs are unique among the threads, so a plan built in one
+# thread is never valid in another one.
+_DISPATCH_STATE_NAMES = (
+    '_in_declarative_mode_',
+    '_dygraph_tracer_',
+    '_in_eager_mode_',
+)
+_dispatch_epoch_ids = itertools.count()
+_dispatch_epoch_listeners = []
+# the idents of the threads in declarative mode, in which the parameters
+# must be read through param_guard instead of the direct slots of layers
+_declarative_threads = set()
+
+
+def _bump_dispatch_epoch(local=None):
+    if local is None:
+        local = global_var
+    local.__dict__['_dispatch_epoch_'] = next(_dispatch_epoch_ids)
+    for listener in _dispatch_epoch_listeners:
+        listener()
+
+
 global_var = GlobalThreadLocal()
 
 _global_expected_place_ = None
@@ -1483,6 +1517,7 @@ class Variable(metaclass=VariableMetaClass):
         self.error_clip = error_clip
 
         is_new_var = False
+        self.block._materialize_if_lazy()
         self.desc = self.block.desc.find_var(name.encode())
 
         if self.desc is None:
@@ -3290,6 +3325,7 @@ class Operator:
             None
         """
         self.desc._rename_input(old_name, new_name)
+        self._update_def_use()
 
     def _rename_output(self, old_name, new_name):
         """
@@ -3303,6 +3339,12 @@ class Operator:
             None
         """
         self.desc._rename_output(old_name, new_name)
+        self._update_def_use()
+
+    def _update_def_use(self):
+        index = self.block._def_use_index
+        if index is not None:
+            index.update(self)
 
     @property
     def input_names(self):
@@ -3335,9 +3377,9 @@ class Operator:
 
     @property
     def idx(self):
-        for i, op in enumerate(self.block.ops):
-            if op == self:
-                return i
+        index = self.block._find_op_index(self)
+        if index is not None:
+            return index
         raise ValueError(
             "Can't find op itself in it's block. It could be a bug of Paddle."
         )
@@ -3624,6 +3666,50 @@ class Operator:
         self.desc.dist_attr = dist_attr
 
 
+class _DefUseIndex:
+    """
+    The def-use index of a Block, which maps the name of a variable to the
+    Operators reading and writing it, so that passes can find the producers
+    and consumers of a variable without scanning all the ops of the block.
+
+    It is kept up to date by the op mutation methods of Block and by
+    Operator._rename_input/_rename_output. After modifying the inputs or
+    outputs of an op desc directly, call `update(op)`.
+    """
+
+    def __init__(self, ops):
+        self.readers = collections.defaultdict(dict)  # name --> {id: op}
+        self.writers = collections.defaultdict(dict)  # name --> {id: op}
+        self._op_args = {}  # id(op) --> (input names, output names)
+        for op in ops:
+            self.add(op)
+
+    def add(self, op):
+        inputs = op.desc.input_arg_names()
+        outputs = op.desc.output_arg_names()
+        self._op_args[id(op)] = (inputs, outputs)
+        for name in inputs:
+            self.readers[name][id(op)] = op
+        for name in outputs:
+            self.writers[name][id(op)] = op
+
+    def remove(self, op):
+        args = self._op_args.pop(id(op), None)
+        if args is None:
+            return
+        for names, index in zip(args, (self.readers, self.writers)):
+            for name in names:
+                ops = index.get(name)
+                if ops is not None:
+                    ops.pop(id(op), None)
+                    if not ops:
+                        del index[name]
+
+    def update(self, op):
+        self.remove(op)
+        self.add(op)
+
+
 class Block:
     """
     In Fluid, a Program is consistence of multi-Block, and Block stores
@@ -3636,6 +3722,9 @@ class Block:
     Args:
         program(Program): The Program that the Block belongs to.
         idx(int): The block's id in the Program.
+        lazy(bool): Whether to create the Variables and Operators of the
+            block from its desc on their first access, which is used by the
+            copy-on-write clone of programs. Default: False.
 
     Notes:
         The constructor of Block should not be invoked directly. Please
@@ -3656,12 +3745,64 @@ class Block:
                                 outputs={"Out": [var]})
     """
 
-    def __init__(self, program, idx):
+    def __init__(self, program, idx, lazy=False):
         self.desc = program.desc.block(idx)
-        self.vars = collections.OrderedDict()  # var_name --> var
-        self.ops = list()  # operator list
+        if lazy:
+            # the pending param and data info copied from other blocks,
+            # applied when the vars and ops are created
+            self._lazy_info = {}
+        else:
+            self._lazy_info = None
+            self.vars = collections.OrderedDict()  # var_name --> var
+            self.ops = list()  # operator list
         self.program = program
         self.removed_vars = collections.OrderedDict()
+        # id(op) --> position in self.ops, validated and rebuilt on lookup
+        self._op_positions = {}
+        self._def_use_index = None
+        # the depth of nested _batch_mutation, in which the op and var
+        # mutation methods do not sync with the c++ desc
+        self._batch_depth = 0
+
+    def __getattr__(self, name):
+        # only called when the attribute is missing, i.e. the vars and ops of
+        # a lazy block which are not created yet
+        if (
+            name in ('vars', 'ops')
+            and self.__dict__.get('_lazy_info') is not None
+        ):
+            self._materialize()
+            return self.__dict__[name]
+        raise AttributeError(
+            "'%s' object has no attribute '%s'" % (type(self).__name__, name)
+        )
+
+    def _is_lazy(self):
+        return self._lazy_info is not None
+
+    def _materialize_if_lazy(self):
+        # the vars and ops of a lazy block are created from its desc, so they
+        # have to be created before the desc is changed
+        if self._lazy_info is not None:
+            self._materialize()
+
+    def _materialize(self):
+        """
+        Create the Variables and Operators of a lazy block from its desc, and
+        apply the param and data info copied from other blocks.
+        """
+        info = self._lazy_info
+        self._lazy_info = None
+        self.vars = collections.OrderedDict()
+        self.ops = list()
+        # the block belongs to a static program, even if it is accessed in
+        # dygraph mode
+        with _dygraph_guard(None):
+            self._sync_with_cpp()
+            if 'params' in info:
+                self._apply_param_info(info['params'])
+            if 'data' in info:
+                self._apply_data_info(info['data'])
 
     def __str__(self):
         return self._to_readable_code()
@@ -3885,6 +4026,8 @@ class Block:
         return var
 
     def has_var(self, name):
+        if self._lazy_info is not None:
+            return self.desc.has_var(name.encode())
         return name in self.vars
 
     def _rename_var(self, name, new_name):
@@ -3968,12 +4111,15 @@ class Block:
         # new vars/ops to python side.
         self.vars[new_name] = var
         del self.vars[name]
-        self._sync_with_cpp()
+        # the c++ end renames the var in the ops of this block too
+        self._def_use_index = None
+        self._maybe_sync_with_cpp()
         return var
 
     def _remove_var(self, name, sync=True):
+        self._materialize_if_lazy()
         if sync == True:
-            self._sync_with_cpp()
+            self._maybe_sync_with_cpp()
         self.desc._remove_var(name.encode())
         del self.vars[name]
 
@@ -4063,6 +4209,7 @@ class Block:
         else:
             from paddle.fluid.dygraph.base import param_guard
 
+            self._materialize_if_lazy()
             op_desc = self.desc.append_op()
             # NOTE(Aurelius84): In case of @to_static, all VarBase(s) should
             # be converted into Variable(s) with same name and block location.
@@ -4080,6 +4227,7 @@ class Block:
                 )
 
             self.ops.append(op)
+            self._on_op_added(op)
 
         return op
 
@@ -4093,7 +4241,7 @@ class Block:
         Returns:
             Operator: the insert Operator.
         """
-        self._sync_with_cpp()
+        self._maybe_sync_with_cpp()
         return self._insert_op_without_sync(index, *args, **kwargs)
 
     def _insert_op_without_sync(self, index, *args, **kwargs):
@@ -4107,9 +4255,11 @@ class Block:
         Returns:
             Operator: the insert Operator.
         """
+        self._materialize_if_lazy()
         op_desc = self.desc._insert_op(index)
         op = Operator(block=self, desc=op_desc, *args, **kwargs)
         self.ops.insert(index, op)
+        self._on_op_added(op)
         return op
 
     def _remove_op(self, index, sync=True):
@@ -4122,9 +4272,11 @@ class Block:
         Returns:
             None
         """
+        self._materialize_if_lazy()
         if sync == True:
-            self._sync_with_cpp()
+            self._maybe_sync_with_cpp()
         self.desc._remove_op(index, index + 1)
+        self._on_op_removed(self.ops[index])
         del self.ops[index]
 
     def _slice_ops(self, start, end):
@@ -4156,6 +4308,7 @@ class Block:
                 kwargs.get("stop_gradient", False),
             )
         else:
+            self._materialize_if_lazy()
             op_desc = self.desc._prepend_op()
             op = Operator(
                 self,
@@ -4166,14 +4319,194 @@ class Block:
                 attrs=kwargs.get("attrs", None),
             )
             self.ops.insert(0, op)
+            self._on_op_added(op)
 
         return op
 
+    def _insert_ops(self, ops, sync=True):
+        """
+        Insert several Operators at once, which costs one pass over the op
+        list instead of one pass per Operator.
+
+        Args:
+            ops(list): the (index, kwargs) pairs of the Operators to insert,
+                where index is the position in the op list before any of
+                them is inserted, and kwargs are the arguments of
+                `_insert_op`. The Operators with the same index are inserted
+                in the order of `ops`.
+            sync(bool): whether to sync with the c++ desc before inserting.
+
+        Returns:
+            list: the inserted Operators, in the order of `ops`.
+        """
+        self._materialize_if_lazy()
+        if sync == True:
+            self._maybe_sync_with_cpp()
+        order = sorted(range(len(ops)), key=lambda i: ops[i][0])
+        for i in order:
+            index = ops[i][0]
+            if index < 0 or index > len(self.ops):
+                raise IndexError(
+                    "The index %d to insert the op is out of range [0, %d]."
+                    % (index, len(self.ops))
+                )
+
+        # insert from the back, so the indices of the front stay valid
+        inserted = [None] * len(ops)
+        for i in reversed(order):
+            index, kwargs = ops[i]
+            op_desc = self.desc._insert_op(index)
+            inserted[i] = Operator(block=self, desc=op_desc, **kwargs)
+
+        new_ops = []
+        start = 0
+        for i in order:
+            index = ops[i][0]
+            new_ops.extend(self.ops[start:index])
+            new_ops.append(inserted[i])
+            start = index
+        new_ops.extend(self.ops[start:])
+        self.ops[:] = new_ops
+        for op in inserted:
+            self._on_op_added(op)
+        return inserted
+
+    def _remove_ops(self, indices, sync=True):
+        """
+        Remove the Operators at several positions at once, which costs one
+        pass over the op list instead of one pass per Operator.
+
+        Args:
+            indices(list): the positions of the Operators to remove.
+            sync(bool): whether to sync with the c++ desc before removing.
+
+        Returns:
+            None
+        """
+        self._materialize_if_lazy()
+        if sync == True:
+            self._maybe_sync_with_cpp()
+        indices = sorted(set(indices))
+        if not indices:
+            return
+        if indices[0] < 0 or indices[-1] >= len(self.ops):
+            raise IndexError(
+                "The indices to remove the ops are out of range [0, %d)."
+                % len(self.ops)
+            )
+
+        # remove the contiguous ranges from the back
+        end = indices[-1] + 1
+        start = indices[-1]
+        for index in reversed(indices[:-1]):
+            if index == start - 1:
+                start = index
+                continue
+            self.desc._remove_op(start, end)
+            start, end = index, index + 1
+        self.desc._remove_op(start, end)
+
+        removed = set(indices)
+        kept = []
+        for index, op in enumerate(self.ops):
+            if index in removed:
+                self._on_op_removed(op)
+            else:
+                kept.append(op)
+        self.ops[:] = kept
+
+    def _find_op_index(self, op):
+        """
+        Get the position of the Operator in this block, or None if it is not
+        in this block. The positions are cached, and the cache is only
+        rebuilt when the op list has changed before the Operator.
+        """
+        index = self._op_positions.get(id(op))
+        if index is None or index >= len(self.ops) or self.ops[index] is not op:
+            self._op_positions = {id(o): i for i, o in enumerate(self.ops)}
+            index = self._op_positions.get(id(op))
+        return index
+
+    def _def_use(self):
+        """
+        Get the def-use index of this block, built on the first call and
+        kept up to date by the op mutation methods afterwards.
+
+        Returns:
+            _DefUseIndex: the def-use index.
+        """
+        if self._def_use_index is None:
+            self._def_use_index = _DefUseIndex(self.ops)
+        return self._def_use_index
+
+    def _var_readers(self, name):
+        """
+        Get the Operators of this block which read the variable, in the order
+        of the op list.
+        """
+        ops = self._def_use().readers.get(name, {}).values()
+        return sorted(ops, key=self._find_op_index)
+
+    def _var_writers(self, name):
+        """
+        Get the Operators of this block which write the variable, in the
+        order of the op list.
+        """
+        ops = self._def_use().writers.get(name, {}).values()
+        return sorted(ops, key=self._find_op_index)
+
+    def _on_op_added(self, op):
+        if self._def_use_index is not None:
+            self._def_use_index.add(op)
+
+    def _on_op_removed(self, op):
+        if self._def_use_index is not None:
+            self._def_use_index.remove(op)
+
+    @signature_safe_contextmanager
+    def _batch_mutation(self):
+        """
+        A with guard to mutate the ops and vars of this block with one sync.
+        The block is synchronized with the c++ desc when the outermost guard
+        enters and exits, and `_insert_op`, `_remove_op`, `_remove_var` and
+        `_rename_var` inside it skip their own sync, which makes a pass
+        inserting or removing many ops linear instead of quadratic in the
+        number of ops.
+
+        Notes: This is a very low level API. Inside the guard, call
+        `_sync_with_cpp` explicitly after changing the op list of the c++
+        desc directly.
+
+        Examples:
+            .. code-block:: python
+
+                with block._batch_mutation():
+                    for idx in reversed(range(len(block.ops))):
+                        if block.ops[idx].type == 'nop':
+                            block._remove_op(idx)
+        """
+        if self._batch_depth == 0:
+            self._sync_with_cpp()
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._sync_with_cpp()
+
+    def _maybe_sync_with_cpp(self):
+        if self._batch_depth == 0:
+            self._sync_with_cpp()
+
     def _sync_with_cpp(self):
         """
         Sync from the desc on the c++ end. This method is used to synchronize
         the c++ desc instance generated by backward.
         """
+        if self._lazy_info is not None:
+            # a lazy block is created from the latest desc on first access
+            return
         # sync variables from cpp
         for var in self.desc.all_vars():
             if not self.has_var(var.name()):
@@ -4202,63 +4535,36 @@ class Block:
             if not self.desc.find_var(var.encode()):
                 self.vars.pop(var)
 
-        # sync operators from cpp
-        ops_in_cpp = []
-        for op_idx in range(0, self.desc.op_size()):
-            ops_in_cpp.append(self.desc.op(op_idx))
-
-        if len(self.ops) != 0:
-            first_op_in_python = self.ops[0].desc
-            last_op_in_python = self.ops[len(self.ops) - 1].desc
-            start_index = None
-            end_index = None
-            for index in range(len(ops_in_cpp)):
-                if first_op_in_python == ops_in_cpp[index]:
-                    start_index = index
-                if last_op_in_python == ops_in_cpp[index]:
-                    end_index = index
-            assert start_index is not None
-            assert end_index is not None
-            assert start_index <= end_index
-        else:
-            start_index = 0
-            end_index = -1
-
-        # sync ops append to the head of cpp_ops
-        for index in range((start_index - 1 - 1), -1, -1):
-            op_desc = ops_in_cpp[index]
-            op = Operator(self, op_desc)
-            self.ops.insert(0, op)
-
-        # sync ops append to the end of cpp_ops
-        for index in range((end_index + 1), len(ops_in_cpp)):
-            op_desc = ops_in_cpp[index]
-            op = Operator(self, op_desc)
-            self.ops.append(op)
+        # sync operators from cpp. The op descs returned by pybind are the
+        # same python objects as long as the Operators hold them, so the
+        # Operators are matched to the c++ ops by the id of their descs.
+        ops_in_python = {id(op.desc): op for op in self.ops}
+        new_ops = []
+        changed = False
+        for op_idx in range(self.desc.op_size()):
+            op_desc = self.desc.op(op_idx)
+            op = ops_in_python.pop(id(op_desc), None)
+            if op is None:
+                op = Operator(self, op_desc)
+                self._on_op_added(op)
+                changed = True
+            elif len(new_ops) >= len(self.ops) or (
+                self.ops[len(new_ops)] is not op
+            ):
+                changed = True
+            new_ops.append(op)
 
         # sync ops removed from c++ end
-        if end_index != -1 and end_index < len(self.ops):
-            ops_in_cpp_index = 0
-            ops_in_python_index = 0
-            while ops_in_python_index < len(
-                self.ops
-            ) and ops_in_cpp_index < len(ops_in_cpp):
-                if (
-                    self.ops[ops_in_python_index].desc
-                    != ops_in_cpp[ops_in_cpp_index]
-                ):
-                    del self.ops[ops_in_python_index]
-                else:
-                    ops_in_cpp_index += 1
-                    ops_in_python_index += 1
-
-        assert len(self.ops) == len(ops_in_cpp)
-        for index in range(len(self.ops)):
-            assert self.ops[index].desc == ops_in_cpp[index]
+        for op in ops_in_python.values():
+            self._on_op_removed(op)
+            changed = True
+        if changed:
+            self.ops[:] = new_ops
 
     def _copy_param_info_from(self, other):
         """
-        Copy the information of parameters from the other block.
+        Copy the information of parameters from the other block. For a lazy
+        block, the information is applied when its vars are created.
 
         Args:
             other(Block): the other block.
@@ -4274,9 +4580,36 @@ class Block:
             raise TypeError(
                 "_copy_param_info_from should be invoked with Block"
             )
-        for p in other.iter_parameters():
+        param_info = other._param_info()
+        if self._lazy_info is not None:
+            self._lazy_info.setdefault('params', {}).update(param_info)
+        else:
+            self._apply_param_info(param_info)
+
+    def _param_info(self):
+        """
+        Get the information of the parameters of this block.
+
+        Returns:
+            dict: from the parameter name to the arguments of Parameter.
+        """
+        if self._lazy_info is not None:
+            return dict(self._lazy_info.get('params', {}))
+        param_info = {}
+        for p in self.iter_parameters():
             assert isinstance(p, Parameter)
-            v = self.vars.get(p.name, None)
+            param_info[p.name] = dict(
+                stop_gradient=p.stop_gradient,
+                trainable=p.trainable,
+                optimize_attr=p.optimize_attr,
+                regularizer=p.regularizer,
+                error_clip=p.error_clip,
+            )
+        return param_info
+
+    def _apply_param_info(self, param_info):
+        for name, kwargs in param_info.items():
+            v = self.vars.get(name, None)
             if v is None:
                 # if the Parameter is pruned, v may be None
                 continue
@@ -4288,12 +4621,8 @@ class Block:
                     dtype=v.dtype,
                     type=v.type,
                     lod_level=v.lod_level,
-                    stop_gradient=p.stop_gradient,
-                    trainable=p.trainable,
-                    optimize_attr=p.optimize_attr,
-                    regularizer=p.regularizer,
-                    error_clip=p.error_clip,
                     name=v.name,
+                    **kwargs,
                 )
             else:
                 new_p = Parameter(
@@ -4304,15 +4633,62 @@ class Block:
                     lod_level=v.lod_level
                     if v.type == core.VarDesc.VarType.LOD_TENSOR
                     else None,
-                    stop_gradient=p.stop_gradient,
-                    trainable=p.trainable,
-                    optimize_attr=p.optimize_attr,
-                    regularizer=p.regularizer,
-                    error_clip=p.error_clip,
                     name=v.name,
+                    **kwargs,
                 )
             self.vars[new_p.name] = new_p
 
+    def _copy_data_info_from(self, other):
+        """
+        Copy the information of data variables from the other block. For a
+        lazy block, the information is applied when its vars are created.
+        """
+        data_info = other._data_info()
+        if self._lazy_info is not None:
+            pending = self._lazy_info.setdefault('data', {})
+            for name, flags in data_info.items():
+                old_flags = pending.get(name, (False, False, False))
+                pending[name] = tuple(a or b for a, b in zip(old_flags, flags))
+        else:
+            self._apply_data_info(data_info)
+
+    def _data_info(self):
+        """
+        Get the information of the data variables of this block.
+
+        Returns:
+            dict: from the variable name to (is_data, need_check_feed,
+            stop_gradient), for the variables with any of them set.
+        """
+        if self._lazy_info is not None:
+            return dict(self._lazy_info.get('data', {}))
+        data_info = {}
+        for name, var in self.vars.items():
+            flags = (
+                bool(var.is_data),
+                var.desc.need_check_feed(),
+                bool(var.stop_gradient),
+            )
+            if any(flags):
+                data_info[name] = flags
+        return data_info
+
+    def _apply_data_info(self, data_info):
+        for name, (
+            is_data,
+            need_check_feed,
+            stop_gradient,
+        ) in data_info.items():
+            var = self.vars.get(name, None)
+            if var is None:
+                continue
+            if is_data:
+                var.is_data = True
+            if need_check_feed:
+                var.desc.set_need_check_feed(True)
+            if stop_gradient:
+                var.stop_gradient = True
+
     def _clone_variable(self, var, force_persistable=True):
         """
         Clone a variable into current block.
@@ -4848,6 +5224,9 @@ class IrGraph:
         ), 'graph must be the instance of core.Graph.'
         self.graph = graph
         self._for_test = for_test
+        # the graph nodes cached inside _batch_edit, to check that the edited
+        # nodes are in the graph without listing all the nodes
+        self._node_set = None
 
     def clone(self):
         """
@@ -4935,7 +5314,7 @@ class IrGraph:
         var_desc.set_shape(shape)
         var_desc.set_dtype(var_dtype)
         var_desc.set_persistable(True)
-        return IrVarNode(self.graph.create_var_node(var_desc))
+        return self._add_node(IrVarNode(self.graph.create_var_node(var_desc)))
 
     def create_var_node(self, name, var_type, shape, var_dtype):
         """
@@ -4956,13 +5335,13 @@ class IrGraph:
         var_desc.set_type(var_type)
         var_desc.set_shape(shape)
         var_desc.set_dtype(var_dtype)
-        return IrVarNode(self.graph.create_var_node(var_desc))
+        return self._add_node(IrVarNode(self.graph.create_var_node(var_desc)))
 
     def create_control_dep_var(self):
         """
         create a control var
         """
-        return IrVarNode(self.graph.create_control_dep_var())
+        return self._add_node(IrVarNode(self.graph.create_control_dep_var()))
 
     def create_var_node_from_desc(self, var_desc):
         """
@@ -4975,7 +5354,7 @@ class IrGraph:
         Returns:
             IrVarNode: the created variable node.
         """
-        return IrVarNode(self.graph.create_var_node(var_desc))
+        return self._add_node(IrVarNode(self.graph.create_var_node(var_desc)))
 
     def create_op_node(self, op_type, attrs, inputs, outputs):
         """
@@ -5006,7 +5385,7 @@ class IrGraph:
             op_desc.set_output(
                 output_name, [var_node.name() for var_node in var_nodes]
             )
-        return IrOpNode(self.graph.create_op_node(op_desc))
+        return self._add_node(IrOpNode(self.graph.create_op_node(op_desc)))
 
     def create_op_node_from_desc(self, op_desc):
         """
@@ -5018,7 +5397,7 @@ class IrGraph:
         Returns:
             IrOpNode: the created operator node.
         """
-        return IrOpNode(self.graph.create_op_node(op_desc))
+        return self._add_node(IrOpNode(self.graph.create_op_node(op_desc)))
 
     def update_input_link(self, old_input_node, new_input_node, op_node):
         """
@@ -5030,9 +5409,9 @@ class IrGraph:
             op_node(IrOpNode): the operator node that is needed to update input's link.
         """
         assert (
-            old_input_node.node in self.graph.nodes()
-            and new_input_node.node in self.graph.nodes()
-            and op_node.node in self.graph.nodes()
+            self._has_node(old_input_node)
+            and self._has_node(new_input_node)
+            and self._has_node(op_node)
         ), 'The three arguments(old_input_node&new_input_node&op_node) must be in the graph nodes.'
         old_input_node.remove_output(op_node)
         op_node.remove_input(old_input_node)
@@ -5050,9 +5429,9 @@ class IrGraph:
             op_node(IrOpNode): the operator node that is needed to update input's link.
         """
         assert (
-            old_output_node.node in self.graph.nodes()
-            and new_output_node.node in self.graph.nodes()
-            and op_node.node in self.graph.nodes()
+            self._has_node(old_output_node)
+            and self._has_node(new_output_node)
+            and self._has_node(op_node)
         ), 'The three arguments(old_output_node &new_output_node &op_node) must be in the graph nodes.'
         old_output_node.remove_input(op_node)
         op_node.remove_output(old_output_node)
@@ -5068,15 +5447,80 @@ class IrGraph:
             node_in(IrNode): the input node.
             node_out(IrNode): the output node.
         """
-        assert node_in.node in self.graph.nodes(), (
+        assert self._has_node(node_in), (
             'node_in(%s) must be in the graph nodes.' % node_in.node.name()
         )
-        assert node_out.node in self.graph.nodes(), (
+        assert self._has_node(node_out), (
             'node_out(%s) must be in the graph nodes.' % node_out.node.name()
         )
         node_in.append_output(node_out)
         node_out.append_input(node_in)
 
+    def link_nodes(self, links):
+        """
+        Connect several pairs of nodes, which lists the graph nodes once
+        instead of once per pair.
+
+        Args:
+            links(list): the (node_in, node_out) pairs of IrNode to connect.
+        """
+        with self._batch_edit():
+            for node_in, node_out in links:
+                self.link_to(node_in, node_out)
+
+    def update_input_links(self, updates):
+        """
+        Update several input links of operator nodes, which lists the graph
+        nodes once instead of once per link.
+
+        Args:
+            updates(list): the (old_input_node, new_input_node, op_node)
+                triples, each of which is the arguments of `update_input_link`.
+        """
+        with self._batch_edit():
+            for old_input_node, new_input_node, op_node in updates:
+                self.update_input_link(old_input_node, new_input_node, op_node)
+
+    @signature_safe_contextmanager
+    def _batch_edit(self):
+        """
+        A with guard to edit the graph with the nodes listed once. The graph
+        nodes are cached when the outermost guard enters, and the nodes
+        created or removed through this IrGraph inside it keep the cache up
+        to date. So `link_to`, `update_input_link` and
+        `update_output_link` check their nodes against the cache instead of
+        listing all the nodes of the graph, which makes a pass linking many
+        nodes linear instead of quadratic in the number of nodes.
+
+        Notes: This is a very low level API. The nodes must not be created or
+        removed through the core.Graph directly inside the guard.
+
+        Examples:
+            .. code-block:: python
+
+                with graph._batch_edit():
+                    for op_node in graph.all_op_nodes():
+                        ...
+        """
+        if self._node_set is not None:
+            yield
+            return
+        self._node_set = set(self.graph.nodes())
+        try:
+            yield
+        finally:
+            self._node_set = None
+
+    def _has_node(self, node):
+        if self._node_set is not None:
+            return node.node in self._node_set
+        return node.node in self.graph.nodes()
+
+    def _add_node(self, node):
+        if self._node_set is not None:
+            self._node_set.add(node.node)
+        return node
+
     def safe_remove_nodes(self, remove_nodes):
         """
         Remove nodes safely since links connected to these removed nodes are
@@ -5092,6 +5536,8 @@ class IrGraph:
                 remove_nodes = {remove_nodes}
         original_nodes = {n.node for n in remove_nodes}
         core.graph_safe_remove_nodes(self.graph, original_nodes)
+        if self._node_set is not None:
+            self._node_set.difference_update(original_nodes)
 
     def resolve_hazard(self):
         ordered_nodes = core.topology_sort(self.graph)
@@ -5941,23 +6387,27 @@ class Program:
         self._sync_with_cpp()
 
         pruned_origin_block_id_map = None
+        # NOTE: the blocks of the cloned program are lazy, whose vars and
+        # ops are only created from the desc when they are accessed, so
+        # cloning a large program only copies its desc.
         if for_test:
             forward_prog = Program()
             forward_prog.desc, pruned_origin_block_id_map = core.prune_backward(
                 self.desc
             )
             forward_prog.blocks = [
-                Block(forward_prog, i)
+                Block(forward_prog, i, lazy=True)
                 for i in range(forward_prog.desc.num_blocks())
             ]
-            forward_prog._sync_with_cpp()
             p = forward_prog._inference_optimize(prune_read_op=False)
         else:
             p = Program()
             p.current_block_idx = self.current_block_idx
             p._seed = self._seed
             p.desc = core.ProgramDesc(self.desc)
-            p.blocks = [Block(p, i) for i in range(self.desc.num_blocks())]
+            p.blocks = [
+                Block(p, i, lazy=True) for i in range(self.desc.num_blocks())
+            ]
 
             p._current_role = self._current_role
             p.__op_role_var = self.__op_role_var
@@ -5965,10 +6415,6 @@ class Program:
             if hasattr(self, 'lr_sheduler'):
                 p.lr_sheduler = self.lr_sheduler
 
-            # NOTE(zhiqiu): we sync the cloned program, to update its program by
-            # its desc.
-            p._sync_with_cpp()
-
         p._copy_param_info_from(self)
         p._copy_data_info_from(self, pruned_origin_block_id_map)
         p._copy_dist_param_info_from(self)
@@ -6089,8 +6535,9 @@ class Program:
         res.desc, pruned_origin_block_id_map = core.prune(
             self.desc, set(feeded_var_names), targets_idx
         )
-        res.blocks = [Block(res, i) for i in range(res.desc.num_blocks())]
-        res._sync_with_cpp()
+        res.blocks = [
+            Block(res, i, lazy=True) for i in range(res.desc.num_blocks())
+        ]
 
         res._copy_param_info_from(self)
         res._copy_data_info_from(self, pruned_origin_block_id_map)
@@ -6149,8 +6596,9 @@ class Program:
                 if op.type() == "batch_norm":
                     # Remove the output ReserveSpace of batch_norm if exists.
                     op.remove_output("ReserveSpace")
-        res.blocks = [Block(res, i) for i in range(res.desc.num_blocks())]
-        res._sync_with_cpp()
+        res.blocks = [
+            Block(res, i, lazy=True) for i in range(res.desc.num_blocks())
+        ]
         return res
 
     def _remove_training_info(self, clip_extra=True):
@@ -6607,14 +7055,7 @@ class Program:
         # The reverse is not true, due to backward pruning.
         for i, block in enumerate(self.blocks):
             other_block = other.blocks[pruned_origin_block_id_map[i]]
-            for var in list(block.vars.values()):
-                other_var = other_block.var(var.name)
-                if other_var.is_data:
-                    var.is_data = True
-                if other_var.desc.need_check_feed():
-                    var.desc.set_need_check_feed(True)
-                if other_var.stop_gradient:
-                    var.stop_gradient = True
+            block._copy_data_info_from(other_block)
 
     def list_vars(self):
         """
@@ -7207,6 +7648,9 @@ class EagerParamBase(_core_eager_eagertensor):
         # hook functions for lazy initialization
         self._init_func = None
         self._init_op_creator = None
+        self._init_shard_func = None
+        # set by paddle.nn.utils.flatten_parameters
+        self._flat_param_buffer = None
 
     def set_init_func(self, obj):
         self._init_func = obj
@@ -7219,6 +7663,7 @@ class EagerParamBase(_core_eager_eagertensor):
         self._init_func()
         # clear function handle to release resource
         self._init_func = None
+        self._init_shard_func = None
 
     @property
     def trainable(self):
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+
 from . import framework
 
 __all__ = ["LazyGuard"]
@@ -111,8 +113,210 @@ class LazyGuard:
 
                 for param in fc.parameters():
                     param.initialize()
+
+        The parameters only hold their shape and dtype until they are
+        initialized, ``materialize`` initializes all of them at once, fills
+        them from a checkpoint, or allocates only the shards owned by the
+        current rank.
         """
         lazy_init_helper().enable()
 
     def __exit__(self, *args, **kwargs):
         lazy_init_helper().disable()
+
+
+def _is_lazy_param(param):
+    """Whether ``param`` is created under LazyGuard and not allocated yet."""
+    return (
+        getattr(param, "_init_func", None) is not None
+        and not param._is_initialized()
+    )
+
+
+def _release_lazy_hooks(param):
+    param._init_func = None
+    param._init_shard_func = None
+
+
+class Shard:
+    """
+    The part of a parameter owned by the current rank, i.e. the elements in
+    ``[start, end)`` along ``axis``. If ``axis`` is None, the part is taken
+    from the flattened parameter, and ``end`` may exceed the number of
+    elements, the exceeding elements are padded with zeros, which is the
+    layout of the sliced parameters of group_sharded stage3.
+
+    Args:
+        start(int): the first index of the shard.
+        end(int): the end index of the shard, exclusive.
+        axis(int, optional): the sharded axis. Default: None.
+    """
+
+    def __init__(self, start, end, axis=None):
+        assert 0 <= start <= end, "The shard [{}, {}) is invalid.".format(
+            start, end
+        )
+        self.start = start
+        self.end = end
+        self.axis = axis
+
+    def shape(self, full_shape):
+        """The shape of the shard of a parameter in ``full_shape``."""
+        if self.axis is None:
+            return [self.end - self.start]
+        shape = list(full_shape)
+        assert self.end <= shape[self.axis]
+        shape[self.axis] = self.end - self.start
+        return shape
+
+    def valid_shape(self, full_shape):
+        """The shape of the shard without the padding."""
+        if self.axis is None:
+            numel = int(np.prod(full_shape))
+            return [max(min(self.end, numel) - self.start, 0)]
+        return self.shape(full_shape)
+
+    def slice(self, value):
+        """
+        Get the shard of ``value``, a numpy.ndarray or a Tensor in the full
+        shape. A numpy.ndarray is sliced without copy, the padding is not
+        added.
+        """
+        if isinstance(value, np.ndarray):
+            if self.axis is None:
+                return value.reshape([-1])[self.start : self.end]
+            index = [slice(None)] * value.ndim
+            index[self.axis] = slice(self.start, self.end)
+            return value[tuple(index)]
+
+        import paddle
+
+        if self.axis is None:
+            numel = int(np.prod(value.shape))
+            value = paddle.flatten(value)
+            axis, end = 0, min(self.end, numel)
+        else:
+            axis, end = self.axis, self.end
+        return paddle.slice(value, axes=[axis], starts=[self.start], ends=[end])
+
+    def pad(self, value, full_shape):
+        """Append the zero padding of the flattened shard to ``value``."""
+        size = self.end - self.start
+        if self.axis is not None or value.shape[0] == size:
+            return value
+
+        import paddle
+
+        padding = paddle.zeros([size - value.shape[0]], dtype=value.dtype)
+        return paddle.concat([value, padding])
+
+
+def _to_param_tensor(value, param):
+    import paddle
+
+    if isinstance(value, np.ndarray):
+        return paddle.to_tensor(value, dtype=param.dtype)
+    if value.dtype != param.dtype:
+        value = value.astype(param.dtype)
+    return value
+
+
+def _materialize_param(param, value=None):
+    """Allocate the lazy ``param``, and fill it with ``value`` if given."""
+    if value is None:
+        param.initialize()
+    else:
+        from .dygraph.layers import _can_share_memory
+
+        if _can_share_memory(param, value):
+            # take the memory of the checkpoint instead of a copy of it
+            value._share_buffer_to(param)
+        else:
+            param.set_value(value)
+    _release_lazy_hooks(param)
+
+
+def _materialize_shard(param, shard, value=None):
+    """
+    Allocate the part ``shard`` of the lazy ``param`` and return it, the
+    parameter itself keeps no memory. The shard is filled with ``value``, the
+    parameter in the full shape, if given, otherwise it is initialized by the
+    initializer of the parameter.
+    """
+    if value is not None:
+        out = _to_param_tensor(shard.slice(value), param)
+    else:
+        assert (
+            param._init_shard_func is not None
+        ), "Required the parameter {} created under LazyGuard.".format(
+            param.name
+        )
+        out = param._init_shard_func(shard)
+    _release_lazy_hooks(param)
+    return shard.pad(out, param.shape)
+
+
+def materialize(layer, state_dict=None, shard_fn=None):
+    """
+    Allocate the parameters of ``layer`` created under ``paddle.LazyGuard``.
+
+    Every parameter is filled with its value in ``state_dict`` if it is
+    there, otherwise it is initialized by its initializer. The parameters are
+    allocated one by one, so no more than one full parameter is alive besides
+    the checkpoint. A tensor of the checkpoint in the dtype and place of the
+    parameter is taken by the parameter without copy.
+
+    If ``shard_fn`` is given, it is called with the structured name and the
+    parameter, and returns the ``Shard`` of the parameter owned by the
+    current rank, or None to allocate the whole parameter. Only the shard is
+    allocated, the parameter itself keeps no memory, and random initializers
+    that draw every element independently generate only the elements of the
+    shard. Note that the parallel layers of tensor parallel already create
+    the parameters in the shape of the local shard, so they need no
+    ``shard_fn``.
+
+    Args:
+        layer(paddle.nn.Layer): the layer constructed under LazyGuard.
+        state_dict(dict, optional): the checkpoint in the full shapes, keyed
+            by the structured names. Default: None.
+        shard_fn(callable, optional): get the Shard of a parameter. Default:
+            None.
+
+    Returns:
+        dict, the shards of the sharded parameters keyed by the structured
+        names.
+
+    Examples:
+
+        .. code-block:: python
+
+            import paddle
+            from paddle.fluid.lazy_init import Shard, materialize
+
+            with paddle.LazyGuard():
+                fc = paddle.nn.Linear(10, 10)
+
+            # the rank owns the rows [0, 5) of the weight
+            shards = materialize(
+                fc,
+                shard_fn=lambda name, p: Shard(0, 5, axis=0)
+                if name == "weight"
+                else None,
+            )
+            print(shards["weight"].shape)  # [5, 10]
+    """
+    assert (
+        framework._non_static_mode()
+    ), "materialize is only available in dygraph mode."
+    state_dict = {} if state_dict is None else state_dict
+    shards = {}
+    for name, param in layer.named_parameters():
+        if not _is_lazy_param(param):
+            continue
+        value = state_dict.get(name, None)
+        shard = shard_fn(name, param) if shard_fn is not None else None
+        if shard is None:
+            _materialize_param(param, value)
+        else:
+            shards[name] = _materialize_shard(param, shard, value)
+    return shards
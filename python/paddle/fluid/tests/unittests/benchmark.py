@@ -17,17 +17,36 @@ import time
 import numpy as np
 from op_test import OpTest
 
+import paddle
 from paddle.fluid.op import Operator
 
 
+def synchronize():
+    if paddle.is_compiled_with_cuda():
+        paddle.device.cuda.synchronize()
+
+
+def timeit(callback, iters, *args, warmup=0, **kwargs):
+    """
+    Returns the average seconds of `iters` calls of callback(*args, **kwargs)
+    after `warmup` untimed calls. The device is synchronized before and after
+    the timed calls, so the kernels launched by them are timed as well.
+    """
+    assert iters != 0, "Iters should >= 1"
+    for i in range(warmup):
+        callback(*args, **kwargs)
+    synchronize()
+    start = time.time()
+    for i in range(iters):
+        callback(*args, **kwargs)
+    synchronize()
+    elapse = time.time() - start
+    return elapse / iters
+
+
 class BenchmarkSuite(OpTest):
     def timeit_function(self, callback, iters, *args, **kwargs):
-        assert iters != 0, "Iters should >= 1"
-        start = time.time()
-        for i in range(iters):
-            callback(*args, **kwargs)
-        elapse = time.time() - start
-        return elapse / iters
+        return timeit(callback, iters, *args, **kwargs)
 
     def _assert_cpu_gpu_same(self, cpu_outs, gpu_outs, fetch_list, atol):
         for item_cpu_out, item_gpu_out, variable in zip(
@@ -0,0 +1,135 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark of mutating large synthetic static programs the way the passes do,
+which compares inserting and removing ops one by one with a sync of the
+block per op against the batched Block._insert_ops and Block._remove_ops, e.g.
+
+    python block_mutation_benchmark.py --num_ops 1000 10000
+    python block_mutation_benchmark.py --num_ops 100000 --skip_per_op
+"""
+
+import argparse
+
+from benchmark import timeit
+
+import paddle
+
+paddle.enable_static()
+
+
+def build_program(num_ops):
+    program = paddle.static.Program()
+    block = program.global_block()
+    x = block.create_var(name="x_0", shape=[1], dtype="float32")
+    for i in range(num_ops):
+        out = block.create_var(
+            name="x_{}".format(i + 1), shape=[1], dtype="float32"
+        )
+        block.append_op(
+            type="scale",
+            inputs={"X": [x]},
+            outputs={"Out": [out]},
+            attrs={"scale": 1.0},
+        )
+        x = out
+    return program
+
+
+def insert_kwargs(block, index):
+    var = block.var("x_{}".format(index))
+    return dict(
+        type="scale",
+        inputs={"X": [var]},
+        outputs={"Out": [var]},
+        attrs={"scale": 1.0},
+    )
+
+
+def insert_per_op(block, indices):
+    for index in sorted(indices, reverse=True):
+        block._insert_op(index, **insert_kwargs(block, index))
+
+
+def insert_batched(block, indices):
+    block._insert_ops(
+        [(index, insert_kwargs(block, index)) for index in indices]
+    )
+
+
+def remove_per_op(block, indices):
+    for index in sorted(indices, reverse=True):
+        block._remove_op(index)
+
+
+def remove_batched(block, indices):
+    block._remove_ops(indices)
+
+
+def run(num_ops, func, every):
+    program = build_program(num_ops)
+    block = program.global_block()
+    indices = list(range(0, num_ops, every))
+    # the block is mutated by the call, so it is timed only once
+    cost = timeit(func, 1, block, indices)
+    assert len(block.ops) == block.desc.op_size()
+    return cost
+
+
+def main(args):
+    print(
+        "{:<10}{:>10}{:>12}{:>16}{:>16}{:>10}".format(
+            "mutation", "ops", "mutated", "per-op(ms)", "batched(ms)", "speedup"
+        )
+    )
+    cases = [
+        ("insert", insert_per_op, insert_batched),
+        ("remove", remove_per_op, remove_batched),
+    ]
+    for num_ops in args.num_ops:
+        for name, per_op, batched in cases:
+            batched_cost = run(num_ops, batched, args.every) * 1e3
+            if args.skip_per_op:
+                per_op_cost = float("nan")
+            else:
+                per_op_cost = run(num_ops, per_op, args.every) * 1e3
+            print(
+                "{:<10}{:>10}{:>12}{:>16.1f}{:>16.1f}{:>10.2f}".format(
+                    name,
+                    num_ops,
+                    len(range(0, num_ops, args.every)),
+                    per_op_cost,
+                    batched_cost,
+                    per_op_cost / batched_cost,
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_ops", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument(
+        "--every",
+        type=int,
+        default=10,
+        help="mutate one op in every `every` ops",
+    )
+    parser.add_argument(
+        "--skip_per_op",
+        action="store_true",
+        help="skip the per-op mutation, which is quadratic in the number "
+        "of ops",
+    )
+    main(parser.parse_args())
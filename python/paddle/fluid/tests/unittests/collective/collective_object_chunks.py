@@ -0,0 +1,93 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import unittest
+
+import numpy as np
+
+import paddle
+import paddle.distributed as dist
+
+# the module attributes, since the package exports the functions of the
+# same names
+all_gather_module = importlib.import_module(
+    'paddle.distributed.communication.all_gather'
+)
+broadcast_module = importlib.import_module(
+    'paddle.distributed.communication.broadcast'
+)
+
+CHUNK_BYTES = 4096
+
+
+def make_object(rank, size):
+    rng = np.random.RandomState(rank)
+    return {
+        'rank': rank,
+        'array': rng.randint(0, 255, size=[size], dtype=np.uint8),
+        'tensor': paddle.to_tensor(rng.rand(size // 8 + 1)),
+        'list': list(range(rank + 1)),
+    }
+
+
+class TestObjectCollectiveChunks(unittest.TestCase):
+    def setUp(self):
+        dist.init_parallel_env()
+        self.rank = dist.get_rank()
+        self.nranks = dist.get_world_size()
+        # small chunks, so the payloads below take several chunk rounds
+        all_gather_module._OBJECT_CHUNK_BYTES = CHUNK_BYTES
+        broadcast_module._OBJECT_CHUNK_BYTES = CHUNK_BYTES
+
+    def check_object(self, obj, expected):
+        self.assertEqual(obj['rank'], expected['rank'])
+        self.assertEqual(obj['list'], expected['list'])
+        np.testing.assert_array_equal(obj['array'], expected['array'])
+        np.testing.assert_array_equal(
+            obj['tensor'].numpy(), expected['tensor'].numpy()
+        )
+
+    def test_all_gather_object(self):
+        # the small objects take the padded all_gather, the large and uneven
+        # ones the send/recv ring, and their last chunks the padded path
+        for sizes in [[10, 30], [10000, 3000], [3000, 10000], [20000, 0]]:
+            sizes = (sizes * self.nranks)[: self.nranks]
+            object_list = []
+            dist.all_gather_object(
+                object_list, make_object(self.rank, sizes[self.rank])
+            )
+            self.assertEqual(len(object_list), self.nranks)
+            for rank, obj in enumerate(object_list):
+                self.check_object(obj, make_object(rank, sizes[rank]))
+
+    def test_broadcast_object_list(self):
+        for src in range(self.nranks):
+            expected = [
+                make_object(src, 3 * CHUNK_BYTES + 5),
+                'between',
+                make_object(src, 10),
+            ]
+            if self.rank == src:
+                object_list = expected
+            else:
+                object_list = [None] * len(expected)
+            dist.broadcast_object_list(object_list, src=src)
+            self.check_object(object_list[0], expected[0])
+            self.assertEqual(object_list[1], 'between')
+            self.check_object(object_list[2], expected[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.distributed.fleet.recompute import RecomputePlanner, plan_recompute
+
+
+def get_blocks(num_blocks, input_size):
+    blocks = []
+    for i in range(num_blocks):
+        blocks.append(
+            paddle.nn.Sequential(
+                paddle.nn.Linear(input_size, input_size * 4),
+                paddle.nn.ReLU(),
+                paddle.nn.Linear(input_size * 4, input_size),
+            )
+        )
+    return paddle.nn.Sequential(*blocks)
+
+
+def run_model(memory_budget=None, steps=5):
+    gen = paddle.seed(10)
+    gen.manual_seed(10)
+    np.random.seed(10)
+    random.seed(10)
+
+    batch_size, input_size = 8, 16
+    model = get_blocks(4, input_size)
+    if memory_budget is not None:
+        model = RecomputePlanner(model, memory_budget=memory_budget)
+    optimizer = paddle.optimizer.SGD(
+        learning_rate=0.01, parameters=model.parameters()
+    )
+
+    loss_ = []
+    grad_ = []
+    for step in range(steps):
+        x_data = np.random.randn(batch_size, input_size).astype(np.float32)
+        x = paddle.to_tensor(x_data)
+        loss = model(x).mean()
+        loss_.append(np.asarray(loss).tolist())
+        loss.backward()
+        for param in model.parameters():
+            assert param.grad is not None, param.name
+        grad_.append(np.asarray(model.parameters()[0]._grad_ivar()).tolist())
+        optimizer.step()
+        optimizer.clear_grad()
+    return loss_, grad_, model
+
+
+class TestPlanRecompute(unittest.TestCase):
+    def test_budget_fits_all(self):
+        plan = plan_recompute([100, 100], [10, 10], [1.0, 1.0], 200)
+        self.assertEqual(plan, [])
+
+    def test_budget_too_small(self):
+        plan = plan_recompute([100, 100, 0], [10, 10, 10], [1.0, 1.0, 1.0], 0)
+        self.assertEqual(plan, [0, 1])
+
+    def test_keep_expensive_layers(self):
+        # only one of the three layers can be kept, keep the most expensive
+        plan = plan_recompute([100, 100, 100], [0, 0, 0], [1.0, 3.0, 2.0], 150)
+        self.assertEqual(plan, [0, 2])
+
+    def test_knapsack(self):
+        # keeping layer 0 and 2 costs 90 bytes and saves 6.5 of recompute
+        plan = plan_recompute(
+            [50, 60, 40, 30], [0, 0, 0, 0], [4.0, 5.0, 2.5, 1.0], 90
+        )
+        self.assertEqual(plan, [1, 3])
+
+    def test_not_recomputable(self):
+        # layer 0 can not be recomputed, so its bytes are always kept
+        plan = plan_recompute(
+            [100, 100], [0, 0], [1.0, 1.0], 0, recomputable=[False, True]
+        )
+        self.assertEqual(plan, [1])
+        plan = plan_recompute(
+            [100, 100], [0, 0], [1.0, 1.0], 100, recomputable=[False, True]
+        )
+        self.assertEqual(plan, [1])
+
+
+class TestRecomputePlanner(unittest.TestCase):
+    def test_planner(self):
+        loss_ref, grad_ref, _ = run_model()
+        for memory_budget in [0, 4096, 1 << 30]:
+            loss, grad, model = run_model(memory_budget=memory_budget)
+            np.testing.assert_allclose(loss_ref, loss, rtol=1e-6)
+            np.testing.assert_allclose(grad_ref, grad, rtol=1e-6)
+
+            report = model.report()
+            self.assertEqual(len(report["activation_bytes"]), 4)
+            self.assertEqual(model.recompute_layers, report["recompute_layers"])
+            if memory_budget == 0:
+                # the first layer is fed with data that stops gradient
+                self.assertEqual(report["recompute_layers"], [1, 2, 3])
+            if memory_budget == 1 << 30:
+                self.assertEqual(report["recompute_layers"], [])
+                self.assertEqual(report["estimated_saved_bytes"], 0)
+            kept_bytes = sum(report["activation_bytes"]) - (
+                report["estimated_saved_bytes"]
+            )
+            if report["recompute_layers"] != [1, 2, 3]:
+                self.assertLessEqual(kept_bytes, memory_budget)
+
+    def test_invalid_layers(self):
+        with self.assertRaises(TypeError):
+            RecomputePlanner(paddle.nn.Linear(4, 4), memory_budget=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -432,6 +432,57 @@ class TestAmpScaler(unittest.TestCase):
             scaler.set_init_loss_scaling(100)
             self.assertEqual(scaler.get_init_loss_scaling() == 100, True)
 
+    def test_update_loss_scaling(self):
+        with fluid.dygraph.guard():
+            model = paddle.nn.Linear(4, 4)
+            optimizer = paddle.optimizer.SGD(
+                learning_rate=0.01, parameters=model.parameters()
+            )
+            scaler = paddle.amp.GradScaler(
+                init_loss_scaling=1024, incr_ratio=2.0, incr_every_n_steps=2
+            )
+            for _ in range(3):
+                loss = paddle.mean(model(paddle.rand([2, 4])))
+                scaled = scaler.scale(loss)
+                scaled.backward()
+                scaler.minimize(optimizer, scaled)
+                optimizer.clear_grad()
+            np.testing.assert_allclose(scaler._scale.numpy(), [2048.0])
+            scaler_state = scaler.state_dict()
+            self.assertEqual(scaler_state["incr_count"], 1)
+            self.assertEqual(scaler_state["decr_count"], 0)
+
+    def test_update_loss_scaling_paths_match(self):
+        def run(update_on_device, init_loss_scaling, found_infs):
+            scaler = paddle.amp.GradScaler(
+                init_loss_scaling=init_loss_scaling,
+                incr_every_n_steps=1,
+                decr_every_n_nan_or_inf=1,
+            )
+            # update_loss_scaling has a CPU kernel, so both paths run here
+            scaler._update_on_device = update_on_device
+            scales = []
+            for found_inf in found_infs:
+                scaler._found_inf = paddle.to_tensor([found_inf])
+                scaler._cache_founf_inf = found_inf
+                scaler._update()
+                scales.append(float(scaler._scale))
+            return scales
+
+        with fluid.dygraph.guard(fluid.CPUPlace()):
+            # a run of inf steps decreases the scale down to 1
+            found_infs = [True] * 8 + [False]
+            on_device = run(True, 16.0, found_infs)
+            on_host = run(False, 16.0, found_infs)
+            self.assertEqual(on_device, on_host)
+            self.assertEqual(on_host[-2], 1.0)
+            # the scale is kept if increasing it overflows
+            max_scale = float(np.finfo(np.float32).max)
+            on_device = run(True, max_scale, [False] * 2)
+            on_host = run(False, max_scale, [False] * 2)
+            self.assertEqual(on_device, on_host)
+            self.assertEqual(on_host[-1], max_scale)
+
     def test_state_dict_and_load_state_dict(self):
         with fluid.dygraph.guard():
             scaler1 = paddle.amp.GradScaler(
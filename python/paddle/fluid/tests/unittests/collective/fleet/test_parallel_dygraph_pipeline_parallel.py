@@ -51,6 +51,9 @@ class TestHybridPipeParallel(TestMultipleGpus):
     def test_hybrid_parallel_transformer_unbalanced_data(self):
         self.run_mnist_2gpu('hybrid_parallel_pp_transformer_unbalanced_data.py')
 
+    def test_hybrid_parallel_pp_activation_offload(self):
+        self.run_mnist_2gpu('hybrid_parallel_pp_activation_offload.py')
+
 
 if __name__ == "__main__":
     unittest.main()
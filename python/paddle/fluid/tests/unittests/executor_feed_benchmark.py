@@ -0,0 +1,117 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark of the per-call latency of Executor.run for small inference
+batches, which compares feeding the numpy inputs through the feed tensors
+bound to the cached program against converting them to new tensors in
+every run, e.g.
+
+    python executor_feed_benchmark.py --batch_size 1 8 64
+    python executor_feed_benchmark.py --num_inputs 8 --feature_size 1024
+"""
+
+import argparse
+
+import numpy as np
+from benchmark import timeit
+
+import paddle
+from paddle.fluid import executor
+
+paddle.enable_static()
+
+
+def build_program(num_inputs, feature_size):
+    main_program = paddle.static.Program()
+    startup_program = paddle.static.Program()
+    with paddle.static.program_guard(main_program, startup_program):
+        inputs = [
+            paddle.static.data(name='x_{}'.format(i), shape=[-1, feature_size])
+            for i in range(num_inputs)
+        ]
+        out = paddle.static.nn.fc(paddle.add_n(inputs), size=16)
+    return main_program.clone(for_test=True), startup_program, out
+
+
+def stage_per_run(staging, feed):
+    # convert every numpy feed to a new tensor, as without the staging
+    staged = []
+    for slot in staging._slots:
+        tensor = executor._as_lodtensor(
+            feed[slot.name], staging._place, slot.var_desc.dtype()
+        )
+        executor._check_feed_desc_shape_type(slot.var_desc, tensor)
+        staged.append((slot.col, tensor))
+    return staged
+
+
+def run(args, batch_size):
+    place = paddle.CPUPlace()
+    exe = paddle.static.Executor(place)
+    scope = paddle.static.Scope()
+    main_program, startup_program, out = build_program(
+        args.num_inputs, args.feature_size
+    )
+    feed = {
+        'x_{}'.format(i): np.random.random(
+            [batch_size, args.feature_size]
+        ).astype('float32')
+        for i in range(args.num_inputs)
+    }
+    with paddle.static.scope_guard(scope):
+        exe.run(startup_program)
+        return timeit(
+            exe.run,
+            args.iters,
+            main_program,
+            feed=feed,
+            fetch_list=[out],
+            warmup=args.warmup,
+        )
+
+
+def main(args):
+    print(
+        "{:<12}{:>16}{:>16}{:>10}".format(
+            "batch_size", "per-run(us)", "staged(us)", "speedup"
+        )
+    )
+    stage = executor._FeedStaging.stage
+    for batch_size in args.batch_size:
+        executor._FeedStaging.stage = stage
+        staged_cost = run(args, batch_size) * 1e6
+        executor._FeedStaging.stage = stage_per_run
+        per_run_cost = run(args, batch_size) * 1e6
+        executor._FeedStaging.stage = stage
+        print(
+            "{:<12}{:>16.1f}{:>16.1f}{:>10.2f}".format(
+                batch_size,
+                per_run_cost,
+                staged_cost,
+                per_run_cost / staged_cost,
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--batch_size", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64]
+    )
+    parser.add_argument("--num_inputs", type=int, default=4)
+    parser.add_argument("--feature_size", type=int, default=256)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--iters", type=int, default=1000)
+    main(parser.parse_args())
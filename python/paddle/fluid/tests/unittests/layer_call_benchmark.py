@@ -0,0 +1,89 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Dygraph benchmark of the per-call overhead of paddle.nn.Layer, which compares
+the default dispatch with the compiled dispatch on deep paddle.nn.Sequential
+stacks of tiny layers, e.g.
+
+    python layer_call_benchmark.py --depths 100 1000 --repeat 20
+"""
+
+import argparse
+
+from benchmark import timeit
+
+import paddle
+from paddle.fluid.dygraph.layers import _set_compiled_dispatch
+
+
+class Identity(paddle.nn.Layer):
+    # no kernel is launched, so the time is all python overhead
+    def forward(self, x):
+        return x
+
+
+class Scale(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.scale = self.create_parameter([1])
+
+    def forward(self, x):
+        return x * self.scale
+
+
+LAYERS = {
+    "identity": Identity,
+    "scale": Scale,
+    "linear": lambda: paddle.nn.Linear(4, 4),
+}
+
+
+def run(model, inputs, repeat):
+    with paddle.no_grad():
+        return timeit(model, repeat, inputs, warmup=1)
+
+
+def main(args):
+    paddle.set_device(args.device)
+    inputs = paddle.randn([args.batch_size, 4])
+    print(
+        "{:<12}{:>8}{:>18}{:>18}{:>10}".format(
+            "layer", "depth", "default(us/call)", "compiled(us/call)", "speedup"
+        )
+    )
+    for name, layer_cls in LAYERS.items():
+        for depth in args.depths:
+            model = paddle.nn.Sequential(*[layer_cls() for _ in range(depth)])
+            costs = []
+            for compiled in [False, True]:
+                _set_compiled_dispatch(compiled)
+                # one call of the Sequential and one of each sublayer
+                calls = depth + 1
+                costs.append(run(model, inputs, args.repeat) / calls * 1e6)
+            print(
+                "{:<12}{:>8}{:>18.3f}{:>18.3f}{:>10.2f}".format(
+                    name, depth, costs[0], costs[1], costs[0] / costs[1]
+                )
+            )
+    _set_compiled_dispatch(False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--batch_size", type=int, default=1)
+    parser.add_argument("--depths", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,105 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Dygraph benchmark of optimizer.step() on models with many small parameters,
+which compares the per-parameter update with the grouped update enabled by
+use_multi_tensor=True, e.g.
+
+    python optimizer_step_benchmark.py --num_layers 1000 5000 --repeat 20
+"""
+
+import argparse
+
+from benchmark import timeit
+
+import paddle
+
+OPTIMIZERS = {
+    "sgd": lambda params, multi: paddle.optimizer.SGD(
+        0.01, parameters=params, use_multi_tensor=multi
+    ),
+    "momentum": lambda params, multi: paddle.optimizer.Momentum(
+        0.01, parameters=params, use_multi_tensor=multi
+    ),
+    "rmsprop": lambda params, multi: paddle.optimizer.RMSProp(
+        0.01, parameters=params, use_multi_tensor=multi
+    ),
+    "adagrad": lambda params, multi: paddle.optimizer.Adagrad(
+        0.01, parameters=params, use_multi_tensor=multi
+    ),
+    "adam": lambda params, multi: paddle.optimizer.Adam(
+        0.01, parameters=params, use_multi_tensor=multi
+    ),
+    "adamw": lambda params, multi: paddle.optimizer.AdamW(
+        0.01, parameters=params, use_multi_tensor=multi
+    ),
+}
+
+
+def run(model, optimizer, hidden, repeat):
+    # the grads are kept, so every step updates the same grads
+    model(paddle.randn([1, hidden])).sum().backward()
+    # warm up, the accumulators and buffers are created in the first step
+    return timeit(optimizer.step, repeat, warmup=1)
+
+
+def main(args):
+    paddle.set_device(args.device)
+    print(
+        "{:<12}{:>10}{:>16}{:>16}{:>10}".format(
+            "optimizer", "params", "default(ms)", "grouped(ms)", "speedup"
+        )
+    )
+    for name in args.optimizers:
+        for num_layers in args.num_layers:
+            costs = []
+            for multi in [False, True]:
+                model = paddle.nn.Sequential(
+                    *[
+                        paddle.nn.Linear(args.hidden, args.hidden)
+                        for _ in range(num_layers)
+                    ]
+                )
+                parameters = model.parameters()
+                optimizer = OPTIMIZERS[name](parameters, multi)
+                cost = run(model, optimizer, args.hidden, args.repeat)
+                costs.append(cost * 1e3)
+            print(
+                "{:<12}{:>10}{:>16.3f}{:>16.3f}{:>10.2f}".format(
+                    name,
+                    len(parameters),
+                    costs[0],
+                    costs[1],
+                    costs[0] / costs[1],
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--hidden", type=int, default=4)
+    parser.add_argument(
+        "--num_layers", type=int, nargs="+", default=[1000, 5000]
+    )
+    parser.add_argument(
+        "--optimizers",
+        type=str,
+        nargs="+",
+        default=list(OPTIMIZERS.keys()),
+        choices=list(OPTIMIZERS.keys()),
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
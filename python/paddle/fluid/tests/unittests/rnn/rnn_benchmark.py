@@ -0,0 +1,88 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Dygraph benchmark of paddle.nn.RNN with the builtin cells, which compares the
+per-step time loop with the fused time loop, e.g.
+
+    python rnn_benchmark.py --device cpu --seq_len 128 --repeat 20
+"""
+
+import argparse
+import os
+import sys
+
+import paddle
+from paddle.nn.layer.rnn import _set_fused_time_loop
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from benchmark import timeit  # noqa: E402
+
+CELLS = {
+    "simple_rnn": paddle.nn.SimpleRNNCell,
+    "lstm": paddle.nn.LSTMCell,
+    "gru": paddle.nn.GRUCell,
+}
+
+
+def run(rnn, inputs, repeat, backward):
+    def step():
+        if backward:
+            outputs, _ = rnn(inputs)
+            outputs.mean().backward()
+            rnn.clear_gradients()
+        else:
+            with paddle.no_grad():
+                rnn(inputs)
+
+    return timeit(step, repeat, warmup=1) * 1000
+
+
+def main(args):
+    paddle.set_device(args.device)
+    inputs = paddle.randn([args.batch_size, args.seq_len, args.input_size])
+    inputs.stop_gradient = False
+    print(
+        "{:<12}{:<10}{:>16}{:>16}{:>10}".format(
+            "cell", "mode", "step loop(ms)", "fused loop(ms)", "speedup"
+        )
+    )
+    for name, cell_cls in CELLS.items():
+        rnn = paddle.nn.RNN(cell_cls(args.input_size, args.hidden_size))
+        for backward in [False, True]:
+            costs = []
+            for fused in [False, True]:
+                _set_fused_time_loop(fused)
+                costs.append(run(rnn, inputs, args.repeat, backward))
+            print(
+                "{:<12}{:<10}{:>16.3f}{:>16.3f}{:>10.2f}".format(
+                    name,
+                    "train" if backward else "infer",
+                    costs[0],
+                    costs[1],
+                    costs[0] / costs[1],
+                )
+            )
+    _set_fused_time_loop(True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--batch_size", type=int, default=16)
+    parser.add_argument("--seq_len", type=int, default=128)
+    parser.add_argument("--input_size", type=int, default=256)
+    parser.add_argument("--hidden_size", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
@@ -21,6 +21,9 @@ import numpy as np
 from convert import convert_params_for_cell
 from rnn_numpy import RNN, BiRNN, GRUCell
 
+from paddle.fluid.layers.utils import flatten
+from paddle.nn.layer.rnn import _set_fused_time_loop
+
 
 class TestRNNWrapper(unittest.TestCase):
     def __init__(self, time_major=True, direction="forward", place="cpu"):
@@ -193,6 +196,80 @@ class TestBiRNNWrapper(unittest.TestCase):
         self.test_with_input_lengths()
 
 
+class TestFusedTimeLoop(unittest.TestCase):
+    def run_rnn(self, rnn, inputs, sequence_length, fused):
+        _set_fused_time_loop(fused)
+        try:
+            x = paddle.to_tensor(inputs, stop_gradient=False)
+            outputs, final_states = rnn(x, sequence_length=sequence_length)
+            loss = outputs.sum() + sum(s.sum() for s in flatten(final_states))
+            loss.backward()
+            grads = [x.grad.numpy()] + [
+                p.grad.numpy() for p in rnn.parameters()
+            ]
+            rnn.clear_gradients()
+            with paddle.no_grad():
+                no_grad_outputs, _ = rnn(x, sequence_length=sequence_length)
+        finally:
+            _set_fused_time_loop(True)
+        results = [outputs.numpy(), no_grad_outputs.numpy()]
+        results += [s.numpy() for s in flatten(final_states)]
+        return results + grads
+
+    def test_fused_time_loop(self):
+        paddle.disable_static(paddle.CPUPlace())
+        inputs = np.random.randn(4, 8, 16)
+        sequence_length = paddle.to_tensor([8, 5, 3, 8], dtype="int64")
+        for cell_cls in [
+            paddle.nn.SimpleRNNCell,
+            paddle.nn.LSTMCell,
+            paddle.nn.GRUCell,
+        ]:
+            for time_major in [False, True]:
+                for is_reverse in [False, True]:
+                    rnn = paddle.nn.RNN(
+                        cell_cls(16, 32),
+                        is_reverse=is_reverse,
+                        time_major=time_major,
+                    )
+                    for lengths in [None, sequence_length]:
+                        x = (
+                            inputs.transpose([1, 0, 2])
+                            if time_major
+                            else inputs
+                        )
+                        expected = self.run_rnn(rnn, x, lengths, False)
+                        results = self.run_rnn(rnn, x, lengths, True)
+                        for y1, y2 in zip(expected, results):
+                            np.testing.assert_allclose(
+                                y1, y2, atol=1e-8, rtol=1e-5
+                            )
+        paddle.enable_static()
+
+    def test_hooked_cell(self):
+        paddle.disable_static(paddle.CPUPlace())
+        inputs = np.random.randn(4, 8, 16)
+        for cell_cls in [
+            paddle.nn.SimpleRNNCell,
+            paddle.nn.LSTMCell,
+            paddle.nn.GRUCell,
+        ]:
+            cell = cell_cls(16, 32)
+            paddle.nn.utils.weight_norm(cell, name='weight_hh')
+            rnn = paddle.nn.RNN(cell)
+            expected = self.run_rnn(rnn, inputs, None, False)
+            results = self.run_rnn(rnn, inputs, None, True)
+            # the weight computed by the hook is used, and the gradients
+            # reach the weight norm parameters
+            self.assertEqual(len(results), len(expected))
+            for y1, y2 in zip(expected, results):
+                np.testing.assert_allclose(y1, y2, atol=1e-8, rtol=1e-5)
+            self.assertIn(
+                'weight_hh_g', [name for name, _ in cell.named_parameters()]
+            )
+        paddle.enable_static()
+
+
 def load_tests(loader, tests, pattern):
     suite = unittest.TestSuite()
     devices = (
@@ -203,4 +280,5 @@ def load_tests(loader, tests, pattern):
             for time_major in [False]:
                 suite.addTest(TestRNNWrapper(time_major, direction, device))
             suite.addTest(TestBiRNNWrapper(time_major, device))
+    suite.addTests(loader.loadTestsFromTestCase(TestFusedTimeLoop))
     return suite
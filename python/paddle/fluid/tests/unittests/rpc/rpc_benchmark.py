@@ -0,0 +1,110 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Local multi-process benchmark of paddle.distributed.rpc.
+
+Worker 1 sends NumPy payloads of increasing sizes to worker 0, which echoes
+them back, and reports the round trip latency and bandwidth for the in-band
+and the zero-copy out-of-band serialization. The mode is switched on both
+workers, so the replies use the same format as the calls, e.g.
+
+    python rpc_benchmark.py --min_size 1024 --max_size 67108864 --repeat 20
+"""
+
+import argparse
+import socket
+import time
+from contextlib import closing
+from multiprocessing import Process
+
+import numpy as np
+
+import paddle
+import paddle.distributed as dist
+from paddle.distributed.rpc.internal import (
+    _set_out_of_band_serialization,
+    _set_zero_copy_deserialization,
+)
+
+
+def worker_name(rank):
+    return "worker{}".format(rank)
+
+
+def echo(x):
+    return x
+
+
+def find_free_port():
+    with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as s:
+        s.bind(("", 0))
+        return s.getsockname()[1]
+
+
+def set_mode(out_of_band):
+    _set_out_of_band_serialization(out_of_band)
+    _set_zero_copy_deserialization(out_of_band)
+
+
+def benchmark(args, out_of_band):
+    set_mode(out_of_band)
+    dist.rpc.rpc_sync(worker_name(0), set_mode, args=(out_of_band,))
+    size = args.min_size
+    while size <= args.max_size:
+        payload = np.random.randint(0, 255, size=[size], dtype=np.uint8)
+        # warm up
+        dist.rpc.rpc_sync(worker_name(0), echo, args=(payload,))
+        start = time.time()
+        for _ in range(args.repeat):
+            dist.rpc.rpc_sync(worker_name(0), echo, args=(payload,))
+        latency = (time.time() - start) / args.repeat
+        # the payload is sent and returned in every call
+        bandwidth = 2 * size / latency / 1024 / 1024
+        print(
+            "out_of_band: {:<6} size: {:>10} B latency: {:>10.3f} ms "
+            "bandwidth: {:>10.2f} MB/s".format(
+                str(out_of_band), size, latency * 1000, bandwidth
+            )
+        )
+        size *= args.step
+
+
+def run_worker(rank, master_endpoint, args):
+    paddle.device.set_device("cpu")
+    dist.rpc.init_rpc(worker_name(rank), rank, 2, master_endpoint)
+    if rank == 1:
+        benchmark(args, out_of_band=False)
+        benchmark(args, out_of_band=True)
+    dist.rpc.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--min_size", type=int, default=1024)
+    parser.add_argument("--max_size", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--step", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    master_endpoint = "127.0.0.1:{}".format(find_free_port())
+    processes = [
+        Process(target=run_worker, args=(rank, master_endpoint, args))
+        for rank in range(2)
+    ]
+    [p.start() for p in processes]
+    [p.join() for p in processes]
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,13 @@ from test_rpc_base import RpcLaunchTestBase, RpcTestBase
 
 import paddle
 import paddle.distributed as dist
+from paddle.distributed.rpc.internal import (
+    PythonFunc,
+    _deserialize,
+    _serialize,
+    _set_out_of_band_serialization,
+    _set_zero_copy_deserialization,
+)
 
 paddle.device.set_device("cpu")
 
@@ -104,6 +111,25 @@ class TestSingleProcessRpc(RpcTestBase):
         out = dist.rpc.rpc_async(worker_name(0), paddle_add, args=args).wait()
         np.testing.assert_allclose(out, res, rtol=1e-05)
 
+    def test_async_rpc_batch(self):
+        a = np.random.random((10, 100))
+        b = np.random.random((10, 100))
+        calls = [(paddle_add, (a, b)), (paddle_add, (b, b)), (np.sum, (a,))]
+        outs = dist.rpc.rpc_async_batch(worker_name(0), calls).wait()
+        self.assertEqual(len(outs), 3)
+        np.testing.assert_allclose(outs[0], np.add(a, b), rtol=1e-05)
+        np.testing.assert_allclose(outs[1], np.add(b, b), rtol=1e-05)
+        np.testing.assert_allclose(outs[2], np.sum(a), rtol=1e-05)
+
+    def test_sync_rpc_tensor_payload(self):
+        a = paddle.rand([10, 100])
+        b = paddle.rand([10, 100])
+        out = dist.rpc.rpc_sync(worker_name(0), paddle.add, args=(a, b))
+        self.assertIsInstance(out, paddle.Tensor)
+        np.testing.assert_allclose(
+            out.numpy(), paddle.add(a, b).numpy(), rtol=1e-05
+        )
+
     def test_get_worker_info(self):
         info = dist.rpc.get_worker_info(worker_name(0))
         self.assertEqual(info.name, worker_name(0))
@@ -121,6 +147,49 @@ class TestSingleProcessRpc(RpcTestBase):
         self.assertEqual(info.rank, 0)
 
 
+class TestRpcSerialization(unittest.TestCase):
+    def test_out_of_band_numpy(self):
+        a = np.random.random((100, 100))
+        obj = PythonFunc(np.add, (a, {"b": np.arange(10)}), {"k": "v"})
+        out = _deserialize(_serialize(obj))
+        np.testing.assert_array_equal(out.args[0], a)
+        # the received arrays can be modified in place
+        self.assertTrue(out.args[0].flags.writeable)
+        out.args[0][0, 0] = -1.0
+        np.testing.assert_array_equal(out.args[1]["b"], np.arange(10))
+        self.assertEqual(out.kwargs, {"k": "v"})
+
+    def test_zero_copy(self):
+        a = np.random.random((100, 100))
+        serial_obj = _serialize(a)
+        _set_zero_copy_deserialization(True)
+        try:
+            out = _deserialize(serial_obj)
+        finally:
+            _set_zero_copy_deserialization(False)
+        np.testing.assert_array_equal(out, a)
+        # the array shares the memory of the received message
+        self.assertFalse(out.flags.writeable)
+
+    def test_tensor(self):
+        x = paddle.rand([4, 8])
+        x.stop_gradient = False
+        out = _deserialize(_serialize([x]))[0]
+        self.assertIsInstance(out, paddle.Tensor)
+        self.assertFalse(out.stop_gradient)
+        np.testing.assert_array_equal(out.numpy(), x.numpy())
+
+    def test_in_band(self):
+        a = np.random.random((10, 10))
+        _set_out_of_band_serialization(False)
+        try:
+            serial_obj = _serialize(a)
+        finally:
+            _set_out_of_band_serialization(True)
+        # messages of the in-band format are still understood
+        np.testing.assert_array_equal(_deserialize(serial_obj), a)
+
+
 class RpcLaunchTest(RpcLaunchTestBase):
     def test_sync_rpc_paddle_add1(self):
         nnodes = 2
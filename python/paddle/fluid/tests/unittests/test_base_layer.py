@@ -12,13 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 import unittest
 
 import numpy as np
 
 import paddle
 import paddle.fluid as fluid
+from paddle.fluid import framework
 from paddle.fluid.dygraph import to_variable
+from paddle.fluid.dygraph.layers import _set_compiled_dispatch
 from paddle.fluid.framework import EagerParamBase, ParamBase, in_dygraph_mode
 
 
@@ -360,6 +363,134 @@ class TestModifiedBuffer(unittest.TestCase):
             )
 
 
+class TestCompiledDispatch(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        _set_compiled_dispatch(True)
+
+    def tearDown(self):
+        _set_compiled_dispatch(False)
+
+    def test_forward(self):
+        model = paddle.nn.Sequential(
+            *[paddle.nn.Linear(4, 4) for _ in range(4)]
+        )
+        x = paddle.rand([2, 4])
+        out = model(x)
+        _set_compiled_dispatch(False)
+        expected = model(x)
+        np.testing.assert_array_equal(out.numpy(), expected.numpy())
+
+    def test_direct_slots(self):
+        linear = paddle.nn.Linear(4, 4)
+        linear(paddle.rand([2, 4]))
+        self.assertIs(linear.__dict__['weight'], linear._parameters['weight'])
+        self.assertEqual(dir(linear).count('weight'), 1)
+
+        weight = linear.create_parameter([4, 4])
+        linear.weight = weight
+        self.assertNotIn('weight', linear.__dict__)
+        self.assertIs(linear.weight, weight)
+        linear(paddle.rand([2, 4]))
+        self.assertIs(linear.__dict__['weight'], weight)
+
+        _set_compiled_dispatch(False)
+        self.assertNotIn('weight', linear.__dict__)
+        self.assertIs(linear.weight, weight)
+
+    def test_declarative_thread(self):
+        linear = paddle.nn.Linear(4, 4)
+        linear(paddle.rand([2, 4]))
+        self.assertIn('weight', linear.__dict__)
+        plan_epoch = linear._call_plan_epoch
+        entered = threading.Event()
+        done = threading.Event()
+        results = {}
+
+        def run_declarative():
+            # the plan built in the main thread is not valid in this thread
+            results['epoch'] = framework.global_var._dispatch_epoch_
+            framework.global_var._in_declarative_mode_ = True
+            entered.set()
+            done.wait()
+            framework.global_var._in_declarative_mode_ = False
+
+        thread = threading.Thread(target=run_declarative)
+        thread.start()
+        entered.wait()
+        self.assertNotEqual(results['epoch'], plan_epoch)
+        # the parameters are not read from the direct slots by any thread
+        # while a thread is in declarative mode
+        self.assertNotIn('weight', linear.__dict__)
+        linear(paddle.rand([2, 4]))
+        self.assertNotIn('weight', linear.__dict__)
+        done.set()
+        thread.join()
+
+        linear(paddle.rand([2, 4]))
+        self.assertIs(linear.__dict__['weight'], linear._parameters['weight'])
+
+    def test_hooks(self):
+        linear = paddle.nn.Linear(4, 4)
+        x = paddle.rand([2, 4])
+        linear(x)
+        helper = linear.register_forward_post_hook(
+            lambda layer, inputs, outputs: outputs * 0
+        )
+        self.assertEqual(float(linear(x).abs().sum()), 0.0)
+        helper.remove()
+        self.assertNotEqual(float(linear(x).abs().sum()), 0.0)
+
+
+class TestStateDict(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_cached_index(self):
+        model = paddle.nn.Sequential(paddle.nn.Linear(2, 2))
+        state_dict = model.state_dict()
+        self.assertEqual(list(state_dict.keys()), ['0.weight', '0.bias'])
+        # the returned dict can be modified by the caller
+        state_dict.pop('0.bias')
+        self.assertEqual(len(model.state_dict()), 2)
+
+        model.add_sublayer('1', paddle.nn.Linear(2, 2))
+        self.assertEqual(
+            list(model.state_dict(structured_name_prefix='m.').keys()),
+            ['m.0.weight', 'm.0.bias', 'm.1.weight', 'm.1.bias'],
+        )
+
+        def drop_bias(state):
+            state.pop('1.bias')
+
+        model[1].register_state_dict_hook(drop_bias)
+        self.assertEqual(
+            list(model.state_dict().keys()), ['0.weight', '0.bias', '1.weight']
+        )
+
+    def test_set_state_dict_share_memory(self):
+        linear = paddle.nn.Linear(2, 2)
+        state_dict = {
+            'weight': paddle.rand([2, 2]),
+            'bias': np.random.rand(2).astype('float32'),
+        }
+        linear.set_state_dict(state_dict, share_memory=True)
+        self.assertTrue(
+            linear.weight._is_shared_buffer_with(state_dict['weight'])
+        )
+        # numpy values are copied
+        np.testing.assert_array_equal(linear.bias.numpy(), state_dict['bias'])
+
+        state_dict = {'weight': paddle.rand([2, 2]), 'bias': paddle.rand([2])}
+        linear.set_state_dict(state_dict)
+        self.assertFalse(
+            linear.weight._is_shared_buffer_with(state_dict['weight'])
+        )
+        np.testing.assert_array_equal(
+            linear.weight.numpy(), state_dict['weight'].numpy()
+        )
+
+
 class TestLayerTo(unittest.TestCase):
     def funcsetUp(self):
         paddle.disable_static()
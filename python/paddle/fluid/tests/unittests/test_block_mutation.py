@@ -0,0 +1,142 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import paddle
+
+paddle.enable_static()
+
+
+def build_program(num_ops):
+    program = paddle.static.Program()
+    block = program.global_block()
+    x = block.create_var(name="x_0", shape=[1], dtype="float32")
+    for i in range(num_ops):
+        out = block.create_var(
+            name="x_{}".format(i + 1), shape=[1], dtype="float32"
+        )
+        block.append_op(
+            type="scale",
+            inputs={"X": [x]},
+            outputs={"Out": [out]},
+            attrs={"scale": float(i)},
+        )
+        x = out
+    return program
+
+
+def scale_kwargs(block, name, scale):
+    var = block.var(name)
+    return dict(
+        type="scale",
+        inputs={"X": [var]},
+        outputs={"Out": [var]},
+        attrs={"scale": scale},
+    )
+
+
+class TestBlockMutation(unittest.TestCase):
+    def assert_synced(self, block):
+        self.assertEqual(len(block.ops), block.desc.op_size())
+        for i, op in enumerate(block.ops):
+            self.assertIs(op.desc, block.desc.op(i))
+            self.assertEqual(op.idx, i)
+
+    def test_insert_ops(self):
+        program = build_program(5)
+        block = program.global_block()
+        old_ops = list(block.ops)
+        inserted = block._insert_ops(
+            [
+                (5, scale_kwargs(block, "x_5", 100.0)),
+                (0, scale_kwargs(block, "x_0", 101.0)),
+                (2, scale_kwargs(block, "x_2", 102.0)),
+                (2, scale_kwargs(block, "x_2", 103.0)),
+            ]
+        )
+        self.assert_synced(block)
+        self.assertEqual(
+            [op.attr("scale") for op in block.ops],
+            [101.0, 0.0, 1.0, 102.0, 103.0, 2.0, 3.0, 4.0, 100.0],
+        )
+        self.assertEqual(
+            [op.attr("scale") for op in inserted], [100.0, 101.0, 102.0, 103.0]
+        )
+        self.assertEqual([op for op in block.ops if op in old_ops], old_ops)
+        with self.assertRaises(IndexError):
+            block._insert_ops([(100, scale_kwargs(block, "x_0", 0.0))])
+
+    def test_remove_ops(self):
+        program = build_program(10)
+        block = program.global_block()
+        kept = [op for i, op in enumerate(block.ops) if i not in (0, 3, 4, 9)]
+        block._remove_ops([9, 3, 0, 4, 3])
+        self.assert_synced(block)
+        self.assertEqual(block.ops, kept)
+        with self.assertRaises(IndexError):
+            block._remove_ops([6])
+
+    def test_def_use(self):
+        program = build_program(4)
+        block = program.global_block()
+        self.assertEqual(block._var_readers("x_1"), [block.ops[1]])
+        self.assertEqual(block._var_writers("x_1"), [block.ops[0]])
+        # the index is kept up to date by the mutation methods
+        inserted = block._insert_ops([(1, scale_kwargs(block, "x_1", 7.0))])
+        self.assertEqual(block._var_readers("x_1"), [inserted[0], block.ops[2]])
+        self.assertEqual(block._var_writers("x_1"), [block.ops[0], inserted[0]])
+        block.ops[2]._rename_input("x_1", "x_0")
+        self.assertEqual(block._var_readers("x_1"), [inserted[0]])
+        self.assertEqual(len(block._var_readers("x_0")), 2)
+        block._remove_op(1)
+        self.assertEqual(block._var_readers("x_1"), [])
+        self.assertEqual(block._var_writers("x_1"), [block.ops[0]])
+        self.assertEqual(block._var_readers("not_exist"), [])
+
+    def test_sync_with_cpp(self):
+        program = build_program(6)
+        block = program.global_block()
+        old_ops = list(block.ops)
+        # change the op list on the c++ end only
+        block.desc._remove_op(1, 3)
+        op_desc = block.desc._insert_op(2)
+        op_desc.set_type("scale")
+        block._sync_with_cpp()
+        self.assert_synced(block)
+        self.assertEqual(block.ops[0], old_ops[0])
+        self.assertEqual(block.ops[1], old_ops[3])
+        self.assertNotIn(block.ops[2], old_ops)
+        self.assertEqual(block.ops[3:], old_ops[4:])
+
+    def test_batch_mutation(self):
+        program = build_program(20)
+        block = program.global_block()
+        with block._batch_mutation():
+            for idx in reversed(range(len(block.ops))):
+                if idx % 2 == 0:
+                    block._remove_op(idx)
+                else:
+                    block._insert_op(
+                        idx, **scale_kwargs(block, "x_{}".format(idx), -1.0)
+                    )
+            # the op list changed on the c++ end is synced on exit
+            block.desc._remove_op(0, 1)
+        self.assert_synced(block)
+        self.assertEqual(len(block.ops), 19)
+        self.assertEqual(block._batch_depth, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
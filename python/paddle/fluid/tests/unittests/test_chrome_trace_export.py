@@ -0,0 +1,207 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import os
+import tempfile
+import unittest
+
+import paddle
+import paddle.profiler as profiler
+from paddle.profiler.trace_export import ChromeTraceWriter, load_chrome_trace
+from paddle.profiler.trace_merge import main, merge_chrome_traces
+
+
+class HostPythonNode:
+    def __init__(self, name, type, start_ns, end_ns):
+        self.name = name
+        self.type = type
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.children_node = []
+        self.runtime_node = []
+        self.device_node = []
+
+
+class DevicePythonNode:
+    def __init__(self, name, type, start_ns, end_ns, device_id, stream_id):
+        self.name = name
+        self.type = type
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.device_id = device_id
+        self.stream_id = stream_id
+
+
+def build_trees(num_steps, clock_ns=0):
+    r"""
+    Every step of 100us runs a matmul op of 30us launching a kernel, and a
+    short relu op of 500ns.
+    """
+    root = HostPythonNode(
+        'Root Node', profiler.TracerEventType.UserDefined, 0, 10**12
+    )
+    for step in range(num_steps):
+        start_ns = clock_ns + step * 100000
+        step_node = HostPythonNode(
+            'ProfileStep#{}'.format(step),
+            profiler.TracerEventType.ProfileStep,
+            start_ns,
+            start_ns + 100000,
+        )
+        matmul = HostPythonNode(
+            'matmul dygraph',
+            profiler.TracerEventType.Operator,
+            start_ns + 1000,
+            start_ns + 31000,
+        )
+        runtime = HostPythonNode(
+            'cudaLaunchKernel',
+            profiler.TracerEventType.CudaRuntime,
+            start_ns + 2000,
+            start_ns + 4000,
+        )
+        runtime.device_node.append(
+            DevicePythonNode(
+                'gemm',
+                profiler.TracerEventType.Kernel,
+                start_ns + 5000,
+                start_ns + 25000,
+                0,
+                7,
+            )
+        )
+        matmul.runtime_node.append(runtime)
+        relu = HostPythonNode(
+            'relu dygraph',
+            profiler.TracerEventType.Operator,
+            start_ns + 40000,
+            start_ns + 40500,
+        )
+        step_node.children_node.extend([matmul, relu])
+        root.children_node.append(step_node)
+    return {1: root}
+
+
+def duration_events(events):
+    return [event for event in events if event.get('ph') == 'X']
+
+
+class TestChromeTraceWriter(unittest.TestCase):
+    def test_incremental_write(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'trace.json.gz')
+            writer = ChromeTraceWriter(path, rank=3)
+            writer.write_nodetrees(build_trees(2))
+            # the file is loadable after every write
+            events = duration_events(load_chrome_trace(path))
+            self.assertEqual(len(events), 2 * 5)
+            writer.write_nodetrees(build_trees(1, clock_ns=10**9))
+            events = load_chrome_trace(path)
+            # the file is a valid gzip stream
+            with gzip.open(path, 'rt') as f:
+                self.assertTrue(f.read().startswith('['))
+        self.assertEqual(len(duration_events(events)), 3 * 5)
+        info = [e for e in events if e['name'] == 'paddle_trace_info']
+        self.assertEqual(info[0]['args']['rank'], 3)
+        kernel = [e for e in events if e['name'] == 'gemm'][0]
+        self.assertEqual(kernel['cat'], 'Kernel')
+        self.assertEqual(kernel['tid'], 7)
+        self.assertAlmostEqual(kernel['ts'], 5.0)
+        self.assertAlmostEqual(kernel['dur'], 20.0)
+        process_names = [
+            e['args']['name'] for e in events if e['name'] == 'process_name'
+        ]
+        self.assertEqual(len(process_names), 2)
+
+    def test_min_duration(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'trace.json')
+            writer = ChromeTraceWriter(path, min_duration_ns=1000)
+            writer.write_nodetrees(build_trees(2))
+            events = duration_events(load_chrome_trace(path))
+        names = {event['name'] for event in events}
+        # the relu op of 500ns is dropped, the steps are always kept
+        self.assertNotIn('relu dygraph', names)
+        self.assertIn('ProfileStep#1', names)
+        self.assertEqual(len(events), 2 * 4)
+
+
+class TestMergeChromeTraces(unittest.TestCase):
+    def test_merge(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            paths = []
+            for rank, clock_ns in enumerate([0, 7 * 10**6]):
+                path = os.path.join(dirname, 'rank{}.json.gz'.format(rank))
+                writer = ChromeTraceWriter(path, rank=rank)
+                writer.write_nodetrees(build_trees(4, clock_ns))
+                paths.append(path)
+            output = os.path.join(dirname, 'merged.json.gz')
+            overview = os.path.join(dirname, 'overview.json.gz')
+            offsets = merge_chrome_traces(
+                paths, output, overview=overview, overview_max_events=4
+            )
+            merged = load_chrome_trace(output)
+            overview_events = load_chrome_trace(overview)
+            main([paths[1], paths[0], '--output', output, '--no_align'])
+            unaligned = load_chrome_trace(output)
+
+        self.assertEqual(offsets, {0: 0.0, 1: 7000.0})
+        steps = [e for e in merged if e['name'] == 'ProfileStep#2']
+        self.assertEqual(len(steps), 2)
+        self.assertEqual(steps[0]['ts'], steps[1]['ts'])
+        self.assertNotEqual(steps[0]['pid'], steps[1]['pid'])
+        process_names = sorted(
+            e['args']['name'] for e in merged if e['name'] == 'process_name'
+        )
+        self.assertEqual(len(process_names), 4)
+        self.assertTrue(process_names[0].startswith('rank 0'))
+        self.assertTrue(process_names[-1].startswith('rank 1'))
+
+        # 4 longest events besides the 8 steps
+        kept = duration_events(overview_events)
+        self.assertEqual(len(kept), 8 + 4)
+        self.assertTrue(
+            all(e['dur'] >= 30 for e in kept if e['cat'] != 'ProfileStep')
+        )
+
+        steps = [e for e in unaligned if e['name'] == 'ProfileStep#2']
+        self.assertAlmostEqual(abs(steps[0]['ts'] - steps[1]['ts']), 7000.0)
+
+
+class TestExportChromeTracingStream(unittest.TestCase):
+    def test_profiler(self):
+        paddle.disable_static()
+        linear = paddle.nn.Linear(4, 4)
+        with tempfile.TemporaryDirectory() as dirname:
+            with profiler.Profiler(
+                targets=[profiler.ProfilerTarget.CPU],
+                scheduler=profiler.make_scheduler(
+                    closed=0, ready=0, record=2, repeat=2
+                ),
+                on_trace_ready=profiler.export_chrome_tracing_stream(dirname),
+            ) as prof:
+                for _ in range(4):
+                    paddle.mean(linear(paddle.rand([2, 4]))).backward()
+                    prof.step()
+            files = os.listdir(dirname)
+            self.assertEqual(len(files), 1)
+            self.assertTrue(files[0].endswith('.paddle_trace.json.gz'))
+            events = load_chrome_trace(os.path.join(dirname, files[0]))
+        steps = {e['name'] for e in events if e.get('cat') == 'ProfileStep'}
+        self.assertEqual(len(steps), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
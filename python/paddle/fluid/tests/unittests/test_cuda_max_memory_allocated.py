@@ -42,6 +42,20 @@ class TestMaxMemoryAllocated(unittest.TestCase):
                 peak_memory_allocated_size, max_memory_allocated(device)
             )
 
+    def test_reset_max_memory_allocated(self):
+        if core.is_compiled_with_cuda():
+            tensor = paddle.zeros([1024, 1024])
+            del tensor
+            peak_memory_allocated_size = max_memory_allocated()
+            paddle.device.cuda._reset_max_memory_allocated()
+            self.assertEqual(max_memory_allocated(), memory_allocated())
+            self.assertLess(max_memory_allocated(), peak_memory_allocated_size)
+            # the peak below the former one is tracked after the reset
+            tensor = paddle.zeros([256, 1024])
+            self.assertGreaterEqual(max_memory_allocated(), memory_allocated())
+            self.assertLess(max_memory_allocated(), peak_memory_allocated_size)
+            del tensor
+
     def test_max_memory_allocated_for_all_places(self):
         if core.is_compiled_with_cuda():
             gpu_num = device_count()
@@ -293,6 +293,62 @@ class TestDataset(unittest.TestCase):
 
         temp_dir.cleanup()
 
+    def test_in_memory_dataset_streaming_shuffle(self):
+        """
+        Testcase for InMemoryDataset streaming global shuffle.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        filenames = []
+        for i in range(4):
+            filename = os.path.join(
+                temp_dir.name, "test_streaming_shuffle_%d.txt" % i
+            )
+            with open(filename, "w") as f:
+                for j in range(8):
+                    f.write("1 %d 2 3 3 4 5 5 5 5 1 %d\n" % (j, i))
+            filenames.append(filename)
+
+        slots = ["slot1", "slot2", "slot3", "slot4"]
+        slots_vars = []
+        for slot in slots:
+            var = paddle.static.data(
+                name=slot, shape=[-1, 1], dtype="int64", lod_level=1
+            )
+            slots_vars.append(var)
+
+        dataset = paddle.distributed.InMemoryDataset()
+        dataset.init(
+            batch_size=4, thread_num=2, pipe_command="cat", use_var=slots_vars
+        )
+        spill_dir = os.path.join(temp_dir.name, "spill")
+        dataset.update_settings(
+            shuffle_memory_budget=512, shuffle_spill_dir=spill_dir
+        )
+        dataset.set_filelist(filenames)
+        exe = fluid.Executor(fluid.CPUPlace())
+        exe.run(fluid.default_startup_program())
+
+        window_ids = []
+        for window_id in dataset.streaming_global_shuffle():
+            window_ids.append(window_id)
+            self.assertEqual(
+                dataset.get_memory_data_size(),
+                dataset.streaming_shuffle_stats[-1]["memory_data_size"],
+            )
+            exe.train_from_dataset(fluid.default_main_program(), dataset)
+
+        # all the instances are shuffled once, window by window
+        self.assertGreater(len(window_ids), 1)
+        self.assertEqual(window_ids, list(range(len(window_ids))))
+        total_size = sum(
+            stats["shuffle_data_size"]
+            for stats in dataset.streaming_shuffle_stats
+        )
+        self.assertEqual(total_size, 32)
+        self.assertEqual(dataset.filelist, filenames)
+
+        temp_dir.cleanup()
+
     def test_in_memory_dataset_gpugraph_mode(self):
         """
         Testcase for InMemoryDataset in gpugraph mode.
@@ -0,0 +1,101 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+
+paddle.enable_static()
+
+
+class TestExecutorFeedStaging(unittest.TestCase):
+    def setUp(self):
+        self.place = paddle.CPUPlace()
+        self.exe = paddle.static.Executor(self.place)
+        self.scope = paddle.static.Scope()
+
+    def build_program(self, increment=False):
+        main_program = paddle.static.Program()
+        with paddle.static.program_guard(main_program):
+            if increment:
+                x = paddle.static.data(name='x', shape=[1], dtype='float32')
+                # write the feed target in place
+                paddle.increment(x)
+            else:
+                x = paddle.static.data(name='x', shape=[-1, 4], dtype='float32')
+            out = paddle.scale(x, scale=2.0)
+        return main_program, out
+
+    def run_program(self, program, out, x):
+        with paddle.static.scope_guard(self.scope):
+            return self.exe.run(program, feed={'x': x}, fetch_list=[out])[0]
+
+    def get_slot(self, program, out, x):
+        _, new_exe = self.exe._executor_cache.get_program_and_executor(
+            program,
+            {'x': x},
+            [out],
+            'feed',
+            'fetch',
+            self.place,
+            self.scope,
+        )
+        return new_exe._feed_staging._slots[0]
+
+    def test_zero_copy(self):
+        program, out = self.build_program()
+        x1 = np.random.random([3, 4]).astype('float32')
+        np.testing.assert_allclose(self.run_program(program, out, x1), x1 * 2)
+        slot = self.get_slot(program, out, x1)
+        self.assertTrue(slot.wrapped)
+        tensor = slot.tensor
+
+        # a non-contiguous feed is copied, but not into the former feed
+        x1_copy = x1.copy()
+        x2 = np.random.random([4, 3]).astype('float32').T
+        np.testing.assert_allclose(self.run_program(program, out, x2), x2 * 2)
+        self.assertFalse(slot.wrapped)
+        self.assertIsNot(slot.tensor, tensor)
+        np.testing.assert_array_equal(x1, x1_copy)
+
+        # the bound tensor is reused for the copied feeds
+        tensor = slot.tensor
+        x3 = np.random.random([4, 3]).astype('float32').T
+        np.testing.assert_allclose(self.run_program(program, out, x3), x3 * 2)
+        self.assertIs(slot.tensor, tensor)
+
+    def test_written_feed(self):
+        program, out = self.build_program(increment=True)
+        x = np.ones([1], dtype='float32')
+        np.testing.assert_allclose(self.run_program(program, out, x), [4.0])
+        slot = self.get_slot(program, out, x)
+        self.assertIsNone(slot.dtype)
+        self.assertFalse(slot.wrapped)
+        np.testing.assert_array_equal(x, [1.0])
+
+    def test_check_feed(self):
+        program, out = self.build_program()
+        x = np.random.random([3, 4]).astype('float32')
+        self.run_program(program, out, x)
+        with self.assertRaises(ValueError):
+            self.run_program(program, out, np.ones([3, 5], 'float32'))
+        with self.assertRaises(ValueError):
+            self.run_program(program, out, np.ones([3, 4], 'float64'))
+        np.testing.assert_allclose(self.run_program(program, out, x), x * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+import paddle
+
+paddle.enable_static()
+
+
+class TestExecutorNonBlocking(unittest.TestCase):
+    def setUp(self):
+        self.main_program = paddle.static.Program()
+        self.startup_program = paddle.static.Program()
+        self.startup_program.random_seed = 2023
+        with paddle.static.program_guard(
+            self.main_program, self.startup_program
+        ):
+            x = paddle.static.data(name='x', shape=[-1, 4], dtype='float32')
+            out = paddle.static.nn.fc(x, size=2)
+            self.loss = paddle.mean(out)
+            paddle.optimizer.SGD(learning_rate=0.1).minimize(self.loss)
+        self.feeds = [
+            {'x': np.random.random([3, 4]).astype('float32')} for _ in range(5)
+        ]
+
+    def train(self, non_blocking):
+        exe = paddle.static.Executor(paddle.CPUPlace())
+        scope = paddle.static.Scope()
+        with paddle.static.scope_guard(scope):
+            exe.run(self.startup_program)
+            rets = [
+                exe.run(
+                    self.main_program,
+                    feed=feed,
+                    fetch_list=[self.loss],
+                    non_blocking=non_blocking,
+                )
+                for feed in self.feeds
+            ]
+        if non_blocking:
+            self.assertLessEqual(len(exe._pending_runs), exe._max_in_flight)
+            rets = [ret.result() for ret in rets]
+        return exe, scope, [ret[0] for ret in rets]
+
+    def test_non_blocking(self):
+        _, _, expected = self.train(non_blocking=False)
+        exe, scope, losses = self.train(non_blocking=True)
+        # the steps are run in order, updating the parameters one by one
+        np.testing.assert_allclose(losses, expected, rtol=1e-6)
+
+        # a blocking run waits for the pending runs
+        with paddle.static.scope_guard(scope):
+            future = exe.run(
+                self.main_program,
+                feed=self.feeds[0],
+                fetch_list=[self.loss],
+                non_blocking=True,
+            )
+            loss = exe.run(
+                self.main_program, feed=self.feeds[0], fetch_list=[self.loss]
+            )[0]
+        self.assertTrue(future.done())
+        self.assertEqual(len(exe._pending_runs), 0)
+        self.assertLess(float(loss), float(future.result()[0]))
+
+        exe.close()
+        self.assertIsNone(exe._run_worker)
+
+    def test_exception(self):
+        exe = paddle.static.Executor(paddle.CPUPlace())
+        with paddle.static.scope_guard(paddle.static.Scope()):
+            exe.run(self.startup_program)
+            future = exe.run(
+                self.main_program,
+                feed={'x': np.ones([3, 5], dtype='float32')},
+                fetch_list=[self.loss],
+                non_blocking=True,
+            )
+            self.assertIsInstance(future, concurrent.futures.Future)
+            with self.assertRaises(ValueError):
+                future.result()
+            # the executor keeps running after a failed run
+            future = exe.run(
+                self.main_program,
+                feed=self.feeds[0],
+                fetch_list=[self.loss],
+                non_blocking=True,
+            )
+            self.assertTrue(np.isfinite(future.result()[0]).all())
+
+    def test_dataset_waits_pending_runs(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        filename = os.path.join(temp_dir.name, "data.txt")
+        with open(filename, "w") as f:
+            f.write("1 1 1 2\n1 3 1 4\n")
+        dataset_program = paddle.static.Program()
+        with paddle.static.program_guard(dataset_program):
+            slots = [
+                paddle.static.data(
+                    name=name, shape=[-1, 1], dtype="int64", lod_level=1
+                )
+                for name in ["slot1", "slot2"]
+            ]
+        dataset = paddle.distributed.QueueDataset()
+        dataset.init(
+            batch_size=2, thread_num=1, pipe_command="cat", use_var=slots
+        )
+        dataset.set_filelist([filename])
+
+        exe = paddle.static.Executor(paddle.CPUPlace())
+        events = []
+        run_in_worker = exe._run_in_worker
+        prepare_trainer = exe._prepare_trainer
+
+        def slow_run_in_worker(**kwargs):
+            time.sleep(0.2)
+            res = run_in_worker(**kwargs)
+            events.append('run')
+            return res
+
+        def record_prepare_trainer(*args, **kwargs):
+            events.append('dataset')
+            return prepare_trainer(*args, **kwargs)
+
+        exe._run_in_worker = slow_run_in_worker
+        exe._prepare_trainer = record_prepare_trainer
+        with paddle.static.scope_guard(paddle.static.Scope()):
+            exe.run(self.startup_program)
+            future = exe.run(
+                self.main_program,
+                feed=self.feeds[0],
+                fetch_list=[self.loss],
+                non_blocking=True,
+            )
+            exe.train_from_dataset(dataset_program, dataset)
+        self.assertTrue(future.done())
+        self.assertEqual(events, ['run', 'dataset'])
+        exe.close()
+        temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+
+
+def create_model():
+    paddle.seed(2023)
+    return paddle.nn.Sequential(
+        paddle.nn.Linear(6, 8),
+        paddle.nn.ReLU(),
+        paddle.nn.Linear(8, 3),
+    )
+
+
+class TestFlattenParameters(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+
+    def test_params_are_views(self):
+        model = create_model()
+        expected = {k: v.numpy() for k, v in model.state_dict().items()}
+        flat = paddle.nn.utils.flatten_parameters(model)
+        self.assertEqual(len(flat.buffers), 1)
+        buffer = flat.buffers[0]
+        self.assertEqual(buffer.buffer.shape, [6 * 8 + 8 + 8 * 3 + 3])
+        for k, v in model.state_dict().items():
+            self.assertEqual(list(v.shape), list(expected[k].shape))
+            np.testing.assert_array_equal(v.numpy(), expected[k])
+            self.assertTrue(v._is_shared_buffer_with(buffer.buffer))
+            self.assertTrue(
+                v._grad_ivar()._is_shared_buffer_with(buffer.grad_buffer)
+            )
+        with self.assertRaises(ValueError):
+            paddle.nn.utils.flatten_parameters(model)
+
+    def train(self, flatten, clear_to_zero=True):
+        model = create_model()
+        if flatten:
+            flat = paddle.nn.utils.flatten_parameters(model)
+        optimizer = paddle.optimizer.SGD(
+            learning_rate=0.1,
+            parameters=model.parameters(),
+            use_multi_tensor=True,
+        )
+        paddle.seed(10)
+        norms = []
+        for _ in range(5):
+            loss = paddle.mean(model(paddle.randn([4, 6])))
+            loss.backward()
+            norm = paddle.nn.utils.clip_grad_norm_(model.parameters(), 0.05)
+            norms.append(float(norm))
+            optimizer.step()
+            optimizer.clear_grad(set_to_zero=clear_to_zero)
+        if flatten:
+            self.assertTrue(flat.buffers[0].is_valid())
+            # the optimizer updates the flat buffer in place
+            buffer = list(optimizer._coalesced_buffers.values())[0][0]
+            self.assertTrue(
+                buffer._is_shared_buffer_with(flat.buffers[0].buffer)
+            )
+        return [p.numpy() for p in model.parameters()], norms
+
+    def test_train(self):
+        expected, expected_norms = self.train(False)
+        for clear_to_zero in [True, False]:
+            actual, norms = self.train(True, clear_to_zero)
+            np.testing.assert_allclose(norms, expected_norms, rtol=1e-05)
+            for x, y in zip(actual, expected):
+                np.testing.assert_allclose(x, y, rtol=1e-05, atol=1e-06)
+
+    def test_grad_norm_and_clip(self):
+        model = create_model()
+        loss = paddle.mean(model(paddle.randn([4, 6])))
+        loss.backward()
+        grads = [p.grad.numpy() for p in model.parameters()]
+        flat = paddle.nn.utils.flatten_parameters(model)
+        for norm_type in [1.0, 2.0, float("inf")]:
+            expected = np.linalg.norm(
+                np.concatenate([g.flatten() for g in grads]), norm_type
+            )
+            np.testing.assert_allclose(
+                flat.grad_norm(norm_type).numpy(), expected, rtol=1e-05
+            )
+
+        total_norm = flat.clip_grad_norm_(0.01)
+        scale = 0.01 / (float(total_norm) + 1e-6)
+        for p, g in zip(model.parameters(), grads):
+            np.testing.assert_allclose(p.grad.numpy(), g * scale, rtol=1e-05)
+
+        model.clear_gradients()
+        self.assertTrue(flat.buffers[0].is_valid())
+        self.assertEqual(float(flat.grad_norm()), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,7 +20,10 @@ from fake_reader import fake_imdb_reader
 import paddle
 import paddle.fluid as fluid
 import paddle.fluid.core as core
-from paddle.nn.clip import _allow_pure_fp16_global_norm_clip
+from paddle.nn.clip import (
+    _allow_pure_fp16_global_norm_clip,
+    _scale_grads_inplace,
+)
 
 paddle.enable_static()
 
@@ -648,6 +651,71 @@ class TestDygraphGradientClipFP64(unittest.TestCase):
             )
 
 
+class TestDygraphGradientClipByGlobalNormInplace(unittest.TestCase):
+    def get_params_grads(self):
+        paddle.seed(2023)
+        # a large weight goes through its own norm kernel and the small
+        # ones are fused together
+        linears = [paddle.nn.Linear(300, 300), paddle.nn.Linear(5, 5)]
+        x = paddle.uniform([4, 300], min=-10, max=10)
+        loss = paddle.mean(linears[1](linears[0](x)[:, :5]))
+        loss.backward()
+        return [
+            (p, p._grad_ivar())
+            for linear in linears
+            for p in linear.parameters()
+        ]
+
+    def check_clip(self, clip_norm, auto_skip_clip):
+        with fluid.dygraph.guard():
+            params_grads = self.get_params_grads()
+            grads = [g.numpy() for _, g in params_grads]
+            expected = paddle.nn.ClipGradByGlobalNorm(clip_norm)(params_grads)
+            clip = paddle.nn.ClipGradByGlobalNorm(
+                clip_norm, auto_skip_clip=auto_skip_clip, inplace=True
+            )
+            actual = clip(params_grads)
+            for (_, g), (_, e), (_, a) in zip(params_grads, expected, actual):
+                # the gradients are scaled in place
+                self.assertIs(a, g)
+                np.testing.assert_allclose(
+                    a.numpy(), e.numpy(), rtol=1e-5, atol=1e-8
+                )
+            if clip_norm > 1e3:
+                for g, (_, a) in zip(grads, actual):
+                    np.testing.assert_allclose(a.numpy(), g, rtol=1e-6)
+
+    def test_clip(self):
+        self.check_clip(0.1, auto_skip_clip=False)
+        self.check_clip(0.1, auto_skip_clip=True)
+
+    def test_skip_clip(self):
+        self.check_clip(1e4, auto_skip_clip=False)
+        self.check_clip(1e4, auto_skip_clip=True)
+
+    def test_non_finite_grad(self):
+        with fluid.dygraph.guard(paddle.CPUPlace()):
+            inf_grad = paddle.to_tensor([1.0, np.inf], dtype='float32')
+            grad = paddle.to_tensor([2.0, 4.0], dtype='float32')
+            # every value is multiplied, and the finite gradient after the
+            # non-finite one is kept
+            _scale_grads_inplace(
+                [inf_grad, grad], paddle.to_tensor([0.5], dtype='float32')
+            )
+            np.testing.assert_array_equal(inf_grad.numpy(), [0.5, np.inf])
+            np.testing.assert_array_equal(grad.numpy(), [1.0, 2.0])
+
+            params_grads = self.get_params_grads()
+            params_grads[0][1][0, 0] = np.inf
+            expected = paddle.nn.ClipGradByGlobalNorm(1.0)(params_grads)
+            expected = [e.numpy() for _, e in expected]
+            actual = paddle.nn.ClipGradByGlobalNorm(1.0, inplace=True)(
+                params_grads
+            )
+            for e, (_, a) in zip(expected, actual):
+                np.testing.assert_array_equal(a.numpy(), e)
+
+
 class TestPureFP16ClipGradByGlobalNorm(unittest.TestCase):
     def check_main(self, expected_has_cast_op):
         main_prog = paddle.static.Program()
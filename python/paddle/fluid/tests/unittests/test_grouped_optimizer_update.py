@@ -0,0 +1,178 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+
+
+class TestGroupedUpdateSGD(unittest.TestCase):
+    def setUp(self):
+        self.set_optimizer()
+
+    def set_optimizer(self):
+        self.optimizer_cls = paddle.optimizer.SGD
+        self.kwargs = {'learning_rate': 0.1}
+
+    def create_model(self):
+        paddle.seed(10)
+        # the second linear has a larger learning rate, it is in another bucket
+        weight_attr = paddle.ParamAttr(learning_rate=2.0)
+        return paddle.nn.Sequential(
+            paddle.nn.Linear(5, 8),
+            paddle.nn.ReLU(),
+            paddle.nn.Linear(8, 8, weight_attr=weight_attr),
+            paddle.nn.Linear(8, 3),
+        )
+
+    def create_parameters(self, model, use_param_group):
+        parameters = model.parameters()
+        if not use_param_group:
+            return parameters
+        return [
+            {'params': parameters[:2]},
+            {'params': parameters[2:], 'learning_rate': 0.5},
+        ]
+
+    def train(
+        self, place, use_multi_tensor, use_param_group=False, set_to_zero=True
+    ):
+        paddle.set_device(place)
+        model = self.create_model()
+        optimizer = self.optimizer_cls(
+            parameters=self.create_parameters(model, use_param_group),
+            use_multi_tensor=use_multi_tensor,
+            **self.kwargs
+        )
+        paddle.seed(20)
+        for _ in range(5):
+            loss = paddle.mean(model(paddle.randn([4, 5])))
+            loss.backward()
+            optimizer.step()
+            optimizer.clear_grad(set_to_zero=set_to_zero)
+        return [p.numpy() for p in model.parameters()], optimizer
+
+    def get_places(self):
+        places = ['cpu']
+        if paddle.is_compiled_with_cuda():
+            places.append('gpu')
+        return places
+
+    def check(self, place, **kwargs):
+        expected, _ = self.train(place, use_multi_tensor=False, **kwargs)
+        actual, optimizer = self.train(place, use_multi_tensor=True, **kwargs)
+        for x, y in zip(actual, expected):
+            np.testing.assert_allclose(x, y, rtol=1e-05, atol=1e-06)
+        state_dict = optimizer.state_dict()
+        for value in state_dict.values():
+            if isinstance(value, paddle.Tensor):
+                self.assertTrue(np.all(np.isfinite(value.numpy())))
+
+    def test_main(self):
+        for place in self.get_places():
+            self.check(place)
+            self.check(place, use_param_group=True)
+            # the released grads are coalesced again in every step
+            self.check(place, set_to_zero=False)
+
+    def test_sparse_grad_is_updated_alone(self):
+        paddle.set_device('cpu')
+        paddle.seed(10)
+        embedding = paddle.nn.Embedding(10, 4, sparse=True)
+        linear = paddle.nn.Linear(4, 4)
+        parameters = embedding.parameters() + linear.parameters()
+        optimizer = self.optimizer_cls(
+            parameters=parameters, use_multi_tensor=True, **self.kwargs
+        )
+        before = [p.numpy() for p in parameters]
+        loss = paddle.mean(linear(embedding(paddle.to_tensor([1, 2, 3]))))
+        loss.backward()
+        self.assertIsNone(
+            optimizer._grouped_update_key(
+                embedding.weight, embedding.weight._grad_ivar()
+            )
+        )
+        optimizer.step()
+        for p, value in zip(parameters, before):
+            self.assertFalse(np.allclose(p.numpy(), value))
+
+
+class TestGroupedUpdateRMSProp(TestGroupedUpdateSGD):
+    def set_optimizer(self):
+        self.optimizer_cls = paddle.optimizer.RMSProp
+        self.kwargs = {'learning_rate': 0.01, 'momentum': 0.9, 'centered': True}
+
+    def test_sparse_grad_is_updated_alone(self):
+        pass
+
+
+class TestGroupedUpdateAdagrad(TestGroupedUpdateSGD):
+    def set_optimizer(self):
+        self.optimizer_cls = paddle.optimizer.Adagrad
+        self.kwargs = {'learning_rate': 0.1, 'initial_accumulator_value': 0.1}
+
+    def test_sparse_grad_is_updated_alone(self):
+        pass
+
+
+class TestGroupedUpdateAdamW(TestGroupedUpdateSGD):
+    def set_optimizer(self):
+        self.optimizer_cls = paddle.optimizer.AdamW
+        self.kwargs = {
+            'learning_rate': 0.01,
+            'weight_decay': 0.1,
+            # the biases are not decayed, they are in other buckets
+            'apply_decay_param_fun': lambda name: 'b_' not in name,
+        }
+
+    def test_sparse_grad_is_updated_alone(self):
+        pass
+
+
+class TestCoalescedBuffers(unittest.TestCase):
+    def test_params_and_grads_are_views(self):
+        paddle.set_device('cpu')
+        model = paddle.nn.Linear(4, 4)
+        optimizer = paddle.optimizer.SGD(
+            learning_rate=0.1,
+            parameters=model.parameters(),
+            use_multi_tensor=True,
+        )
+        for _ in range(2):
+            loss = paddle.mean(model(paddle.randn([2, 4])))
+            loss.backward()
+            optimizer.step()
+            optimizer.clear_grad()
+        self.assertEqual(len(optimizer._coalesced_buffers), 1)
+        param, grad = list(optimizer._coalesced_buffers.values())[0]
+        self.assertEqual(param.shape, [20])
+        for p in model.parameters():
+            self.assertTrue(p._is_shared_buffer_with(param))
+            self.assertTrue(p.grad._is_shared_buffer_with(grad))
+
+        # a param taking another buffer is coalesced again
+        weight = paddle.rand([4, 4])
+        weight._share_buffer_to(model.weight)
+        loss = paddle.mean(model(paddle.randn([2, 4])))
+        loss.backward()
+        optimizer.step()
+        param = list(optimizer._coalesced_buffers.values())[0][0]
+        self.assertTrue(model.weight._is_shared_buffer_with(param))
+        self.assertFalse(model.weight._is_shared_buffer_with(weight))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,7 @@
 import unittest
 
 from paddle import fluid
+from paddle.fluid.framework import IrGraph
 
 
 class TestIRGraph(unittest.TestCase):
@@ -116,6 +117,60 @@ class TestIRGraph(unittest.TestCase):
         pass
 
 
+class TestIrGraphBatchEdit(unittest.TestCase):
+    def find_node(self, graph, name):
+        for node in graph.all_nodes():
+            if node.name() == name:
+                return node
+
+    def test_link_nodes(self):
+        graph = IrGraph(build_graph())
+        x1 = self.find_node(graph, "x1")
+        out = self.find_node(graph, "out")
+        y = graph.create_var_node(
+            "y", fluid.core.VarDesc.VarType.LOD_TENSOR, [10, 20], x1.dtype()
+        )
+        scale = graph.create_op_node("scale", {}, {"X": out}, {"Out": y})
+        graph.link_nodes([(out, scale), (scale, y)])
+        self.assertEqual([n.name() for n in scale.inputs], ["out"])
+        self.assertEqual([n.name() for n in scale.outputs], ["y"])
+        self.assertIsNone(graph._node_set)
+
+    def test_update_input_links(self):
+        graph = IrGraph(build_graph())
+        x1 = self.find_node(graph, "x1")
+        op = self.find_node(graph, "sum")
+        with graph._batch_edit():
+            x3 = graph.create_var_node(
+                "x3",
+                fluid.core.VarDesc.VarType.LOD_TENSOR,
+                [10, 20],
+                x1.dtype(),
+            )
+            graph.update_input_links([(x1, x3, op)])
+            self.assertIsNotNone(graph._node_set)
+        self.assertEqual(sorted(n.name() for n in op.inputs), ["x2", "x3"])
+        self.assertEqual(op.input("X"), ["x3", "x2"])
+        self.assertEqual(x1.outputs, [])
+
+    def test_removed_nodes(self):
+        graph = IrGraph(build_graph())
+        x1 = self.find_node(graph, "x1")
+        with graph._batch_edit():
+            self.assertTrue(graph._has_node(x1))
+            graph.safe_remove_nodes(x1)
+            self.assertFalse(graph._has_node(x1))
+        self.assertEqual(len(graph.all_nodes()), 3)
+
+    def test_node_not_in_graph(self):
+        graph = IrGraph(build_graph())
+        other_graph = IrGraph(build_graph())
+        out = self.find_node(graph, "out")
+        other_x1 = self.find_node(other_graph, "x1")
+        with self.assertRaises(AssertionError):
+            graph.link_nodes([(other_x1, out)])
+
+
 def build_graph():
     prog = fluid.core.ProgramDesc()
     block = prog.block(0)
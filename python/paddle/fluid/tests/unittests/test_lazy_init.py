@@ -19,6 +19,7 @@ import numpy as np
 import paddle
 from paddle import LazyGuard
 from paddle.fluid import unique_name
+from paddle.fluid.lazy_init import Shard, materialize
 from paddle.nn import Layer, Linear
 from paddle.nn.initializer import (
     Constant,
@@ -203,5 +204,83 @@ class TestXavierUniform(TestUniform):
         self.b_initializer = XavierUniform()
 
 
+class TestMaterialize(unittest.TestCase):
+    def setUp(self):
+        unique_name.dygraph_parameter_name_checker._name_set = set()
+
+    def create_model(self, w_initializer=Constant(0.6)):
+        with LazyGuard():
+            fc = Linear(
+                10,
+                6,
+                weight_attr=paddle.ParamAttr(initializer=w_initializer),
+                bias_attr=paddle.ParamAttr(initializer=Constant(0.3)),
+            )
+        return fc
+
+    def test_materialize(self):
+        fc = self.create_model()
+        self.assertEqual(materialize(fc), {})
+        np.testing.assert_allclose(
+            fc.weight.numpy(), np.full([10, 6], 0.6, dtype=np.float32)
+        )
+        np.testing.assert_allclose(
+            fc.bias.numpy(), np.full([6], 0.3, dtype=np.float32)
+        )
+
+    def test_materialize_from_state_dict(self):
+        fc = self.create_model()
+        weight = paddle.rand([10, 6])
+        bias = np.random.rand(6).astype(np.float32)
+        materialize(fc, {"weight": weight, "bias": bias})
+        # the tensor of the checkpoint is taken without copy
+        self.assertTrue(fc.weight._is_shared_buffer_with(weight))
+        np.testing.assert_allclose(fc.bias.numpy(), bias)
+
+    def test_materialize_shard(self):
+        fc = self.create_model()
+
+        def shard_fn(name, param):
+            if name == "weight":
+                return Shard(2, 5, axis=1)
+            # the flattened bias is padded to 8 elements
+            return Shard(4, 8)
+
+        shards = materialize(fc, shard_fn=shard_fn)
+        self.assertFalse(fc.weight._is_initialized())
+        self.assertFalse(fc.bias._is_initialized())
+        np.testing.assert_allclose(
+            shards["weight"].numpy(), np.full([10, 3], 0.6, dtype=np.float32)
+        )
+        np.testing.assert_allclose(
+            shards["bias"].numpy(), np.array([0.3, 0.3, 0, 0], np.float32)
+        )
+
+    def test_materialize_shard_from_state_dict(self):
+        fc = self.create_model()
+        weight = np.random.rand(10, 6).astype(np.float32)
+        shards = materialize(
+            fc,
+            {"weight": weight},
+            shard_fn=lambda name, param: Shard(0, 4, axis=0),
+        )
+        np.testing.assert_allclose(shards["weight"].numpy(), weight[:4])
+        np.testing.assert_allclose(
+            shards["bias"].numpy(), np.full([4], 0.3, dtype=np.float32)
+        )
+
+    def test_shard_uses_full_fans(self):
+        fc = self.create_model(XavierUniform())
+        shards = materialize(
+            fc, shard_fn=lambda name, param: Shard(0, 1, axis=0)
+        )
+        limit = np.sqrt(6.0 / (10 + 6))
+        weight = shards["weight"].numpy()
+        self.assertEqual(weight.shape, (1, 6))
+        self.assertTrue(np.all(np.abs(weight) <= limit))
+        # the fans of the shard would give a larger limit
+        self.assertLess(limit, np.sqrt(6.0 / (1 + 6)))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1002,6 +1002,159 @@ class TestLRScheduler(unittest.TestCase):
             natural_lr_warmup.step()
 
 
+class ClippedStepDecay(paddle.optimizer.lr.StepDecay):
+    # inherits the closed form of StepDecay, which ignores the clipping
+    def get_lr(self):
+        return max(super().get_lr(), 0.1)
+
+
+class TestDeviceSchedule(unittest.TestCase):
+    def create_schedulers(self):
+        return [
+            ClippedStepDecay(0.5, step_size=3, gamma=0.5),
+            paddle.optimizer.lr.LinearWarmup(
+                ClippedStepDecay(0.5, step_size=3, gamma=0.5), 5, 0.0, 0.5
+            ),
+            paddle.optimizer.lr.StepDecay(0.5, step_size=3),
+            paddle.optimizer.lr.PolynomialDecay(0.5, decay_steps=7, cycle=True),
+            paddle.optimizer.lr.NoamDecay(0.01, warmup_steps=5),
+            paddle.optimizer.lr.LinearWarmup(
+                paddle.optimizer.lr.MultiStepDecay(0.5, [3, 6]), 5, 0.0, 0.5
+            ),
+            # no closed form, the table is computed by stepping a copy
+            paddle.optimizer.lr.LinearWarmup(
+                paddle.optimizer.lr.CosineAnnealingDecay(0.5, T_max=6),
+                5,
+                0.0,
+                0.5,
+            ),
+            paddle.optimizer.lr.OneCycleLR(0.5, total_steps=20),
+        ]
+
+    def test_lr_table(self):
+        for scheduler in self.create_schedulers():
+            scheduler.step()
+            table = scheduler.get_lr_table(20)
+            expected = [scheduler.last_lr]
+            for _ in range(19):
+                scheduler.step()
+                expected.append(scheduler.last_lr)
+            np.testing.assert_allclose(table, expected, rtol=1e-12)
+
+        with self.assertRaises(TypeError):
+            paddle.optimizer.lr.ReduceOnPlateau(0.5).get_lr_table(10)
+
+    def test_overridden_get_lr(self):
+        epochs = np.arange(10, dtype='int64')
+        scheduler = ClippedStepDecay(0.5, step_size=3, gamma=0.5)
+        self.assertIsNone(scheduler._get_checked_closed_form_lrs(epochs))
+        np.testing.assert_allclose(
+            scheduler.get_lr_table(10),
+            [0.5] * 3 + [0.25] * 3 + [0.125] * 3 + [0.1],
+            rtol=1e-12,
+        )
+        scheduler = paddle.optimizer.lr.StepDecay(0.5, step_size=3, gamma=0.5)
+        self.assertIsNotNone(scheduler._get_checked_closed_form_lrs(epochs))
+
+    def train_dygraph(self, scheduler, num_steps=None):
+        paddle.disable_static()
+        paddle.seed(2023)
+        linear = paddle.nn.Linear(10, 10)
+        if num_steps is not None:
+            scheduler.set_device_schedule(num_steps)
+        sgd = paddle.optimizer.SGD(
+            learning_rate=scheduler, parameters=linear.parameters()
+        )
+        lrs = []
+        for _ in range(20):
+            loss = paddle.mean(linear(paddle.ones([4, 10])))
+            loss.backward()
+            sgd.step()
+            sgd.clear_grad()
+            lrs.append(float(sgd._global_learning_rate()))
+            scheduler.step()
+        paddle.enable_static()
+        return linear.weight.numpy(), lrs
+
+    def test_dygraph(self):
+        for scheduler, device_scheduler, short_scheduler in zip(
+            self.create_schedulers(),
+            self.create_schedulers(),
+            self.create_schedulers(),
+        ):
+            expected, expected_lrs = self.train_dygraph(scheduler)
+            actual, lrs = self.train_dygraph(device_scheduler, 20)
+            np.testing.assert_allclose(lrs, expected_lrs, rtol=1e-06)
+            np.testing.assert_allclose(actual, expected, rtol=1e-05)
+
+            # the learning rate stays at the last value of the table
+            _, lrs = self.train_dygraph(short_scheduler, 15)
+            np.testing.assert_allclose(lrs[:15], expected_lrs[:15], rtol=1e-06)
+            np.testing.assert_allclose(
+                lrs[15:], [expected_lrs[14]] * 5, rtol=1e-06
+            )
+            np.testing.assert_allclose(
+                short_scheduler.last_lr, lrs[-1], rtol=1e-06
+            )
+
+    def test_set_state_dict(self):
+        paddle.disable_static()
+        linear = paddle.nn.Linear(10, 10)
+        scheduler = paddle.optimizer.lr.StepDecay(0.5, step_size=3)
+        scheduler.set_device_schedule(20)
+        sgd = paddle.optimizer.SGD(
+            learning_rate=scheduler, parameters=linear.parameters()
+        )
+        for _ in range(7):
+            linear(paddle.ones([4, 10])).mean().backward()
+            sgd.step()
+            scheduler.step()
+        state_dict = sgd.state_dict()
+
+        scheduler1 = paddle.optimizer.lr.StepDecay(0.5, step_size=3)
+        scheduler1.set_device_schedule(20)
+        sgd1 = paddle.optimizer.SGD(
+            learning_rate=scheduler1, parameters=linear.parameters()
+        )
+        sgd1.set_state_dict(state_dict)
+        self.assertEqual(scheduler1.last_epoch, 7)
+        linear(paddle.ones([4, 10])).mean().backward()
+        sgd1.step()
+        self.assertAlmostEqual(
+            float(sgd1._global_learning_rate()), 0.5 * 0.1**2
+        )
+        paddle.enable_static()
+
+    def test_static(self):
+        paddle.enable_static()
+        scheduler = paddle.optimizer.lr.LinearWarmup(
+            paddle.optimizer.lr.StepDecay(0.5, step_size=3), 5, 0.0, 0.5
+        )
+        expected = scheduler.get_lr_table(10)
+        scheduler.set_device_schedule(10)
+        main_prog = paddle.static.Program()
+        start_prog = paddle.static.Program()
+        with paddle.static.program_guard(main_prog, start_prog):
+            x = paddle.static.data(name='x', shape=[3, 4])
+            loss = paddle.mean(paddle.static.nn.fc(x, 4))
+            sgd = paddle.optimizer.SGD(learning_rate=scheduler)
+            sgd.minimize(loss)
+            lr_var = sgd._global_learning_rate()
+        # the learning rate is not fed by the executor
+        self.assertFalse(hasattr(main_prog, 'lr_sheduler'))
+
+        exe = paddle.static.Executor(paddle.CPUPlace())
+        exe.run(start_prog)
+        for i in range(12):
+            (out,) = exe.run(
+                main_prog,
+                feed={'x': np.random.randn(3, 4).astype('float32')},
+                fetch_list=[lr_var],
+            )
+            np.testing.assert_allclose(out, [expected[min(i, 9)]], rtol=1e-06)
+            scheduler.step()
+
+
 if __name__ == '__main__':
     paddle.enable_static()
     unittest.main()
@@ -14,6 +14,8 @@
 
 import unittest
 
+import numpy as np
+
 import paddle.profiler.statistic_helper as statistic_helper
 
 
@@ -130,6 +132,55 @@ class TestStatisticHelper(unittest.TestCase):
         dst = statistic_helper.subtract_ranges(src1, src2)
         self.assertEqual(dst, [(10, 11)])
 
+    def test_random_ranges(self):
+        def random_ranges(rng):
+            starts = rng.randint(0, 100, rng.randint(0, 20))
+            return [
+                (start, start + length)
+                for start, length in zip(
+                    starts.tolist(), rng.randint(1, 15, len(starts)).tolist()
+                )
+            ]
+
+        def cover(ranges):
+            covered = np.zeros(120, dtype=bool)
+            for start, end in ranges:
+                covered[start:end] = True
+            return covered
+
+        def check_disjoint(ranges):
+            for i in range(1, len(ranges)):
+                self.assertGreaterEqual(ranges[i][0], ranges[i - 1][1])
+
+        rng = np.random.RandomState(2023)
+        for _ in range(200):
+            src1 = random_ranges(rng)
+            src2 = random_ranges(rng)
+            merged = statistic_helper.merge_self_ranges(list(src1))
+            for i in range(1, len(merged)):
+                self.assertGreater(merged[i][0], merged[i - 1][1])
+            np.testing.assert_array_equal(cover(merged), cover(src1))
+            self.assertEqual(
+                statistic_helper.sum_ranges(merged), np.sum(cover(src1))
+            )
+            dst = statistic_helper.merge_ranges(src1, src2)
+            np.testing.assert_array_equal(cover(dst), cover(src1 + src2))
+            dst = statistic_helper.intersection_ranges(src1, src2)
+            check_disjoint(dst)
+            np.testing.assert_array_equal(cover(dst), cover(src1) & cover(src2))
+            dst = statistic_helper.subtract_ranges(src1, src2)
+            check_disjoint(dst)
+            np.testing.assert_array_equal(
+                cover(dst), cover(src1) & ~cover(src2)
+            )
+            # the array version gives the same result
+            np.testing.assert_array_equal(
+                statistic_helper.subtract_ranges_array(
+                    np.array(src1, dtype=np.int64).reshape(-1, 2), src2
+                ).reshape(-1, 2),
+                np.array(dst, dtype=np.int64).reshape(-1, 2),
+            )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,68 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.distributed.communication.serialization_utils import (
+    deserialize_object,
+    serialize_object,
+)
+
+
+class TestObjectSerialization(unittest.TestCase):
+    def test_python_object(self):
+        obj = {"foo": [1, 2, 3], "bar": ("x", 1.5, None)}
+        frame = serialize_object(obj)
+        self.assertEqual(frame.dtype, np.uint8)
+        self.assertEqual(deserialize_object(frame), obj)
+
+    def test_array_and_tensor(self):
+        array = np.random.random([64, 32]).astype("float32")
+        tensor = paddle.to_tensor(np.arange(100, dtype="int64"))
+        obj = {"array": array, "tensor": tensor, "meta": [1, "a"]}
+        frame = serialize_object(obj)
+        result = deserialize_object(frame)
+
+        np.testing.assert_array_equal(result["array"], array)
+        self.assertTrue(isinstance(result["tensor"], paddle.Tensor))
+        np.testing.assert_array_equal(result["tensor"].numpy(), tensor.numpy())
+        self.assertEqual(result["meta"], [1, "a"])
+
+    @unittest.skipIf(
+        sys.version_info < (3, 8), "out-of-band pickling needs protocol 5"
+    )
+    def test_array_not_pickled(self):
+        array = np.random.random([256, 256])
+        frame = serialize_object(array)
+        # the array bytes are copied into the frame once
+        self.assertLess(frame.size, array.nbytes + 1024)
+        np.testing.assert_array_equal(
+            frame[-array.nbytes :].view(array.dtype), array.ravel()
+        )
+
+    def test_frame_offset(self):
+        frames = [serialize_object(obj) for obj in [[1, 2], np.ones([3])]]
+        data = np.concatenate(frames)
+        self.assertEqual(deserialize_object(data[: frames[0].size]), [1, 2])
+        np.testing.assert_array_equal(
+            deserialize_object(data[frames[0].size :]), np.ones([3])
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle.profiler as profiler
+import paddle.profiler.profiler_statistic as profiler_statistic
+from paddle.profiler.event_store import DEVICE, HOST, RUNTIME, EventStore
+
+
+class HostPythonNode:
+    def __init__(self, name, type, start_ns, end_ns, process_id, thread_id):
+        self.name = name
+        self.type = type
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.process_id = process_id
+        self.thread_id = thread_id
+        self.children_node = []
+        self.runtime_node = []
+        self.device_node = []
+        self.mem_node = []
+
+
+class DevicePythonNode:
+    def __init__(
+        self, name, type, start_ns, end_ns, device_id, context_id, stream_id
+    ):
+        self.name = name
+        self.type = type
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.device_id = device_id
+        self.context_id = context_id
+        self.stream_id = stream_id
+
+
+def build_step(step, start_ns):
+    r"""
+    One ProfileStep of 100ns running a matmul op, whose kernel is launched
+    on stream 0, and an allreduce op, whose nccl kernel is launched on
+    stream 1 and overlaps the matmul kernel.
+    """
+    step_node = HostPythonNode(
+        'ProfileStep#{}'.format(step),
+        profiler.TracerEventType.ProfileStep,
+        start_ns,
+        start_ns + 100,
+        1000,
+        1,
+    )
+    matmul = HostPythonNode(
+        'matmul dygraph',
+        profiler.TracerEventType.Operator,
+        start_ns + 10,
+        start_ns + 40,
+        1000,
+        1,
+    )
+    allreduce = HostPythonNode(
+        'c_allreduce_sum dygraph',
+        profiler.TracerEventType.Operator,
+        start_ns + 50,
+        start_ns + 80,
+        1000,
+        1,
+    )
+    for op, kernel_name, stream_id, kernel_start in [
+        (matmul, 'gemm', 0, 30),
+        (allreduce, 'ncclAllReduceKernel', 1, 60),
+    ]:
+        runtime = HostPythonNode(
+            'cudaLaunchKernel',
+            profiler.TracerEventType.CudaRuntime,
+            op.start_ns + 2,
+            op.start_ns + 5,
+            1000,
+            1,
+        )
+        runtime.device_node.append(
+            DevicePythonNode(
+                kernel_name,
+                profiler.TracerEventType.Kernel,
+                start_ns + kernel_start,
+                start_ns + kernel_start + 30,
+                0,
+                0,
+                stream_id,
+            )
+        )
+        op.runtime_node.append(runtime)
+        step_node.children_node.append(op)
+    return step_node
+
+
+def build_trees(num_steps):
+    root = HostPythonNode(
+        'Root Node',
+        profiler.TracerEventType.UserDefined,
+        0,
+        float('inf'),
+        1000,
+        1,
+    )
+    for step in range(num_steps):
+        root.children_node.append(build_step(step, step * 100))
+    return {1: root}
+
+
+class TestEventStore(unittest.TestCase):
+    def test_columns(self):
+        store = EventStore.from_nodetrees(build_trees(1))
+        columns = store.columns
+        # 1 step + 2 ops + 2 runtimes + 2 kernels, the root is not stored
+        self.assertEqual(len(store), 7)
+        self.assertEqual(
+            columns['kind'].tolist(),
+            [HOST, HOST, RUNTIME, DEVICE, HOST, RUNTIME, DEVICE],
+        )
+        self.assertEqual(columns['parent'].tolist(), [-1, 0, 1, 2, 0, 4, 5])
+        self.assertEqual(columns['depth'].tolist(), [0, 1, 2, 3, 1, 2, 3])
+        # traverse_tree visits the last child first
+        self.assertEqual(
+            store.names[columns['name'][1]], 'c_allreduce_sum dygraph'
+        )
+        self.assertEqual(columns['stream_id'][3], 1)
+        self.assertEqual(
+            store.types[columns['type'][0]],
+            profiler.TracerEventType.ProfileStep,
+        )
+
+    def test_append_and_aggregate(self):
+        store = EventStore.from_nodetrees(build_trees(2))
+        store.append({2: build_trees(1)[1]})
+        self.assertEqual(len(store), 21)
+        kernel = (store.columns['kind'] == DEVICE) & store.type_mask(
+            profiler.TracerEventType.Kernel
+        )
+        self.assertEqual(
+            store.aggregate(kernel),
+            {'ncclAllReduceKernel': (3, 90, 30, 30), 'gemm': (3, 90, 30, 30)},
+        )
+        ops = store.type_mask(profiler.TracerEventType.Operator)
+        np.testing.assert_array_equal(
+            store.union(ops),
+            [[10, 40], [50, 80], [110, 140], [150, 180]],
+        )
+
+    def test_propagate(self):
+        store = EventStore.from_nodetrees(build_trees(1))
+        flags = np.zeros(len(store), dtype=bool)
+        flags[1] = True
+        self.assertEqual(
+            store.propagate(flags).tolist(),
+            [False, True, True, True, False, False, False],
+        )
+
+    def test_windows(self):
+        store = EventStore.from_nodetrees(build_trees(4))
+        np.testing.assert_array_equal(
+            store.step_ranges(), [[i * 100, i * 100 + 100] for i in range(4)]
+        )
+        windows = list(store.windows())
+        self.assertEqual([len(window) for window in windows], [7] * 4)
+        self.assertEqual(windows[1].columns['parent'].tolist()[:3], [-1, 0, 1])
+
+    def test_incremental_summary(self):
+        nodetrees = build_trees(4)
+        time_range_summary = profiler_statistic.TimeRangeSummary()
+        time_range_summary.parse(nodetrees)
+        distributed_summary = profiler_statistic.DistributedSummary()
+        distributed_summary.parse(nodetrees)
+
+        window_time_range_summary = profiler_statistic.TimeRangeSummary()
+        window_distributed_summary = profiler_statistic.DistributedSummary()
+        for window in EventStore.from_nodetrees(nodetrees).windows():
+            window_time_range_summary.update(window)
+            window_distributed_summary.update(window)
+
+        for summary in [time_range_summary, window_time_range_summary]:
+            self.assertEqual(
+                summary.get_cpu_range_sum(profiler.TracerEventType.Operator),
+                240,
+            )
+            self.assertEqual(
+                summary.get_gpu_range_sum(0, profiler.TracerEventType.Kernel),
+                240,
+            )
+            self.assertEqual(
+                summary.call_times[profiler.TracerEventType.Kernel], 8
+            )
+        self.assertEqual(
+            dict(time_range_summary.CPUTimeRange),
+            dict(window_time_range_summary.CPUTimeRange),
+        )
+        for summary in [distributed_summary, window_distributed_summary]:
+            self.assertEqual(summary.cpu_calls, 4)
+            self.assertEqual(summary.gpu_calls, 4)
+            self.assertEqual(
+                summary.computation_range,
+                [(i * 100 + 30, i * 100 + 60) for i in range(4)],
+            )
+            self.assertEqual(
+                summary.overlap_range,
+                [(i * 100 + 50, i * 100 + 60) for i in range(4)],
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
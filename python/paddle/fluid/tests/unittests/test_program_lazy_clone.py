@@ -0,0 +1,235 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.fluid.executor import _add_feed_fetch_ops
+
+paddle.enable_static()
+
+
+def build_program():
+    main_program = paddle.static.Program()
+    startup_program = paddle.static.Program()
+    with paddle.static.program_guard(main_program, startup_program):
+        x = paddle.static.data(name='x', shape=[-1, 4], dtype='float32')
+        hidden = paddle.static.nn.fc(x, size=8)
+        hidden.stop_gradient = True
+        out = paddle.static.nn.fc(hidden, size=2)
+        loss = paddle.mean(out)
+        paddle.optimizer.SGD(learning_rate=0.1).minimize(loss)
+    return main_program, startup_program, hidden, loss
+
+
+class TestProgramLazyClone(unittest.TestCase):
+    def test_clone(self):
+        main_program, _, hidden, _ = build_program()
+        cloned = main_program.clone()
+        block = cloned.global_block()
+        self.assertTrue(block._is_lazy())
+        self.assertTrue(block.has_var('x'))
+        self.assertFalse(block.has_var('not_exist'))
+        self.assertTrue(block._is_lazy())
+
+        self.assertEqual(len(block.ops), block.desc.op_size())
+        self.assertFalse(block._is_lazy())
+        self.assertEqual(
+            [op.type for op in block.ops],
+            [op.type for op in main_program.global_block().ops],
+        )
+        params = main_program.global_block().all_parameters()
+        cloned_params = block.all_parameters()
+        self.assertEqual(
+            [p.name for p in params], [p.name for p in cloned_params]
+        )
+        for p, cloned_p in zip(params, cloned_params):
+            self.assertIsNot(p, cloned_p)
+            self.assertEqual(p.trainable, cloned_p.trainable)
+            self.assertEqual(p.optimize_attr, cloned_p.optimize_attr)
+        self.assertTrue(block.var('x').is_data)
+        self.assertTrue(block.var('x').desc.need_check_feed())
+        self.assertTrue(block.var(hidden.name).stop_gradient)
+
+    def test_clone_of_lazy_clone(self):
+        main_program, _, _, _ = build_program()
+        cloned = main_program.clone().clone(for_test=True)
+        block = cloned.global_block()
+        self.assertTrue(block._is_lazy())
+        self.assertNotIn('sgd', [op.type for op in block.ops])
+        self.assertTrue(block.var('x').is_data)
+        self.assertEqual(
+            len(block.all_parameters()),
+            len(main_program.global_block().all_parameters()),
+        )
+
+    def test_prune(self):
+        main_program, _, hidden, _ = build_program()
+        pruned = main_program._prune_with_input(['x'], [hidden])
+        block = pruned.global_block()
+        self.assertTrue(block._is_lazy())
+        self.assertEqual(len(block.ops), block.desc.op_size())
+        self.assertTrue(block.var(hidden.name).stop_gradient)
+
+    def check_mutations(self, program):
+        block = program.global_block()
+        self.assertTrue(block._is_lazy())
+        op_types = [
+            block.desc.op(i).type() for i in range(block.desc.op_size())
+        ]
+        # the vars are bound by name, which keeps the block lazy until the
+        # op is appended
+        block.append_op(
+            type='scale',
+            inputs={'X': ['x']},
+            outputs={'Out': ['x']},
+            attrs={'scale': 2.0},
+        )
+        self.assertEqual(len(block.ops), block.desc.op_size())
+        self.assertEqual([op.type for op in block.ops], op_types + ['scale'])
+
+        for mutate in [
+            lambda block: block.append_op(
+                type='scale', inputs={'X': ['x']}, outputs={'Out': ['x']}
+            ),
+            lambda block: block._prepend_op(
+                type='scale', inputs={'X': ['x']}, outputs={'Out': ['x']}
+            ),
+            lambda block: block._insert_op(
+                1, type='scale', inputs={'X': ['x']}, outputs={'Out': ['x']}
+            ),
+            lambda block: block._insert_ops(
+                [
+                    (
+                        1,
+                        dict(
+                            type='scale',
+                            inputs={'X': ['x']},
+                            outputs={'Out': ['x']},
+                        ),
+                    )
+                ]
+            ),
+            lambda block: block._remove_op(0),
+            lambda block: block._remove_ops([0, 1]),
+        ]:
+            block = program.clone().global_block()
+            self.assertTrue(block._is_lazy())
+            mutate(block)
+            self.assertEqual(len(block.ops), block.desc.op_size())
+            self.assertEqual(
+                [op.type for op in block.ops],
+                [block.desc.op(i).type() for i in range(block.desc.op_size())],
+            )
+            for op, i in zip(block.ops, range(block.desc.op_size())):
+                self.assertEqual(
+                    op.output_arg_names, block.desc.op(i).output_arg_names()
+                )
+
+    def test_mutate_lazy_clone(self):
+        main_program, _, _, _ = build_program()
+        self.check_mutations(main_program.clone())
+
+    def test_mutate_lazy_prune(self):
+        main_program, _, hidden, _ = build_program()
+        self.check_mutations(main_program._prune_with_input(['x'], [hidden]))
+
+    def test_remove_var_of_lazy_clone(self):
+        main_program, _, _, loss = build_program()
+        block = main_program.clone().global_block()
+        self.assertTrue(block._is_lazy())
+        block._remove_var(loss.name)
+        self.assertFalse(block.has_var(loss.name))
+        self.assertFalse(block.desc.has_var(loss.name.encode()))
+
+    def test_add_feed_fetch_ops(self):
+        main_program, _, hidden, loss = build_program()
+        program = _add_feed_fetch_ops(
+            main_program, {'x': None}, [hidden, loss.name], 'feed', 'fetch'
+        )
+        block = program.global_block()
+        # the feed and fetch ops are bound by name, without creating the
+        # vars and ops of the cloned program
+        self.assertTrue(block._is_lazy())
+        op_types = [block.desc.op(i).type() for i in range(3)]
+        self.assertEqual(op_types[0], 'feed')
+        self.assertEqual(block.ops[-1].type, 'fetch')
+        self.assertEqual(block.ops[-1].attr('col'), 1)
+        self.assertEqual(block.ops[-1].input('X'), [loss.name])
+        self.assertEqual(block.ops[-2].input('X'), [hidden.name])
+        self.assertEqual(block.ops[0].input('X'), ['feed'])
+        self.assertTrue(block.var('fetch').persistable)
+        self.assertNotIn(
+            'feed', [op.type for op in main_program.global_block().ops]
+        )
+
+    def test_run(self):
+        main_program, startup_program, hidden, loss = build_program()
+        test_program = main_program.clone(for_test=True)
+        exe = paddle.static.Executor(paddle.CPUPlace())
+        scope = paddle.static.Scope()
+        x = np.random.random([3, 4]).astype('float32')
+        with paddle.static.scope_guard(scope):
+            exe.run(startup_program)
+            hidden_out, loss_out = exe.run(
+                test_program, feed={'x': x}, fetch_list=[hidden, loss]
+            )
+            (loss_only,) = exe.run(
+                test_program, feed={'x': x}, fetch_list=[loss]
+            )
+        self.assertEqual(hidden_out.shape, (3, 8))
+        np.testing.assert_allclose(loss_out, loss_only, rtol=1e-6)
+        with self.assertRaises(ValueError):
+            with paddle.static.scope_guard(scope):
+                exe.run(
+                    test_program,
+                    feed={'x': np.ones([3, 5], 'float32')},
+                    fetch_list=[loss],
+                )
+
+    def test_run_materialized(self):
+        main_program, startup_program, hidden, loss = build_program()
+        test_program = main_program.clone(for_test=True)
+        # create the vars and ops before the executor applies its passes
+        self.assertGreater(len(test_program.global_block().ops), 0)
+        self.assertFalse(test_program.global_block()._is_lazy())
+        place = paddle.CPUPlace()
+        exe = paddle.static.Executor(place)
+        scope = paddle.static.Scope()
+        x = np.random.random([3, 4]).astype('float32')
+        with paddle.static.scope_guard(scope):
+            exe.run(startup_program)
+            (loss_out,) = exe.run(
+                test_program, feed={'x': x}, fetch_list=[loss]
+            )
+        program, _ = exe._executor_cache.get_program_and_executor(
+            test_program, {'x': x}, [loss], 'feed', 'fetch', place, scope
+        )
+        # the ops of the cached program match its desc after the passes
+        block = program.global_block()
+        self.assertEqual(len(block.ops), block.desc.op_size())
+        for i, op in enumerate(block.ops):
+            op_desc = block.desc.op(i)
+            self.assertEqual(op.type, op_desc.type())
+            self.assertEqual(op.input_arg_names, op_desc.input_arg_names())
+            self.assertEqual(op.output_arg_names, op_desc.output_arg_names())
+        for name in block.vars:
+            self.assertTrue(block.desc.has_var(name.encode()))
+        self.assertTrue(np.isfinite(loss_out).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -399,6 +399,75 @@ class TestBeamSearch(ModuleApiTest):
         self.check_output()
 
 
+class TestBeamSearchCheckFinishedSteps(unittest.TestCase):
+    def decode(self, decoder, inits, check_finished_steps, max_step_num):
+        outputs, final_states, lengths = dynamic_decode(
+            decoder,
+            inits,
+            max_step_num=max_step_num,
+            return_length=True,
+            check_finished_steps=check_finished_steps,
+        )
+        return [outputs, lengths] + [final_states.cell_states[0]]
+
+    def test_check_finished_steps(self):
+        paddle.disable_static()
+        paddle.seed(2023)
+        embedder = Embedding(20, 16)
+        output_layer = nn.Linear(16, 20)
+        eos_bias = np.zeros([20], "float32")
+        eos_bias[1] = 6.0
+        eos_bias = paddle.to_tensor(eos_bias)
+        decoder = BeamSearchDecoder(
+            nn.LSTMCell(16, 16),
+            start_token=0,
+            end_token=1,
+            beam_size=4,
+            embedding_fn=embedder,
+            output_fn=lambda x: output_layer(x) + eos_bias,
+        )
+        inits = [paddle.rand([3, 16]), paddle.rand([3, 16])]
+        with paddle.no_grad():
+            for max_step_num in [None, 30]:
+                expected = self.decode(decoder, inits, 1, max_step_num)
+                # the decoding finishes in the middle of the checked steps
+                self.assertLess(expected[0].shape[1], 30)
+                for check_finished_steps in [3, 64]:
+                    results = self.decode(
+                        decoder, inits, check_finished_steps, max_step_num
+                    )
+                    for x, y in zip(expected, results):
+                        np.testing.assert_array_equal(x.numpy(), y.numpy())
+        paddle.enable_static()
+
+    def test_grow_buffers(self):
+        paddle.disable_static()
+        paddle.seed(2023)
+        embedder = Embedding(20, 16)
+        output_layer = nn.Linear(16, 20)
+        eos_bias = np.zeros([20], "float32")
+        eos_bias[1] = -1e9
+        eos_bias = paddle.to_tensor(eos_bias)
+        decoder = BeamSearchDecoder(
+            nn.LSTMCell(16, 16),
+            start_token=0,
+            end_token=1,
+            beam_size=4,
+            embedding_fn=embedder,
+            output_fn=lambda x: output_layer(x) + eos_bias,
+        )
+        inits = [paddle.rand([3, 16]), paddle.rand([3, 16])]
+        # the outputs need gradient, so they are not written into buffers
+        expected = self.decode(decoder, inits, 1, 70)
+        with paddle.no_grad():
+            # the decoding never finishes, the buffers grow beyond 32 steps
+            results = self.decode(decoder, inits, 1, 70)
+        self.assertEqual(results[0].shape[1], 71)
+        for x, y in zip(expected, results):
+            np.testing.assert_allclose(x.numpy(), y.numpy(), rtol=1e-6)
+        paddle.enable_static()
+
+
 class EncoderCell(SimpleRNNCell):
     def __init__(
         self,
@@ -0,0 +1,159 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import http.server
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+import paddle
+import paddle.profiler as profiler
+from paddle.profiler.sampling import LatencyAggregator
+
+
+class HostPythonNode:
+    def __init__(self, name, type, start_ns, end_ns):
+        self.name = name
+        self.type = type
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.children_node = []
+        self.runtime_node = []
+        self.device_node = []
+
+
+def build_trees(step, matmul_ns):
+    root = HostPythonNode(
+        'Root Node', profiler.TracerEventType.UserDefined, 0, 10**9
+    )
+    step_node = HostPythonNode(
+        'ProfileStep#{}'.format(step),
+        profiler.TracerEventType.ProfileStep,
+        0,
+        1000,
+    )
+    linear = HostPythonNode(
+        'Linear', profiler.TracerEventType.Forward, 100, 100 + 2 * matmul_ns
+    )
+    for i in range(2):
+        start = 100 + i * matmul_ns
+        linear.children_node.append(
+            HostPythonNode(
+                'matmul dygraph',
+                profiler.TracerEventType.Operator,
+                start,
+                start + matmul_ns,
+            )
+        )
+    step_node.children_node.append(linear)
+    root.children_node.append(step_node)
+    return {1: root}
+
+
+class TestLatencyAggregator(unittest.TestCase):
+    def test_aggregates(self):
+        aggregator = LatencyAggregator(window=3)
+        for step, matmul_ns in enumerate([10, 20, 300, 40]):
+            aggregator.add(build_trees(step, matmul_ns))
+        # the first sample is dropped from the ring buffer
+        self.assertEqual(len(aggregator.samples), 3)
+        aggregates = aggregator.aggregates()
+        matmul = aggregates['operator']['matmul dygraph']
+        self.assertEqual(matmul['calls'], 6)
+        self.assertEqual(matmul['total_ns'], 2 * (20 + 300 + 40))
+        # 20 in [16, 32), 40 in [32, 64) and 300 in [256, 512)
+        self.assertEqual(matmul['histogram'], [[32, 2], [64, 2], [512, 2]])
+        self.assertEqual(matmul['p50_ns'], 64)
+        self.assertEqual(matmul['p99_ns'], 512)
+        self.assertEqual(aggregates['layer']['Linear']['calls'], 3)
+        self.assertEqual(len(aggregates['step']), 3)
+        self.assertEqual(aggregates['user_defined'], {})
+
+    def test_flush_to_file(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'aggregates.jsonl')
+            aggregator = LatencyAggregator(target=path)
+            for step in range(2):
+                aggregator.add(build_trees(step, 10))
+                aggregator.flush()
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[1]['sampled_steps'], 2)
+        self.assertEqual(
+            records[1]['aggregates']['operator']['matmul dygraph']['calls'], 4
+        )
+
+    def test_flush_to_http(self):
+        received = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers['Content-Length'])
+                received.append(json.loads(self.rfile.read(length)))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        aggregator = LatencyAggregator(
+            target='http://127.0.0.1:{}/'.format(server.server_port)
+        )
+        aggregator.add(build_trees(0, 10))
+        aggregator.flush()
+        thread.join()
+        server.server_close()
+        self.assertEqual(len(received), 1)
+        self.assertIn('Linear', received[0]['aggregates']['layer'])
+
+    def test_flush_failure_warns(self):
+        aggregator = LatencyAggregator(target='http://127.0.0.1:1/')
+        aggregator.add(build_trees(0, 10))
+        with self.assertWarns(UserWarning):
+            aggregator.flush()
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def test_sampling(self):
+        paddle.disable_static()
+        linear = paddle.nn.Linear(4, 4)
+        prof = profiler.SamplingProfiler(sample_every=5)
+        prof.start()
+        for step in range(20):
+            # only the last step of every 5 steps is recorded
+            self.assertEqual(profiler.utils.in_profiler_mode(), step % 5 == 4)
+            paddle.mean(linear(paddle.rand([2, 4]))).backward()
+            prof.step()
+        prof.stop()
+        self.assertFalse(profiler.utils.in_profiler_mode())
+        self.assertEqual(len(prof.aggregator.samples), 4)
+        aggregates = prof.aggregator.aggregates()
+        self.assertEqual(aggregates['layer']['Linear']['calls'], 4)
+        self.assertEqual(len(aggregates['step']), 4)
+
+    def test_invalid_args(self):
+        with self.assertRaises(ValueError):
+            profiler.SamplingProfiler(sample_every=1)
+        with self.assertRaises(ValueError):
+            profiler.SamplingProfiler(window=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
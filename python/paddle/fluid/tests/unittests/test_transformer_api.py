@@ -1033,6 +1033,193 @@ class TestTransformer(unittest.TestCase):
                 src, tgt, src_mask, tgt_mask, memory_mask
             )
 
+    def test_multi_head_attention_preallocated_cache(self):
+        batch_size, embed_dim, num_heads, max_length = 3, 16, 4, 8
+        causal_mask = np.triu(np.full([3, 3], -1e9, "float32"), 1)
+        with fluid.dygraph.guard(fluid.CPUPlace()):
+            attn = MultiHeadAttention(embed_dim, num_heads)
+            prompt = paddle.rand([batch_size, 3, embed_dim])
+            cache = attn.gen_cache(prompt, type=attn.Cache)
+            prealloc_cache = attn.gen_cache(
+                prompt, type=attn.PreallocatedCache, max_length=max_length
+            )
+            self.assertEqual(
+                prealloc_cache.k.shape,
+                [batch_size, num_heads, max_length, embed_dim // num_heads],
+            )
+            k_buffer = prealloc_cache.k
+
+            out, cache = attn(
+                prompt, attn_mask=paddle.to_tensor(causal_mask), cache=cache
+            )
+            prealloc_out, prealloc_cache = attn(prompt, cache=prealloc_cache)
+            np.testing.assert_allclose(
+                out.numpy(), prealloc_out.numpy(), rtol=1e-5, atol=1e-6
+            )
+            for _ in range(3):
+                query = paddle.rand([batch_size, 1, embed_dim])
+                out, cache = attn(query, cache=cache)
+                prealloc_out, prealloc_cache = attn(query, cache=prealloc_cache)
+                np.testing.assert_allclose(
+                    out.numpy(), prealloc_out.numpy(), rtol=1e-5, atol=1e-6
+                )
+            np.testing.assert_array_equal(
+                prealloc_cache.lengths.numpy(), [6] * batch_size
+            )
+            # the buffers are updated in place
+            np.testing.assert_allclose(
+                k_buffer.numpy()[:, :, :6], cache.k.numpy(), rtol=1e-6
+            )
+
+            index = paddle.to_tensor([2, 0, 0])
+            reordered = attn.reorder_cache(prealloc_cache, index)
+            np.testing.assert_array_equal(
+                reordered.k.numpy(), prealloc_cache.k.numpy()[[2, 0, 0]]
+            )
+
+    def test_multi_head_attention_preallocated_cache_lengths(self):
+        embed_dim, num_heads, max_length = 16, 4, 6
+        prompt_lengths = [1, 3]
+        with fluid.dygraph.guard(fluid.CPUPlace()):
+            attn = MultiHeadAttention(embed_dim, num_heads)
+            prompt = paddle.rand([2, 3, embed_dim])
+            query = paddle.rand([2, 1, embed_dim])
+            cache = attn.gen_cache(
+                prompt, type=attn.PreallocatedCache, max_length=max_length
+            )
+            _, cache = attn(prompt, cache=cache)
+            cache = cache._replace(
+                lengths=paddle.to_tensor(prompt_lengths, dtype="int64")
+            )
+            out, cache = attn(query, cache=cache)
+            np.testing.assert_array_equal(cache.lengths.numpy(), [2, 4])
+
+            for i, length in enumerate(prompt_lengths):
+                row_prompt = prompt[i : i + 1, :length]
+                row_cache = attn.gen_cache(row_prompt, type=attn.Cache)
+                mask = np.triu(np.full([length, length], -1e9, "float32"), 1)
+                _, row_cache = attn(
+                    row_prompt,
+                    attn_mask=paddle.to_tensor(mask),
+                    cache=row_cache,
+                )
+                row_out, _ = attn(query[i : i + 1], cache=row_cache)
+                np.testing.assert_allclose(
+                    out.numpy()[i : i + 1],
+                    row_out.numpy(),
+                    rtol=1e-5,
+                    atol=1e-6,
+                )
+
+    def test_decoder_preallocated_cache(self):
+        d_model, n_head, dim_feedforward, batch_size = 16, 4, 32, 2
+        with fluid.dygraph.guard(fluid.CPUPlace()):
+            decoder_layer = TransformerDecoderLayer(
+                d_model, n_head, dim_feedforward, dropout=0.0
+            )
+            decoder = TransformerDecoder(decoder_layer, 2)
+            decoder.eval()
+            memory = paddle.rand([batch_size, 5, d_model])
+            cache = decoder.gen_cache(memory)
+            prealloc_cache = decoder.gen_cache(memory, max_length=4)
+            self.assertTrue(
+                isinstance(
+                    prealloc_cache[0][0], MultiHeadAttention.PreallocatedCache
+                )
+            )
+            for _ in range(4):
+                tgt = paddle.rand([batch_size, 1, d_model])
+                out, cache = decoder(tgt, memory, cache=cache)
+                prealloc_out, prealloc_cache = decoder(
+                    tgt, memory, cache=prealloc_cache
+                )
+                np.testing.assert_allclose(
+                    out.numpy(), prealloc_out.numpy(), rtol=1e-5, atol=1e-6
+                )
+
+    def test_multi_head_attention_preallocated_cache_overflow(self):
+        embed_dim, num_heads, max_length = 16, 4, 4
+        with fluid.dygraph.guard(fluid.CPUPlace()):
+            attn = MultiHeadAttention(embed_dim, num_heads)
+            prompt = paddle.rand([2, 3, embed_dim])
+            cache = attn.gen_cache(
+                prompt, type=attn.PreallocatedCache, max_length=max_length
+            )
+            _, cache = attn(prompt, cache=cache)
+            _, cache = attn(paddle.rand([2, 1, embed_dim]), cache=cache)
+            # the written positions are tracked on the host
+            self.assertEqual(cache._end, max_length)
+            with self.assertRaises(ValueError):
+                attn(paddle.rand([2, 1, embed_dim]), cache=cache)
+            # replaced lengths are checked as well
+            replaced = cache._replace(
+                lengths=paddle.to_tensor([1, max_length], dtype='int64')
+            )
+            self.assertIsNone(replaced._end)
+            with self.assertRaises(ValueError):
+                attn(paddle.rand([2, 1, embed_dim]), cache=replaced)
+            _, cache = attn(
+                paddle.rand([2, 1, embed_dim]),
+                cache=cache._replace(
+                    lengths=paddle.to_tensor([1, 2], dtype='int64')
+                ),
+            )
+            self.assertEqual(cache._end, 3)
+            with self.assertRaises(ValueError):
+                attn.gen_cache(
+                    paddle.rand([2, 5, embed_dim]),
+                    paddle.rand([2, 5, embed_dim]),
+                    type=attn.PreallocatedCache,
+                    max_length=max_length,
+                )
+
+    def test_beam_search_preallocated_cache(self):
+        d_model, n_head, vocab_size = 16, 4, 10
+        batch_size, beam_size, max_step_num = 2, 3, 5
+
+        class DecoderCell(paddle.nn.Layer):
+            def __init__(self, decoder):
+                super().__init__()
+                self.decoder = decoder
+
+            def forward(self, inputs, states, memory):
+                outputs, new_states = self.decoder(
+                    inputs.unsqueeze(1), memory, cache=states
+                )
+                return outputs.squeeze(1), new_states
+
+        with fluid.dygraph.guard(fluid.CPUPlace()):
+            decoder_layer = TransformerDecoderLayer(
+                d_model, n_head, 32, dropout=0.0
+            )
+            decoder = TransformerDecoder(decoder_layer, 2)
+            decoder.eval()
+            beam_search = paddle.nn.BeamSearchDecoder(
+                DecoderCell(decoder),
+                start_token=0,
+                end_token=1,
+                beam_size=beam_size,
+                embedding_fn=paddle.nn.Embedding(vocab_size, d_model),
+                output_fn=paddle.nn.Linear(d_model, vocab_size),
+            )
+            memory = paddle.rand([batch_size, 5, d_model])
+            tiled_memory = (
+                paddle.nn.BeamSearchDecoder.tile_beam_merge_with_batch(
+                    memory, beam_size
+                )
+            )
+            outputs = []
+            # dynamic_decode runs at most max_step_num + 1 steps
+            for max_length in [None, max_step_num + 1]:
+                output, _ = paddle.nn.dynamic_decode(
+                    beam_search,
+                    inits=decoder.gen_cache(memory, max_length=max_length),
+                    max_step_num=max_step_num,
+                    memory=tiled_memory,
+                )
+                outputs.append(output.numpy())
+            np.testing.assert_array_equal(outputs[0], outputs[1])
+
     def test_generate_square_subsequent_mask(self):
         length = 5
         d_model, n_head, dim_feedforward = 8, 4, 64
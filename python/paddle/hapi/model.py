@@ -315,9 +315,9 @@ class StaticGraphAdapter:
         self.mode = 'eval'
         return self._run(inputs, labels)
 
-    def predict_batch(self, inputs):
+    def predict_batch(self, inputs, non_blocking=False):
         self.mode = 'test'
-        return self._run(inputs, None)
+        return self._run(inputs, None, non_blocking)
 
     def parameters(self, *args, **kwargs):
         return self.model.network.parameters(*args, **kwargs)
@@ -484,11 +484,18 @@ class StaticGraphAdapter:
 
         t.set(ndarray, place)
 
-    def _run(self, inputs, labels=None):
+    def _run(self, inputs, labels=None, non_blocking=False):
+        # NOTE: With non_blocking=True, the step is enqueued to the executor
+        # and a function is returned, which waits for the step and returns
+        # the outputs. Only the test mode, which has no metric to update,
+        # runs without blocking.
         compiled_prog = self._compiled_progs.get(self.mode, None)
         assert (
             compiled_prog
         ), "Model is not ready, please call `model.prepare()` first"
+        assert (
+            not non_blocking or self.mode == 'test'
+        ), "Only the test mode supports `non_blocking` by now."
 
         inputs = to_list(inputs)
         if labels is not None:
@@ -542,15 +549,14 @@ class StaticGraphAdapter:
             feed=feed,
             fetch_list=pruned_fetch_list,
             return_numpy=False,
+            non_blocking=non_blocking,
         )
+        if non_blocking:
+            return lambda: self._restore_fetches(
+                rets.result(), feed, pruned_fetch_idx_name_map
+            )
 
-        # restore pruned fetch_list Variable from feeds
-        for i, name in enumerate(pruned_fetch_idx_name_map):
-            if len(name) > 0:
-                rets.insert(i, feed[name])
-
-        # LoDTensor cannot be fetch as numpy directly
-        rets = [np.array(v) for v in rets]
+        rets = self._restore_fetches(rets, feed, pruned_fetch_idx_name_map)
         if self.mode == 'test':
             return rets[:]
 
@@ -587,6 +593,15 @@ class StaticGraphAdapter:
         else:
             return rets[:num_loss] if num_loss else metrics
 
+    def _restore_fetches(self, rets, feed, pruned_fetch_idx_name_map):
+        # restore pruned fetch_list Variable from feeds
+        for i, name in enumerate(pruned_fetch_idx_name_map):
+            if len(name) > 0:
+                rets.insert(i, feed[name])
+
+        # LoDTensor cannot be fetch as numpy directly
+        return [np.array(v) for v in rets]
+
     def prepare(self):
         modes = ['train', 'eval', 'test']
         for mode in modes:
@@ -1259,7 +1274,7 @@ class Model:
         return loss
 
     @no_grad()
-    def predict_batch(self, inputs):
+    def predict_batch(self, inputs, non_blocking=False):
         """
 
         Run one predicting step on a batch of data.
@@ -1268,10 +1283,16 @@ class Model:
             inputs (numpy.ndarray|Tensor|list): Batch of input data. It could
                 be a numpy array or paddle.Tensor, or a list of arrays or
                 tensors (in case the model has multiple inputs).
+            non_blocking (bool, optional): Whether to return before the step
+                finishes. In static graph mode, the step is enqueued to the
+                executor, and the arrays in `inputs` must not be modified
+                until it finishes. In dynamic graph mode, the step finishes
+                before returning. Default: False.
 
         Returns:
             A list of numpy.ndarray of predictions, that is the outputs
-            of Model forward.
+            of Model forward. If `non_blocking` is True, a function which
+            waits for the step and returns the predictions.
 
         Examples:
 
@@ -1302,10 +1323,12 @@ class Model:
                 #          dtype=float32)]
 
         """
+        if non_blocking and isinstance(self._adapter, StaticGraphAdapter):
+            return self._adapter.predict_batch(inputs, non_blocking=True)
         loss = self._adapter.predict_batch(inputs)
         if fluid._non_static_mode() and self._input_info is None:
             self._update_inputs()
-        return loss
+        return (lambda: loss) if non_blocking else loss
 
     def save(self, path, training=True):
         """
@@ -2255,7 +2278,19 @@ class Model:
         logs={},
     ):
         outputs = []
-        for step, data in enumerate(data_loader):
+        # in static graph mode, the next batch is loaded while the predicting
+        # step runs, unless predict_batch is overridden
+        pipelined = (
+            mode == 'predict'
+            and isinstance(self._adapter, StaticGraphAdapter)
+            and type(self).predict_batch is Model.predict_batch
+        )
+        data_iter = iter(data_loader)
+        end = object()
+        data = next(data_iter, end)
+        step = 0
+        while data is not end:
+            next_data = None
             # data might come from different types of data_loader and have
             # different format, as following:
             # 1. DataLoader in static graph:
@@ -2306,11 +2341,19 @@ class Model:
                     logs[k] = v
             else:
                 if self._inputs is not None:
-                    outs = self.predict_batch(data[: len(self._inputs)])
+                    data = data[: len(self._inputs)]
+                if pipelined:
+                    # the loader may reuse the numpy buffers of the batch
+                    # while loading the next one, so the step runs on a copy
+                    data = [
+                        np.array(d) if isinstance(d, np.ndarray) else d
+                        for d in data
+                    ]
+                    finish = self.predict_batch(data, non_blocking=True)
+                    next_data = next(data_iter, end)
+                    outputs.append(finish())
                 else:
-                    outs = self.predict_batch(data)
-
-                outputs.append(outs)
+                    outputs.append(self.predict_batch(data))
 
             logs['step'] = step
             if (
@@ -2330,6 +2373,8 @@ class Model:
                     self.stop_training = True
                     del self.num_iters
                     break
+            data = next(data_iter, end) if next_data is None else next_data
+            step += 1
         self._reset_metrics()
 
         if mode == 'predict':
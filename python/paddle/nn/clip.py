@@ -227,6 +227,48 @@ def _squared_l2_norm(x):
     return out
 
 
+# gradients with at most this many elements are concatenated, so that their
+# squared norms are computed by a single kernel
+_FUSED_NORM_MAX_NUMEL = 1 << 16
+
+
+def _fused_squared_l2_norms(grads):
+    r"""
+    Return the squared L2 norms of a list of tensors of the same dtype. The
+    small tensors are flattened and reduced together, so the result has one
+    entry per large tensor plus one for all the small tensors.
+    """
+    sum_squares = []
+    small_grads = []
+    for g in grads:
+        if g._numel() <= _FUSED_NORM_MAX_NUMEL:
+            small_grads.append(g.reshape([-1]))
+        else:
+            sum_squares.append(_squared_l2_norm(g))
+    if len(small_grads) == 1:
+        sum_squares.append(_squared_l2_norm(small_grads[0]))
+    elif len(small_grads) > 1:
+        sum_squares.append(_squared_l2_norm(paddle.concat(small_grads)))
+    return sum_squares
+
+
+def _scale_grads_inplace(grads, clip_var):
+    r"""
+    Multiply ``grads`` by ``clip_var`` in place, without reading ``clip_var``
+    on the host. Every value is multiplied, non-finite ones included, so the
+    result is the same on every device.
+    """
+    scales = {}
+    for g in grads:
+        if g.dtype not in scales:
+            scales[g.dtype] = (
+                clip_var.astype(g.dtype)
+                if clip_var.dtype != g.dtype
+                else clip_var
+            )
+        _C_ops.assign_out_(_C_ops.multiply(g, scales[g.dtype]), g)
+
+
 class BaseErrorClipAttr:
     def __str__(self):
         raise NotImplementedError()
@@ -592,6 +634,8 @@ class ClipGradByGlobalNorm(ClipGradBase):
         clip_norm (float): The maximum norm value.
         group_name (str, optional): The group name for this clip. Default value is ``default_group``.
         auto_skip_clip (bool, optional): skip clipping gradient. Default value is ``False``.
+        inplace (bool, optional): Whether to scale the gradients in place in dynamic graph mode, so the clipped
+            gradients are not kept along with the original ones. Default value is ``False``.
 
     Examples:
         .. code-block:: python
@@ -612,13 +656,19 @@ class ClipGradByGlobalNorm(ClipGradBase):
     """
 
     def __init__(
-        self, clip_norm, group_name="default_group", auto_skip_clip=False
+        self,
+        clip_norm,
+        group_name="default_group",
+        auto_skip_clip=False,
+        inplace=False,
     ):
         super().__init__()
         self.clip_norm = float(clip_norm)
         self.group_name = group_name
         assert isinstance(auto_skip_clip, bool)
         self.auto_skip_clip = auto_skip_clip
+        assert isinstance(inplace, bool)
+        self.inplace = inplace
 
     def __str__(self):
         return "Gradient Clip By GlobalNorm, global_norm=%f" % (self.clip_norm)
@@ -626,9 +676,9 @@ class ClipGradByGlobalNorm(ClipGradBase):
     @imperative_base.no_grad()
     def _dygraph_clip(self, params_grads):
         params_and_grads = []
-        sum_square_list = []
-        sum_square_list_fp16 = []
-        sum_square_list_fp32 = []
+        merge_grads_fp16 = []
+        merge_grads_fp32 = []
+        merge_grads_fp64 = []
         for p, g in params_grads:
             if g is None:
                 continue
@@ -644,31 +694,42 @@ class ClipGradByGlobalNorm(ClipGradBase):
                 merge_grad = merge_selected_rows(g)
                 merge_grad = get_tensor_from_selected_rows(merge_grad)
 
-            sum_square = _squared_l2_norm(merge_grad)
             if (
-                sum_square.dtype == core.VarDesc.VarType.FP16
-                or sum_square.dtype == core.VarDesc.VarType.BF16
+                merge_grad.dtype == core.VarDesc.VarType.FP16
+                or merge_grad.dtype == core.VarDesc.VarType.BF16
             ):
-                sum_square_list_fp16.append(sum_square)
-            elif sum_square.dtype == core.VarDesc.VarType.FP32:
-                sum_square_list_fp32.append(sum_square)
+                merge_grads_fp16.append(merge_grad)
+            elif merge_grad.dtype == core.VarDesc.VarType.FP32:
+                merge_grads_fp32.append(merge_grad)
             else:
-                sum_square_list.append(sum_square)
+                merge_grads_fp64.append(merge_grad)
 
         # all parameters have been filterd out
         if (
-            len(sum_square_list)
-            + len(sum_square_list_fp16)
-            + len(sum_square_list_fp32)
+            len(merge_grads_fp64)
+            + len(merge_grads_fp16)
+            + len(merge_grads_fp32)
             == 0
         ):
             return params_grads
 
+        sum_square_list = _fused_squared_l2_norms(merge_grads_fp64)
+        sum_square_list_fp32 = _fused_squared_l2_norms(merge_grads_fp32)
+        sum_square_list_fp16 = []
+        for dtype in (core.VarDesc.VarType.FP16, core.VarDesc.VarType.BF16):
+            sum_square_list_fp16.extend(
+                _fused_squared_l2_norms(
+                    [g for g in merge_grads_fp16 if g.dtype == dtype]
+                )
+            )
+
         sum_dtype = 'float64' if len(sum_square_list) > 0 else "float32"
         global_norm_var = []
         if len(sum_square_list_fp16) > 0:
-            global_norm_var_fp16 = paddle.add_n(sum_square_list_fp16)
-            global_norm_var.append(global_norm_var_fp16.astype(sum_dtype))
+            global_norm_var_fp16 = paddle.add_n(
+                [x.astype(sum_dtype) for x in sum_square_list_fp16]
+            )
+            global_norm_var.append(global_norm_var_fp16)
         if len(sum_square_list_fp32) > 0:
             global_norm_var_fp32 = paddle.add_n(sum_square_list_fp32)
             if sum_dtype == 'float32':
@@ -684,35 +745,35 @@ class ClipGradByGlobalNorm(ClipGradBase):
             shape=[1], dtype=global_norm_var.dtype, fill_value=self.clip_norm
         )
 
-        need_clip = False
-        if not self.auto_skip_clip:  # always apply clip
-            need_clip = True
-            clip_var = paddle.divide(
-                x=max_global_norm,
-                y=paddle.maximum(x=global_norm_var, y=max_global_norm),
-            )
-        elif global_norm_var > max_global_norm:
-            # only when global_norm_var > max_global_norm, grad need clip
-            need_clip = True
-            clip_var = paddle.divide(x=max_global_norm, y=global_norm_var)
+        # The clip ratio is 1 when global_norm_var <= max_global_norm, so
+        # auto_skip_clip is the same computation and the decision whether to
+        # clip stays on device instead of syncing on the comparison.
+        clip_var = paddle.divide(
+            x=max_global_norm,
+            y=paddle.maximum(x=global_norm_var, y=max_global_norm),
+        )
 
+        inplace_grads = []
         for p, g in params_grads:
             if g is None:
                 continue
             if getattr(p, 'need_clip', True) is False:
                 params_and_grads.append((p, g))
                 continue
-            # TODO(wangxi): use inplace elementwise_mul
-            if need_clip:
-                clip_input = (
-                    clip_var.astype(g.dtype)
-                    if clip_var.dtype != g.dtype
-                    else clip_var
-                )
-                new_grad = paddle.multiply(g, clip_input)
-                params_and_grads.append((p, new_grad))
-            else:
+            if self.inplace and in_dygraph_mode() and not g.is_selected_rows():
+                inplace_grads.append(g)
                 params_and_grads.append((p, g))
+                continue
+            clip_input = (
+                clip_var.astype(g.dtype)
+                if clip_var.dtype != g.dtype
+                else clip_var
+            )
+            new_grad = paddle.multiply(g, clip_input)
+            params_and_grads.append((p, new_grad))
+
+        if inplace_grads:
+            _scale_grads_inplace(inplace_grads, clip_var)
 
         return params_and_grads
 
@@ -510,18 +510,28 @@ class BeamSearchDecoder(Decoder):
                 as the input argument `beam_state`.
 
         """
-        self.vocab_size = logits.shape[-1]
-        self.vocab_size_tensor = paddle.full(
-            shape=[1], dtype="int64", fill_value=self.vocab_size
-        )
-        noend_array = [-self.kinf] * self.vocab_size
-        noend_array[self.end_token] = 0
+        # in dynamic graph mode, the constant tensors are reused among steps
+        # to avoid copying them to device on every step
+        mask_key = (logits.shape[-1], paddle.get_default_dtype())
+        if not (
+            _non_static_mode()
+            and getattr(self, "_noend_mask_key", None) == mask_key
+        ):
+            self.vocab_size = logits.shape[-1]
+            self.vocab_size_tensor = paddle.full(
+                shape=[1], dtype="int64", fill_value=self.vocab_size
+            )
+            noend_array = [-self.kinf] * self.vocab_size
+            noend_array[self.end_token] = 0
 
-        self.noend_mask_tensor = paddle.assign(np.array(noend_array, "float32"))
-        if paddle.get_default_dtype() == "float64":
-            self.noend_mask_tensor = paddle.cast(
-                self.noend_mask_tensor, "float64"
+            self.noend_mask_tensor = paddle.assign(
+                np.array(noend_array, "float32")
             )
+            if paddle.get_default_dtype() == "float64":
+                self.noend_mask_tensor = paddle.cast(
+                    self.noend_mask_tensor, "float64"
+                )
+            self._noend_mask_key = mask_key if _non_static_mode() else None
 
         step_log_probs = paddle.log(paddle.nn.functional.softmax(logits))
         step_log_probs = self._mask_probs(step_log_probs, beam_state.finished)
@@ -676,6 +686,7 @@ def _dynamic_decode_imperative(
     impute_finished=False,
     is_test=False,
     return_length=False,
+    check_finished_steps=1,
     **kwargs
 ):
     def _maybe_copy(state, new_state, step_mask):
@@ -706,10 +717,15 @@ def _dynamic_decode_imperative(
     cond = paddle.logical_not((paddle.all(initial_finished)))
     sequence_lengths = paddle.cast(paddle.zeros_like(initial_finished), "int64")
     outputs = None
+    preallocate = False
+    check_finished_steps = max(int(check_finished_steps), 1)
+    # (states, sequence_lengths, all_finished) of the steps not checked yet
+    unchecked_steps = []
+    num_steps = None if cond.numpy() else 0
 
     step_idx = 0
     step_idx_tensor = paddle.full(shape=[1], fill_value=step_idx, dtype="int64")
-    while cond.numpy():
+    while num_steps is None:
         (step_outputs, next_states, next_inputs, next_finished) = decoder.step(
             step_idx_tensor, inputs, states, **kwargs
         )
@@ -742,13 +758,49 @@ def _dynamic_decode_imperative(
                 next_states, "lengths", sequence_lengths
             )
 
-        outputs = (
-            map_structure(lambda x: ArrayWrapper(x), step_outputs)
-            if step_idx == 0
-            else map_structure(
-                lambda x, x_array: x_array.append(x), step_outputs, outputs
+        if step_idx == 0:
+            # the step outputs are written into buffers preallocated for all
+            # steps if the number of steps is bounded and no grad is needed
+            preallocate = max_step_num is not None and all(
+                x.stop_gradient for x in flatten(step_outputs)
+            )
+        if preallocate:
+            # the buffers start with a few steps and are doubled when full, up
+            # to the max_step_num + 1 steps, as most decoding stops early
+            if step_idx == 0:
+                outputs = map_structure(
+                    lambda x: paddle.empty(
+                        [min(max_step_num + 1, 32)] + x.shape, dtype=x.dtype
+                    ),
+                    step_outputs,
+                )
+            elif step_idx == flatten(outputs)[0].shape[0]:
+                capacity = min(2 * step_idx, max_step_num + 1)
+                outputs = map_structure(
+                    lambda buffer: paddle.concat(
+                        [
+                            buffer,
+                            paddle.empty(
+                                [capacity - step_idx] + buffer.shape[1:],
+                                dtype=buffer.dtype,
+                            ),
+                        ]
+                    ),
+                    outputs,
+                )
+            map_structure(
+                lambda x, buffer: buffer.__setitem__(step_idx, x),
+                step_outputs,
+                outputs,
+            )
+        else:
+            outputs = (
+                map_structure(lambda x: ArrayWrapper(x), step_outputs)
+                if step_idx == 0
+                else map_structure(
+                    lambda x, x_array: x_array.append(x), step_outputs, outputs
+                )
             )
-        )
         inputs, states, finished, sequence_lengths = (
             next_inputs,
             next_states,
@@ -759,13 +811,29 @@ def _dynamic_decode_imperative(
         step_idx_tensor = paddle.increment(x=step_idx_tensor, value=1.0)
         step_idx += 1
 
-        cond = paddle.logical_not(paddle.all(finished))
-        if max_step_num is not None and step_idx > max_step_num:
-            break
-
-    final_outputs = map_structure(
-        lambda x: paddle.stack(x.array, axis=0), outputs
-    )
+        # keep the references of the states instead of syncing on every
+        # step, the steps after all entries are finished are dropped
+        unchecked_steps.append((states, sequence_lengths, paddle.all(finished)))
+        reach_max_step = max_step_num is not None and step_idx > max_step_num
+        if reach_max_step or step_idx % check_finished_steps == 0:
+            all_finished = paddle.stack(
+                [step[2] for step in unchecked_steps]
+            ).numpy()
+            if all_finished.any():
+                first = int(np.argmax(all_finished))
+                states, sequence_lengths = unchecked_steps[first][:2]
+                num_steps = step_idx - len(unchecked_steps) + first + 1
+            elif reach_max_step:
+                num_steps = step_idx
+            unchecked_steps = []
+
+    if preallocate:
+        # slicing copies the used steps, the buffers are released on return
+        final_outputs = map_structure(lambda x: x[:num_steps], outputs)
+    else:
+        final_outputs = map_structure(
+            lambda x: paddle.stack(x.array[:num_steps], axis=0), outputs
+        )
     final_states = states
 
     try:
@@ -798,6 +866,7 @@ def _dynamic_decode_declarative(
     impute_finished=False,
     is_test=False,
     return_length=False,
+    check_finished_steps=1,
     **kwargs
 ):
     initial_inputs, initial_states, initial_finished = decoder.initialize(inits)
@@ -990,6 +1059,7 @@ def dynamic_decode(
     impute_finished=False,
     is_test=False,
     return_length=False,
+    check_finished_steps=1,
     **kwargs
 ):
     r"""
@@ -1026,6 +1096,16 @@ def dynamic_decode(
         return_length(bool, optional):  A flag indicating whether to return an
             extra Tensor variable in the output tuple, which stores the actual
             lengths of all decoded sequences. Default `False`.
+        check_finished_steps(int, optional): In dynamic graph mode, check
+            whether all the entries are finished every `check_finished_steps`
+            decoding steps instead of every step, which syncs the device with
+            the host once per check. The steps decoded after all the entries
+            are finished are dropped from the results, thus the results are
+            the same as checking every step. If :attr:`max_step_num` is provided
+            and the step outputs need no gradient, they are written into
+            preallocated buffers, which grow with the decoded steps. In static graph mode, including `paddle.jit.to_static`, the
+            decoding loop is a `while` op and this argument is ignored.
+            Default `1`.
         **kwargs: Additional keyword arguments. Arguments passed to `decoder.step`.
 
     Returns:
@@ -1071,6 +1151,7 @@ def dynamic_decode(
             impute_finished,
             is_test,
             return_length,
+            check_finished_steps,
             **kwargs
         )
     else:
@@ -1082,5 +1163,6 @@ def dynamic_decode(
             impute_finished,
             is_test,
             return_length,
+            check_finished_steps,
             **kwargs
         )
@@ -31,6 +31,8 @@ class ConstantInitializer(Initializer):
 
     """
 
+    _elementwise = True
+
     def __init__(self, value=0.0, force_cpu=False):
         assert value is not None
         super().__init__()
@@ -32,6 +32,11 @@ class Initializer:
     directly, but need to use one of its implementations.
     """
 
+    # Whether the elements are drawn independently and only depend on the
+    # shape through the fans, then a shard of a lazy parameter can be
+    # initialized without the rest of the parameter.
+    _elementwise = False
+
     def __init__(self):
         pass
 
@@ -62,9 +67,36 @@ class Initializer:
         param._init_op_creator = functools.partial(
             init_op_creator, self.forward, param
         )
+        param._init_shard_func = functools.partial(
+            self._init_shard, param, block
+        )
 
         return param
 
+    def _init_shard(self, param, block, shard):
+        """
+        Initialize the part ``shard`` of the lazy parameter ``param``, see
+        ``paddle.fluid.lazy_init.Shard``, and return it without the padding.
+        """
+        from ...fluid.framework import EagerParamBase
+
+        if not self._elementwise:
+            # the values depend on the whole parameter
+            self.forward(param, block)
+            out = shard.slice(param)
+            param._clear_data()
+            return out
+
+        out = EagerParamBase(
+            shape=shard.valid_shape(param.shape),
+            dtype=param.dtype,
+            name=param.name + "@shard",
+        )
+        # the fans are computed from the whole parameter
+        out._fan_shape = param.shape
+        self.forward(out, block)
+        return out.detach()
+
     def _check_block(self, block):
         if block is None:
             block = default_main_program().global_block()
@@ -86,7 +118,7 @@ class Initializer:
         Returns:
             tuple of two integers (fan_in, fan_out)
         """
-        shape = var.shape
+        shape = getattr(var, "_fan_shape", var.shape)
         if not shape or len(shape) == 0:
             fan_in = fan_out = 1
         elif len(shape) == 1:
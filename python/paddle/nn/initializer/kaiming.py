@@ -57,6 +57,8 @@ class MSRAInitializer(Initializer):
 
     """
 
+    _elementwise = True
+
     def __init__(
         self,
         uniform=True,
@@ -32,6 +32,8 @@ class NormalInitializer(Initializer):
 
     """
 
+    _elementwise = True
+
     def __init__(self, loc=0.0, scale=1.0, seed=0):
         assert loc is not None
         assert scale is not None
@@ -148,6 +150,8 @@ class TruncatedNormalInitializer(Initializer):
 
     """
 
+    _elementwise = True
+
     def __init__(self, loc=0.0, scale=1.0, seed=0):
         assert loc is not None
         assert scale is not None
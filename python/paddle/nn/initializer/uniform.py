@@ -51,6 +51,8 @@ class UniformInitializer(Initializer):
         if diag_num > 0 or diag_step > 0:
             assert diag_num > 0 and diag_step > 0
         super().__init__()
+        # the diagonal depends on the position in the whole parameter
+        self._elementwise = diag_num == 0
         self._low = low
         self._high = high
         self._seed = seed
@@ -60,6 +60,8 @@ class XavierInitializer(Initializer):
 
     """
 
+    _elementwise = True
+
     def __init__(self, uniform=True, fan_in=None, fan_out=None, seed=0):
         assert uniform is not None
         assert seed is not None
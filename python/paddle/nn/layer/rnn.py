@@ -149,6 +149,74 @@ def _transpose_batch_time(x):
     return paddle.transpose(x, perm)
 
 
+_use_fused_time_loop = True
+
+
+def _set_fused_time_loop(enable):
+    """Enable or disable the fused time loop of the builtin cells in dygraph mode."""
+    global _use_fused_time_loop
+    _use_fused_time_loop = enable
+
+
+def _can_fuse_time_loop(cell, inputs, kwargs):
+    # subclasses may override forward, so only the exact builtin cells are
+    # fused, and the fused loop does not call the cell, so hooks such as
+    # weight_norm would not run on it
+    return (
+        _use_fused_time_loop
+        and type(cell) in (SimpleRNNCell, LSTMCell, GRUCell)
+        and not cell._forward_pre_hooks
+        and not cell._forward_post_hooks
+        and isinstance(inputs, (Variable, core.eager.Tensor))
+        and not kwargs
+    )
+
+
+def _fused_time_loop(cell, inputs, states, mask, time_step_index):
+    """
+    Run a builtin cell over time major `inputs`. The input projection of all
+    time steps is one matmul, and only the recurrent part runs in the loop.
+    If no gradient is needed, the step outputs are written into a
+    preallocated output tensor instead of being stacked.
+    """
+    time_steps = inputs.shape[0]
+    step_input_gates = paddle.unbind(cell._input_projection(inputs), axis=0)
+    step_masks = paddle.unbind(mask, axis=0) if mask is not None else None
+    preallocate = not framework._dygraph_tracer()._has_grad or (
+        inputs.stop_gradient
+        and all(x.stop_gradient for x in flatten(states))
+        and all(p.stop_gradient for p in cell.parameters())
+    )
+
+    outputs = []
+    for i in range(time_steps):
+        step_outputs, new_states = cell._recurrent_step(
+            step_input_gates[i], states
+        )
+        if step_masks is not None:
+            new_states = map_structure(
+                partial(_maybe_copy, step_mask=step_masks[i]),
+                states,
+                new_states,
+            )
+        states = new_states
+        if not preallocate:
+            outputs.append(step_outputs)
+            continue
+        if i == 0:
+            shape = list(step_outputs.shape)
+            shape.insert(time_step_index, time_steps)
+            outputs = paddle.empty(shape, dtype=step_outputs.dtype)
+        if time_step_index == 0:
+            outputs[i] = step_outputs
+        else:
+            outputs[:, i] = step_outputs
+
+    if not preallocate:
+        outputs = paddle.stack(outputs, axis=time_step_index)
+    return outputs, states
+
+
 def _rnn_dynamic_graph(
     cell,
     inputs,
@@ -185,6 +253,18 @@ def _rnn_dynamic_graph(
         )
 
     states = initial_states
+    if _can_fuse_time_loop(cell, inputs, kwargs):
+        final_outputs, final_states = _fused_time_loop(
+            cell,
+            inputs,
+            states,
+            mask if sequence_length is not None else None,
+            time_step_index,
+        )
+        if is_reverse:
+            final_outputs = paddle.reverse(final_outputs, axis=time_step_index)
+        return final_outputs, final_states
+
     outputs = []
     for i in range(time_steps):
         step_inputs = map_structure(lambda x: x[i], inputs)
@@ -784,10 +864,16 @@ class SimpleRNNCell(RNNCellBase):
     def forward(self, inputs, states=None):
         if states is None:
             states = self.get_initial_states(inputs, self.state_shape)
-        pre_h = states
+        return self._recurrent_step(self._input_projection(inputs), states)
+
+    def _input_projection(self, inputs):
         i2h = paddle.matmul(inputs, self.weight_ih, transpose_y=True)
         if self.bias_ih is not None:
             i2h += self.bias_ih
+        return i2h
+
+    def _recurrent_step(self, i2h, states):
+        pre_h = states
         h2h = paddle.matmul(pre_h, self.weight_hh, transpose_y=True)
         if self.bias_hh is not None:
             h2h += self.bias_hh
@@ -938,11 +1024,19 @@ class LSTMCell(RNNCellBase):
     def forward(self, inputs, states=None):
         if states is None:
             states = self.get_initial_states(inputs, self.state_shape)
-        pre_hidden, pre_cell = states
+        return self._recurrent_step(self._input_projection(inputs), states)
+
+    def _input_projection(self, inputs):
         gates = paddle.matmul(inputs, self.weight_ih, transpose_y=True)
         if self.bias_ih is not None:
             gates = gates + self.bias_ih
-        gates += paddle.matmul(pre_hidden, self.weight_hh, transpose_y=True)
+        return gates
+
+    def _recurrent_step(self, gates, states):
+        pre_hidden, pre_cell = states
+        gates = gates + paddle.matmul(
+            pre_hidden, self.weight_hh, transpose_y=True
+        )
         if self.bias_hh is not None:
             gates = gates + self.bias_hh
 
@@ -1098,10 +1192,16 @@ class GRUCell(RNNCellBase):
         if states is None:
             states = self.get_initial_states(inputs, self.state_shape)
 
-        pre_hidden = states
+        return self._recurrent_step(self._input_projection(inputs), states)
+
+    def _input_projection(self, inputs):
         x_gates = paddle.matmul(inputs, self.weight_ih, transpose_y=True)
         if self.bias_ih is not None:
             x_gates = x_gates + self.bias_ih
+        return x_gates
+
+    def _recurrent_step(self, x_gates, states):
+        pre_hidden = states
         h_gates = paddle.matmul(pre_hidden, self.weight_hh, transpose_y=True)
         if self.bias_hh is not None:
             h_gates = h_gates + self.bias_hh
@@ -155,6 +155,15 @@ class MultiHeadAttention(Layer):
     Cache = collections.namedtuple("Cache", ["k", "v"])
     StaticCache = collections.namedtuple("StaticCache", ["k", "v"])
 
+    class PreallocatedCache(
+        collections.namedtuple("PreallocatedCache", ["k", "v", "lengths"])
+    ):
+        # the number of positions written in the buffers, which is tracked
+        # on the host in dynamic graph mode so the writes are checked without
+        # reading `lengths` back from the device. None if it is unknown, such
+        # as after the fields are replaced.
+        _end = None
+
     def __init__(
         self,
         embed_dim,
@@ -254,9 +263,84 @@ class MultiHeadAttention(Layer):
             k = tensor.concat([cache.k, k], axis=2)
             v = tensor.concat([cache.v, v], axis=2)
             cache = self.Cache(k, v)
+        elif isinstance(cache, self.PreallocatedCache):
+            # for decoder self-attention in inference, write the current
+            # positions into the buffers instead of reallocating them
+            cache = self._update_preallocated_cache(cache, k, v)
+            k, v = cache.k, cache.v
 
         return (q, k, v) if cache is None else (q, k, v, cache)
 
+    def _update_preallocated_cache(self, cache, k, v):
+        seq_len = k.shape[2] if paddle.in_dynamic_mode() else paddle.shape(k)[2]
+        # put_along_axis does not check the indices, so the positions beyond
+        # the buffers have to be rejected before writing them
+        max_length = cache.k.shape[2]
+        if paddle.in_dynamic_mode():
+            end = cache._end
+            if end is None:
+                end = paddle.max(cache.lengths).item()
+            if end + seq_len > max_length:
+                raise ValueError(
+                    "The positions to write exceed max_length ({}) of "
+                    "PreallocatedCache, please generate the cache with a "
+                    "larger max_length.".format(max_length)
+                )
+        else:
+            overflow = paddle.max(cache.lengths) + seq_len > max_length
+            paddle.static.nn.control_flow.Assert(
+                paddle.logical_not(overflow), [cache.lengths]
+            )
+        positions = cache.lengths.unsqueeze(1) + paddle.arange(
+            seq_len, dtype=cache.lengths.dtype
+        )
+        # [batch_size, 1, seq_len, 1], broadcasted to the shape of `k`
+        index = positions.unsqueeze([1, 3])
+        if paddle.in_dynamic_mode():
+            k = tensor.put_along_axis_(cache.k, index, k, axis=2)
+            v = tensor.put_along_axis_(cache.v, index, v, axis=2)
+        else:
+            k = tensor.put_along_axis(cache.k, index, k, axis=2)
+            v = tensor.put_along_axis(cache.v, index, v, axis=2)
+        cache = self.PreallocatedCache(k, v, cache.lengths + seq_len)
+        if paddle.in_dynamic_mode():
+            cache._end = end + seq_len
+        return cache
+
+    def _preallocated_cache_mask(self, cache, q, dtype):
+        # every query attends to the cached positions up to its own position,
+        # the positions not written yet are masked out
+        query_length = (
+            q.shape[2] if paddle.in_dynamic_mode() else paddle.shape(q)[2]
+        )
+        lengths = cache.lengths
+        key_positions = paddle.arange(cache.k.shape[2], dtype=lengths.dtype)
+        query_positions = (
+            lengths.unsqueeze(1)
+            - query_length
+            + paddle.arange(query_length, dtype=lengths.dtype)
+        )
+        mask = key_positions.unsqueeze([0, 1]) <= query_positions.unsqueeze(2)
+        return _convert_attention_mask(mask.unsqueeze(1), dtype)
+
+    def reorder_cache(self, cache, index):
+        """
+        Selects the batch entries of `cache` by `index`, which is mostly used
+        to reorder the beams in beam search.
+
+        Parameters:
+            cache (MultiHeadAttention.Cache|MultiHeadAttention.StaticCache|MultiHeadAttention.PreallocatedCache):
+                The cache to reorder.
+            index (Tensor): A 1-D int32 or int64 tensor, the indices of the
+                batch entries to select.
+
+        Returns:
+            namedtuple: an instance of the same type as `cache`.
+        """
+        return type(cache)(
+            *[tensor.index_select(x, index, axis=0) for x in cache]
+        )
+
     def compute_kv(self, key, value):
         r"""
         Applies linear projection on input keys and values, then splits heads
@@ -289,11 +373,12 @@ class MultiHeadAttention(Layer):
         v = tensor.transpose(x=v, perm=[0, 2, 1, 3])
         return k, v
 
-    def gen_cache(self, key, value=None, type=Cache):
+    def gen_cache(self, key, value=None, type=Cache, max_length=None):
         """
         Generates cache for `forward` usage in inference accroding to arguments.
-        The generated cache is an instance of `MultiHeadAttention.Cache` or an
-        instance of `MultiHeadAttention.StaticCache`.
+        The generated cache is an instance of `MultiHeadAttention.Cache`, an
+        instance of `MultiHeadAttention.StaticCache` or an instance of
+        `MultiHeadAttention.PreallocatedCache`.
 
         `Cache` or `StaticCache` is namedtuple with `k` and `v` as fields,
         and it stores tensors shaped `[batch_size, num_heads, length, embed_dim]`
@@ -310,6 +395,18 @@ class MultiHeadAttention(Layer):
         and the tensors keep unchanged among decoding steps, which are mostly used
         for decoder-encoder cross attention.
 
+        If the generated cache is an instance of `PreallocatedCache`, `k` and `v`
+        fields are buffers shaped `[batch_size, num_heads, max_length, embed_dim // num_heads]`
+        and `lengths` field is an int64 tensor shaped `[batch_size]` holding
+        the number of positions written for every batch entry. `forward` writes
+        the results of the current positions into the buffers in place at
+        `lengths`, instead of concatenating them to new tensors, and masks out
+        the positions not written yet. Sequences of different lengths can be
+        held by replacing `lengths`, such as `cache._replace(lengths=seq_lens)`.
+        Writing positions beyond `max_length` raises an error.
+        All fields are batch major, thus the cache can be tiled and reordered
+        like other states, for example by `nn.BeamSearchDecoder`.
+
         The cache is generated as follows:
 
         1. If `type` is `StaticCache`, apply `compute_kv(key, value)` and use the
@@ -323,6 +420,11 @@ class MultiHeadAttention(Layer):
         3. If `type` is `Cache` and `value` is not None, use `key`, `value` to create
         an instance of `Cache`.
 
+        4. If `type` is `PreallocatedCache`, generate zero buffers for `max_length`
+        positions, where `batch_size` is from the first dimension of `key`. If
+        `value` is not None, `key` and `value` are written into the first
+        positions of the buffers.
+
         Parameters:
             key (Tensor): The keys for multi-head attention. It is
                 a tensor with shape `[batch_size, key_length, kdim]`. The
@@ -332,15 +434,42 @@ class MultiHeadAttention(Layer):
                 is a tensor with shape `[batch_size, value_length, vdim]`.
                 The data type should be float32 or float64. If None, `key` is only
                 for batch size reference. Default None.
-            type (type): It should be `MultiHeadAttention.StaticCache` or
-                `MultiHeadAttention.Cache` to indicate the cache type to generate.
+            type (type): It should be `MultiHeadAttention.StaticCache`,
+                `MultiHeadAttention.Cache` or `MultiHeadAttention.PreallocatedCache`
+                to indicate the cache type to generate.
+            max_length (int, optional): The number of positions of the buffers
+                of `PreallocatedCache`. It is required when `type` is
+                `PreallocatedCache`. Default None.
 
         Returns:
-            namedtuple: an instance of `Cache` or `StaticCache` accordingly.
+            namedtuple: an instance of `Cache`, `StaticCache` or `PreallocatedCache` accordingly.
         """
         if type == MultiHeadAttention.StaticCache:  # static_kv
             k, v = self.compute_kv(key, value)
             return self.StaticCache(k, v)
+        elif type == MultiHeadAttention.PreallocatedCache:
+            if max_length is None:
+                raise ValueError(
+                    "max_length should be provided to generate PreallocatedCache."
+                )
+            k, v = [
+                layers.fill_constant_batch_size_like(
+                    input=key,
+                    shape=[-1, self.num_heads, max_length, self.head_dim],
+                    dtype=key.dtype,
+                    value=0,
+                )
+                for _ in range(2)
+            ]
+            lengths = layers.fill_constant_batch_size_like(
+                input=key, shape=[-1], dtype="int64", value=0
+            )
+            cache = self.PreallocatedCache(k, v, lengths)
+            if paddle.in_dynamic_mode():
+                cache._end = 0
+            if value is not None:
+                cache = self._update_preallocated_cache(cache, key, value)
+            return cache
         elif value is None:  # incremental_state
             k = layers.fill_constant_batch_size_like(
                 input=key,
@@ -396,6 +525,10 @@ class MultiHeadAttention(Layer):
                 `StaticCache`, `key` and `value` args would be ignored, `k` and
                 `v` fields would be used as calculated results on `key` and
                 `value`, which mostly used for decoder-encoder cross attention.
+                If it is an instance of `PreallocatedCache`, the results of
+                current query are written into the buffers of `k` and `v` in
+                place, and `attn_mask` should be broadcasted to
+                `[batch_size, n_head, query_length, max_length]` if provided.
                 It is only used for inference and should be None for training.
                 Default None.
 
@@ -409,7 +542,9 @@ class MultiHeadAttention(Layer):
                 having the same type as `cache`, and if it is `StaticCache`, it \
                 is same as the input `cache`, if it is `Cache`, the new cache \
                 reserves tensors concatanating raw tensors with intermediate \
-                results of current query.
+                results of current query, if it is `PreallocatedCache`, the new \
+                cache shares the buffers with the input `cache` and has updated \
+                `lengths`.
         """
         key = query if key is None else key
         value = query if value is None else value
@@ -427,6 +562,10 @@ class MultiHeadAttention(Layer):
             # Support bool or int mask
             attn_mask = _convert_attention_mask(attn_mask, product.dtype)
             product = product + attn_mask
+        if isinstance(cache, self.PreallocatedCache):
+            product = product + self._preallocated_cache_mask(
+                cache, q, product.dtype
+            )
         weights = F.softmax(product)
         if self.dropout:
             weights = F.dropout(
@@ -993,7 +1132,7 @@ class TransformerDecoderLayer(Layer):
             tgt if cache is None else (tgt, (incremental_cache, static_cache))
         )
 
-    def gen_cache(self, memory):
+    def gen_cache(self, memory, max_length=None):
         r"""
         Generates cache for `forward` usage. The generated cache is a tuple
         composed of an instance of `MultiHeadAttention.Cache` and an instance
@@ -1003,6 +1142,10 @@ class TransformerDecoderLayer(Layer):
             memory (Tensor): The output of Transformer encoder. It is a tensor
                 with shape `[batch_size, source_length, d_model]`. The data type
                 should be float32 or float64.
+            max_length (int, optional): If provided, `incremental_cache` is an
+                instance of `MultiHeadAttention.PreallocatedCache` with buffers
+                for `max_length` target positions, which are updated in place
+                among decoding steps. Default None.
 
         Returns:
             tuple: It is a tuple( :code:`(incremental_cache, static_cache)` ). \
@@ -1015,9 +1158,16 @@ class TransformerDecoderLayer(Layer):
                 See `MultiHeadAttention.gen_cache` and `MultiHeadAttention.forward` \
                 for more details.
         """
-        incremental_cache = self.self_attn.gen_cache(
-            memory, type=self.self_attn.Cache
-        )
+        if max_length is None:
+            incremental_cache = self.self_attn.gen_cache(
+                memory, type=self.self_attn.Cache
+            )
+        else:
+            incremental_cache = self.self_attn.gen_cache(
+                memory,
+                type=self.self_attn.PreallocatedCache,
+                max_length=max_length,
+            )
         static_cache = self.cross_attn.gen_cache(
             memory, memory, type=self.cross_attn.StaticCache
         )
@@ -1150,7 +1300,7 @@ class TransformerDecoder(Layer):
 
         return output if cache is None else (output, new_caches)
 
-    def gen_cache(self, memory, do_zip=False):
+    def gen_cache(self, memory, do_zip=False, max_length=None):
         r"""
         Generates cache for `forward` usage. The generated cache is a list, and
         each element in it is a tuple( :code:`(incremental_cache, static_cache)` )
@@ -1165,6 +1315,10 @@ class TransformerDecoder(Layer):
                 should be float32 or float64.
             do_zip (bool, optional): Indicate whether to apply `zip` on the tuples.
                 If True, return a list with two elements. Default False
+            max_length (int, optional): If provided, the incremental caches are
+                instances of `MultiHeadAttention.PreallocatedCache` with buffers
+                for `max_length` target positions. See `TransformerDecoderLayer.gen_cache`
+                for more details. Default None.
 
         Returns:
             list: It is a list, and each element in the list is a tuple produced \
@@ -1172,7 +1326,10 @@ class TransformerDecoder(Layer):
                 for more details. If `do_zip` is True, apply `zip` on these tuples \
                 and return a list with two elements.
         """
-        cache = [layer.gen_cache(memory) for layer in self.layers]
+        cache = [
+            layer.gen_cache(memory, max_length=max_length)
+            for layer in self.layers
+        ]
         if do_zip:
             cache = list(zip(*cache))
         return cache
@@ -14,6 +14,8 @@
 
 import paddle
 
+from .flat_parameters import _scale_flat_grads, _split_flat_params
+
 __all__ = ['clip_grad_norm_']
 
 
@@ -68,7 +70,11 @@ def clip_grad_norm_(
     if norm_type not in support_norm_type:
         raise ValueError(f'norm_type only support {support_norm_type}')
 
-    grads = [p.grad for p in parameters if p.grad is not None]
+    # the flat buffers of paddle.nn.utils.flatten_parameters are handled as
+    # one gradient each
+    flats, parameters = _split_flat_params(parameters)
+    grads = [flat.grad_buffer for flat in flats]
+    grads += [p.grad for p in parameters if p.grad is not None]
     max_norm = float(max_norm)
     norm_type = float(norm_type)
     if len(grads) == 0:
@@ -99,6 +105,7 @@ def clip_grad_norm_(
     # Note: when the coef is clamped to 1, it is redundant to multiply the clamped coef, but this
     # avoids the `if clip_coef < 1:` condition.
     clip_coef_clamped = paddle.clip(clip_coef, max=1.0)
+    _scale_flat_grads(flats, clip_coef_clamped)
     with paddle.no_grad():
         for _, p in enumerate(parameters):
             g = p.grad
@@ -0,0 +1,217 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import paddle
+from paddle.fluid.framework import dygraph_only
+
+from ..clip import _scale_grads_inplace
+
+__all__ = []
+
+
+class FlatParameterBuffer:
+    """
+    One contiguous buffer holding the parameters of the same dtype and place,
+    and one holding their gradients. The parameters and gradients are views
+    of the buffers, in the order of ``params`` and without alignment padding,
+    which is also the layout of ``coalesce_tensor`` with use_align=False.
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.names = tuple(p.name for p in params)
+        with paddle.no_grad():
+            self.buffer = paddle.concat([paddle.flatten(p) for p in params])
+            self.grad_buffer = paddle.concat(
+                [
+                    paddle.flatten(p._grad_ivar())
+                    if p._grad_ivar() is not None
+                    else paddle.zeros([int(p._numel())], dtype=p.dtype)
+                    for p in params
+                ]
+            )
+            offset = 0
+            for p in params:
+                shape = p.shape
+                end = offset + int(p._numel())
+                param_view = self.buffer._slice(offset, end)
+                param_view._share_buffer_to(p)
+                p.get_tensor()._set_dims(shape)
+                grad_view = self.grad_buffer._slice(offset, end)
+                grad_view.get_tensor()._set_dims(shape)
+                p._copy_gradient_from(grad_view)
+                p._flat_param_buffer = self
+                offset = end
+
+    def is_valid(self):
+        """
+        Whether every parameter and gradient is still a view of the buffers.
+        Replacing them, e.g. by ``clear_gradient(False)``, breaks the views.
+        """
+        for p in self.params:
+            grad = p._grad_ivar()
+            if (
+                grad is None
+                or not p._is_shared_buffer_with(self.buffer)
+                or not grad._is_shared_buffer_with(self.grad_buffer)
+            ):
+                return False
+        return True
+
+    @paddle.no_grad()
+    def zero_grad(self):
+        self.grad_buffer.zero_()
+
+
+def _split_flat_params(params):
+    """
+    Split ``params`` into the flat buffers all of whose parameters are in
+    ``params`` and still views of it, and the remaining parameters, which
+    have to be handled one by one.
+    """
+    groups = {}
+    rest = []
+    for p in params:
+        flat = getattr(p, '_flat_param_buffer', None)
+        if flat is None:
+            rest.append(p)
+        else:
+            groups.setdefault(id(flat), (flat, []))[1].append(p)
+    flats = []
+    for flat, flat_params in groups.values():
+        if len(flat_params) == len(flat.params) and flat.is_valid():
+            flats.append(flat)
+        else:
+            rest.extend(flat_params)
+    return flats, rest
+
+
+@paddle.no_grad()
+def _scale_flat_grads(flats, scale):
+    _scale_grads_inplace([f.grad_buffer for f in flats], scale)
+
+
+class FlatParameters:
+    """
+    The flat buffers of the parameters of a Layer, returned by
+    ``paddle.nn.utils.flatten_parameters``.
+
+    Zeroing, computing the norm of and clipping the gradients takes one
+    kernel per buffer. ``Layer.clear_gradients``, ``Optimizer.clear_grad``
+    and ``paddle.nn.utils.clip_grad_norm_`` use the buffers automatically,
+    and the optimizers created with ``use_multi_tensor=True`` update a
+    buffer by one kernel when the parameters of a bucket are exactly the
+    parameters of the buffer.
+    """
+
+    def __init__(self, buffers):
+        self.buffers = buffers
+
+    @property
+    def parameters(self):
+        return [p for flat in self.buffers for p in flat.params]
+
+    def zero_grad(self):
+        """Set the gradients of all flattened parameters to zero."""
+        for flat in self.buffers:
+            flat.zero_grad()
+
+    @paddle.no_grad()
+    def grad_norm(self, norm_type=2.0):
+        """
+        Get the norm of the gradients of all flattened parameters, treated
+        as a single vector.
+
+        Args:
+            norm_type (float, optional): type of the p-norm, `inf` for the
+                infinity norm. Default: 2.0.
+
+        Returns:
+            Tensor, a float32 Tensor of shape [1].
+        """
+        norm_type = float(norm_type)
+        norms = [
+            paddle.linalg.norm(flat.grad_buffer, norm_type).astype('float32')
+            for flat in self.buffers
+        ]
+        if len(norms) == 1:
+            return norms[0]
+        if norm_type == float("inf"):
+            return paddle.max(paddle.stack(norms))
+        return paddle.linalg.norm(paddle.stack(norms), norm_type)
+
+    @paddle.no_grad()
+    def clip_grad_norm_(self, max_norm, norm_type=2.0):
+        """
+        Clip the gradients of all flattened parameters by their total norm
+        in place, see ``paddle.nn.utils.clip_grad_norm_``.
+
+        Returns:
+            Tensor, the total norm of the gradients before clipping.
+        """
+        total_norm = self.grad_norm(norm_type)
+        clip_coef = paddle.clip(float(max_norm) / (total_norm + 1e-6), max=1.0)
+        _scale_flat_grads(self.buffers, clip_coef)
+        return total_norm
+
+
+@dygraph_only
+def flatten_parameters(layer):
+    """
+    Place the trainable parameters of ``layer`` and their gradients into
+    contiguous flat buffers, one per dtype and place. The parameters and
+    gradients become views of the buffers, so ``layer.state_dict()`` still
+    returns one Tensor per parameter, but zeroing, clipping and updating
+    the gradients can be done by one kernel per buffer.
+
+    The gradients of the flattened parameters are created as zeros, and
+    they are always zeroed instead of released, since releasing them would
+    break the views. Parameters with ``stop_gradient=True`` are not
+    flattened.
+
+    Args:
+        layer(paddle.nn.Layer): the layer whose parameters are flattened.
+
+    Returns:
+        FlatParameters, the flat buffers with the methods ``zero_grad``,
+        ``grad_norm`` and ``clip_grad_norm_``.
+
+    Examples:
+       .. code-block:: python
+
+            import paddle
+
+            model = paddle.nn.Sequential(
+                paddle.nn.Linear(10, 10), paddle.nn.Linear(10, 1)
+            )
+            flat = paddle.nn.utils.flatten_parameters(model)
+            sgd = paddle.optimizer.SGD(
+                0.1, parameters=model.parameters(), use_multi_tensor=True
+            )
+            loss = model(paddle.rand([4, 10])).mean()
+            loss.backward()
+            flat.clip_grad_norm_(1.0)
+            sgd.step()
+            flat.zero_grad()
+    """
+    groups = {}
+    for p in layer.parameters():
+        if p.stop_gradient:
+            continue
+        if getattr(p, '_flat_param_buffer', None) is not None:
+            raise ValueError(
+                "The parameter {} has been flattened already.".format(p.name)
+            )
+        groups.setdefault((p.dtype, str(p.place)), []).append(p)
+    return FlatParameters([FlatParameterBuffer(ps) for ps in groups.values()])
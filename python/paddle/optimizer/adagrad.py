@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from paddle import _C_ops
+
 from ..fluid import framework
 from .optimizer import Optimizer
 
@@ -65,6 +67,9 @@ class Adagrad(Optimizer):
             The default value is None.
         initial_accumulator_value (float, optional): Initial value for moment accumulator.
             The default value is 0.0.
+        use_multi_tensor (bool, optional): Whether to update the parameters sharing the dtype, place and
+            learning rate by one kernel call on their contiguous buffers in dygraph mode, the parameters,
+            gradients and accumulators become views of the buffers. Default is false.
 
     Examples:
         .. code-block:: python
@@ -104,6 +109,7 @@ class Adagrad(Optimizer):
 
     """
     _moment_acc_str = "moment"
+    _supports_grouped_update = True
 
     def __init__(
         self,
@@ -114,6 +120,7 @@ class Adagrad(Optimizer):
         grad_clip=None,
         name=None,
         initial_accumulator_value=0.0,
+        use_multi_tensor=False,
     ):
         assert learning_rate is not None
         assert epsilon is not None
@@ -127,6 +134,7 @@ class Adagrad(Optimizer):
         self.type = "adagrad"
         self._epsilon = epsilon
         self.initial_accumulator_value = initial_accumulator_value
+        self._use_multi_tensor = use_multi_tensor
         self._default_dict = {
             'epsilon': epsilon,
             'initial_accumulator_value': initial_accumulator_value,
@@ -173,6 +181,22 @@ class Adagrad(Optimizer):
 
         return adagrad_op
 
+    def _append_grouped_optimize_op(self, block, params_grads):
+        params = [p for p, _ in params_grads]
+        moments = [
+            self._get_accumulator(self._moment_acc_str, p) for p in params
+        ]
+        param, grad, moment = self._coalesce_bucket(
+            params, [params, [g for _, g in params_grads], moments]
+        )
+        _C_ops.adagrad_(
+            param,
+            grad,
+            moment,
+            self._create_param_lr(params_grads[0]),
+            self._epsilon,
+        )
+
     def _update_param_group(self, parameters):
         self._epsilon = parameters.get('epsilon', self._default_dict['epsilon'])
         self.initial_accumulator_value = parameters.get(
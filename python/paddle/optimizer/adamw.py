@@ -88,6 +88,8 @@ class AdamW(Optimizer):
             different semantics with the original Adam algorithm and may lead to different result.
             The default value is False.
         multi_precision (bool, optional): Whether to use multi-precision during weight updating. Default is false.
+        use_multi_tensor (bool, optional): Whether to update the parameters sharing the dtype, place,
+            learning rate and weight decay by one kernel call in dygraph mode. Default is false.
         name (str, optional): Normally there is no need for user to set this property.
             For more information, please refer to :ref:`api_guide_Name`.
             The default value is None.
@@ -146,6 +148,7 @@ class AdamW(Optimizer):
     _moment2_acc_str = "moment2"
     _beta1_pow_acc_str = "beta1_pow_acc"
     _beta2_pow_acc_str = "beta2_pow_acc"
+    _supports_grouped_update = True
 
     def __init__(
         self,
@@ -160,6 +163,7 @@ class AdamW(Optimizer):
         grad_clip=None,
         lazy_mode=False,
         multi_precision=False,
+        use_multi_tensor=False,
         name=None,
     ):
         assert learning_rate is not None
@@ -278,7 +282,7 @@ class AdamW(Optimizer):
         else:
             self._param_groups = self._parameter_list
 
-        self._use_multi_tensor = None
+        self._use_multi_tensor = use_multi_tensor
         self.regularization = None
         self._auxiliary_vars = {}
         self._already_create_accumulater = set()
@@ -359,6 +363,61 @@ class AdamW(Optimizer):
             self._master_weights[param.name] = var
         return var
 
+    def _with_decay(self, param):
+        # Whether we should do weight decay for the parameter.
+        return self._apply_decay_param_fun is None or bool(
+            self._apply_decay_param_fun(param.name)
+        )
+
+    def _grouped_update_key(self, param, grad):
+        key = super()._grouped_update_key(param, grad)
+        # the CPU kernel only applies lr_ratio to the weight decay, which
+        # can not be expressed by the learning rate of the bucket
+        if (
+            key is None
+            or self._lazy_mode
+            or (self._lr_ratio is not None and self._lr_ratio(param) != 1.0)
+        ):
+            return None
+        return key + (self._with_decay(param),)
+
+    def _append_grouped_optimize_op(self, block, params_grads):
+        params = [p for p, _ in params_grads]
+        find_master = self._multi_precision and self._is_dtype_fp16_or_bf16(
+            params[0].dtype
+        )
+        _beta1 = (
+            self._beta1
+            if not isinstance(self._beta1, Variable)
+            else self._beta1.numpy().item(0)
+        )
+        _beta2 = (
+            self._beta2
+            if not isinstance(self._beta2, Variable)
+            else self._beta2.numpy().item(0)
+        )
+        _C_ops.multi_tensor_adam_(
+            params,
+            [g for _, g in params_grads],
+            self._create_param_lr(params_grads[0]),
+            [self._get_accumulator(self._moment1_acc_str, p) for p in params],
+            [self._get_accumulator(self._moment2_acc_str, p) for p in params],
+            [self._get_accumulator(self._beta1_pow_acc_str, p) for p in params],
+            [self._get_accumulator(self._beta2_pow_acc_str, p) for p in params],
+            [self._master_weights[p.name] for p in params]
+            if find_master
+            else None,
+            None,
+            _beta1,
+            _beta2,
+            self._epsilon,
+            2048 * 32,
+            self._weight_decay if self._with_decay(params[0]) else 0.0,
+            True,
+            find_master,
+            False,
+        )
+
     def _get_accumulator(self, name, param):
         """Utility function to fetch an accumulator for a parameter
         Args:
@@ -447,13 +506,7 @@ class AdamW(Optimizer):
             param_and_grad = self._update_param_group(param_and_grad)
         param, grad = param_and_grad
 
-        # Whether we should do weight decay for the parameter.
-        with_decay = True
-        if (
-            self._apply_decay_param_fun is not None
-            and not self._apply_decay_param_fun(param.name)
-        ):
-            with_decay = False
+        with_decay = self._with_decay(param)
 
         moment1 = self._get_accumulator(
             self._moment1_acc_str, param_and_grad[0]
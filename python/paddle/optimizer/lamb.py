@@ -96,6 +96,7 @@ class Lamb(Optimizer):
     _moment2_acc_str = "moment2"
     _beta1_pow_acc_str = "beta1_pow_acc"
     _beta2_pow_acc_str = "beta2_pow_acc"
+    _skip_update_on_device = True
 
     def __init__(
         self,
@@ -299,6 +300,7 @@ class Lamb(Optimizer):
             master_weight = None
 
         if framework.in_dygraph_mode():
+            found_inf = self._get_auxiliary_var('found_inf')
             _C_ops.lamb_(
                 param_and_grad[0],
                 param_and_grad[1],
@@ -308,7 +310,7 @@ class Lamb(Optimizer):
                 beta1_pow_acc,
                 beta2_pow_acc,
                 master_weight,
-                None,
+                found_inf if isinstance(found_inf, core.eager.Tensor) else None,
                 weight_decay,
                 self._beta1,
                 self._beta2,
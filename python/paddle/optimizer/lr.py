@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import math
 import warnings
 
@@ -91,6 +92,11 @@ class LRScheduler:
 
     """
 
+    # the learning rates of the epochs from _lr_table_start on, set by
+    # set_device_schedule
+    _lr_table = None
+    _lr_table_start = None
+
     def __init__(self, learning_rate=0.1, last_epoch=-1, verbose=False):
         if not isinstance(learning_rate, (float, int)):
             raise TypeError(
@@ -127,9 +133,18 @@ class LRScheduler:
         """
         if epoch is None:
             self.last_epoch += 1
-            self.last_lr = self.get_lr()
         else:
             self.last_epoch = epoch
+        if self._lr_table is not None and (
+            self.last_epoch >= self._lr_table_start
+        ):
+            index = min(
+                self.last_epoch - self._lr_table_start, len(self._lr_table) - 1
+            )
+            self.last_lr = float(self._lr_table[index])
+        elif epoch is None:
+            self.last_lr = self.get_lr()
+        else:
             if hasattr(self, "_get_closed_form_lr"):
                 self.last_lr = self._get_closed_form_lr()
             else:
@@ -199,6 +214,7 @@ class LRScheduler:
             warnings.warn(
                 "There are some unused values in state_dict. Maybe the optimizer have different 'LearningRateDecay' when invoking state_dict and set_dict"
             )
+        self._rebuild_lr_table()
 
     # alias for set_state_dict
     set_dict = set_state_dict
@@ -213,6 +229,115 @@ class LRScheduler:
         # calculate by python float
         raise NotImplementedError
 
+    def _get_closed_form_lrs(self, epochs):
+        """
+        Compute the learning rates of the int64 numpy array ``epochs`` at
+        once. Returns None if the scheduler has no closed form, then the
+        learning rates are computed by stepping a copy of the scheduler.
+        """
+        return None
+
+    def _get_checked_closed_form_lrs(self, epochs):
+        # a subclass overriding get_lr does not follow the closed form it
+        # inherits, so only use the closed form defined with the get_lr
+        for cls in type(self).__mro__:
+            if '_get_closed_form_lrs' in vars(cls):
+                break
+        if type(self).get_lr is not cls.get_lr:
+            return None
+        return self._get_closed_form_lrs(epochs)
+
+    def get_lr_table(self, num_steps):
+        """
+
+        Get the learning rates of the current epoch and the following
+        ``num_steps - 1`` epochs, i.e. the values ``last_lr`` will take if
+        ``step()`` is called once per epoch. The scheduler is not changed.
+
+        The built-in schedulers with a closed form are evaluated at all the
+        epochs at once, the others are evaluated by stepping a copy of the
+        scheduler.
+
+        Args:
+            num_steps (int): the number of epochs.
+
+        Returns:
+            numpy.ndarray, the float64 learning rates of shape [num_steps].
+
+        """
+        if not isinstance(num_steps, int) or num_steps <= 0:
+            raise ValueError(
+                "num_steps should be a positive integer, but received {}".format(
+                    num_steps
+                )
+            )
+        epochs = numpy.arange(
+            self.last_epoch, self.last_epoch + num_steps, dtype='int64'
+        )
+        lrs = self._get_checked_closed_form_lrs(epochs)
+        if lrs is not None:
+            return numpy.asarray(lrs, dtype='float64')
+        scheduler = copy.deepcopy(self)
+        scheduler._lr_table = None
+        scheduler.verbose = False
+        lrs = [scheduler.last_lr]
+        for _ in range(num_steps - 1):
+            scheduler.step()
+            lrs.append(scheduler.last_lr)
+        return numpy.array(lrs, dtype='float64')
+
+    def set_device_schedule(self, num_steps):
+        """
+
+        Precompute the learning rates of the next ``num_steps`` epochs, so
+        the optimizer reads the learning rate of each step from a tensor on
+        device, indexed by a step counter on device, instead of getting it
+        from python and setting it before every step. ``step()`` looks the
+        learning rate up in the table as well.
+
+        The device schedule assumes ``step()`` is called once after every
+        ``optimizer.step()`` , or once per ``Executor.run`` in static graph
+        mode, which no longer feeds the learning rate. After ``num_steps``
+        steps, the learning rate stays at the last value of the table, both
+        on device and in ``step()`` .
+
+        Args:
+            num_steps (int): the number of epochs to precompute, usually the
+                total number of training steps.
+
+        Returns:
+            None
+
+        Examples:
+            .. code-block:: python
+
+                import paddle
+
+                linear = paddle.nn.Linear(10, 10)
+                scheduler = paddle.optimizer.lr.LinearWarmup(
+                    paddle.optimizer.lr.CosineAnnealingDecay(0.1, T_max=100),
+                    warmup_steps=10, start_lr=0.0, end_lr=0.1)
+                scheduler.set_device_schedule(110)
+                sgd = paddle.optimizer.SGD(
+                    learning_rate=scheduler, parameters=linear.parameters())
+                for step in range(110):
+                    loss = linear(paddle.rand([4, 10])).mean()
+                    loss.backward()
+                    sgd.step()
+                    sgd.clear_grad()
+                    scheduler.step()
+
+        """
+        self._lr_table = None
+        self._lr_table = self.get_lr_table(num_steps)
+        self._lr_table_start = self.last_epoch
+
+    def _rebuild_lr_table(self):
+        # the table is computed from the state, so it is rebuilt after the
+        # state is loaded
+        if self._lr_table is not None:
+            self.set_device_schedule(len(self._lr_table))
+
 
 class NoamDecay(LRScheduler):
     r"""
@@ -311,6 +436,13 @@ class NoamDecay(LRScheduler):
         b = self.warmup_steps**-1.5 * self.last_epoch
         return self.base_lr * (self.d_model**-0.5) * min(a, b)
 
+    def _get_closed_form_lrs(self, epochs):
+        a = numpy.where(
+            epochs == 0, 1.0, numpy.maximum(epochs, 1).astype('float64') ** -0.5
+        )
+        b = self.warmup_steps**-1.5 * epochs
+        return self.base_lr * (self.d_model**-0.5) * numpy.minimum(a, b)
+
 
 class PiecewiseDecay(LRScheduler):
     """
@@ -409,6 +541,13 @@ class PiecewiseDecay(LRScheduler):
                 return self.values[i]
         return self.values[len(self.values) - 1]
 
+    def _get_closed_form_lrs(self, epochs):
+        index = numpy.searchsorted(self.boundaries, epochs, side='right')
+        index = numpy.where(
+            index == len(self.boundaries), len(self.values) - 1, index
+        )
+        return numpy.asarray(self.values, dtype='float64')[index]
+
 
 class NaturalExpDecay(LRScheduler):
     r"""
@@ -490,6 +629,9 @@ class NaturalExpDecay(LRScheduler):
     def get_lr(self):
         return self.base_lr * math.exp(-1 * self.gamma * self.last_epoch)
 
+    def _get_closed_form_lrs(self, epochs):
+        return self.base_lr * numpy.exp(-1 * self.gamma * epochs)
+
 
 class InverseTimeDecay(LRScheduler):
     r"""
@@ -570,6 +712,9 @@ class InverseTimeDecay(LRScheduler):
     def get_lr(self):
         return self.base_lr / (1 + self.gamma * self.last_epoch)
 
+    def _get_closed_form_lrs(self, epochs):
+        return self.base_lr / (1 + self.gamma * epochs)
+
 
 class PolynomialDecay(LRScheduler):
     r"""
@@ -698,6 +843,19 @@ class PolynomialDecay(LRScheduler):
             (1 - float(tmp_epoch_num) / float(tmp_decay_steps)) ** self.power
         ) + self.end_lr
 
+    def _get_closed_form_lrs(self, epochs):
+        epochs = epochs.astype('float64')
+        if self.cycle:
+            div_res = numpy.ceil(epochs / float(self.decay_steps))
+            div_res = numpy.where(epochs == 0, 1.0, div_res)
+            decay_steps = self.decay_steps * div_res
+        else:
+            epochs = numpy.minimum(epochs, self.decay_steps)
+            decay_steps = float(self.decay_steps)
+        return (self.base_lr - self.end_lr) * (
+            (1 - epochs / decay_steps) ** self.power
+        ) + self.end_lr
+
 
 class LinearWarmup(LRScheduler):
     r"""
@@ -834,6 +992,8 @@ class LinearWarmup(LRScheduler):
         super().set_state_dict(state_dict)
         if isinstance(self.learning_rate, LRScheduler):
             self.learning_rate.set_state_dict(state_dict["LinearWarmup_LR"])
+        # the state of the wrapped scheduler is part of the table
+        self._rebuild_lr_table()
 
     def get_lr(self):
         if self.last_epoch < self.warmup_steps:
@@ -847,6 +1007,20 @@ class LinearWarmup(LRScheduler):
 
             return self.learning_rate
 
+    def _get_closed_form_lrs(self, epochs):
+        warmup_lrs = (self.end_lr - self.start_lr) * epochs.astype(
+            'float64'
+        ) / float(self.warmup_steps) + self.start_lr
+        if isinstance(self.learning_rate, LRScheduler):
+            lrs = self.learning_rate._get_checked_closed_form_lrs(
+                numpy.maximum(epochs - self.warmup_steps, 0)
+            )
+            if lrs is None:
+                return None
+        else:
+            lrs = float(self.learning_rate)
+        return numpy.where(epochs < self.warmup_steps, warmup_lrs, lrs)
+
 
 class ExponentialDecay(LRScheduler):
     r"""
@@ -929,6 +1103,9 @@ class ExponentialDecay(LRScheduler):
     def get_lr(self):
         return self.base_lr * (self.gamma**self.last_epoch)
 
+    def _get_closed_form_lrs(self, epochs):
+        return self.base_lr * (self.gamma ** epochs.astype('float64'))
+
 
 class MultiStepDecay(LRScheduler):
     """
@@ -1039,6 +1216,10 @@ class MultiStepDecay(LRScheduler):
                 return self.base_lr * (self.gamma**i)
         return self.base_lr * (self.gamma ** len(self.milestones))
 
+    def _get_closed_form_lrs(self, epochs):
+        i = numpy.searchsorted(self.milestones, epochs, side='right')
+        return self.base_lr * (self.gamma ** i.astype('float64'))
+
 
 class StepDecay(LRScheduler):
     """
@@ -1141,6 +1322,10 @@ class StepDecay(LRScheduler):
         i = self.last_epoch // self.step_size
         return self.base_lr * (self.gamma**i)
 
+    def _get_closed_form_lrs(self, epochs):
+        i = (epochs // self.step_size).astype('float64')
+        return self.base_lr * (self.gamma**i)
+
 
 class LambdaDecay(LRScheduler):
     """
@@ -1382,6 +1567,12 @@ class ReduceOnPlateau(LRScheduler):
             'last_lr',
         ]
 
+    def get_lr_table(self, num_steps):
+        raise TypeError(
+            "The learning rates of ReduceOnPlateau depend on the metrics, "
+            "they cannot be precomputed."
+        )
+
     def step(self, metrics, epoch=None):
         """
         step should be called after `optimizer.step()` . It will update the learning rate in optimizer according to ``metrics`` .
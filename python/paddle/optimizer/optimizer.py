@@ -19,7 +19,7 @@ import numpy as np
 
 import paddle
 import paddle.autograd as imperative_base
-from paddle import _C_ops
+from paddle import _C_ops, _legacy_C_ops
 from paddle.fluid import core
 from paddle.fluid.framework import (
     Variable,
@@ -39,6 +39,41 @@ from .lr import LRScheduler
 
 __all__ = []
 
+# the update kernels of the grouped update and coalesce_tensor are registered
+# for these dtypes
+_GROUPED_UPDATE_CPU_DTYPES = (
+    core.VarDesc.VarType.FP32,
+    core.VarDesc.VarType.FP64,
+)
+_GROUPED_UPDATE_GPU_DTYPES = _GROUPED_UPDATE_CPU_DTYPES + (
+    core.VarDesc.VarType.FP16,
+)
+
+
+def _coalesce(tensors, fused=None):
+    """
+    Copy ``tensors`` into one contiguous buffer and make them views of it,
+    unless they are all views of ``fused`` already. Returns the buffer.
+    """
+    if fused is not None and all(
+        t._is_shared_buffer_with(fused) for t in tensors
+    ):
+        return fused
+    dtype = tensors[0].dtype
+    fused = framework._varbase_creator(dtype=dtype)
+    _legacy_C_ops.coalesce_tensor(
+        tensors,
+        tensors,
+        fused,
+        "copy_data",
+        True,
+        "use_align",
+        False,
+        "dtype",
+        dtype,
+    )
+    return fused
+
 
 @framework.static_only
 def append_backward_new(
@@ -162,6 +197,15 @@ class Optimizer:
 
     """
 
+    # Whether the dygraph update kernels take found_inf as SkipUpdate and
+    # check it on device. Only Lamb does, the other optimizers read found_inf
+    # on the host.
+    _skip_update_on_device = False
+
+    # Whether the optimizer implements _append_grouped_optimize_op, which is
+    # used in dygraph mode if use_multi_tensor is True.
+    _supports_grouped_update = False
+
     @imperative_base.no_grad()
     def __init__(
         self,
@@ -274,6 +318,12 @@ class Optimizer:
         self._use_multi_tensor = None
 
         self._param_dict = self._create_multi_tensor_dict()
+        # the tables of a device schedule which the learning rate table and
+        # the step counter on device are created for
+        self._lr_table_source = None
+        self._lr_step_source = None
+        # {param names of a bucket: coalesced buffers}
+        self._coalesced_buffers = {}
         self._auxiliary_vars = {}
         self._already_create_accumulater = set()
 
@@ -430,7 +480,12 @@ class Optimizer:
             )
             else _lr_dtype
         )
-        if isinstance(self._learning_rate, LRScheduler):
+        if (
+            isinstance(self._learning_rate, LRScheduler)
+            and self._learning_rate._lr_table is not None
+        ):
+            self._create_scheduled_learning_rate(_lr_dtype)
+        elif isinstance(self._learning_rate, LRScheduler):
             lr_var = self._global_learning_rate()
             # only create global lr_var once
             if not isinstance(lr_var, framework.Variable):
@@ -472,6 +527,75 @@ class Optimizer:
                     persistable=True,
                 )
 
+    def _create_scheduled_learning_rate(self, dtype):
+        """
+        Create the learning rate of a scheduler with a device schedule. It is
+        gathered from the table of the scheduler by a step counter, which is
+        increased on device before every update, so the learning rate is
+        neither computed in python nor fed to the device.
+        """
+        scheduler = self._learning_rate
+        table = scheduler._lr_table
+        if in_dygraph_mode():
+            if self._lr_step_source is not table:
+                self._advance_lr_schedule()
+            if self._lr_table_source is not table:
+                self._lr_table_source = table
+                self._lr_table_tensor = paddle.to_tensor(table, dtype=dtype)
+            index = paddle.clip(self._lr_step, 0, len(table) - 1)
+            self._learning_rate_map[
+                framework.default_main_program()
+            ] = paddle.gather(self._lr_table_tensor, index)
+            return
+
+        # only create global lr_var once
+        if isinstance(self._global_learning_rate(), framework.Variable):
+            return
+        main_prog = framework.default_main_program()
+        with main_prog._lr_schedule_guard():
+            table_var = self.helper.create_global_variable(
+                name=unique_name.generate('learning_rate_table'),
+                shape=[len(table)],
+                persistable=True,
+                stop_gradient=True,
+                dtype=dtype,
+            )
+            self.helper.set_variable_initializer(
+                table_var, initializer=paddle.nn.initializer.Assign(table)
+            )
+            # the counter is increased before every run
+            step = paddle.fluid.layers.autoincreased_step_counter(
+                counter_name=unique_name.generate('@LR_TABLE_COUNTER@'),
+                begin=scheduler.last_epoch - scheduler._lr_table_start,
+            )
+            index = paddle.clip(step, 0, len(table) - 1)
+            lr_var = paddle.gather(table_var, index)
+        self._learning_rate_map[main_prog] = lr_var
+
+    @framework.dygraph_only
+    def _advance_lr_schedule(self):
+        """
+        Increase the step counter of a device schedule in dygraph mode, once
+        per step. The counter restarts from the epoch of the scheduler when
+        the table is rebuilt, e.g. by set_state_dict.
+        """
+        scheduler = self._learning_rate
+        if (
+            not isinstance(scheduler, LRScheduler)
+            or scheduler._lr_table is None
+        ):
+            return
+        table = scheduler._lr_table
+        if self._lr_step_source is table:
+            _C_ops.increment_(self._lr_step, 1.0)
+        else:
+            self._lr_step_source = table
+            self._lr_step = paddle.full(
+                [1],
+                scheduler.last_epoch - scheduler._lr_table_start,
+                dtype='int64',
+            )
+
     @framework.dygraph_only
     def set_lr(self, value):
         """
@@ -830,6 +954,8 @@ class Optimizer:
         start = len(target_block.ops)
         self.helper = LayerHelper(self.__class__.__name__)
 
+        if in_dygraph_mode() and param_group_idx == 0:
+            self._advance_lr_schedule()
         self._create_global_learning_rate()
 
         # NOTE: Multi Tensor support [ Momentum, Adam ] for dygraph mode
@@ -925,13 +1051,24 @@ class Optimizer:
 
             if framework._non_static_mode():
                 found_inf = self._get_auxiliary_var('found_inf')
-                if found_inf:
+                # the update kernels of Lamb read found_inf on device and skip
+                # the update themselves, so the host does not wait for it
+                skip_on_device = self._skip_update_on_device and isinstance(
+                    found_inf, core.eager.Tensor
+                )
+                if not skip_on_device and found_inf:
                     if isinstance(found_inf, core.eager.Tensor):
                         self._set_auxiliary_var('found_inf', True)
                 else:
-                    if isinstance(found_inf, core.eager.Tensor):
+                    if not skip_on_device and isinstance(
+                        found_inf, core.eager.Tensor
+                    ):
                         self._set_auxiliary_var('found_inf', False)
-                    if isinstance(parameters_and_grads, list):
+                    if self._use_multi_tensor and self._supports_grouped_update:
+                        self._append_grouped_optimize_ops(
+                            target_block, parameters_and_grads
+                        )
+                    elif isinstance(parameters_and_grads, list):
                         for param_and_grad in parameters_and_grads:
                             if param_and_grad[1] is None:
                                 continue
@@ -1318,6 +1455,13 @@ class Optimizer:
                         param_list.append(p)
 
         if _in_eager_without_dygraph_check():
+            from paddle.nn.utils.flat_parameters import _split_flat_params
+
+            # the grads of flattened params are views, they are zeroed by
+            # one kernel per buffer and never released
+            flats, param_list = _split_flat_params(param_list)
+            for flat in flats:
+                flat.zero_grad()
             for p in param_list:
                 p.clear_gradient(set_to_zero)
         else:
@@ -1524,6 +1668,97 @@ class Optimizer:
         """
         pass
 
+    def _grouped_update_key(self, param, grad):
+        """
+        Get the key of the bucket ``param`` is updated in by the grouped
+        update, or None if it is updated alone. The parameters in a bucket
+        share the dtype, the place and the learning rate, subclasses append
+        the options of the update kernel that differ between parameters.
+        """
+        if grad.is_selected_rows():
+            return None
+        place = param.place
+        if place.is_gpu_place():
+            if param.dtype not in _GROUPED_UPDATE_GPU_DTYPES:
+                return None
+        elif not place.is_cpu_place() or (
+            param.dtype not in _GROUPED_UPDATE_CPU_DTYPES
+        ):
+            return None
+        param_lr = getattr(param, 'optimize_attr', {}).get('learning_rate', 1.0)
+        if isinstance(param_lr, Variable):
+            param_lr = id(param_lr)
+        return (param.dtype, str(place), param_lr)
+
+    @framework.dygraph_only
+    def _append_grouped_optimize_ops(self, target_block, parameters_and_grads):
+        """
+        Bucket the parameters by ``_grouped_update_key`` and update each
+        bucket by one ``_append_grouped_optimize_op`` call, instead of one
+        ``_append_optimize_op`` call per parameter.
+        """
+        if isinstance(parameters_and_grads, dict):
+            # the options of the param group are set to self
+            parameters_and_grads = self._update_param_group(
+                parameters_and_grads
+            )
+        buckets = {}
+        for param, grad in parameters_and_grads:
+            if grad is None or param.stop_gradient:
+                continue
+            key = self._grouped_update_key(param, grad)
+            if key is None:
+                self._append_optimize_op(target_block, (param, grad))
+            else:
+                buckets.setdefault(key, []).append((param, grad))
+        for params_grads in buckets.values():
+            self._append_grouped_optimize_op(target_block, params_grads)
+
+    @framework.dygraph_only
+    def _append_grouped_optimize_op(self, target_block, params_grads):
+        """
+        Update a bucket of parameters, which share the key returned by
+        ``_grouped_update_key``, by as few kernel calls as possible.
+        This function will be overridden in the corresponding optimizer file.
+        """
+        raise NotImplementedError()
+
+    @framework.dygraph_only
+    def _coalesce_bucket(self, params, tensor_lists):
+        """
+        Get the contiguous buffers of a bucket for the elementwise update
+        kernels. Each list in ``tensor_lists`` holds one tensor per param in
+        ``params``, e.g. the params, the grads or an accumulator, and its
+        tensors are made views of its buffer, so updating the buffer updates
+        all of them. The buffers are cached and only rebuilt for the lists
+        whose tensors are no longer views of them, e.g. the grads released by
+        clear_grad(set_to_zero=False). The first two lists are the params and
+        the grads, which may be flattened already.
+        """
+        names = tuple(p.name for p in params)
+        buffers = self._coalesced_buffers.get(names)
+        if buffers is None or len(buffers) != len(tensor_lists):
+            # the buckets changed, drop the buffers of the old buckets
+            # holding any of the params
+            names_set = set(names)
+            self._coalesced_buffers = {
+                k: v
+                for k, v in self._coalesced_buffers.items()
+                if names_set.isdisjoint(k)
+            }
+            buffers = [None] * len(tensor_lists)
+            # reuse the buffers of paddle.nn.utils.flatten_parameters
+            flat = getattr(params[0], '_flat_param_buffer', None)
+            if flat is not None and flat.names == names:
+                buffers[:2] = [flat.buffer, flat.grad_buffer]
+        with paddle.no_grad():
+            buffers = [
+                _coalesce(tensors, fused)
+                for tensors, fused in zip(tensor_lists, buffers)
+            ]
+        self._coalesced_buffers[names] = buffers
+        return buffers
+
     def _is_dtype_fp16_or_bf16(self, dtype):
         """
         check the dtype is fp16 or the dtype is bf16
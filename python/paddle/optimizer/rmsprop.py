@@ -98,6 +98,9 @@ class RMSProp(Optimizer):
           some derived class of ``GradientClipBase`` . There are three cliping strategies
           ( :ref:`api_fluid_clip_GradientClipByGlobalNorm` , :ref:`api_fluid_clip_GradientClipByNorm` ,
           :ref:`api_fluid_clip_GradientClipByValue` ). Default None, meaning there is no gradient clipping.
+        use_multi_tensor (bool, optional): Whether to update the parameters sharing the dtype, place and
+          learning rate by one kernel call on their contiguous buffers in dygraph mode, the parameters,
+          gradients and accumulators become views of the buffers. Default is false.
         name (str, optional): This parameter is used by developers to print debugging information.
           For details, please refer to :ref:`api_guide_Name`. Default is None.
 
@@ -143,6 +146,7 @@ class RMSProp(Optimizer):
     _momentum_acc_str = "momentum"
     _mean_square_acc_str = "mean_square"
     _mean_grad_acc_str = "mean_grad"
+    _supports_grouped_update = True
 
     def __init__(
         self,
@@ -154,6 +158,7 @@ class RMSProp(Optimizer):
         parameters=None,
         weight_decay=None,
         grad_clip=None,
+        use_multi_tensor=False,
         name=None,
     ):
         if learning_rate is None:
@@ -184,6 +189,7 @@ class RMSProp(Optimizer):
         self._epsilon = epsilon
         self._momentum = momentum
         self._centered = centered
+        self._use_multi_tensor = use_multi_tensor
         self._default_dict = {
             'rho': rho,
             'epsilon': epsilon,
@@ -265,6 +271,32 @@ class RMSProp(Optimizer):
 
             return rmsprop_op
 
+    def _append_grouped_optimize_op(self, block, params_grads):
+        params = [p for p, _ in params_grads]
+        accumulators = [
+            [self._get_accumulator(name, p) for p in params]
+            for name in (
+                self._momentum_acc_str,
+                self._mean_square_acc_str,
+                self._mean_grad_acc_str,
+            )
+        ]
+        param, grad, momentum, mean_square, mean_grad = self._coalesce_bucket(
+            params, [params, [g for _, g in params_grads]] + accumulators
+        )
+        _C_ops.rmsprop_(
+            param,
+            mean_square,
+            grad,
+            momentum,
+            self._create_param_lr(params_grads[0]),
+            mean_grad,
+            self._epsilon,
+            self._rho,
+            self._momentum,
+            self._centered,
+        )
+
     def _update_param_group(self, parameters):
         self._epsilon = parameters.get('epsilon', self._default_dict['epsilon'])
         self._rho = parameters.get('rho', self._default_dict['rho'])
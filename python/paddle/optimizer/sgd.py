@@ -51,6 +51,9 @@ class SGD(Optimizer):
             some derived class of ``GradientClipBase`` . There are three cliping strategies
             ( :ref:`api_fluid_clip_GradientClipByGlobalNorm` , :ref:`api_fluid_clip_GradientClipByNorm` ,
             :ref:`api_fluid_clip_GradientClipByValue` ). Default None, meaning there is no gradient clipping.
+        use_multi_tensor (bool, optional): Whether to update the parameters sharing the dtype, place and
+            learning rate by one kernel call on their contiguous buffers in dygraph mode, the parameters
+            and gradients become views of the buffers. Default is false.
         name (str, optional): The default value is None. Normally there is no need for user
                 to set this property. For more information, please refer to
                 :ref:`api_guide_Name` .
@@ -72,6 +75,8 @@ class SGD(Optimizer):
 
     """
 
+    _supports_grouped_update = True
+
     def __init__(
         self,
         learning_rate=0.001,
@@ -79,6 +84,7 @@ class SGD(Optimizer):
         weight_decay=None,
         grad_clip=None,
         multi_precision=False,
+        use_multi_tensor=False,
         name=None,
     ):
         if learning_rate is None:
@@ -93,6 +99,7 @@ class SGD(Optimizer):
         self.type = "sgd"
         self._multi_precision = multi_precision
         self._master_weights = {}
+        self._use_multi_tensor = use_multi_tensor
 
     def _create_master_weight(self, param):
         if param.name in self._master_weights:
@@ -196,6 +203,25 @@ class SGD(Optimizer):
 
             return sgd_op
 
+    @no_grad
+    def _append_grouped_optimize_op(self, block, params_grads):
+        params = [p for p, _ in params_grads]
+        find_master = (
+            self._multi_precision
+            and params[0].dtype == core.VarDesc.VarType.FP16
+        )
+        tensor_lists = [params, [g for _, g in params_grads]]
+        if find_master:
+            tensor_lists.append([self._master_weights[p.name] for p in params])
+        buffers = self._coalesce_bucket(params, tensor_lists)
+        _C_ops.sgd_(
+            buffers[0],
+            self._create_param_lr(params_grads[0]),
+            buffers[1],
+            buffers[2] if find_master else None,
+            find_master,
+        )
+
     def _update_param_group(self, parameters):
         parameters = parameters.get('params')
         return parameters
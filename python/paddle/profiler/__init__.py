@@ -14,11 +14,13 @@
 
 from .profiler import ProfilerState, ProfilerTarget
 from .profiler import make_scheduler, export_chrome_tracing, export_protobuf
+from .profiler import export_chrome_tracing_stream
 from .profiler import Profiler
 from .profiler import SummaryView
 from .profiler import TracerEventType
 from .utils import RecordEvent, load_profiler_result
 from .profiler_statistic import SortedKeys
+from .sampling import SamplingProfiler
 
 __all__ = [
     'ProfilerState',
@@ -26,9 +28,11 @@ __all__ = [
     'make_scheduler',
     'export_chrome_tracing',
     'export_protobuf',
+    'export_chrome_tracing_stream',
     'Profiler',
     'RecordEvent',
     'load_profiler_result',
     'SortedKeys',
     'SummaryView',
+    'SamplingProfiler',
 ]
@@ -0,0 +1,371 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from paddle.fluid.core import TracerEventType
+
+from .statistic_helper import merge_self_ranges_array
+
+__all__ = []
+
+# kinds of the events
+HOST = 0
+RUNTIME = 1
+DEVICE = 2
+
+_COLUMNS = {
+    'kind': np.int8,
+    'type': np.int32,
+    'name': np.int32,
+    'start_ns': np.int64,
+    'end_ns': np.int64,
+    'thread': np.int32,
+    'device_id': np.int64,
+    'stream_id': np.int64,
+    'parent': np.int64,
+    'depth': np.int32,
+}
+
+
+class EventStore:
+    r"""
+    Columnar storage of the host, runtime and device events of the profiler
+    node trees, one NumPy array per column, so the summaries are computed by
+    vectorized sort-and-sweep and group-by operations instead of walking the
+    trees.
+
+    The columns are:
+
+    - **kind**: HOST, RUNTIME or DEVICE.
+    - **type**: the TracerEventType as int, see ``types``.
+    - **name**: the index of the event name in ``names``.
+    - **start_ns**, **end_ns**: the time range of the event.
+    - **thread**: the index in ``threads`` of the thread id of the node tree
+      holding the event.
+    - **device_id**, **stream_id**: -1 for the host and runtime events.
+    - **parent**: the index of the parent host event of a host event, of the
+      host event launching a runtime event, and of the runtime event of a
+      device event. -1 for the children and the runtime events of a root.
+    - **depth**: the depth of the event below the root, from 0.
+
+    The root nodes themselves are not stored. Events are stored in the same
+    order ``traverse_tree`` visits them.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.threads = []
+        self.types = {}
+        self._name_ids = {}
+        self._chunks = []
+        self._columns = None
+        self._size = 0
+
+    @classmethod
+    def from_nodetrees(cls, nodetrees):
+        store = cls()
+        store.append(nodetrees)
+        return store
+
+    def __len__(self):
+        return self._size
+
+    def _name_id(self, name):
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self._name_ids[name] = name_id
+            self.names.append(name)
+        return name_id
+
+    def _type_id(self, event_type):
+        type_id = int(event_type)
+        if type_id not in self.types:
+            self.types[type_id] = event_type
+        return type_id
+
+    def append(self, nodetrees):
+        r"""
+        Add the events of more node trees, e.g. the trees of the next step
+        window, without touching the events already stored.
+        """
+        columns = {name: [] for name in _COLUMNS}
+        kinds = columns['kind']
+        types = columns['type']
+        names = columns['name']
+        starts = columns['start_ns']
+        ends = columns['end_ns']
+        threads = columns['thread']
+        device_ids = columns['device_id']
+        stream_ids = columns['stream_id']
+        parents = columns['parent']
+        depths = columns['depth']
+
+        def add(kind, node, parent, depth, thread, device_id, stream_id):
+            kinds.append(kind)
+            types.append(self._type_id(node.type))
+            names.append(self._name_id(node.name))
+            starts.append(node.start_ns)
+            ends.append(node.end_ns)
+            threads.append(thread)
+            device_ids.append(device_id)
+            stream_ids.append(stream_id)
+            parents.append(parent)
+            depths.append(depth)
+            return self._size + len(kinds) - 1
+
+        for thread_id, rootnode in nodetrees.items():
+            thread = len(self.threads)
+            self.threads.append(thread_id)
+            stack = [(rootnode, -1, -1)]
+            while stack:
+                current_node, parent, depth = stack.pop()
+                if current_node is rootnode:
+                    index = -1
+                else:
+                    index = add(
+                        HOST, current_node, parent, depth, thread, -1, -1
+                    )
+                for childnode in current_node.children_node:
+                    stack.append((childnode, index, depth + 1))
+                for runtimenode in current_node.runtime_node:
+                    runtime_index = add(
+                        RUNTIME,
+                        runtimenode,
+                        index,
+                        depth + 1,
+                        thread,
+                        -1,
+                        -1,
+                    )
+                    for devicenode in runtimenode.device_node:
+                        add(
+                            DEVICE,
+                            devicenode,
+                            runtime_index,
+                            depth + 2,
+                            thread,
+                            devicenode.device_id,
+                            devicenode.stream_id,
+                        )
+
+        if kinds:
+            self._chunks.append(
+                {
+                    name: np.asarray(values, dtype=_COLUMNS[name])
+                    for name, values in columns.items()
+                }
+            )
+            self._columns = None
+            self._size += len(kinds)
+        return self
+
+    @property
+    def columns(self):
+        r"""
+        The dict from the column name to its array, concatenated lazily from
+        the appended chunks.
+        """
+        if self._columns is None:
+            if self._chunks:
+                self._columns = {
+                    name: np.concatenate(
+                        [chunk[name] for chunk in self._chunks]
+                    )
+                    for name in _COLUMNS
+                }
+            else:
+                self._columns = {
+                    name: np.empty(0, dtype=dtype)
+                    for name, dtype in _COLUMNS.items()
+                }
+            self._chunks = [self._columns]
+        return self._columns
+
+    def type_mask(self, event_type):
+        return self.columns['type'] == int(event_type)
+
+    def name_mask(self, predicate):
+        r"""
+        The mask of the events whose name satisfies ``predicate``, which is
+        called once per distinct name.
+        """
+        matched = np.array(
+            [bool(predicate(name)) for name in self.names], dtype=bool
+        )
+        if len(matched) == 0:
+            return np.zeros(len(self), dtype=bool)
+        return matched[self.columns['name']]
+
+    def attached_to_root(self):
+        r"""
+        The mask of the runtime events of the roots and their device events,
+        which the summaries skip together with the roots.
+        """
+        columns = self.columns
+        kind = columns['kind']
+        parent = columns['parent']
+        mask = (kind == RUNTIME) & (parent < 0)
+        device = np.flatnonzero(kind == DEVICE)
+        mask[device] = mask[parent[device]]
+        return mask
+
+    def propagate(self, flags):
+        r"""
+        Propagate the boolean ``flags`` of the events to all the events below
+        them: host children, runtime events and their device events.
+        """
+        flags = np.array(flags, dtype=bool)
+        columns = self.columns
+        parent = columns['parent']
+        depth = columns['depth']
+        order = np.argsort(depth, kind='stable')
+        bounds = np.searchsorted(
+            depth[order], np.arange(1, int(depth.max(initial=0)) + 2)
+        )
+        for begin, end in zip(bounds[:-1], bounds[1:]):
+            indices = order[begin:end]
+            indices = indices[parent[indices] >= 0]
+            flags[indices] |= flags[parent[indices]]
+        return flags
+
+    def ranges(self, mask=None):
+        r"""
+        The [N, 2] array of the time ranges of the events in ``mask``.
+        """
+        columns = self.columns
+        if mask is None:
+            return np.stack([columns['start_ns'], columns['end_ns']], axis=1)
+        return np.stack(
+            [columns['start_ns'][mask], columns['end_ns'][mask]], axis=1
+        )
+
+    def union(self, mask=None):
+        r"""
+        The merged time ranges covered by the events in ``mask``.
+        """
+        return merge_self_ranges_array(self.ranges(mask))
+
+    def aggregate(self, mask=None):
+        r"""
+        Group the events in ``mask`` by name, and get the number of calls,
+        the total, min and max duration of every name.
+
+        Returns:
+            dict: from the name to (calls, total, min, max), in the order the
+            names first appear.
+        """
+        columns = self.columns
+        name_ids = columns['name']
+        durations = columns['end_ns'] - columns['start_ns']
+        if mask is not None:
+            name_ids = name_ids[mask]
+            durations = durations[mask]
+        if len(name_ids) == 0:
+            return {}
+        order = np.argsort(name_ids, kind='stable')
+        name_ids = name_ids[order]
+        durations = durations[order]
+        firsts = np.flatnonzero(
+            np.concatenate([[True], name_ids[1:] != name_ids[:-1]])
+        )
+        calls = np.diff(np.append(firsts, len(name_ids)))
+        totals = np.add.reduceat(durations, firsts)
+        mins = np.minimum.reduceat(durations, firsts)
+        maxs = np.maximum.reduceat(durations, firsts)
+        results = {}
+        # the stable sort keeps the first appearance of every name first
+        for i in np.argsort(order[firsts], kind='stable'):
+            results[self.names[name_ids[firsts[i]]]] = (
+                int(calls[i]),
+                int(totals[i]),
+                int(mins[i]),
+                int(maxs[i]),
+            )
+        return results
+
+    def select(self, mask):
+        r"""
+        A new EventStore holding the events in ``mask``. The parent of an
+        event becomes -1 if its parent is not selected.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        columns = self.columns
+        new_index = np.cumsum(mask) - 1
+        selected = {name: column[mask] for name, column in columns.items()}
+        parent = selected['parent']
+        has_parent = parent >= 0
+        has_parent[has_parent] = mask[parent[has_parent]]
+        selected['parent'] = np.where(
+            has_parent, new_index[np.maximum(parent, 0)], -1
+        )
+        store = EventStore()
+        store.names = list(self.names)
+        store.threads = list(self.threads)
+        store.types = dict(self.types)
+        store._name_ids = dict(self._name_ids)
+        store._chunks = [selected]
+        store._size = int(np.count_nonzero(mask))
+        return store
+
+    def step_ranges(self):
+        r"""
+        The time ranges of the ProfileStep events, sorted by start time.
+        """
+        columns = self.columns
+        mask = (columns['kind'] == HOST) & self.type_mask(
+            TracerEventType.ProfileStep
+        )
+        ranges = self.ranges(mask)
+        return ranges[np.argsort(ranges[:, 0], kind='stable')]
+
+    def launch_ns(self):
+        r"""
+        The start time of the events, except that device events take the
+        start time of the runtime events launching them.
+        """
+        columns = self.columns
+        launch_ns = columns['start_ns'].copy()
+        device = np.flatnonzero(columns['kind'] == DEVICE)
+        launch_ns[device] = launch_ns[columns['parent'][device]]
+        return launch_ns
+
+    def window_index(self):
+        r"""
+        The index in ``step_ranges()`` of the step window every event is
+        launched in, -1 for the events launched out of all the windows.
+        """
+        step_ranges = self.step_ranges()
+        launch_ns = self.launch_ns()
+        index = np.searchsorted(step_ranges[:, 0], launch_ns, side='right') - 1
+        inside = index >= 0
+        inside[inside] = launch_ns[inside] < step_ranges[index[inside], 1]
+        return np.where(inside, index, -1)
+
+    def window(self, start_ns, end_ns):
+        r"""
+        A new EventStore holding the events started in [start_ns, end_ns).
+        Device events go with the window of the runtime events launching
+        them, even if they are executed after the window ends.
+        """
+        launch_ns = self.launch_ns()
+        return self.select((launch_ns >= start_ns) & (launch_ns < end_ns))
+
+    def windows(self):
+        r"""
+        Iterate the EventStores of the step windows, one per ProfileStep.
+        """
+        for start_ns, end_ns in self.step_ranges().tolist():
+            yield self.window(start_ns, end_ns)
@@ -31,6 +31,7 @@ from paddle.fluid.core import (
     enable_memory_recorder,
     enable_op_info_recorder,
 )
+from paddle.fluid.framework import _bump_dispatch_epoch
 from paddle.profiler import utils
 
 from .profiler_statistic import (
@@ -40,6 +41,7 @@ from .profiler_statistic import (
     gen_layer_flops,
 )
 from .timer import benchmark
+from .trace_export import ChromeTraceWriter
 from .utils import RecordEvent, wrap_optimizers
 
 
@@ -267,6 +269,73 @@ def export_chrome_tracing(
     return handle_fn
 
 
+def export_chrome_tracing_stream(
+    dir_name: str,
+    worker_name: Optional[str] = None,
+    min_duration_ns: int = 0,
+) -> Callable:
+    r"""
+    Return a callable, used for outputing tracing data to one gzip-compressed chrome tracing format file incrementally.
+    Unlike :ref:`export_chrome_tracing <api_paddle_profiler_export_chrome_tracing>`, which writes a new file every time the trace is ready,
+    the events of every trace are appended to the same file step by step, so the file stays loadable and small during a long job.
+    The file name will be set as `worker_name`, and if `worker_name` is not set, the default name is `rank[rank]_host_[hostname]pid_[pid]`.
+    The traces of the ranks can be merged into one timeline by ``python -m paddle.profiler.trace_merge``.
+
+    Args:
+        dir_name(str): Directory to save profiling data.
+        worker_name(str, optional): Prefix of the file name saved, default is `rank[rank]_host_[hostname]pid_[pid]`.
+        min_duration_ns(int, optional): The events shorter than it are not written, except the ProfileStep events. Default value is 0.
+
+    Returns:
+        A callable, which takes a Profiler object as parameter and appends its tracing data to the chrome tracing format file.
+
+    Examples:
+        The return value can be used as parameter ``on_trace_ready`` in :ref:`Profiler <api_paddle_profiler_Profiler>` .
+
+        .. code-block:: python
+
+            # required: gpu
+            import paddle.profiler as profiler
+            with profiler.Profiler(
+                    targets=[profiler.ProfilerTarget.CPU, profiler.ProfilerTarget.GPU],
+                    scheduler = profiler.make_scheduler(closed=0, ready=0, record=1),
+                    on_trace_ready=profiler.export_chrome_tracing_stream('./log', min_duration_ns=1000)) as p:
+                for iter in range(10):
+                    #train()
+                    p.step()
+    """
+    if not os.path.exists(dir_name):
+        try:
+            os.makedirs(dir_name, exist_ok=True)
+        except Exception:
+            raise RuntimeError(
+                "Can not create directory '{}' for saving profiling results.".format(
+                    dir_name
+                )
+            )
+    writer = None
+
+    def handle_fn(prof):
+        nonlocal worker_name, writer
+        if writer is None:
+            if not worker_name:
+                worker_name = "rank{}_host_{}pid_{}".format(
+                    os.getenv('PADDLE_TRAINER_ID', '0'),
+                    socket.gethostname(),
+                    str(os.getpid()),
+                )
+            now = datetime.datetime.now()
+            filename = '{}_time_{}.paddle_trace.json.gz'.format(
+                worker_name, now.strftime('%Y_%m_%d_%H_%M_%S_%f')
+            )
+            writer = ChromeTraceWriter(
+                os.path.join(dir_name, filename), min_duration_ns
+            )
+        writer.write_nodetrees(prof.profiler_result.get_data())
+
+    return handle_fn
+
+
 def export_protobuf(
     dir_name: str, worker_name: Optional[str] = None
 ) -> Callable:
@@ -578,6 +647,7 @@ class Profiler:
         benchmark().begin()
         if not self.timer_only or self.emit_nvtx:
             utils._is_profiler_used = True
+            _bump_dispatch_epoch()
         if self.timer_only:
             return
         if self.record_shapes or self.with_flops:
@@ -645,7 +715,9 @@ class Profiler:
             self.profiler_result = self.profiler.stop()
             if self.on_trace_ready:
                 self.on_trace_ready(self)
-        utils._is_profiler_used = False
+        if utils._is_profiler_used:
+            utils._is_profiler_used = False
+            _bump_dispatch_epoch()
 
     def step(self, num_samples: Optional[int] = None):
         r"""
@@ -15,15 +15,13 @@ import collections
 import re
 from enum import Enum
 
+import numpy as np
+
 from paddle.fluid.core import TracerEventType, TracerMemEventType
 from paddle.utils.flops import flops
 
-from .statistic_helper import (
-    intersection_ranges,
-    merge_ranges,
-    merge_self_ranges,
-    sum_ranges,
-)
+from .event_store import DEVICE, HOST, EventStore
+from .statistic_helper import intersection_ranges, merge_ranges, sum_ranges
 
 _AllTracerEventType = [
     TracerEventType.Operator,
@@ -356,54 +354,43 @@ class TimeRangeSummary:
         r"""
         Analysis node trees in profiler result, and get time range for different tracer event type.
         """
-        thread2hostnodes = traverse_tree(nodetrees)
-        for threadid, hostnodes in thread2hostnodes.items():
-            CPUTimeRange = collections.defaultdict(list)
-            GPUTimeRange = collections.defaultdict(
-                lambda: collections.defaultdict(
-                    lambda: collections.defaultdict(list)
-                )
-            )  # device_id/type/stream_id
-            for hostnode in hostnodes[1:]:  # skip root node
+        self.update(EventStore.from_nodetrees(nodetrees))
 
-                CPUTimeRange[hostnode.type].append(
-                    (hostnode.start_ns, hostnode.end_ns)
-                )
-                self.call_times[hostnode.type] += 1
-                for runtimenode in hostnode.runtime_node:
-                    CPUTimeRange[runtimenode.type].append(
-                        (runtimenode.start_ns, runtimenode.end_ns)
-                    )
-                    self.call_times[runtimenode.type] += 1
-                    for devicenode in runtimenode.device_node:
-                        GPUTimeRange[devicenode.device_id][devicenode.type][
-                            devicenode.stream_id
-                        ].append((devicenode.start_ns, devicenode.end_ns))
-                        self.call_times[devicenode.type] += 1
-
-            for event_type, time_ranges in CPUTimeRange.items():
-                time_ranges = merge_self_ranges(time_ranges, is_sorted=False)
-                self.CPUTimeRange[event_type] = merge_ranges(
-                    self.CPUTimeRange[event_type], time_ranges, is_sorted=True
+    def update(self, store):
+        r"""
+        Add the events of an EventStore, e.g. the events of one more step window, to the summary.
+        """
+        columns = store.columns
+        kind = columns['kind']
+        types = columns['type']
+        device_ids = columns['device_id']
+        valid = ~store.attached_to_root()
+        host = valid & (kind != DEVICE)
+        for type_id in np.unique(types[host]).tolist():
+            mask = host & (types == type_id)
+            event_type = store.types[type_id]
+            self.call_times[event_type] += int(np.count_nonzero(mask))
+            self.CPUTimeRange[event_type] = merge_ranges(
+                self.CPUTimeRange[event_type], store.union(mask), is_sorted=True
+            )
+            self.CPUTimeRangeSum[event_type] = sum_ranges(
+                self.CPUTimeRange[event_type]
+            )
+        device = valid & (kind == DEVICE)
+        for device_id in np.unique(device_ids[device]).tolist():
+            on_device = device & (device_ids == device_id)
+            for type_id in np.unique(types[on_device]).tolist():
+                mask = on_device & (types == type_id)
+                event_type = store.types[type_id]
+                self.call_times[event_type] += int(np.count_nonzero(mask))
+                # the ranges of all streams are merged
+                self.GPUTimeRange[device_id][event_type] = merge_ranges(
+                    self.GPUTimeRange[device_id][event_type],
+                    store.union(mask),
+                    is_sorted=True,
                 )
-            for device_id, device_time_ranges in GPUTimeRange.items():
-                for event_type, event_time_ranges in device_time_ranges.items():
-                    for stream_id, time_ranges in event_time_ranges.items():
-                        time_ranges = merge_self_ranges(
-                            time_ranges, is_sorted=False
-                        )
-                        self.GPUTimeRange[device_id][event_type] = merge_ranges(
-                            self.GPUTimeRange[device_id][event_type],
-                            time_ranges,
-                            is_sorted=True,
-                        )
-
-        for event_type, time_ranges in self.CPUTimeRange.items():
-            self.CPUTimeRangeSum[event_type] = sum_ranges(time_ranges)
-        for device_id, device_time_ranges in self.GPUTimeRange.items():
-            for event_type, time_ranges in device_time_ranges.items():
                 self.GPUTimeRangeSum[device_id][event_type] = sum_ranges(
-                    time_ranges
+                    self.GPUTimeRange[device_id][event_type]
                 )
 
     def get_gpu_devices(self):
@@ -430,71 +417,86 @@ class DistributedSummary:
         self.overlap_range = []
         self.cpu_calls = 0
         self.gpu_calls = 0
+        # the distinct communication ranges, counted as calls
+        self._cpu_communication_calls = np.empty((0, 2), dtype=np.int64)
+        self._gpu_communication_calls = np.empty((0, 2), dtype=np.int64)
 
     def parse(self, nodetrees):
         '''
         Collect all communication and computation time ranges.
         '''
-        thread2hostnodes = traverse_tree(nodetrees)
-        for threadid, hostnodes in thread2hostnodes.items():
-            for hostnode in hostnodes[1:]:  # skip root node
-                # case 1: TracerEventType is Communication
-                if hostnode.type == TracerEventType.Communication:
-                    self.cpu_communication_range.append(
-                        (hostnode.start_ns, hostnode.end_ns)
-                    )
-                    device_nodes = get_device_nodes(hostnode)
-                    for device_node in device_nodes:
-                        if device_node.type == TracerEventType.Kernel:
-                            self.gpu_communication_range.append(
-                                (device_node.start_ns, device_node.end_ns)
-                            )
-
-                # case 2: TracerEventType is Operator but is communication op
-                elif hostnode.type == TracerEventType.Operator and any(
-                    [
-                        name in hostnode.name.lower()
-                        for name in _CommunicationOpName
-                    ]
-                ):
-                    self.cpu_communication_range.append(
-                        (hostnode.start_ns, hostnode.end_ns)
+        self.update(EventStore.from_nodetrees(nodetrees))
+
+    def update(self, store):
+        '''
+        Add the communication and computation time ranges of an EventStore, e.g. the events of one more step window.
+        '''
+        columns = store.columns
+        kind = columns['kind']
+        parent = columns['parent']
+        host = kind == HOST
+        # case 1: TracerEventType is Communication
+        # case 2: TracerEventType is Operator but is communication op
+        communication = host & (
+            store.type_mask(TracerEventType.Communication)
+            | (
+                store.type_mask(TracerEventType.Operator)
+                & store.name_mask(
+                    lambda name: any(
+                        [
+                            op_name in name.lower()
+                            for op_name in _CommunicationOpName
+                        ]
                     )
-                    device_nodes = get_device_nodes(hostnode)
-                    for device_node in device_nodes:
-                        if device_node.type == TracerEventType.Kernel:
-                            self.gpu_communication_range.append(
-                                (device_node.start_ns, device_node.end_ns)
-                            )
-
-                # case 3: Others, filter kernels named with nccl
-                else:
-                    for runtimenode in hostnode.runtime_node:
-                        for devicenode in runtimenode.device_node:
-                            if devicenode.type == TracerEventType.Kernel:
-                                if 'nccl' in devicenode.name.lower():
-                                    self.gpu_communication_range.append(
-                                        (devicenode.start_ns, devicenode.end_ns)
-                                    )
-                                else:
-                                    self.computation_range.append(
-                                        (devicenode.start_ns, devicenode.end_ns)
-                                    )
-        self.cpu_calls = len(set(self.cpu_communication_range))
-        self.gpu_calls = len(set(self.gpu_communication_range))
-        self.cpu_communication_range = merge_self_ranges(
-            self.cpu_communication_range, is_sorted=False
+                )
+            )
+        )
+        kernel = (
+            (kind == DEVICE)
+            & store.type_mask(TracerEventType.Kernel)
+            & ~store.attached_to_root()
         )
-        self.gpu_communication_range = merge_self_ranges(
-            self.gpu_communication_range, is_sorted=False
+        # kernels called in the time range of case 1 and case 2
+        gpu_communication = kernel & store.propagate(communication)
+        # case 3: Others, filter kernels named with nccl
+        others = np.zeros(len(store), dtype=bool)
+        kernel_indices = np.flatnonzero(kernel)
+        others[kernel_indices] = ~communication[parent[parent[kernel_indices]]]
+        nccl = store.name_mask(lambda name: 'nccl' in name.lower())
+        gpu_communication |= others & nccl
+        computation = others & ~nccl
+
+        self._cpu_communication_calls = np.unique(
+            np.concatenate(
+                [self._cpu_communication_calls, store.ranges(communication)]
+            ),
+            axis=0,
+        )
+        self._gpu_communication_calls = np.unique(
+            np.concatenate(
+                [self._gpu_communication_calls, store.ranges(gpu_communication)]
+            ),
+            axis=0,
+        )
+        self.cpu_calls = len(self._cpu_communication_calls)
+        self.gpu_calls = len(self._gpu_communication_calls)
+        self.cpu_communication_range = merge_ranges(
+            self.cpu_communication_range,
+            store.union(communication),
+            is_sorted=True,
+        )
+        self.gpu_communication_range = merge_ranges(
+            self.gpu_communication_range,
+            store.union(gpu_communication),
+            is_sorted=True,
         )
         self.communication_range = merge_ranges(
             self.cpu_communication_range,
             self.gpu_communication_range,
             is_sorted=True,
         )
-        self.computation_range = merge_self_ranges(
-            self.computation_range, is_sorted=False
+        self.computation_range = merge_ranges(
+            self.computation_range, store.union(computation), is_sorted=True
         )
         self.overlap_range = intersection_ranges(
             self.communication_range, self.computation_range, is_sorted=True
@@ -631,10 +633,14 @@ class EventSummary:
         self.memory_manipulation_items = {}  # for memory manipulation summary
         self.kernel_items = {}  # for kernel summary
 
-    def parse(self, nodetrees):
+    def parse(self, nodetrees, store=None):
         r"""
-        Analysis operator event in the nodetress.
+        Analysis operator event in the nodetress. The kernel summary is
+        aggregated from ``store``, the EventStore of the nodetrees, which is
+        built if not given.
         """
+        if store is None:
+            store = EventStore.from_nodetrees(nodetrees)
         node_statistic_trees, thread2host_statistic_nodes = wrap_tree(nodetrees)
         for (
             threadid,
@@ -662,7 +668,7 @@ class EventSummary:
                             == TracerEventType.PythonUserDefined
                         ):
                             self.add_userdefined_item(host_statistic_node)
-            self.add_kernel_item(host_statistic_nodes[0])
+        self.add_kernel_items(store)
 
         for threadid, root_statistic_node in node_statistic_trees.items():
             deque = collections.deque()
@@ -757,6 +763,21 @@ class EventSummary:
                     self.kernel_items[name] = EventSummary.DeviceItem(name)
                 self.kernel_items[name].add_item(device_node)
 
+    def add_kernel_items(self, store):
+        kernel = (store.columns['kind'] == DEVICE) & store.type_mask(
+            TracerEventType.Kernel
+        )
+        for name, (calls, total, min_time, max_time) in store.aggregate(
+            kernel
+        ).items():
+            if name not in self.kernel_items:
+                self.kernel_items[name] = EventSummary.DeviceItem(name)
+            item = self.kernel_items[name]
+            item.call += calls
+            item.gpu_time += total
+            item.max_gpu_time = max(item.max_gpu_time, max_time)
+            item.min_gpu_time = min(item.min_gpu_time, min_time)
+
 
 class MemorySummary:
     r"""
@@ -866,9 +887,10 @@ class StatisticData:
         self.event_summary = EventSummary()
         self.distributed_summary = DistributedSummary()
         self.memory_summary = MemorySummary()
-        self.time_range_summary.parse(node_trees)
-        self.event_summary.parse(node_trees)
-        self.distributed_summary.parse(node_trees)
+        store = EventStore.from_nodetrees(node_trees)
+        self.time_range_summary.update(store)
+        self.event_summary.parse(node_trees, store)
+        self.distributed_summary.update(store)
         self.memory_summary.parse(node_trees)
 
 
@@ -0,0 +1,321 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import json
+import os
+import socket
+import time
+import urllib.request
+from typing import Iterable, Optional
+from warnings import warn
+
+import numpy as np
+
+from paddle.fluid.core import TracerEventType
+from paddle.fluid.framework import _bump_dispatch_epoch
+from paddle.profiler import utils
+
+from .event_store import HOST, EventStore
+from .profiler import Profiler, ProfilerState, ProfilerTarget, make_scheduler
+
+__all__ = []
+
+# bucket i of a histogram counts the durations in [2^i, 2^(i+1)) ns
+_NUM_BUCKETS = 64
+
+# the categories of the aggregates, and the host event types of each
+_CATEGORIES = collections.OrderedDict(
+    [
+        ('step', [TracerEventType.ProfileStep]),
+        ('layer', [TracerEventType.Forward]),
+        ('operator', [TracerEventType.Operator]),
+        (
+            'user_defined',
+            [TracerEventType.UserDefined, TracerEventType.PythonUserDefined],
+        ),
+    ]
+)
+
+
+def _histograms(store, mask):
+    r"""
+    Group the events in ``mask`` by name, and get the log2 histogram and the
+    total duration of every name.
+
+    Returns:
+        dict: from the name to (histogram, total_ns).
+    """
+    columns = store.columns
+    name_ids = columns['name'][mask]
+    if len(name_ids) == 0:
+        return {}
+    durations = (columns['end_ns'] - columns['start_ns'])[mask]
+    buckets = np.frexp(np.maximum(durations, 1).astype(np.float64))[1] - 1
+    buckets = np.minimum(buckets, _NUM_BUCKETS - 1)
+    unique_ids, inverse = np.unique(name_ids, return_inverse=True)
+    counts = np.bincount(
+        inverse * _NUM_BUCKETS + buckets,
+        minlength=len(unique_ids) * _NUM_BUCKETS,
+    ).reshape(len(unique_ids), _NUM_BUCKETS)
+    totals = np.zeros(len(unique_ids), dtype=np.int64)
+    np.add.at(totals, inverse, durations)
+    return {
+        store.names[name_id]: (counts[i], int(totals[i]))
+        for i, name_id in enumerate(unique_ids.tolist())
+    }
+
+
+def _quantile(histogram, q):
+    r"""
+    The upper bound of the bucket holding the ``q`` quantile.
+    """
+    cumsum = np.cumsum(histogram)
+    bucket = int(np.searchsorted(cumsum, q * cumsum[-1]))
+    return 2 ** (bucket + 1)
+
+
+class LatencyAggregator:
+    r"""
+    Rolling latency histograms of the steps, layers, operators and user
+    defined events of the sampled steps, used as the ``on_trace_ready`` of
+    :ref:`SamplingProfiler <api_paddle_profiler_SamplingProfiler>` .
+
+    The aggregates of every sampled step are kept in a ring buffer of
+    ``window`` samples, so memory stays bounded on long-running jobs, and the
+    rolling aggregates over the buffer are flushed every ``flush_interval``
+    seconds to ``target``.
+
+    Args:
+        window (int, optional): The number of sampled steps kept. Default: 64.
+        flush_interval (float, optional): The minimal interval in seconds
+            between two flushes. Default: 60.
+        target (str, optional): A file path, to which every flush appends one
+            line of JSON, or an ``http://`` url, to which every flush POSTs
+            the JSON. Default: None, which means not to flush.
+    """
+
+    def __init__(
+        self,
+        window: int = 64,
+        flush_interval: float = 60.0,
+        target: Optional[str] = None,
+    ):
+        if window < 1:
+            raise ValueError(
+                "window should be positive, but got {}".format(window)
+            )
+        self.samples = collections.deque(maxlen=window)
+        self.flush_interval = flush_interval
+        self.target = target
+        self.step_num = 0
+        self.aggregate_ns = 0
+        self._last_flush = time.time()
+
+    def __call__(self, prof):
+        self.step_num = prof.step_num
+        self.add(prof.profiler_result.get_data())
+        if time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def add(self, nodetrees):
+        r"""
+        Add the events of the node trees of one sampled step.
+        """
+        start = time.perf_counter_ns()
+        store = EventStore.from_nodetrees(nodetrees)
+        host = store.columns['kind'] == HOST
+        sample = {}
+        for category, event_types in _CATEGORIES.items():
+            mask = np.zeros(len(store), dtype=bool)
+            for event_type in event_types:
+                mask |= store.type_mask(event_type)
+            sample[category] = _histograms(store, host & mask)
+        self.samples.append(sample)
+        self.aggregate_ns += time.perf_counter_ns() - start
+
+    def aggregates(self):
+        r"""
+        The rolling aggregates over the sampled steps in the ring buffer.
+
+        Returns:
+            dict: from the category, one of 'step', 'layer', 'operator' and
+            'user_defined', to the dict from the event name to its calls,
+            total and quantiles of latency in ns, and the non-empty buckets
+            of its histogram as [upper bound in ns, count].
+        """
+        merged = {category: {} for category in _CATEGORIES}
+        for sample in self.samples:
+            for category, items in sample.items():
+                merged_items = merged[category]
+                for name, (histogram, total) in items.items():
+                    if name in merged_items:
+                        merged_histogram, merged_total = merged_items[name]
+                        merged_items[name] = (
+                            merged_histogram + histogram,
+                            merged_total + total,
+                        )
+                    else:
+                        merged_items[name] = (histogram, total)
+
+        results = {}
+        for category, items in merged.items():
+            results[category] = {}
+            for name, (histogram, total) in items.items():
+                buckets = np.flatnonzero(histogram)
+                results[category][name] = {
+                    'calls': int(histogram.sum()),
+                    'total_ns': total,
+                    'p50_ns': _quantile(histogram, 0.5),
+                    'p90_ns': _quantile(histogram, 0.9),
+                    'p99_ns': _quantile(histogram, 0.99),
+                    'histogram': [
+                        [2 ** (int(bucket) + 1), int(histogram[bucket])]
+                        for bucket in buckets
+                    ],
+                }
+        return results
+
+    def flush(self):
+        r"""
+        Write the rolling aggregates to ``target``. Failures only warn, so a
+        broken target never stops the training job.
+        """
+        self._last_flush = time.time()
+        if not self.target:
+            return
+        record = {
+            'time': self._last_flush,
+            'hostname': socket.gethostname(),
+            'pid': os.getpid(),
+            'step': self.step_num,
+            'sampled_steps': len(self.samples),
+            'aggregate_ms': self.aggregate_ns / 1e6,
+            'aggregates': self.aggregates(),
+        }
+        data = json.dumps(record, separators=(',', ':'))
+        try:
+            if self.target.startswith(('http://', 'https://')):
+                request = urllib.request.Request(
+                    self.target,
+                    data=data.encode('utf-8'),
+                    headers={'Content-Type': 'application/json'},
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+            else:
+                with open(self.target, 'a') as f:
+                    f.write(data + '\n')
+        except Exception as e:
+            warn(
+                "Failed to flush the profiler aggregates to {}: {}".format(
+                    self.target, e
+                )
+            )
+
+
+class SamplingProfiler(Profiler):
+    r"""
+    An always-on profiler for long-running jobs, which records one step in
+    every ``sample_every`` steps and keeps rolling latency histograms of the
+    steps, layers, operators and :ref:`RecordEvent <api_paddle_profiler_RecordEvent>`
+    of the sampled steps, flushed periodically to a file or a local HTTP
+    endpoint, instead of exporting full traces.
+
+    The profiler mode, which records the layers and user defined events, is
+    only on in the sampled steps, so the other steps run at full speed and
+    the overhead is about the cost of one profiled step divided by
+    ``sample_every``.
+
+    Args:
+        sample_every (int, optional): Record one step in every ``sample_every``
+            steps, at least 2. Default: 100.
+        window (int, optional): The number of sampled steps kept in the ring
+            buffer of the rolling aggregates. Default: 64.
+        flush_interval (float, optional): The minimal interval in seconds
+            between two flushes. Default: 60.
+        target (str, optional): A file path, to which every flush appends one
+            line of JSON, or an ``http://`` url, to which every flush POSTs
+            the JSON. Default: None, which means not to flush.
+        targets (list, optional): The devices to profile, see
+            :ref:`Profiler <api_paddle_profiler_Profiler>` . Default: CPU
+            only, since tracing the devices costs more.
+        skip_first (int, optional): The number of first steps not sampled,
+            e.g. the warmup steps. Default: 0.
+
+    Examples:
+        .. code-block:: python
+
+            import paddle
+            import paddle.profiler as profiler
+
+            linear = paddle.nn.Linear(10, 10)
+            prof = profiler.SamplingProfiler(
+                sample_every=10, target='./profiler_aggregates.jsonl'
+            )
+            prof.start()
+            for iter in range(100):
+                linear(paddle.rand([4, 10])).mean().backward()
+                prof.step()
+            prof.stop()
+            print(prof.aggregator.aggregates()['layer']['Linear'])
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_every: int = 100,
+        window: int = 64,
+        flush_interval: float = 60.0,
+        target: Optional[str] = None,
+        targets: Optional[Iterable[ProfilerTarget]] = None,
+        skip_first: int = 0,
+    ):
+        if sample_every < 2:
+            raise ValueError(
+                "sample_every should be at least 2, but got {}".format(
+                    sample_every
+                )
+            )
+        self.aggregator = LatencyAggregator(window, flush_interval, target)
+        super().__init__(
+            targets=targets or [ProfilerTarget.CPU],
+            scheduler=make_scheduler(
+                closed=sample_every - 2,
+                ready=1,
+                record=1,
+                skip_first=skip_first,
+            ),
+            on_trace_ready=self.aggregator,
+        )
+
+    def _sync_profiler_mode(self):
+        used = self.current_state in (
+            ProfilerState.RECORD,
+            ProfilerState.RECORD_AND_RETURN,
+        )
+        if utils._is_profiler_used != used:
+            utils._is_profiler_used = used
+            _bump_dispatch_epoch()
+
+    def start(self):
+        super().start()
+        self._sync_profiler_mode()
+
+    def _trigger_action(self):
+        super()._trigger_action()
+        self._sync_profiler_mode()
+
+    def stop(self):
+        super().stop()
+        self.aggregator.flush()
@@ -13,216 +13,139 @@
 # limitations under the License.
 
 
-def sum_ranges(ranges):
-    result = 0
-    for time_range in ranges:
-        result += time_range[1] - time_range[0]
-    return result
+import numpy as np
 
 
-def merge_self_ranges(src_ranges, is_sorted=False):
-    merged_ranges = []
-    if len(src_ranges) > 0:
-        if not is_sorted:
-            src_ranges.sort(key=lambda x: x[0])
-        cur_indx = 0
-        merged_ranges.append((src_ranges[cur_indx][0], src_ranges[cur_indx][1]))
-        for cur_indx in range(1, len(src_ranges)):
-            if src_ranges[cur_indx][1] > merged_ranges[-1][1]:
-                if src_ranges[cur_indx][0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (
-                        merged_ranges[-1][0],
-                        src_ranges[cur_indx][1],
-                    )
-                else:
-                    merged_ranges.append(
-                        (src_ranges[cur_indx][0], src_ranges[cur_indx][1])
-                    )
-    return merged_ranges
+def _as_ranges(ranges):
+    r"""
+    Convert a list of (start, end) tuples or an array to an int64 array of
+    shape [N, 2].
+    """
+    ranges = np.asarray(ranges, dtype=np.int64)
+    return ranges.reshape(-1, 2)
 
 
-def merge_ranges(range_list1, range_list2, is_sorted=False):
-    merged_ranges = []
-    if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
-    len1 = len(range_list1)
-    len2 = len(range_list2)
-    if len1 == 0 and len2 == 0:
-        return merged_ranges
-    elif len1 == 0:
-        return range_list2
-    elif len2 == 0:
-        return range_list1
-    else:
-        indx1 = 0
-        indx2 = 0
-        range1 = range_list1[indx1]
-        range2 = range_list2[indx2]
-        if range1[0] < range2[0]:
-            merged_ranges.append(range1)
-            indx1 += 1
-        else:
-            merged_ranges.append(range2)
-            indx2 += 1
-        while indx1 < len1 and indx2 < len2:
-            range1 = range_list1[indx1]
-            range2 = range_list2[indx2]
-            if range1[0] < range2[0]:
-                if range1[1] > merged_ranges[-1][1]:
-                    if range1[0] <= merged_ranges[-1][1]:
-                        merged_ranges[-1] = (merged_ranges[-1][0], range1[1])
-                    else:
-                        merged_ranges.append((range1[0], range1[1]))
-                    indx1 += 1
-                else:
-                    indx1 += 1
-            else:
-                if range2[1] > merged_ranges[-1][1]:
-                    if range2[0] <= merged_ranges[-1][1]:
-                        merged_ranges[-1] = (merged_ranges[-1][0], range2[1])
-                    else:
-                        merged_ranges.append((range2[0], range2[1]))
-                    indx2 += 1
-                else:
-                    indx2 += 1
-
-        while indx1 < len1:
-            range1 = range_list1[indx1]
-            if range1[1] > merged_ranges[-1][1]:
-                if range1[0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (merged_ranges[-1][0], range1[1])
-                else:
-                    merged_ranges.append((range1[0], range1[1]))
-                indx1 += 1
-            else:
-                indx1 += 1
-        while indx2 < len2:
-            range2 = range_list2[indx2]
-            if range2[1] > merged_ranges[-1][1]:
-                if range2[0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (merged_ranges[-1][0], range2[1])
-                else:
-                    merged_ranges.append((range2[0], range2[1]))
-                indx2 += 1
-            else:
-                indx2 += 1
-    return merged_ranges
+def _to_list(ranges):
+    return [tuple(time_range) for time_range in ranges.tolist()]
 
 
-def intersection_ranges(range_list1, range_list2, is_sorted=False):
-    result_range = []
-    if len(range_list1) == 0 or len(range_list2) == 0:
-        return result_range
+def sum_ranges(ranges):
+    ranges = _as_ranges(ranges)
+    return int(np.sum(ranges[:, 1] - ranges[:, 0]))
+
+
+def merge_self_ranges_array(src_ranges, is_sorted=False):
+    r"""
+    Merge the overlapping and touching ranges by one sort and one sweep:
+    a range starts a new merged range if it starts after the max end of
+    all the ranges before it.
+    """
+    src_ranges = _as_ranges(src_ranges)
+    if len(src_ranges) == 0:
+        return src_ranges
     if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
+        src_ranges = src_ranges[np.argsort(src_ranges[:, 0], kind='stable')]
+    starts = src_ranges[:, 0]
+    max_ends = np.maximum.accumulate(src_ranges[:, 1])
+    is_first = np.empty(len(src_ranges), dtype=bool)
+    is_first[0] = True
+    is_first[1:] = starts[1:] > max_ends[:-1]
+    firsts = np.flatnonzero(is_first)
+    lasts = np.append(firsts[1:] - 1, len(src_ranges) - 1)
+    return np.stack([starts[firsts], max_ends[lasts]], axis=1)
+
+
+def merge_ranges_array(range_list1, range_list2, is_sorted=False):
+    range_list1 = _as_ranges(range_list1)
+    range_list2 = _as_ranges(range_list2)
+    if is_sorted and len(range_list2) == 0:
+        return range_list1
+    if is_sorted and len(range_list1) == 0:
+        return range_list2
+    return merge_self_ranges_array(
+        np.concatenate([range_list1, range_list2]), is_sorted=False
+    )
+
 
+def _sweep(range_list1, range_list2):
+    r"""
+    Sweep the boundaries of two range lists in time order, the ends before
+    the starts at the same time. Returns the pieces between two adjacent
+    boundaries, and how many ranges of each list cover each piece.
+    """
     len1 = len(range_list1)
     len2 = len(range_list2)
-    indx1 = 0
-    indx2 = 0
-    range1 = range_list1[indx1]
-    range2 = range_list2[indx2]
-    while indx1 < len1 and indx2 < len2:
-        if range2[1] <= range1[0]:
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] <= range1[0] and range2[1] < range1[1]:
-            assert range2[1] > range1[0]
-            result_range.append((range1[0], range2[1]))
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] <= range1[0]:
-            assert range2[1] >= range1[1]
-            result_range.append(range1)
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-
-        elif range2[1] < range1[1]:
-            assert range2[0] > range1[0]
-            result_range.append(range2)
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] < range1[1]:
-            assert range2[1] >= range1[1]
-            result_range.append((range2[0], range1[1]))
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-
-        else:
-            assert range2[0] >= range1[1]
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-    return result_range
+    times = np.concatenate(
+        [
+            range_list1[:, 0],
+            range_list1[:, 1],
+            range_list2[:, 0],
+            range_list2[:, 1],
+        ]
+    )
+    delta1 = np.concatenate(
+        [
+            np.ones(len1, dtype=np.int64),
+            -np.ones(len1, dtype=np.int64),
+            np.zeros(2 * len2, dtype=np.int64),
+        ]
+    )
+    delta2 = np.concatenate(
+        [
+            np.zeros(2 * len1, dtype=np.int64),
+            np.ones(len2, dtype=np.int64),
+            -np.ones(len2, dtype=np.int64),
+        ]
+    )
+    order = np.lexsort((delta1 + delta2, times))
+    times = times[order]
+    count1 = np.cumsum(delta1[order])[:-1]
+    count2 = np.cumsum(delta2[order])[:-1]
+    return times[:-1], times[1:], count1, count2
+
+
+def _select_pieces(starts, ends, mask):
+    mask &= ends > starts
+    return np.stack([starts[mask], ends[mask]], axis=1)
+
+
+def intersection_ranges_array(range_list1, range_list2, is_sorted=False):
+    range_list1 = _as_ranges(range_list1)
+    range_list2 = _as_ranges(range_list2)
+    if len(range_list1) == 0 or len(range_list2) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    if not is_sorted:
+        range_list1 = merge_self_ranges_array(range_list1)
+        range_list2 = merge_self_ranges_array(range_list2)
+    starts, ends, count1, count2 = _sweep(range_list1, range_list2)
+    return _select_pieces(starts, ends, (count1 > 0) & (count2 > 0))
 
 
-def subtract_ranges(range_list1, range_list2, is_sorted=False):
-    result_range = []
+def subtract_ranges_array(range_list1, range_list2, is_sorted=False):
+    range_list1 = _as_ranges(range_list1)
+    range_list2 = _as_ranges(range_list2)
     if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
-    if len(range_list1) == 0:
-        return result_range
-    if len(range_list2) == 0:
+        range_list1 = merge_self_ranges_array(range_list1)
+        range_list2 = merge_self_ranges_array(range_list2)
+    if len(range_list1) == 0 or len(range_list2) == 0:
         return range_list1
+    starts, ends, count1, count2 = _sweep(range_list1, range_list2)
+    return _select_pieces(starts, ends, (count1 > 0) & (count2 <= 0))
 
-    len1 = len(range_list1)
-    len2 = len(range_list2)
-    indx1 = 0
-    indx2 = 0
-    range1 = range_list1[indx1]
-    range2 = range_list2[indx2]
-
-    while indx1 < len(range_list1):
-        if indx2 == len(range_list2):
-            result_range.append(range1)
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-        elif range2[1] <= range1[0]:
-            indx2 += 1
-            if indx2 != len2:
-                range2 = range_list2[indx2]
-        elif range2[0] <= range1[0] and range2[1] < range1[1]:
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 != len2:
-                range2 = range_list2[indx2]
-        elif range2[0] <= range1[0]:
-            assert range2[1] >= range1[1]
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 != len1:
-                range1 = range_list1[indx1]
-        elif range2[0] < range1[1]:
-            assert range2[0] > range1[0]
-            result_range.append((range1[0], range2[0]))
-            range1 = (range2[0], range1[1])
-        else:
-            assert range2[0] >= range1[1]
-            result_range.append(range1)
-            indx1 += 1
-            if indx1 != len1:
-                range1 = range_list1[indx1]
-    return result_range
+
+def merge_self_ranges(src_ranges, is_sorted=False):
+    return _to_list(merge_self_ranges_array(src_ranges, is_sorted))
+
+
+def merge_ranges(range_list1, range_list2, is_sorted=False):
+    return _to_list(merge_ranges_array(range_list1, range_list2, is_sorted))
+
+
+def intersection_ranges(range_list1, range_list2, is_sorted=False):
+    return _to_list(
+        intersection_ranges_array(range_list1, range_list2, is_sorted)
+    )
+
+
+def subtract_ranges(range_list1, range_list2, is_sorted=False):
+    return _to_list(subtract_ranges_array(range_list1, range_list2, is_sorted))
@@ -0,0 +1,239 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+import os
+import socket
+
+import numpy as np
+
+from paddle.fluid.core import TracerEventType
+
+from .event_store import DEVICE, EventStore
+
+__all__ = []
+
+# the pids of the devices in a trace, which are out of the range of the
+# process ids of the hosts
+_DEVICE_PID_OFFSET = 1 << 32
+
+# the name of the metadata event holding the rank and host of a trace
+TRACE_INFO_NAME = 'paddle_trace_info'
+
+
+def _get_rank():
+    return int(os.getenv('PADDLE_TRAINER_ID', '0'))
+
+
+def _open_trace(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', compresslevel=6)
+    return open(path, mode)
+
+
+class ChromeTraceWriter:
+    r"""
+    Write the events of profiler node trees to a chrome trace file
+    incrementally, one step window after another.
+
+    The file is in the JSON Array Format of chrome tracing, whose closing
+    ``]`` is optional, and every write appends a complete gzip member to a
+    ``.gz`` file, so the file can be loaded by chrome://tracing or Perfetto
+    at any time, even while the job is still writing it.
+
+    Args:
+        path (str): The path of the trace, gzip-compressed if it ends with
+            ``.gz``.
+        min_duration_ns (int, optional): The events shorter than it are not
+            written, except the ProfileStep events. Default: 0.
+        rank (int, optional): The rank written into the trace for merging the
+            traces of ranks. Default: None, which means PADDLE_TRAINER_ID.
+    """
+
+    def __init__(self, path, min_duration_ns=0, rank=None):
+        self.path = path
+        self.min_duration_ns = min_duration_ns
+        self.rank = _get_rank() if rank is None else rank
+        self.pid = os.getpid()
+        self.hostname = socket.gethostname()
+        self._named_pids = set()
+        self._named_tids = set()
+        self._empty = True
+        with _open_trace(path, 'w') as f:
+            f.write('[\n')
+        self._write(
+            [
+                json.dumps(
+                    {
+                        'name': TRACE_INFO_NAME,
+                        'ph': 'M',
+                        'pid': self.pid,
+                        'args': {
+                            'rank': self.rank,
+                            'hostname': self.hostname,
+                            'pid': self.pid,
+                        },
+                    }
+                )
+            ]
+        )
+
+    def _write(self, lines):
+        if not lines:
+            return
+        with _open_trace(self.path, 'a') as f:
+            if not self._empty:
+                f.write(',\n')
+            f.write(',\n'.join(lines))
+        self._empty = False
+
+    def _metadata(self, pid, tid, process_name, thread_name):
+        lines = []
+        if pid not in self._named_pids:
+            self._named_pids.add(pid)
+            lines.append(
+                json.dumps(
+                    {
+                        'name': 'process_name',
+                        'ph': 'M',
+                        'pid': pid,
+                        'args': {'name': process_name},
+                    }
+                )
+            )
+        if (pid, tid) not in self._named_tids:
+            self._named_tids.add((pid, tid))
+            lines.append(
+                json.dumps(
+                    {
+                        'name': 'thread_name',
+                        'ph': 'M',
+                        'pid': pid,
+                        'tid': tid,
+                        'args': {'name': thread_name},
+                    }
+                )
+            )
+        return lines
+
+    def _event_lines(self, store, indices):
+        columns = store.columns
+        kind = columns['kind']
+        type_names = {
+            type_id: str(event_type).split('.')[-1]
+            for type_id, event_type in store.types.items()
+        }
+        lines = []
+        for i in indices.tolist():
+            if kind[i] == DEVICE:
+                device_id = int(columns['device_id'][i])
+                pid = _DEVICE_PID_OFFSET + device_id
+                tid = int(columns['stream_id'][i])
+                lines.extend(
+                    self._metadata(
+                        pid,
+                        tid,
+                        'rank {} device {}'.format(self.rank, device_id),
+                        'stream {}'.format(tid),
+                    )
+                )
+            else:
+                pid = self.pid
+                tid = store.threads[columns['thread'][i]]
+                lines.extend(
+                    self._metadata(
+                        pid,
+                        tid,
+                        'rank {} {} pid {}'.format(
+                            self.rank, self.hostname, self.pid
+                        ),
+                        'thread {}'.format(tid),
+                    )
+                )
+            start_ns = int(columns['start_ns'][i])
+            end_ns = int(columns['end_ns'][i])
+            lines.append(
+                '{{"name": {}, "cat": "{}", "ph": "X", "pid": {}, '
+                '"tid": {}, "ts": {}.{:03d}, "dur": {}.{:03d}}}'.format(
+                    json.dumps(store.names[columns['name'][i]]),
+                    type_names[columns['type'][i]],
+                    pid,
+                    json.dumps(tid),
+                    start_ns // 1000,
+                    start_ns % 1000,
+                    (end_ns - start_ns) // 1000,
+                    (end_ns - start_ns) % 1000,
+                )
+            )
+        return lines
+
+    def write_store(self, store):
+        r"""
+        Write the events of an EventStore, one step window at a time.
+        """
+        if len(store) == 0:
+            return
+        columns = store.columns
+        keep = (
+            columns['end_ns'] - columns['start_ns'] >= self.min_duration_ns
+        ) | store.type_mask(TracerEventType.ProfileStep)
+        window_index = store.window_index()
+        order = np.argsort(window_index, kind='stable')
+        order = order[keep[order]]
+        sorted_index = window_index[order]
+        bounds = np.flatnonzero(np.diff(sorted_index)) + 1
+        for indices in np.split(order, bounds):
+            if len(indices):
+                self._write(self._event_lines(store, indices))
+
+    def write_nodetrees(self, nodetrees):
+        r"""
+        Write the events of profiler node trees, e.g. the result of
+        ``ProfilerResult.get_data()``.
+        """
+        self.write_store(EventStore.from_nodetrees(nodetrees))
+
+
+def load_chrome_trace(path):
+    r"""
+    Load the events of a chrome trace file, which may be gzip-compressed, in
+    the JSON Object Format or in the JSON Array Format without the closing
+    ``]``.
+
+    Returns:
+        list: the trace events.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+    text = data.decode('utf-8').strip()
+    if text.startswith('{'):
+        return json.loads(text)['traceEvents']
+    text = text.rstrip(',')
+    if not text.endswith(']'):
+        text += ']'
+    return json.loads(text)
+
+
+def write_chrome_trace(path, events):
+    r"""
+    Write the events to a chrome trace file in the JSON Object Format,
+    gzip-compressed if ``path`` ends with ``.gz``.
+    """
+    with _open_trace(path, 'w') as f:
+        f.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        f.write(',\n'.join(json.dumps(event) for event in events))
+        f.write('\n]}\n')
@@ -0,0 +1,230 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Merge the chrome traces of the ranks of a paddle.distributed.launch job into
+one timeline, e.g.
+
+    python -m paddle.profiler.trace_merge log/*.paddle_trace.json.gz \
+        --output merged.json.gz --overview overview.json.gz
+
+The clocks of the ranks are aligned by the ProfileStep events: in a
+synchronous job every rank starts step k at about the same time, so the
+offset of a rank is the median difference between the start times of its
+steps and those of the reference rank.
+"""
+
+import argparse
+from warnings import warn
+
+import numpy as np
+
+from .trace_export import TRACE_INFO_NAME, load_chrome_trace, write_chrome_trace
+
+__all__ = []
+
+
+def _trace_rank(events, default):
+    for event in events:
+        if event.get('ph') == 'M' and event.get('name') == TRACE_INFO_NAME:
+            return event['args']['rank']
+    return default
+
+
+def _step_starts(events):
+    return {
+        event['name']: float(event['ts'])
+        for event in events
+        if event.get('ph') == 'X' and event.get('cat') == 'ProfileStep'
+    }
+
+
+def estimate_clock_offsets(traces, reference_rank=None):
+    r"""
+    Estimate the clock offset of every rank to the reference rank in us, by
+    the median difference between the start times of the same ProfileStep.
+
+    Args:
+        traces (dict): from the rank to its trace events.
+        reference_rank (int, optional): Default: None, the smallest rank.
+
+    Returns:
+        dict: from the rank to its offset, which is subtracted from its
+        timestamps to align it to the reference rank.
+    """
+    if reference_rank is None:
+        reference_rank = min(traces)
+    reference = _step_starts(traces[reference_rank])
+    offsets = {}
+    for rank, events in traces.items():
+        steps = _step_starts(events)
+        common = [name for name in steps if name in reference]
+        if not common:
+            if rank != reference_rank:
+                warn(
+                    "Rank {} has no ProfileStep in common with rank {}, its "
+                    "clock is not aligned.".format(rank, reference_rank)
+                )
+            offsets[rank] = 0.0
+            continue
+        offsets[rank] = float(
+            np.median([steps[name] - reference[name] for name in common])
+        )
+    return offsets
+
+
+def downsample_trace(events, max_events):
+    r"""
+    Get an overview of the trace by keeping the ``max_events`` longest
+    duration events, together with all the metadata and ProfileStep
+    events, so the top level of the timeline stays complete.
+    """
+    durations = [
+        float(event.get('dur', 0))
+        for event in events
+        if event.get('ph') == 'X' and event.get('cat') != 'ProfileStep'
+    ]
+    if len(durations) <= max_events:
+        return list(events)
+    threshold = np.partition(durations, len(durations) - max_events)[
+        len(durations) - max_events
+    ]
+    kept = []
+    num_kept = 0
+    for event in events:
+        if event.get('ph') != 'X' or event.get('cat') == 'ProfileStep':
+            kept.append(event)
+        elif float(event.get('dur', 0)) >= threshold and num_kept < max_events:
+            kept.append(event)
+            num_kept += 1
+    return kept
+
+
+def merge_chrome_traces(
+    paths,
+    output,
+    overview=None,
+    overview_max_events=100000,
+    align=True,
+    reference_rank=None,
+):
+    r"""
+    Merge the chrome traces of the ranks into one timeline. The processes of
+    every rank are renumbered and sorted by rank, and their names are
+    prefixed with the rank.
+
+    Args:
+        paths (list): The traces of the ranks, written by
+            ``export_chrome_tracing_stream`` or ``Profiler.export``. The rank
+            of a trace without rank info is its index in ``paths``.
+        output (str): The merged trace, gzip-compressed if it ends with
+            ``.gz``.
+        overview (str, optional): The downsampled overview of the merged
+            trace. Default: None, which means not to write it.
+        overview_max_events (int, optional): The max number of duration
+            events in the overview. Default: 100000.
+        align (bool, optional): Whether to align the clocks of the ranks by
+            the ProfileStep events. Default: True.
+        reference_rank (int, optional): The rank whose clock the others are
+            aligned to. Default: None, the smallest rank.
+
+    Returns:
+        dict: from the rank to the clock offset in us subtracted from it.
+    """
+    traces = {}
+    for index, path in enumerate(paths):
+        events = load_chrome_trace(path)
+        rank = _trace_rank(events, index)
+        if rank in traces:
+            raise ValueError(
+                "The trace {} has the same rank {} as another trace.".format(
+                    path, rank
+                )
+            )
+        traces[rank] = events
+
+    if align:
+        offsets = estimate_clock_offsets(traces, reference_rank)
+    else:
+        offsets = {rank: 0.0 for rank in traces}
+
+    merged = []
+    pids = {}
+    for rank in sorted(traces):
+        offset = offsets[rank]
+        for event in traces[rank]:
+            if event.get('name') == TRACE_INFO_NAME:
+                continue
+            event = dict(event)
+            if 'pid' in event:
+                key = (rank, event['pid'])
+                if key not in pids:
+                    pids[key] = len(pids) + 1
+                    merged.append(
+                        {
+                            'name': 'process_sort_index',
+                            'ph': 'M',
+                            'pid': pids[key],
+                            'args': {'sort_index': pids[key]},
+                        }
+                    )
+                event['pid'] = pids[key]
+            if event.get('ph') == 'M':
+                if event.get('name') == 'process_name':
+                    name = str(event['args'].get('name', ''))
+                    if not name.startswith('rank '):
+                        event['args'] = dict(
+                            event['args'],
+                            name='rank {} {}'.format(rank, name),
+                        )
+            elif 'ts' in event:
+                event['ts'] = float(event['ts']) - offset
+            merged.append(event)
+
+    write_chrome_trace(output, merged)
+    if overview:
+        write_chrome_trace(
+            overview, downsample_trace(merged, overview_max_events)
+        )
+    return offsets
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Merge the chrome traces of the ranks into one timeline."
+    )
+    parser.add_argument("traces", nargs="+", help="the traces of the ranks")
+    parser.add_argument("--output", required=True, help="the merged trace")
+    parser.add_argument("--overview", help="the downsampled overview trace")
+    parser.add_argument("--overview_max_events", type=int, default=100000)
+    parser.add_argument(
+        "--no_align",
+        action="store_true",
+        help="do not align the clocks of the ranks",
+    )
+    parser.add_argument("--reference_rank", type=int, default=None)
+    args = parser.parse_args(args)
+    offsets = merge_chrome_traces(
+        args.traces,
+        args.output,
+        overview=args.overview,
+        overview_max_events=args.overview_max_events,
+        align=not args.no_align,
+        reference_rank=args.reference_rank,
+    )
+    for rank in sorted(offsets):
+        print("rank {}: clock offset {:.3f} us".format(rank, offsets[rank]))
+
+
+if __name__ == '__main__':
+    main()
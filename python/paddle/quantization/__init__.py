@@ -51,10 +51,12 @@ from .config import QuantConfig
 from .base_quanter import BaseQuanter
 from .factory import quanter
 from .qat import QAT
+from .ptq import PTQ
 
 __all__ = [
     "QuantConfig",
     "BaseQuanter",
     "quanter",
     "QAT",
+    "PTQ",
 ]
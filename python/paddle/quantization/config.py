@@ -423,7 +423,7 @@ class QuantConfig(object):
                 + '): '
                 + sublayer_str
                 + ', '
-                + str(self._layer2config[sublayer])
+                + str(self._layer2config.get(sublayer, None))
             )
 
         final_str = layer.__class__.__name__ + '('
@@ -0,0 +1,73 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import paddle
+
+from ..base_quanter import BaseQuanter
+from ..factory import QuanterFactory
+
+
+class AbsmaxObserver(QuanterFactory):
+    r"""
+    Observe the maximum absolute value of the target tensor for
+    post-training quantization. The maximum is reduced on the device of the
+    tensor and accumulated in a one-element tensor, so no tensor is kept
+    after it is observed.
+
+    And it is symmetric uniform quantization which means the zero point is always 0.
+
+    Args:
+        quant_bits(int, optional): Number of bits to represent an quantized integer in binary.
+
+    Examples:
+       .. code-block:: python
+
+            from paddle.quantization import QuantConfig
+            from paddle.quantization.observers import AbsmaxObserver
+            observer = AbsmaxObserver(quant_bits=8)
+            q_config = QuantConfig(activation=observer, weight=None)
+    """
+
+    def __init__(self, quant_bits=8):
+        super(AbsmaxObserver, self).__init__(quant_bits=quant_bits)
+
+    def _get_class(self):
+        return AbsmaxObserverLayer
+
+
+class AbsmaxObserverLayer(BaseQuanter):
+    def __init__(self, layer, quant_bits=8):
+        super(AbsmaxObserverLayer, self).__init__()
+        self._quant_bits = quant_bits
+        self.register_buffer(
+            '_abs_max', paddle.zeros([1], dtype='float32'), persistable=True
+        )
+
+    def forward(self, input):
+        with paddle.no_grad():
+            abs_max = paddle.max(paddle.abs(input)).astype('float32')
+            self._abs_max = paddle.maximum(self._abs_max, abs_max.reshape([1]))
+        return input
+
+    def bit_length(self):
+        return self._quant_bits
+
+    def quant_axis(self):
+        return None
+
+    def scales(self):
+        return self._abs_max
+
+    def zero_points(self):
+        return None
@@ -0,0 +1,143 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import functools
+
+import paddle
+from paddle.nn import Layer
+
+from .config import QuantConfig
+
+
+class _ObserveInputsHook:
+    r"""
+    The forward pre-hook observing every tensor input of a layer, each with
+    an observer of its own created on the first call.
+    """
+
+    def __init__(self, create_observer):
+        self._create_observer = create_observer
+        self.observers = []
+
+    def __call__(self, layer, inputs):
+        tensors = [x for x in inputs if paddle.is_tensor(x)]
+        while len(self.observers) < len(tensors):
+            self.observers.append(self._create_observer())
+        for observer, x in zip(self.observers, tensors):
+            observer(x)
+
+
+class PTQ(object):
+    r"""
+    Tools used to prepare model for post-training quantization. The
+    activation observers are called by forward pre-hooks of the observed
+    layers, so every activation is observed as soon as it is produced and
+    no activation is kept for calibration. The observers are kept by PTQ
+    instead of the model, so the state dict of the model is unchanged.
+
+    Args:
+        config(QuantConfig) - Quantization configuration
+
+    Examples:
+        .. code-block:: python
+            from paddle.quantization import PTQ, QuantConfig
+            from paddle.quantization.observers import AbsmaxObserver
+            observer = AbsmaxObserver(quant_bits=8)
+            q_config = QuantConfig(activation=observer, weight=None)
+            ptq = PTQ(q_config)
+    """
+
+    def __init__(self, config: QuantConfig):
+        self._config = copy.deepcopy(config)
+        self._hook_handles = []
+        self._observe_hooks = {}
+
+    def quantize(self, model: Layer, inplace=False):
+        r"""
+        Create a model for post-training quantization.
+
+        The quantization configuration will be propagated in the model.
+        And the activation observers will be registered to the layers by
+        forward pre-hooks, without changing the forward of the model. The
+        observers are returned by ``observers``.
+
+        Args:
+            model(Layer) - The model to be quantized.
+            inplace(bool) - Whether to modify the model in-place.
+
+        Return: The prepared model for post-training quantization.
+
+        Examples:
+        .. code-block:: python
+            from paddle.quantization import PTQ, QuantConfig
+            from paddle.quantization.observers import AbsmaxObserver
+            from paddle.vision.models import LeNet
+
+            observer = AbsmaxObserver(quant_bits=8)
+            q_config = QuantConfig(activation=observer, weight=None)
+            ptq = PTQ(q_config)
+            model = LeNet()
+            model.eval()
+            quant_model = ptq.quantize(model)
+            print(quant_model)
+        """
+        _model = model if inplace else copy.deepcopy(model)
+        self._config._specify(_model)
+        self._insert_activation_observers(_model, self._config)
+        return _model
+
+    def remove_hooks(self):
+        r"""
+        Remove the forward pre-hooks calling the activation observers, which
+        stops the calibration. The observers are held by this PTQ object
+        and returned by `observers()`.
+        """
+        for handle in self._hook_handles:
+            handle.remove()
+        self._hook_handles = []
+
+    def observers(self):
+        r"""
+        Get the activation observers.
+
+        Return: A dict mapping the name of each observed layer in the model
+            to the observers of its tensor inputs, in the order of the inputs.
+        """
+        return {
+            name: hook.observers for name, hook in self._observe_hooks.items()
+        }
+
+    def _insert_activation_observers(
+        self, model: Layer, config: QuantConfig, prefix=""
+    ):
+        for name, child in model.named_children():
+            name = prefix + name
+            if config._need_observe(child):
+                hook = _ObserveInputsHook(
+                    functools.partial(config._get_observer, child)
+                )
+                self._observe_hooks[name] = hook
+                self._hook_handles.append(child.register_forward_pre_hook(hook))
+            else:
+                self._insert_activation_observers(child, config, name + ".")
+
+    def _details(self):
+        return self._config.details()
+
+    def __str__(self):
+        return self._details()
+
+    def __repr__(self):
+        return self.__str__()
@@ -15,6 +15,7 @@
 import logging
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -114,6 +115,39 @@ def _apply_pass(
     return graph
 
 
+class _CaptureSlots:
+    '''
+    The py_func callables of the streaming capture. PyFuncRegistry never
+    frees its callables, so they are registered once per process and
+    reused: the capture op of slot i calls the capture function bound to
+    slot i by the last bind.
+    '''
+
+    _func_ids = []
+    _bound = []
+
+    @classmethod
+    def func_ids(cls, num_slots):
+        while len(cls._func_ids) < num_slots:
+            cls._func_ids.append(
+                static.nn.common.PyFuncRegistry(
+                    cls._make_slot_func(len(cls._func_ids))
+                ).id
+            )
+        return cls._func_ids[:num_slots]
+
+    @classmethod
+    def bind(cls, capture_funcs):
+        cls._bound = list(capture_funcs)
+
+    @classmethod
+    def _make_slot_func(cls, slot):
+        def _capture(tensor):
+            cls._bound[slot](tensor)
+
+        return _capture
+
+
 class PostTrainingQuantization:
     """
     Utilizing post training quantization methon to quantize the FP32 model,
@@ -154,6 +188,9 @@ class PostTrainingQuantization:
         scale_dict=None,
         return_graph=False,
         deploy_backend=None,
+        search_sample_size=None,
+        num_threads=None,
+        streaming_capture=False,
     ):
         '''
         Constructor.
@@ -247,6 +284,21 @@ class PostTrainingQuantization:
             deploy_backend(str, optional): Deploy backend, it can be None, `TensorRT`,
                 `MKLDNN`, `ARM`. And it will extend the new backend. Default is None,
                 which means to use the default general quantization configuration.
+            search_sample_size(int, optional): If set, the threshold search of
+                algo 'mse' and 'emd' evaluates the loss of an activation with
+                more elements on a fixed random subsample of this size, which
+                is much faster for large activations. Default is None, which
+                means to use all the elements.
+            num_threads(int, optional): The number of threads to sample the
+                independent variables and to quantize the weights in parallel.
+                Default is None, which means to use the number of CPUs, but at
+                most 8.
+            streaming_capture(bool, optional): If set as True, every activation
+                is passed to the sampling by a py_func op right after it is
+                produced, and then released, instead of keeping all the
+                activations persistable in the scope until the end of every
+                batch. It reduces the peak memory of calibration. Default is
+                False.
         Returns:
             None
 
@@ -362,6 +414,11 @@ class PostTrainingQuantization:
         self._clip_extra = True if self._onnx_format else False
         self._skip_tensor_list = skip_tensor_list
         self._optimize_model = optimize_model
+        self._search_sample_size = search_sample_size
+        if num_threads is None:
+            num_threads = min(os.cpu_count() or 1, 8)
+        self._num_threads = num_threads
+        self._streaming_capture = streaming_capture
 
         # Define variables
         self._place = self._executor.place
@@ -372,6 +429,13 @@ class PostTrainingQuantization:
 
         self._quantized_weight_var_name = set()
         self._quantized_act_var_name = set()
+        # The vars for sampling, see _set_activation_persistable
+        self._sampling_program = None
+        self._persistable_act_var_names = set()
+        self._capture_func = None
+        self._captured_act = None
+        self._capture_slots = []
+        self._thread_pool = None
         self._weight_op_pairs = {}
         # The vars for alog = KL or hist
         self._sampling_act_abs_min_max = {}
@@ -458,14 +522,9 @@ class PostTrainingQuantization:
                 bar_format='Preparation stage, Run batch:|{bar}| {n_fmt}/{total_fmt}',
                 ncols=80,
             ) as t:
+                self._capture_func = self._collect_activation_abs_min_max
                 for data in self._data_loader():
-                    self._executor.run(
-                        program=self._program,
-                        feed=data,
-                        fetch_list=self._fetch_list,
-                        return_numpy=False,
-                        scope=self._scope,
-                    )
+                    self._run_sampling_program(data)
                     self._collect_activation_abs_min_max()
                     batch_id += 1
                     t.update()
@@ -479,14 +538,9 @@ class PostTrainingQuantization:
             bar_format='Sampling stage, Run batch:|{bar}| {n_fmt}/{total_fmt}',
             ncols=80,
         ) as t:
+            self._capture_func = self._sampling
             for data in self._data_loader():
-                self._executor.run(
-                    program=self._program,
-                    feed=data,
-                    fetch_list=self._fetch_list,
-                    return_numpy=False,
-                    scope=self._scope,
-                )
+                self._run_sampling_program(data)
                 self._sampling()
                 batch_id += 1
                 t.update()
@@ -730,20 +784,121 @@ class PostTrainingQuantization:
     def _set_activation_persistable(self):
         '''
         Set activation variables to be persistable, so can obtain
-        the tensor data in sample_data
+        the tensor data in sample_data. With streaming_capture, only the
+        activations which are not captured by py_func ops are persistable.
         '''
-        for var in self._program.list_vars():
-            if var.name in self._quantized_act_var_name:
+        if self._streaming_capture:
+            self._sampling_program = self._insert_capture_ops()
+        else:
+            self._sampling_program = self._program
+            self._persistable_act_var_names = set(self._quantized_act_var_name)
+        for var in self._sampling_program.list_vars():
+            if var.name in self._persistable_act_var_names:
                 var.persistable = True
 
     def _reset_activation_persistable(self):
         '''
         Reset activations to be not persistable.
         '''
-        for var in self._program.list_vars():
-            if var.name in self._quantized_act_var_name:
+        for var in self._sampling_program.list_vars():
+            if var.name in self._persistable_act_var_names:
                 var.persistable = False
                 self._scope.find_var(var.name).get_tensor()._clear()
+        self._sampling_program = None
+        self._capture_slots = []
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown()
+            self._thread_pool = None
+
+    def _run_sampling_program(self, data):
+        '''
+        Run the sampling program on a batch of data. The capture slots are
+        bound to the activations of this instance before every run, since
+        they are shared by all the instances.
+        '''
+        _CaptureSlots.bind(self._capture_slots)
+        self._executor.run(
+            program=self._sampling_program,
+            feed=data,
+            fetch_list=self._fetch_list,
+            return_numpy=False,
+            scope=self._scope,
+        )
+
+    def _insert_capture_ops(self):
+        '''
+        Clone the program for sampling, and insert a py_func op after the
+        last op writing every activation in the global block, which passes
+        the activation to the sampling methods as soon as it is produced.
+        So the activations are not kept alive in the scope together. The
+        activations only produced in sub-blocks are still persistable.
+
+        Returns:
+            Program: the program to run for sampling.
+        '''
+        program = self._program.clone()
+        block = program.global_block()
+        positions = {}
+        for var_name in self._feed_list:
+            if var_name in self._quantized_act_var_name:
+                # the feed ops are prepended before index 0 at runtime
+                positions[var_name] = 0
+        for idx, op in enumerate(block.ops):
+            for var_name in op.output_arg_names:
+                if var_name in self._quantized_act_var_name:
+                    positions[var_name] = idx + 1
+
+        self._capture_slots = [
+            self._make_capture_func(var_name) for var_name in positions
+        ]
+        func_ids = _CaptureSlots.func_ids(len(positions))
+        capture_ops = []
+        for func_id, (var_name, idx) in zip(func_ids, positions.items()):
+            capture_ops.append(
+                (
+                    idx,
+                    dict(
+                        type='py_func',
+                        inputs={'X': [var_name]},
+                        outputs={'Out': []},
+                        attrs={
+                            'forward_callable_id': func_id,
+                            'backward_callable_id': -1,
+                            'backward_skip_vars': [],
+                        },
+                    ),
+                )
+            )
+        block._insert_ops(capture_ops)
+        self._persistable_act_var_names = self._quantized_act_var_name - set(
+            positions
+        )
+        return program
+
+    def _make_capture_func(self, var_name):
+        def _capture(tensor):
+            self._captured_act = (var_name, np.array(tensor))
+            try:
+                self._capture_func()
+            finally:
+                self._captured_act = None
+
+        return _capture
+
+    def _sampling_act_var_names(self):
+        '''
+        Get the activations to sample now, which is the activation passed by
+        its py_func op in the streaming capture, or the persistable
+        activations after the program runs.
+        '''
+        if self._captured_act is not None:
+            return [self._captured_act[0]]
+        return self._persistable_act_var_names
+
+    def _load_act_data(self, var_name):
+        if self._captured_act is not None:
+            return self._captured_act[1]
+        return utils.load_variable_data(self._scope, var_name)
 
     def _sampling(self):
         '''
@@ -764,148 +919,101 @@ class PostTrainingQuantization:
         elif self._algo in ["KL", "hist"]:
             self._sample_histogram()
 
-    def _sample_mse(self):
-        if self._quantized_threshold == {}:
-            for var_name in self._quantized_weight_var_name:
-                var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
-        _logger.info("MSE searching stage ...")
-        for var_name in self._quantized_act_var_name:
+    def _weight_quant_axis(self, var_name):
+        if (
+            self._weight_op_pairs[var_name]
+            in utils._channelwise_quant_axis1_ops
+        ):
+            return 1
+        return 0
+
+    def _parallel_map(self, func, var_names):
+        '''
+        Apply func to every variable, in the threads of num_threads. The
+        pool of the threads is kept until the sampling ends, since the
+        streaming capture maps the activations once per captured tensor.
+        '''
+        if self._thread_pool is None and self._num_threads > 1:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self._num_threads
+            )
+        return utils.parallel_map(
+            func, var_names, self._num_threads, self._thread_pool
+        )
+
+    def _weight_abs_max(self):
+        '''
+        Get the abs max of the quantized weights, which is channel-wise for
+        weight_quantize_type channel_wise_abs_max.
+
+        Returns:
+            dict: from the weight name to its abs max.
+        '''
+
+        def _abs_max(var_name):
             var_tensor = utils.load_variable_data(self._scope, var_name)
+            if self._weight_quantize_type == "abs_max":
+                return float(np.max(np.abs(var_tensor)))
+            return utils.channel_wise_abs_max(
+                var_tensor, self._weight_quant_axis(var_name)
+            )
+
+        var_names = list(self._quantized_weight_var_name)
+        return dict(zip(var_names, self._parallel_map(_abs_max, var_names)))
+
+    def _search_act_threshold(self, loss_type):
+        '''
+        Search the threshold of every activation with the loss of this
+        batch, and keep the one with the minimal loss among all batches.
+        '''
+
+        def _search(var_name):
+            var_tensor = self._load_act_data(var_name)
             if var_tensor.size == 0:
+                return None
+            return utils.search_threshold(
+                var_tensor,
+                loss_type,
+                self._activation_bits,
+                self._onnx_format,
+                self._search_sample_size,
+            )
+
+        var_names = list(self._sampling_act_var_names())
+        for var_name, result in zip(
+            var_names, self._parallel_map(_search, var_names)
+        ):
+            if result is None:
                 self._zero_size_var_names.add(var_name)
                 continue
-            var_tensor = var_tensor.flatten()
-            abs_max_value = float(np.max(np.abs(var_tensor)))
-            abs_max_value = 1e-8 if abs_max_value == 0.0 else abs_max_value
-            s = 0.3
+            loss, threshold = result
             if var_name not in self._best_calibration_loss:
                 self._best_calibration_loss[var_name] = float('inf')
-            while s <= 1.0:
-                scale = s * abs_max_value
-                s += 0.02
-                bins = 2 ** (self._activation_bits - 1) - 1
-                if self._onnx_format:
-                    quant_var = np.clip(
-                        np.round(var_tensor / scale * bins), -bins - 1, bins
-                    )
-                    quant_dequant_var = quant_var / bins * scale
-                else:
-                    quant_dequant_var = (
-                        np.round(np.clip(var_tensor, 0.0, scale) / scale * bins)
-                        / bins
-                        * scale
-                    )
-                mse_loss = ((var_tensor - quant_dequant_var) ** 2).mean()
-                if mse_loss <= self._best_calibration_loss[var_name]:
-                    self._best_calibration_loss[var_name] = mse_loss
-                    self._quantized_threshold[var_name] = scale
+            if loss <= self._best_calibration_loss[var_name]:
+                self._best_calibration_loss[var_name] = loss
+                self._quantized_threshold[var_name] = threshold
+
+    def _sample_mse(self):
+        if self._quantized_threshold == {}:
+            self._quantized_threshold.update(self._weight_abs_max())
+        _logger.info("MSE searching stage ...")
+        self._search_act_threshold('mse')
 
     def _sample_emd(self):
         if self._quantized_threshold == {}:
-            for var_name in self._quantized_weight_var_name:
-                var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+            self._quantized_threshold.update(self._weight_abs_max())
         _logger.info("EMD searching stage ...")
-        for var_name in self._quantized_act_var_name:
-            var_tensor = utils.load_variable_data(self._scope, var_name)
-            if var_tensor.size == 0:
-                self._zero_size_var_names.add(var_name)
-                continue
-            var_tensor = var_tensor.flatten()
-            abs_max_value = float(np.max(np.abs(var_tensor)))
-            abs_max_value = 1e-8 if abs_max_value == 0.0 else abs_max_value
-            s = 0.3
-            if var_name not in self._best_calibration_loss:
-                self._best_calibration_loss[var_name] = float('inf')
-            while s <= 1.0:
-                scale = s * abs_max_value
-                s += 0.02
-                bins = 2 ** (self._activation_bits - 1) - 1
-                if self._onnx_format:
-                    quant_var = np.clip(
-                        np.round(var_tensor / scale * bins), -bins - 1, bins
-                    )
-                    quant_dequant_var = quant_var / bins * scale
-                else:
-                    quant_dequant_var = (
-                        np.round(np.clip(var_tensor, 0.0, scale) / scale * bins)
-                        / bins
-                        * scale
-                    )
-                emd_loss = np.abs(
-                    np.mean(var_tensor) - np.mean(quant_dequant_var)
-                ) + np.abs(np.std(var_tensor) - np.std(quant_dequant_var))
-                if emd_loss <= self._best_calibration_loss[var_name]:
-                    self._best_calibration_loss[var_name] = emd_loss
-                    self._quantized_threshold[var_name] = scale
+        self._search_act_threshold('emd')
 
     def _sample_avg(self):
         if self._quantized_threshold == {}:
-            for var_name in self._quantized_weight_var_name:
-                var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+            self._quantized_threshold.update(self._weight_abs_max())
 
-        for var_name in self._quantized_act_var_name:
-            var_tensor = utils.load_variable_data(self._scope, var_name)
+        def _abs_avg(var_name):
+            var_tensor = self._load_act_data(var_name)
             if var_tensor.size == 0:
-                self._zero_size_var_names.add(var_name)
-                continue
-            abs_max_value = float(np.max(np.abs(var_tensor)))
-            if var_name not in self._quantized_var_avg:
-                self._quantized_var_avg[var_name] = []
-            abs_avg_value = float(
+                return None
+            return float(
                 np.mean(
                     np.max(
                         np.abs(var_tensor.reshape(var_tensor.shape[0], -1)),
@@ -913,33 +1021,24 @@ class PostTrainingQuantization:
                     )
                 )
             )
+
+        var_names = list(self._sampling_act_var_names())
+        for var_name, abs_avg_value in zip(
+            var_names, self._parallel_map(_abs_avg, var_names)
+        ):
+            if abs_avg_value is None:
+                self._zero_size_var_names.add(var_name)
+                continue
+            if var_name not in self._quantized_var_avg:
+                self._quantized_var_avg[var_name] = []
             self._quantized_var_avg[var_name].append(abs_avg_value)
 
     def _sample_abs_max(self):
         if self._quantized_threshold == {}:
-            for var_name in self._quantized_weight_var_name:
-                var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+            self._quantized_threshold.update(self._weight_abs_max())
 
-        for var_name in self._quantized_act_var_name:
-            var_tensor = utils.load_variable_data(self._scope, var_name)
+        for var_name in self._sampling_act_var_names():
+            var_tensor = self._load_act_data(var_name)
             if var_tensor.size == 0:
                 self._zero_size_var_names.add(var_name)
                 continue
@@ -957,24 +1056,14 @@ class PostTrainingQuantization:
                     min_value = float(np.min(var_tensor))
                     max_value = float(np.max(var_tensor))
                 elif self._weight_quantize_type == "channel_wise_abs_max":
-                    min_value = []
-                    max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            min_value.append(float(np.min(var_tensor[:, i])))
-                            max_value.append(float(np.max(var_tensor[:, i])))
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            min_value.append(float(np.min(var_tensor[i])))
-                            max_value.append(float(np.max(var_tensor[i])))
+                    min_value, max_value = utils.channel_wise_min_max(
+                        var_tensor, self._weight_quant_axis(var_name)
+                    )
                 self._quantized_var_min[var_name] = min_value
                 self._quantized_var_max[var_name] = max_value
 
-        for var_name in self._quantized_act_var_name:
-            var_tensor = utils.load_variable_data(self._scope, var_name)
+        for var_name in self._sampling_act_var_names():
+            var_tensor = self._load_act_data(var_name)
             if var_tensor.size == 0:
                 self._zero_size_var_names.add(var_name)
                 continue
@@ -990,8 +1079,8 @@ class PostTrainingQuantization:
                 self._quantized_var_max[var_name] = max_value
 
     def _sample_histogram(self):
-        for var_name in self._quantized_act_var_name:
-            var_tensor = utils.load_variable_data(self._scope, var_name)
+        for var_name in self._sampling_act_var_names():
+            var_tensor = self._load_act_data(var_name)
             if (var_tensor.size == 0) or (
                 var_name not in self._sampling_act_histogram
             ):
@@ -1008,29 +1097,10 @@ class PostTrainingQuantization:
         https://github.com/megvii-research/FQ-ViT/
         """
         if self._quantized_threshold == {}:
-            for var_name in self._quantized_weight_var_name:
-                var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+            self._quantized_threshold.update(self._weight_abs_max())
 
-        for var_name in self._quantized_act_var_name:
-            var_tensor = utils.load_variable_data(self._scope, var_name)
+        for var_name in self._sampling_act_var_names():
+            var_tensor = self._load_act_data(var_name)
             if var_tensor.size == 0:
                 self._zero_size_var_names.add(var_name)
                 continue
@@ -1092,8 +1162,8 @@ class PostTrainingQuantization:
         Collect the abs_min and abs_max for all activation. When algo = KL,
         get the min and max value, and then calculate the threshold.
         '''
-        for var_name in self._quantized_act_var_name:
-            var_tensor = utils.load_variable_data(self._scope, var_name)
+        for var_name in self._sampling_act_var_names():
+            var_tensor = self._load_act_data(var_name)
             if var_tensor.size == 0:
                 self._zero_size_var_names.add(var_name)
                 continue
@@ -1136,26 +1206,7 @@ class PostTrainingQuantization:
         assert self._algo in ["KL", "hist"], "The algo should be KL or hist."
 
         # Abs_max threshold for weights
-        for var_name in self._quantized_weight_var_name:
-            weight_data = utils.load_variable_data(self._scope, var_name)
-            if self._weight_quantize_type == "abs_max":
-                weight_threshold = float(np.max(np.abs(weight_data)))
-            elif self._weight_quantize_type == "channel_wise_abs_max":
-                weight_threshold = []
-                if (
-                    self._weight_op_pairs[var_name]
-                    in utils._channelwise_quant_axis1_ops
-                ):
-                    for i in range(weight_data.shape[1]):
-                        weight_threshold.append(
-                            float(np.max(np.abs(weight_data[:, i])))
-                        )
-                else:
-                    for i in range(weight_data.shape[0]):
-                        weight_threshold.append(
-                            float(np.max(np.abs(weight_data[i])))
-                        )
-            self._quantized_var_threshold[var_name] = weight_threshold
+        self._quantized_var_threshold.update(self._weight_abs_max())
 
         for var_name in self._quantized_act_var_name:
             if (var_name in self._zero_size_var_names) and (
@@ -1316,6 +1367,7 @@ class PostTrainingQuantization:
                     activation_bits=self._activation_bits,
                     weight_quantize_type=self._weight_quantize_type,
                     quantizable_op_type=self.quant_config.weight_quant_operation_types,
+                    num_threads=self._num_threads,
                 )
 
                 for sub_graph in graph.all_sub_graphs():
@@ -1527,6 +1579,9 @@ class PostTrainingQuantizationProgram(PostTrainingQuantization):
         cache_dir=None,
         scale_dict=None,
         return_graph=True,
+        search_sample_size=None,
+        num_threads=None,
+        streaming_capture=False,
     ):
         super().__init__(
             executor,
@@ -1559,6 +1614,9 @@ class PostTrainingQuantizationProgram(PostTrainingQuantization):
             cache_dir,
             scale_dict,
             return_graph,
+            search_sample_size=search_sample_size,
+            num_threads=num_threads,
+            streaming_capture=streaming_capture,
         )
         self.FLAG = False
         self._program = program
@@ -272,8 +272,8 @@ class QuantizationTransformPass:
             self._is_test = graph.is_test()
         # marked the variable which has been dequantized.
         dequantized_vars = collections.OrderedDict()
-        persistable_vars = [p.name() for p in graph.all_persistable_nodes()]
-        processed_vars = []
+        persistable_vars = {p.name() for p in graph.all_persistable_nodes()}
+        processed_vars = set()
 
         def _quant_preprocess(op_node):
             user_skipped = False
@@ -337,13 +337,13 @@ class QuantizationTransformPass:
                         target_out_node = self._insert_func(
                             graph, self._weight_quantize_func, var_node, op
                         )
-                        processed_vars.append(name)
+                        processed_vars.add(name)
                         continue
                     elif not is_weight and self._act_quantize_func is not None:
                         target_out_node = self._insert_func(
                             graph, self._act_quantize_func, var_node, op
                         )
-                        processed_vars.append(name)
+                        processed_vars.add(name)
                         continue
 
                     quant_bits = (
@@ -405,35 +405,39 @@ class QuantizationTransformPass:
                     has_weight = True
             return has_weight
 
-        if not self._is_test:
-            self._create_global_step(graph)
-        ops = graph.all_op_nodes()
-        # Do the preproccess of quantization, such as skipping some ops
-        # for not being quantized.
-        for op in ops:
-            if (
-                op.name() in self._quantizable_ops
-                or op.name() in self._quantizable_grad_ops
-            ):
-                _quant_preprocess(op)
-        # Insert mapping table to solve the problem in saving inference model.
-        graph.out_node_mapping_table = dict()
-        # The process of _transform_forward and _transform_backward is needed in two for loops.
-        # The loop for transforming the forward graph:
-        with tqdm(
-            total=len(ops),
-            bar_format='Adding quant op with weight:|{bar}| {n_fmt}/{total_fmt}',
-            ncols=80,
-        ) as t:
+        # the nodes are listed once for all the links of the pass
+        with graph._batch_edit():
+            if not self._is_test:
+                self._create_global_step(graph)
+            ops = graph.all_op_nodes()
+            # Do the preproccess of quantization, such as skipping some ops
+            # for not being quantized.
             for op in ops:
-                if op.name() in self._quantizable_ops:
-                    if not self._is_skip_quant(graph, op) and _has_weight(op):
-                        _transform_forward(graph, op)
-                t.update()
-        # The loop for renaming the inputs of backward op.
-        for op in ops:
-            if op.name() in self._quantizable_grad_ops and _has_weight(op):
-                _transform_backward(graph, op)
+                if (
+                    op.name() in self._quantizable_ops
+                    or op.name() in self._quantizable_grad_ops
+                ):
+                    _quant_preprocess(op)
+            # Insert mapping table to solve the problem in saving inference model.
+            graph.out_node_mapping_table = dict()
+            # The process of _transform_forward and _transform_backward is needed in two for loops.
+            # The loop for transforming the forward graph:
+            with tqdm(
+                total=len(ops),
+                bar_format='Adding quant op with weight:|{bar}| {n_fmt}/{total_fmt}',
+                ncols=80,
+            ) as t:
+                for op in ops:
+                    if op.name() in self._quantizable_ops:
+                        if not self._is_skip_quant(graph, op) and _has_weight(
+                            op
+                        ):
+                            _transform_forward(graph, op)
+                    t.update()
+            # The loop for renaming the inputs of backward op.
+            for op in ops:
+                if op.name() in self._quantizable_grad_ops and _has_weight(op):
+                    _transform_backward(graph, op)
         graph.resolve_hazard()
         return graph
 
@@ -1078,6 +1082,7 @@ class QuantizationFreezePass:
         round_type='round',
         weight_quantize_type='abs_max',
         quantizable_op_type=None,
+        num_threads=None,
     ):
         """
         The freeze pass is used to adjust the quantize operator order, for example:
@@ -1103,11 +1108,14 @@ class QuantizationFreezePass:
                 since weights are fixed once the model is well trained.
             quantizable_op_type(list[str]): This input param will be removed latter. The pass
                 will process all quantized op, so it is not necessary to set the input param.
+            num_threads(int, optional): The number of threads to quantize the
+                weights. If None, it is the number of CPUs, up to 8. Default is None.
         """
         assert scope is not None, 'The scope cannot be set None.'
         assert place is not None, 'The place cannot be set None.'
         self._scope = scope
         self._bias_correction = bias_correction
+        self._num_threads = num_threads
         self._place = _get_paddle_place(place)
         self._weight_bits = weight_bits
         self._activation_bits = activation_bits
@@ -1119,6 +1127,7 @@ class QuantizationFreezePass:
         self._op_output_rename_map = collections.OrderedDict()
         self._quant_var_scale_map = collections.OrderedDict()
         self._quantized_ops = set()
+        self._persistable_vars = set()
 
     def apply(self, graph):
         """
@@ -1129,8 +1138,21 @@ class QuantizationFreezePass:
         Returns:
             None
         """
+        # the nodes are listed once for all the links of the pass
+        with graph._batch_edit():
+            self._freeze(graph)
+
+        # remove the unused var node in the graph
+        self._remove_unused_var_nodes(graph)
+        graph.resolve_hazard()
+        return graph
+
+    def _freeze(self, graph):
         # Get input scales in fake quant op and process weights
-        persistable_vars = [p.name() for p in graph.all_persistable_nodes()]
+        self._persistable_vars = {
+            p.name() for p in graph.all_persistable_nodes()
+        }
+        quantized_weights = []
         ops = graph.all_op_nodes()
         for op_node in ops:
             op_name = op_node.name()
@@ -1141,7 +1163,7 @@ class QuantizationFreezePass:
                         input_arg_name = graph.out_node_mapping_table[
                             input_arg_name
                         ]
-                if input_arg_name not in persistable_vars:
+                if input_arg_name not in self._persistable_vars:
                     scale_v = graph._find_node_by_name(
                         op_node.outputs, op_node.output('OutScale')[0]
                     )
@@ -1165,7 +1187,6 @@ class QuantizationFreezePass:
                     self._quant_var_scale_map[input_arg_name] = scale_v
                     # Quantize weight and restore
                     if self._round_type == 'round':
-                        param_v = self._load_var(input_arg_name)
                         if any(
                             _check_grandchild_op_node(op_node, op)
                             for op in utils._channelwise_quant_axis1_ops
@@ -1175,26 +1196,12 @@ class QuantizationFreezePass:
                             quant_axis = 0
                         if input_arg_name not in self._quantized_ops:
                             self._quantized_ops.add(input_arg_name)
-                            quantized_param_v = utils.quant_tensor(
-                                param_v.copy(),
-                                scale_v,
-                                quant_axis,
-                                self._weight_bits,
+                            quantized_weights.append(
+                                (input_arg_name, scale_v, quant_axis)
                             )
-                            quantized_param_v = np.round(quantized_param_v)
-                            # Weight bias correction
-                            if self._bias_correction is True:
-                                quantized_param_v = utils.bias_correction_w(
-                                    param_v,
-                                    quantized_param_v,
-                                    scale_v,
-                                    quant_axis,
-                                    weight_bits=self._weight_bits,
-                                )
-                                quantized_param_v = np.round(quantized_param_v)
-                            self._restore_var(input_arg_name, quantized_param_v)
 
                     self._remove_fake_quant_and_dequant_op(graph, op_node)
+        self._quantize_weights(quantized_weights)
 
         # Remove all fake dequant op
         ops = graph.all_op_nodes()
@@ -1224,17 +1231,50 @@ class QuantizationFreezePass:
                     self._insert_post_dequant_op(graph, op_node)
 
         # Rename inputs of the followed ops after inserting dequant_op after fc/conv
-        for op_node in ops:
-            for var_node in op_node.inputs:
-                if var_node.node in self._op_output_rename_map:
-                    old_in = var_node
-                    new_in = self._op_output_rename_map[var_node.node]
-                    graph.update_input_link(old_in, new_in, op_node)
+        graph.update_input_links(
+            [
+                (var_node, self._op_output_rename_map[var_node.node], op_node)
+                for op_node in ops
+                for var_node in op_node.inputs
+                if var_node.node in self._op_output_rename_map
+            ]
+        )
 
-        # remove the unused var node in the graph
-        self._remove_unused_var_nodes(graph)
-        graph.resolve_hazard()
-        return graph
+    def _quantize_weights(self, quantized_weights):
+        """
+        Quantize the (name, scale, quant_axis) weights in the threads of
+        num_threads, and restore them to the scope in order.
+        """
+
+        def _quantize(weight):
+            name, scale_v, quant_axis = weight
+            param_v = self._load_var(name)
+            quantized_param_v = utils.quant_tensor(
+                param_v.copy(),
+                scale_v,
+                quant_axis,
+                self._weight_bits,
+            )
+            quantized_param_v = np.round(quantized_param_v)
+            # Weight bias correction
+            if self._bias_correction is True:
+                quantized_param_v = utils.bias_correction_w(
+                    param_v,
+                    quantized_param_v,
+                    scale_v,
+                    quant_axis,
+                    weight_bits=self._weight_bits,
+                )
+                quantized_param_v = np.round(quantized_param_v)
+            return quantized_param_v
+
+        quantized_param_vs = utils.parallel_map(
+            _quantize, quantized_weights, self._num_threads
+        )
+        for (name, _, _), quantized_param_v in zip(
+            quantized_weights, quantized_param_vs
+        ):
+            self._restore_var(name, quantized_param_v)
 
     def _remove_fake_quant_and_dequant_op(self, graph, op_node):
         k = graph._find_node_by_name(op_node.outputs, op_node.output('Out')[0])
@@ -1248,7 +1288,6 @@ class QuantizationFreezePass:
         graph.safe_remove_nodes(op_node)
 
     def _insert_post_channel_dequant_op(self, graph, op_node, quant_axis):
-        persistable_vars = [p.name() for p in graph.all_persistable_nodes()]
         for var_node in op_node.inputs:
             name = var_node.name()
             if name not in op_node.input_arg_names():
@@ -1260,7 +1299,7 @@ class QuantizationFreezePass:
                 graph.update_input_link(old_in, new_in, op_node)
             original_var_name = self._original_var_name(name)
             scale_v = self._quant_var_scale_map[original_var_name]
-            if original_var_name in persistable_vars:
+            if original_var_name in self._persistable_vars:
                 assert isinstance(
                     scale_v, list
                 ), 'The scale of parameter %s is not a list.' % (
@@ -1324,15 +1363,18 @@ class QuantizationFreezePass:
             },
             outputs={'Out': dequant_var_node},
         )
-        graph.link_to(output_var_node, dequant_op_node)
-        graph.link_to(scale_var_node, dequant_op_node)
-        graph.link_to(weight_scale_node, dequant_op_node)
-        graph.link_to(dequant_op_node, dequant_var_node)
+        graph.link_nodes(
+            [
+                (output_var_node, dequant_op_node),
+                (scale_var_node, dequant_op_node),
+                (weight_scale_node, dequant_op_node),
+                (dequant_op_node, dequant_var_node),
+            ]
+        )
         self._op_output_rename_map[output_var_node.node] = dequant_var_node
         return dequant_var_node
 
     def _insert_post_dequant_op(self, graph, op_node):
-        persistable_vars = [p.name() for p in graph.all_persistable_nodes()]
         max_range = 1
         param_range = (1 << (self._weight_bits - 1)) - 1
         act_range = (1 << (self._activation_bits - 1)) - 1
@@ -1347,7 +1389,7 @@ class QuantizationFreezePass:
                 graph.update_input_link(old_in, new_in, op_node)
             original_var_name = self._original_var_name(name)
             scale_v = self._quant_var_scale_map[original_var_name]
-            if original_var_name in persistable_vars:
+            if original_var_name in self._persistable_vars:
                 assert self._is_float(
                     scale_v
                 ), 'The scale of parameter %s is not a float.' % (
@@ -1384,9 +1426,13 @@ class QuantizationFreezePass:
             inputs={'X': output_var_node, 'Scale': scale_var_node},
             outputs={'Out': dequant_var_node},
         )
-        graph.link_to(output_var_node, dequant_op_node)
-        graph.link_to(scale_var_node, dequant_op_node)
-        graph.link_to(dequant_op_node, dequant_var_node)
+        graph.link_nodes(
+            [
+                (output_var_node, dequant_op_node),
+                (scale_var_node, dequant_op_node),
+                (dequant_op_node, dequant_var_node),
+            ]
+        )
         self._op_output_rename_map[output_var_node.node] = dequant_var_node
         return dequant_var_node
 
@@ -1447,7 +1493,9 @@ class QuantizationFreezePass:
 
 
 class ConvertToInt8Pass:
-    def __init__(self, scope, place, quantizable_op_type=None):
+    def __init__(
+        self, scope, place, quantizable_op_type=None, num_threads=None
+    ):
         """
         Convert the weights into int8_t type.
 
@@ -1458,11 +1506,14 @@ class ConvertToInt8Pass:
                 where ``x`` is the index of the GPUs.
             quantizable_op_type(list[str]): This input param will be removed latter. The pass
                 will process all quantized op, so it is not necessary to set the input param.
+            num_threads(int, optional): The number of threads to convert the
+                weights. If None, it is the number of CPUs, up to 8. Default is None.
         """
         assert scope is not None, 'The scope cannot be set None.'
         assert place is not None, 'The place cannot be set None.'
         self._scope = scope
         self._place = _get_paddle_place(place)
+        self._num_threads = num_threads
 
     def apply(self, graph):
         """
@@ -1474,25 +1525,28 @@ class ConvertToInt8Pass:
         Returns:
             None
         """
-        persistable_vars = [p.name() for p in graph.all_persistable_nodes()]
+        persistable_vars = {p.name() for p in graph.all_persistable_nodes()}
         ops = graph.all_op_nodes()
         input_map = {}
-        for op_node in ops:
-            if (
-                op_node.op().has_attr("quantization_type")
-                and op_node.op().attr("quantization_type") == "qat_with_weight"
-            ):
-                for var_node in op_node.inputs:
-                    name = var_node.name()
-                    if name in persistable_vars:
-                        if name not in input_map:
-                            int8_var_node = self._convert_to_int8(
-                                graph, var_node
-                            )
-                            input_map[name] = int8_var_node
-                        graph.update_input_link(
-                            var_node, input_map[name], op_node
-                        )
+        updates = []
+        with graph._batch_edit():
+            for op_node in ops:
+                if (
+                    op_node.op().has_attr("quantization_type")
+                    and op_node.op().attr("quantization_type")
+                    == "qat_with_weight"
+                ):
+                    for var_node in op_node.inputs:
+                        name = var_node.name()
+                        if name in persistable_vars:
+                            if name not in input_map:
+                                int8_var_node = self._convert_to_int8(
+                                    graph, var_node
+                                )
+                                input_map[name] = int8_var_node
+                            updates.append((var_node, input_map[name], op_node))
+            graph.update_input_links(updates)
+        self._store_int8_vars(list(input_map.keys()))
 
         # remove the unused var node in the graph
         self._remove_unused_var_nodes(graph)
@@ -1507,17 +1561,28 @@ class ConvertToInt8Pass:
             shape=var_node.shape(),
             var_dtype=core.VarDesc.VarType.INT8,
         )
-        array = self._load_var(var_node.name())
         self._scope.var(int8_var_node_name)
-        self._store_var(int8_var_node_name, array, np.int8)
         return int8_var_node
 
+    def _store_int8_vars(self, names):
+        """
+        Convert the weights to int8 in the threads of num_threads, and store
+        them to the scope in order.
+        """
+        arrays = utils.parallel_map(
+            lambda name: self._load_var(name).astype(np.int8),
+            names,
+            self._num_threads,
+        )
+        for name, array in zip(names, arrays):
+            self._store_var(name + ".int8", array, np.int8)
+
     def _load_var(self, name):
         return np.array(self._scope.find_var(name).get_tensor())
 
     def _store_var(self, name, array, dtype):
         tensor = self._scope.find_var(name).get_tensor()
-        tensor.set(array.astype(dtype), self._place)
+        tensor.set(array.astype(dtype, copy=False), self._place)
 
     def _remove_unused_var_nodes(self, graph):
         all_used_vars = set()
@@ -0,0 +1,157 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark of the time of QuantizationTransformPass, QuantizationFreezePass
+and ConvertToInt8Pass against the number of ops of a stack of fc layers, e.g.
+
+    python quantization_pass_benchmark.py --num_layers 100 1000
+    python quantization_pass_benchmark.py --num_layers 1000 --num_threads 1 8
+    python quantization_pass_benchmark.py --num_layers 1000 --no_batch_edit
+
+--no_batch_edit replaces IrGraph._batch_edit with a guard doing nothing, so
+every link lists all the graph nodes to check its nodes, as before the
+batched graph edit.
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+
+import numpy as np
+
+import paddle
+from paddle.fluid.framework import IrGraph
+from paddle.framework import core
+from paddle.static.quantization import (
+    ConvertToInt8Pass,
+    QuantizationFreezePass,
+    QuantizationTransformPass,
+)
+
+sys.path.append(
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "../../../fluid/tests/unittests",
+    )
+)
+from benchmark import timeit  # noqa: E402
+
+paddle.enable_static()
+
+
+def build_program(num_layers, hidden_size):
+    main_program = paddle.static.Program()
+    startup_program = paddle.static.Program()
+    with paddle.static.program_guard(main_program, startup_program):
+        x = paddle.static.data(name='x', shape=[-1, hidden_size])
+        hidden = x
+        for _ in range(num_layers):
+            hidden = paddle.static.nn.fc(hidden, size=hidden_size)
+    return main_program, startup_program, x, hidden
+
+
+def apply_passes(args, num_layers, num_threads):
+    place = paddle.CPUPlace()
+    exe = paddle.static.Executor(place)
+    scope = paddle.static.Scope()
+    main_program, startup_program, x, out = build_program(
+        num_layers, args.hidden_size
+    )
+    with paddle.static.scope_guard(scope):
+        exe.run(startup_program)
+    graph = IrGraph(core.Graph(main_program.desc), for_test=True)
+    num_ops = len(graph.all_op_nodes())
+    costs = []
+
+    # the graph is changed by the passes, so each of them is timed only once
+    transform_pass = QuantizationTransformPass(
+        scope=scope,
+        place=place,
+        activation_quantize_type='moving_average_abs_max',
+        weight_quantize_type=args.weight_quantize_type,
+    )
+    costs.append(timeit(transform_pass.apply, 1, graph))
+
+    # run once to compute the scales of the weights
+    feed = {'x': np.random.random([1, args.hidden_size]).astype('float32')}
+    with paddle.static.scope_guard(scope):
+        exe.run(graph.to_program(), feed=feed, fetch_list=[out.name])
+
+    freeze_pass = QuantizationFreezePass(
+        scope=scope,
+        place=place,
+        weight_quantize_type=args.weight_quantize_type,
+        num_threads=num_threads,
+    )
+    costs.append(timeit(freeze_pass.apply, 1, graph))
+
+    int8_pass = ConvertToInt8Pass(
+        scope=scope, place=place, num_threads=num_threads
+    )
+    costs.append(timeit(int8_pass.apply, 1, graph))
+    return num_ops, costs
+
+
+def main(args):
+    if args.no_batch_edit:
+        IrGraph._batch_edit = lambda self: contextlib.nullcontext()
+    print(
+        "{:<10}{:>10}{:>10}{:>16}{:>14}{:>14}".format(
+            "layers",
+            "ops",
+            "threads",
+            "transform(ms)",
+            "freeze(ms)",
+            "int8(ms)",
+        )
+    )
+    for num_layers in args.num_layers:
+        for num_threads in args.num_threads:
+            num_ops, costs = apply_passes(args, num_layers, num_threads)
+            print(
+                "{:<10}{:>10}{:>10}{:>16.1f}{:>14.1f}{:>14.1f}".format(
+                    num_layers,
+                    num_ops,
+                    num_threads,
+                    *[cost * 1e3 for cost in costs]
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--num_layers", type=int, nargs="+", default=[100, 1000]
+    )
+    parser.add_argument("--hidden_size", type=int, default=256)
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        nargs="+",
+        default=[1, 8],
+        help="the number of threads to quantize the weights",
+    )
+    parser.add_argument(
+        "--weight_quantize_type",
+        default="channel_wise_abs_max",
+        choices=["abs_max", "channel_wise_abs_max"],
+    )
+    parser.add_argument(
+        "--no_batch_edit",
+        action="store_true",
+        help="check the nodes of every link by listing all the graph nodes",
+    )
+    main(parser.parse_args())
@@ -0,0 +1,161 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.static.quantization import PostTrainingQuantization, utils
+
+paddle.enable_static()
+
+
+def sequential_search(x, loss_type, bits=8, onnx_format=False):
+    x = x.flatten()
+    abs_max_value = float(np.max(np.abs(x)))
+    best_loss, best_threshold = float('inf'), None
+    s = 0.3
+    while s <= 1.0:
+        scale = s * abs_max_value
+        s += 0.02
+        bins = 2 ** (bits - 1) - 1
+        if onnx_format:
+            quant_var = np.clip(np.round(x / scale * bins), -bins - 1, bins)
+            quant_dequant_var = quant_var / bins * scale
+        else:
+            quant_dequant_var = (
+                np.round(np.clip(x, 0.0, scale) / scale * bins) / bins * scale
+            )
+        if loss_type == 'mse':
+            loss = ((x - quant_dequant_var) ** 2).mean()
+        else:
+            loss = np.abs(np.mean(x) - np.mean(quant_dequant_var)) + np.abs(
+                np.std(x) - np.std(quant_dequant_var)
+            )
+        if loss <= best_loss:
+            best_loss, best_threshold = loss, scale
+    return best_loss, best_threshold
+
+
+class TestSearchThreshold(unittest.TestCase):
+    def test_search_threshold(self):
+        rng = np.random.RandomState(0)
+        for _ in range(10):
+            x = (rng.randn(4, 8, 6) * rng.rand() * 5).astype('float32')
+            for loss_type in ['mse', 'emd']:
+                for onnx_format in [False, True]:
+                    expected = sequential_search(x, loss_type, 8, onnx_format)
+                    # small chunks evaluate the candidates in several steps
+                    for chunk_size in [1, 500, 1 << 22]:
+                        loss, threshold = utils.search_threshold(
+                            x, loss_type, 8, onnx_format, chunk_size=chunk_size
+                        )
+                        self.assertEqual(threshold, expected[1])
+                        np.testing.assert_allclose(loss, expected[0], rtol=1e-5)
+
+    def test_sample_size(self):
+        x = np.random.RandomState(1).randn(100000).astype('float32')
+        loss, threshold = utils.search_threshold(x, 'mse', sample_size=10000)
+        expected = sequential_search(x, 'mse')
+        self.assertLess(
+            abs(threshold - expected[1]), 0.05 * float(np.max(np.abs(x)))
+        )
+
+    def test_channel_wise(self):
+        w = np.random.RandomState(2).randn(4, 5, 3, 3).astype('float32')
+        self.assertEqual(
+            utils.channel_wise_abs_max(w, 0),
+            [float(np.max(np.abs(w[i]))) for i in range(4)],
+        )
+        self.assertEqual(
+            utils.channel_wise_abs_max(w, 1),
+            [float(np.max(np.abs(w[:, i]))) for i in range(5)],
+        )
+        min_value, max_value = utils.channel_wise_min_max(w, 1)
+        self.assertEqual(min_value, [float(np.min(w[:, i])) for i in range(5)])
+        self.assertEqual(max_value, [float(np.max(w[:, i])) for i in range(5)])
+
+
+class TestPostTrainingQuantizationSearch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.model_dir = self.temp_dir.name
+        main_program = paddle.static.Program()
+        startup_program = paddle.static.Program()
+        with paddle.static.program_guard(main_program, startup_program):
+            x = paddle.static.data(name='x', shape=[-1, 3, 8, 8])
+            conv = paddle.static.nn.conv2d(x, num_filters=4, filter_size=3)
+            out = paddle.static.nn.fc(paddle.nn.functional.relu(conv), size=2)
+        exe = paddle.static.Executor(paddle.CPUPlace())
+        exe.run(startup_program)
+        paddle.static.save_inference_model(
+            os.path.join(self.model_dir, 'model'),
+            [x],
+            [out],
+            exe,
+            program=main_program,
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def quantize(self, algo, num_threads):
+        rng = np.random.RandomState(3)
+
+        def data_loader():
+            for _ in range(3):
+                yield {'x': rng.rand(2, 3, 8, 8).astype('float32')}
+
+        ptq = PostTrainingQuantization(
+            executor=paddle.static.Executor(paddle.CPUPlace()),
+            model_dir=self.model_dir,
+            model_filename='model.pdmodel',
+            params_filename='model.pdiparams',
+            data_loader=data_loader,
+            batch_nums=3,
+            algo=algo,
+            quantizable_op_type=['conv2d', 'mul'],
+            num_threads=num_threads,
+        )
+        ptq.quantize()
+        # the frozen weights, before the next run overwrites the scope
+        ptq.frozen_weights = {
+            var_name: utils.load_variable_data(ptq._scope, var_name)
+            for var_name in ptq._quantized_weight_var_name
+        }
+        return ptq
+
+    def test_threads(self):
+        for algo in ['mse', 'emd', 'avg']:
+            ptq = self.quantize(algo, 1)
+            threaded_ptq = self.quantize(algo, 4)
+            for var_name, weight in ptq.frozen_weights.items():
+                np.testing.assert_array_equal(
+                    weight, threaded_ptq.frozen_weights[var_name]
+                )
+            self.assertEqual(
+                ptq._quantized_threshold, threaded_ptq._quantized_threshold
+            )
+            self.assertEqual(
+                ptq._quantized_var_avg, threaded_ptq._quantized_var_avg
+            )
+            for var_name in ptq._quantized_weight_var_name:
+                self.assertIsInstance(ptq._quantized_threshold[var_name], list)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.static.nn.common import PyFuncRegistry
+from paddle.static.quantization import PostTrainingQuantization
+
+paddle.enable_static()
+
+
+class TestPostTrainingQuantizationStreaming(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.model_dir = self.temp_dir.name
+        main_program = paddle.static.Program()
+        startup_program = paddle.static.Program()
+        with paddle.static.program_guard(main_program, startup_program):
+            x = paddle.static.data(name='x', shape=[-1, 3, 8, 8])
+            conv = paddle.static.nn.conv2d(x, num_filters=4, filter_size=3)
+            pool = paddle.nn.functional.max_pool2d(
+                paddle.nn.functional.relu(conv), kernel_size=2
+            )
+            out = paddle.static.nn.fc(pool, size=2)
+        exe = paddle.static.Executor(paddle.CPUPlace())
+        exe.run(startup_program)
+        paddle.static.save_inference_model(
+            os.path.join(self.model_dir, 'model'),
+            [x],
+            [out],
+            exe,
+            program=main_program,
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def quantize(self, algo, streaming_capture):
+        rng = np.random.RandomState(0)
+
+        def data_loader():
+            for _ in range(3):
+                yield {'x': rng.rand(2, 3, 8, 8).astype('float32')}
+
+        ptq = PostTrainingQuantization(
+            executor=paddle.static.Executor(paddle.CPUPlace()),
+            model_dir=self.model_dir,
+            model_filename='model.pdmodel',
+            params_filename='model.pdiparams',
+            data_loader=data_loader,
+            batch_nums=3,
+            algo=algo,
+            quantizable_op_type=['conv2d', 'mul', 'pool2d'],
+            streaming_capture=streaming_capture,
+        )
+        program = ptq.quantize()
+        return ptq, program
+
+    def test_streaming_capture(self):
+        num_funcs = None
+        for algo in ['abs_max', 'avg', 'mse', 'hist', 'KL', 'min_max']:
+            ptq, program = self.quantize(algo, False)
+            streaming_ptq, streaming_program = self.quantize(algo, True)
+            # the capture callables are registered once and reused
+            if num_funcs is None:
+                num_funcs = PyFuncRegistry.registered_func_num()
+            self.assertEqual(PyFuncRegistry.registered_func_num(), num_funcs)
+            self.assertIsNone(streaming_ptq._thread_pool)
+            self.assertEqual(
+                streaming_ptq._quantized_threshold, ptq._quantized_threshold
+            )
+            self.assertEqual(
+                streaming_ptq._quantized_var_threshold,
+                ptq._quantized_var_threshold,
+            )
+            self.assertEqual(
+                streaming_ptq._quantized_var_min, ptq._quantized_var_min
+            )
+            self.assertEqual(
+                streaming_ptq._quantized_var_max, ptq._quantized_var_max
+            )
+            # the activations are captured without being persistable, and
+            # the quantized program has no capture ops
+            self.assertEqual(streaming_ptq._persistable_act_var_names, set())
+            self.assertNotIn(
+                'py_func',
+                [op.type for op in streaming_program.global_block().ops],
+            )
+            for var_name in streaming_ptq._quantized_act_var_name:
+                var = streaming_program.global_block().var(var_name)
+                self.assertFalse(var.persistable)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -267,6 +269,123 @@ def l2_loss(gt, pred):
     return ((gt - pred) ** 2).mean()
 
 
+def channel_wise_abs_max(x, quant_axis=0):
+    '''
+    Get the abs max of every channel of x along quant_axis, by a single
+    reduction over the other axes.
+    '''
+    reduce_axis = tuple(i for i in range(x.ndim) if i != quant_axis)
+    return np.max(np.abs(x), axis=reduce_axis).tolist()
+
+
+def channel_wise_min_max(x, quant_axis=0):
+    '''
+    Get the min and max of every channel of x along quant_axis.
+    '''
+    reduce_axis = tuple(i for i in range(x.ndim) if i != quant_axis)
+    return (
+        np.min(x, axis=reduce_axis).tolist(),
+        np.max(x, axis=reduce_axis).tolist(),
+    )
+
+
+def parallel_map(func, items, num_threads=None, pool=None):
+    '''
+    Apply func to every item in a pool of num_threads threads, and return
+    the results in the order of items. The numpy computations release the
+    GIL, so the items are processed in parallel. num_threads defaults to
+    the number of CPUs, up to 8. If pool is given, the items are processed
+    in it instead of a new pool, for callers mapping many times.
+    '''
+    if num_threads is None:
+        num_threads = min(os.cpu_count() or 1, 8)
+    items = list(items)
+    if num_threads <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    if pool is not None:
+        return list(pool.map(func, items))
+    with ThreadPoolExecutor(max_workers=min(num_threads, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+def _threshold_search_ratios():
+    # the same candidates as stepping s from 0.3 to 1.0 by 0.02
+    ratios = []
+    s = 0.3
+    while s <= 1.0:
+        ratios.append(s)
+        s += 0.02
+    return ratios
+
+
+_THRESHOLD_SEARCH_RATIOS = _threshold_search_ratios()
+
+
+def search_threshold(
+    x,
+    loss_type='mse',
+    quant_bits=8,
+    onnx_format=False,
+    sample_size=None,
+    chunk_size=1 << 22,
+):
+    '''
+    Search the threshold of x which minimizes the quantization loss, among
+    the candidates s * abs_max(x) for s from 0.3 to 1.0 with the step 0.02.
+    The candidates are evaluated together as a 2-D array, in chunks of
+    about chunk_size elements.
+
+    Args:
+        x(np.ndarray): The tensor to quantize.
+        loss_type(str): The quantization loss, 'mse' or 'emd'.
+        quant_bits(int): The quantization bit number.
+        onnx_format(bool): Whether to quantize in the format of ONNX.
+        sample_size(int, optional): If x has more elements than it, the loss
+            is evaluated on a fixed random subsample of sample_size elements.
+            Default is None, which means to use all the elements.
+        chunk_size(int): The max number of elements of a chunk.
+
+    Returns:
+        tuple: the minimal loss and its threshold. The larger threshold is
+        returned if several thresholds have the minimal loss.
+    '''
+    assert loss_type in ['mse', 'emd'], "The loss_type should be mse or emd."
+    x = x.flatten()
+    abs_max_value = float(np.max(np.abs(x)))
+    abs_max_value = 1e-8 if abs_max_value == 0.0 else abs_max_value
+    if sample_size is not None and x.size > sample_size:
+        x = x[np.random.RandomState(0).randint(0, x.size, sample_size)]
+    thresholds = [s * abs_max_value for s in _THRESHOLD_SEARCH_RATIOS]
+    bins = 2 ** (quant_bits - 1) - 1
+    if loss_type == 'emd':
+        x_mean = np.mean(x)
+        x_std = np.std(x)
+    num_per_chunk = max(1, chunk_size // max(x.size, 1))
+    losses = []
+    for start in range(0, len(thresholds), num_per_chunk):
+        scale = np.array(
+            thresholds[start : start + num_per_chunk], dtype=x.dtype
+        )[:, None]
+        if onnx_format:
+            quant_var = np.clip(np.round(x / scale * bins), -bins - 1, bins)
+            quant_dequant_var = quant_var / bins * scale
+        else:
+            quant_dequant_var = (
+                np.round(np.clip(x, 0.0, scale) / scale * bins) / bins * scale
+            )
+        if loss_type == 'mse':
+            loss = ((x - quant_dequant_var) ** 2).mean(axis=1)
+        else:
+            loss = np.abs(x_mean - np.mean(quant_dequant_var, axis=1)) + np.abs(
+                x_std - np.std(quant_dequant_var, axis=1)
+            )
+        losses.append(loss)
+    losses = np.concatenate(losses)
+    # the last minimum, as the sequential search keeps the later one on ties
+    best = len(losses) - 1 - int(np.argmin(losses[::-1]))
+    return float(losses[best]), thresholds[best]
+
+
 class tqdm:
     def __init__(self, total, bar_format='Loading|{bar}', ncols=80):
         self.total = total
@@ -0,0 +1,114 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+import paddle.nn.functional as F
+from paddle.nn import Conv2D, Linear, ReLU, Sequential
+from paddle.quantization import PTQ, QuantConfig
+from paddle.quantization.observers import AbsmaxObserver
+from paddle.quantization.observers.abs_max import AbsmaxObserverLayer
+
+
+class Model(paddle.nn.Layer):
+    def __init__(self):
+        super(Model, self).__init__()
+        self.features = Sequential(
+            Conv2D(3, 6, 3, stride=1, padding=1),
+            ReLU(),
+            paddle.nn.MaxPool2D(2, stride=2),
+        )
+        self.fc = Linear(6 * 16 * 16, 10)
+
+    def forward(self, inputs):
+        x = self.features(inputs)
+        x = paddle.flatten(x, 1)
+        return F.relu(self.fc(x))
+
+
+class Add(paddle.nn.Layer):
+    def forward(self, x, y):
+        return x + y
+
+
+class AddModel(paddle.nn.Layer):
+    def __init__(self):
+        super(AddModel, self).__init__()
+        self.add = Add()
+
+    def forward(self, x, y):
+        return self.add(x, y)
+
+
+class TestPTQ(unittest.TestCase):
+    def test_ptq(self):
+        model = Model()
+        model.eval()
+        observer = AbsmaxObserver(quant_bits=8)
+        q_config = QuantConfig(activation=observer, weight=None)
+        ptq = PTQ(q_config)
+        quant_model = ptq.quantize(model)
+        # the observers are not added to the model
+        self.assertEqual(
+            list(quant_model.state_dict().keys()),
+            list(model.state_dict().keys()),
+        )
+        self.assertEqual(
+            sorted(ptq.observers().keys()),
+            ['fc', 'features.0', 'features.1', 'features.2'],
+        )
+
+        inputs = [
+            paddle.to_tensor(np.random.random([2, 3, 32, 32]).astype('float32'))
+            for _ in range(3)
+        ]
+        for data in inputs:
+            out = quant_model(data)
+        # the observers do not change the output
+        np.testing.assert_allclose(out.numpy(), model(inputs[-1]).numpy())
+        for observers in ptq.observers().values():
+            self.assertEqual(len(observers), 1)
+            self.assertIsInstance(observers[0], AbsmaxObserverLayer)
+
+        conv_observer = ptq.observers()['features.0'][0]
+        expected = max(float(np.abs(data.numpy()).max()) for data in inputs)
+        np.testing.assert_allclose(
+            conv_observer.scales().numpy(), [expected], rtol=1e-6
+        )
+
+        ptq.remove_hooks()
+        quant_model(inputs[0] * 10)
+        np.testing.assert_allclose(
+            conv_observer.scales().numpy(), [expected], rtol=1e-6
+        )
+
+    def test_multiple_inputs(self):
+        model = AddModel()
+        q_config = QuantConfig(activation=None, weight=None)
+        q_config.add_type_config(Add, activation=AbsmaxObserver())
+        ptq = PTQ(q_config)
+        quant_model = ptq.quantize(model)
+        quant_model(paddle.ones([2, 4]), paddle.full([2, 4], -3.0))
+        # each input has an observer of its own
+        observers = ptq.observers()['add']
+        self.assertEqual(len(observers), 2)
+        np.testing.assert_allclose(observers[0].scales().numpy(), [1.0])
+        np.testing.assert_allclose(observers[1].scales().numpy(), [3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -557,6 +557,74 @@ class TestModelFunction(unittest.TestCase):
             np.testing.assert_allclose(out, ref, rtol=1e-6)
             fluid.disable_dygraph() if dynamic else None
 
+    def test_predict_reused_buffer(self):
+        dim = 20
+        batches = [
+            np.random.random(size=(4, dim)).astype(np.float32) for _ in range(5)
+        ]
+
+        def reused_buffer_loader():
+            # the loader fills the same numpy buffer for every batch
+            buffer = np.empty_like(batches[0])
+            for batch in batches:
+                buffer[...] = batch
+                yield [buffer]
+
+        paddle.set_device('cpu')
+        paddle.enable_static()
+        self.set_seed()
+        net = MyModel()
+        inputs = [InputSpec([None, dim], 'float32', 'x')]
+        model = Model(net, inputs)
+        model.prepare()
+        expected = [model.predict_batch([batch])[0] for batch in batches]
+        (outputs,) = model.predict(reused_buffer_loader(), verbose=0)
+        self.assertEqual(len(outputs), len(batches))
+        for out, ref in zip(outputs, expected):
+            np.testing.assert_allclose(out, ref, rtol=1e-6)
+        paddle.disable_static()
+
+    def test_predict_overridden_predict_batch(self):
+        dim = 20
+        batches = [
+            np.random.random(size=(4, dim)).astype(np.float32) for _ in range(3)
+        ]
+
+        class CountingModel(Model):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.predicted = 0
+
+            def predict_batch(self, inputs):
+                self.predicted += 1
+                return super().predict_batch(inputs)
+
+        class OutputsChecker(paddle.callbacks.Callback):
+            def __init__(self, model):
+                super().__init__()
+                self.counting = model
+                self.steps = []
+
+            def on_predict_batch_end(self, step, logs=None):
+                # the outputs of the step exist when the step ends
+                self.steps.append((step, self.counting.predicted))
+
+        paddle.set_device('cpu')
+        paddle.enable_static()
+        self.set_seed()
+        net = MyModel()
+        inputs = [InputSpec([None, dim], 'float32', 'x')]
+        model = CountingModel(net, inputs)
+        model.prepare()
+        checker = OutputsChecker(model)
+        (outputs,) = model.predict(
+            [[batch] for batch in batches], verbose=0, callbacks=[checker]
+        )
+        self.assertEqual(len(outputs), len(batches))
+        self.assertEqual(model.predicted, len(batches))
+        self.assertEqual(checker.steps, [(0, 1), (1, 2), (2, 3)])
+        paddle.disable_static()
+
     def test_save_load(self):
         path = os.path.join(tempfile.mkdtemp(), '.cache_test_save_load')
         if not os.path.exists(path):